@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+BGZF Decompression Benchmark
+
+Writes a synthetic multi-sample VCF in BGZF blocks and compares the
+throughput (uncompressed MB/s) of single-threaded ``gzip.open`` text
+reading with the thread-pool block reader in personal_genomics.bgzf.
+
+Usage:
+    python benchmarks/bench_bgzf.py [--size-mb 2048] [--workers 1,2,4,8]
+
+Author: OpenClaw AI
+Date: 2026-02-07
+"""
+
+import argparse
+import gzip
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from personal_genomics.bgzf import (
+    BGZF_BLOCK_SIZE,
+    BGZF_EOF,
+    compress_bgzf,
+    default_workers,
+    iter_file_chunks,
+)
+
+SAMPLES = 8
+
+
+def synthetic_records(n_records, seed=42):
+    """VCF text for ``n_records`` sorted biallelic SNVs with GT:GQ samples."""
+    rng = random.Random(seed)
+    calls = ["0/0", "0/1", "1/1", "0|1", "1|0", "./."]
+    lines = []
+    pos = 10_000
+    for i in range(n_records):
+        pos += rng.randint(1, 400)
+        ref, alt = rng.sample("ACGT", 2)
+        samples = "\t".join(f"{rng.choice(calls)}:{rng.randint(1, 99)}" for _ in range(SAMPLES))
+        lines.append(f"1\t{pos}\trs{1000 + i}\t{ref}\t{alt}\t50\tPASS\tAF=0.{rng.randint(1, 99)}\tGT:GQ\t{samples}")
+    return ("\n".join(lines) + "\n").encode()
+
+
+def write_synthetic_vcf(path, size_mb):
+    """
+    Write a BGZF VCF of about ``size_mb`` uncompressed MB by repeating one
+    generated slab of records (compressed once, so setup stays quick).
+    """
+    header = "##fileformat=VCFv4.2\n#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\t"
+    header += "\t".join(f"S{i}" for i in range(SAMPLES)) + "\n"
+    slab = synthetic_records(40_000)
+    # Cut on a block boundary so repeated slabs stay valid BGZF
+    slab = slab[:len(slab) // BGZF_BLOCK_SIZE * BGZF_BLOCK_SIZE]
+    slab_bgzf = compress_bgzf(slab)[:-len(BGZF_EOF)]
+
+    total = len(header)
+    with open(path, "wb") as fh:
+        fh.write(compress_bgzf(header.encode())[:-len(BGZF_EOF)])
+        while total < size_mb * 1e6:
+            fh.write(slab_bgzf)
+            total += len(slab)
+        fh.write(BGZF_EOF)
+    return total
+
+
+def read_gzip_text(path):
+    """Baseline: the text-mode loop every loader used."""
+    n = 0
+    with gzip.open(path, "rt", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            n += len(line)
+    return n
+
+
+def read_gzip_bytes(path):
+    n = 0
+    with gzip.open(path, "rb") as f:
+        while True:
+            chunk = f.read(4 * 1024 * 1024)
+            if not chunk:
+                return n
+            n += len(chunk)
+
+
+def read_parallel(path, workers):
+    return sum(len(chunk) for chunk in iter_file_chunks(path, workers=workers))
+
+
+def time_reader(label, reader, size_bytes):
+    start = time.perf_counter()
+    n = reader()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed:>8.2f} {size_bytes / elapsed / 1e6:>10.1f}")
+    return n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--size-mb', type=int, default=2048,
+                        help='uncompressed VCF size (default 2048)')
+    parser.add_argument('--workers', default=None,
+                        help='comma-separated thread counts (default 1,2,4,...,%d)' % default_workers())
+    parser.add_argument('--skip-text', action='store_true',
+                        help='skip the slow gzip.open text-mode baseline')
+    args = parser.parse_args()
+
+    if args.workers:
+        worker_counts = [int(w) for w in args.workers.split(',')]
+    else:
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= default_workers():
+            worker_counts.append(worker_counts[-1] * 2)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'synthetic.vcf.gz')
+        size = write_synthetic_vcf(path, args.size_mb)
+        print(f"Synthetic BGZF VCF: {size / 1e6:,.0f} MB uncompressed, "
+              f"{os.path.getsize(path) / 1e6:,.0f} MB on disk")
+
+        print(f"{'reader':<24} {'seconds':>8} {'MB/s':>10}")
+        if not args.skip_text:
+            time_reader('gzip.open (text)', lambda: read_gzip_text(path), size)
+        expected = time_reader('gzip.open (bytes)', lambda: read_gzip_bytes(path), size)
+        for workers in worker_counts:
+            n = time_reader(f'bgzf ({workers} threads)', lambda: read_parallel(path, workers), size)
+            assert n == expected, "parallel reader returned a different byte count"
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Consumer DNA File Parser Benchmark
+
+Builds a synthetic ~700k-line chip file from the row patterns in
+tests/fixtures/synthetic_dna.py and compares the vectorized parser with
+the line-by-line loader (lines/sec).
+
+Usage:
+    python benchmarks/bench_consumer_parser.py [--lines 700000] [--format 23andme|ancestry]
+
+Author: OpenClaw AI
+Date: 2026-02-07
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from comprehensive_analysis import _load_consumer_format_lines, load_consumer_format
+from tests.fixtures.synthetic_dna import (
+    SYNTHETIC_GENOME_AFRICAN,
+    SYNTHETIC_GENOME_ASIAN,
+    SYNTHETIC_GENOME_EUROPEAN,
+)
+
+
+def fixture_rows():
+    """Data rows (rsid, chrom, pos, allele1, allele2) from the fixtures."""
+    rows = []
+    for genome in (SYNTHETIC_GENOME_EUROPEAN, SYNTHETIC_GENOME_AFRICAN, SYNTHETIC_GENOME_ASIAN):
+        for line in genome.splitlines():
+            parts = line.split('\t')
+            if len(parts) == 5 and parts[0].startswith('rs'):
+                rows.append(parts)
+    return rows
+
+
+def write_synthetic_file(path, n_lines, fmt='23andme', seed=42):
+    """
+    Write an n_lines chip file: fixture rows plus generated rows with the
+    same shape, ~1% no-calls and a sprinkling of indels.
+    """
+    rng = random.Random(seed)
+    fixtures = fixture_rows()
+    bases = 'ACGT'
+
+    with open(path, 'w') as f:
+        f.write("# Synthetic benchmark genome - NOT REAL HUMAN DATA\n")
+        f.write("rsid\tchromosome\tposition\tgenotype\n" if fmt == '23andme'
+                else "rsid\tchromosome\tposition\tallele1\tallele2\n")
+        for i in range(n_lines):
+            if i < len(fixtures):
+                rsid, chrom, pos, a1, a2 = fixtures[i]
+            else:
+                rsid = f"rs{rng.randint(1, 800_000_000)}"
+                chrom = str(rng.randint(1, 22)) if i % 40 else rng.choice(['X', 'Y', 'MT'])
+                pos = str(rng.randint(1, 250_000_000))
+                roll = rng.random()
+                if roll < 0.01:
+                    a1 = a2 = '-' if fmt == '23andme' else '0'
+                elif roll < 0.012:
+                    a1, a2 = 'D', 'I'
+                else:
+                    a1, a2 = rng.choice(bases), rng.choice(bases)
+            if fmt == '23andme':
+                f.write(f"{rsid}\t{chrom}\t{pos}\t{a1}{a2}\n")
+            else:
+                f.write(f"{rsid}\t{chrom}\t{pos}\t{a1}\t{a2}\n")
+
+
+def time_loader(loader, path, repeats):
+    best = float('inf')
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = loader(path)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--lines', type=int, default=700_000)
+    parser.add_argument('--format', choices=['23andme', 'ancestry'], default='23andme')
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'genome.txt')
+        write_synthetic_file(path, args.lines, args.format)
+        size_mb = os.path.getsize(path) / 1e6
+        print(f"Synthetic {args.format} file: {args.lines:,} lines, {size_mb:.1f} MB")
+
+        slow_t, slow = time_loader(_load_consumer_format_lines, path, args.repeats)
+        fast_t, fast = time_loader(load_consumer_format, path, args.repeats)
+
+    assert fast == slow, "vectorized parser disagrees with line-by-line loader"
+
+    print(f"{'parser':<14} {'seconds':>8} {'lines/sec':>14}")
+    print(f"{'line-by-line':<14} {slow_t:>8.3f} {args.lines / slow_t:>14,.0f}")
+    print(f"{'vectorized':<14} {fast_t:>8.3f} {args.lines / fast_t:>14,.0f}")
+    print(f"speedup: {slow_t / fast_t:.1f}x ({len(fast):,} SNPs)")
+
+
+if __name__ == '__main__':
+    main()
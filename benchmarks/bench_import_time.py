@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Cold-Start Import Benchmark
+
+Measures wall-clock start-up time of fresh interpreters for the CLI and
+for scripts that touch a single marker category, plus the heaviest
+modules from ``python -X importtime``.
+
+Usage:
+    python benchmarks/bench_import_time.py [--runs 7] [--top 10]
+
+Author: OpenClaw AI
+Date: 2026-02-07
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO = Path(__file__).parent.parent
+
+SCENARIOS = [
+    ("python -c 'import markers'", ["-c", "import markers"]),
+    ("single category (PHARMACOGENOMICS_MARKERS)",
+     ["-c", "from markers import PHARMACOGENOMICS_MARKERS"]),
+    ("single category (markers.traits)", ["-c", "from markers.traits import TRAIT_MARKERS"]),
+    ("import personal_genomics.genotypes", ["-c", "import personal_genomics.genotypes"]),
+    ("import comprehensive_analysis", ["-c", "import comprehensive_analysis"]),
+    ("python comprehensive_analysis.py (no args)", ["comprehensive_analysis.py"]),
+]
+
+
+def time_run(args, runs):
+    """Median and min wall time (seconds) of ``python <args>`` over ``runs``."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="")
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable] + args, cwd=REPO, env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), min(times)
+
+
+def top_imports(args, top):
+    """Heaviest modules (cumulative microseconds) from -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime"] + args, cwd=REPO,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        rows.append((int(parts[1]), parts[2].rstrip()))
+    # Top-level imports only (no nesting indent beyond one space)
+    roots = [r for r in rows if not r[1].startswith("  ")]
+    return sorted(roots, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=7, help="Runs per scenario")
+    parser.add_argument("--top", type=int, default=8, help="Heaviest imports to list")
+    args = parser.parse_args()
+
+    # Warm the bytecode cache so runs measure import work, not compilation
+    for _, cmd in SCENARIOS:
+        time_run(cmd, 1)
+
+    print(f"{'Scenario':<48} {'median':>9} {'min':>9}")
+    print("-" * 68)
+    for label, cmd in SCENARIOS:
+        median, best = time_run(cmd, args.runs)
+        print(f"{label:<48} {median * 1000:>7.0f}ms {best * 1000:>7.0f}ms")
+
+    print(f"\nHeaviest imports for 'python comprehensive_analysis.py':")
+    for micros, name in top_imports(["comprehensive_analysis.py"], args.top):
+        print(f"  {micros / 1000:>8.1f}ms  {name.strip()}")
+
+
+if __name__ == "__main__":
+    main()
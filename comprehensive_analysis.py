@@ -51,20 +51,25 @@ Example:
 
 from __future__ import annotations
 
+import os
 import sys
 import json
-import gzip
+import hashlib
+import inspect
 import math
 import re
+import time
 import logging
 import shutil
 import webbrowser
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import islice
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, deque
 from datetime import datetime
 from typing import (
     Dict, List, Optional, Any, Tuple, Union,
-    TypedDict, Sequence, Mapping
+    TypedDict, Sequence, Mapping, Iterable
 )
 
 # Configure logging
@@ -150,6 +155,28 @@ GENOTYPE_PATTERN = re.compile(r'^[ACGT]{1,2}$|^[ACGTDI]{1,2}$|^--$|^00$|^\?$', r
 # MODULE IMPORTS (with graceful fallback)
 # =============================================================================
 
+import numpy as np
+
+from personal_genomics.bgzf import iter_text_lines, read_file_bytes
+from personal_genomics.cohort import KINSHIP_THIRD_DEGREE, CohortBuilder, CohortMatrix
+from personal_genomics.ibd import GeneticMap, IBDParams, match_cohort
+from personal_genomics.genotypes import (
+    ALLELE_CODES,
+    GenotypeStore,
+    GenotypeStoreBuilder,
+    HAPLOID_BASE,
+    MISSING_CODE,
+    OTHER_CODE,
+    chromosome_code,
+    decode_genotype,
+    encode_genotype,
+    rsid_to_int,
+)
+from personal_genomics.json_stream import JSONObjectWriter, write_json
+from personal_genomics.prs_engine import PRSWeightMatrix
+from personal_genomics.result_cache import ResultCache, cache_key, file_digest, fingerprint
+from personal_genomics.vcf import VCFReader
+
 MODULES_LOADED = False
 
 try:
@@ -334,22 +361,16 @@ def detect_format(filepath: Union[str, Path]) -> str:
     if filepath.endswith('.vcf') or filepath.endswith('.vcf.gz'):
         return 'vcf'
 
-    # Determine opener based on compression
-    opener = gzip.open if filepath.endswith('.gz') else open
-    mode = 'rt' if filepath.endswith('.gz') else 'r'
-
     try:
-        with opener(filepath, mode, encoding='utf-8', errors='replace') as f:
-            header_lines = []
-            for i, line in enumerate(f):
-                if i >= 20:
-                    break
-                header_lines.append(line)
+        # Inline inflate: only the first chunk is needed
+        lines = iter_text_lines(filepath, workers=1)
+        header_lines = list(islice(lines, 20))
+        lines.close()
     except IOError as e:
         logger.error(f"Error reading file header: {e}")
         raise
 
-    content = ''.join(header_lines).lower()
+    content = '\n'.join(header_lines).lower()
 
     if '23andme' in content:
         return '23andme'
@@ -365,166 +386,438 @@ def detect_format(filepath: Union[str, Path]) -> str:
         return 'generic'
 
 
-def load_vcf(filepath: Union[str, Path]) -> Dict[str, str]:
+def load_vcf(
+    filepath: Union[str, Path],
+    sample: Optional[Union[str, int]] = None,
+    rsids: Optional[Iterable[str]] = None,
+) -> GenotypeStore:
     """
-    Load VCF file into rsid -> genotype dictionary.
+    Load one sample of a VCF file into a columnar rsid -> genotype store.
+
+    Records without an rsID are keyed by ``chrom:pos``. For bgzipped
+    files, ``rsids`` reads only the BGZF blocks holding those variants
+    (using a block index saved next to the file).
 
     Args:
         filepath: Path to VCF file (.vcf or .vcf.gz).
+        sample: Sample name or column index (default: first sample).
+        rsids: Only load these rsIDs.
 
     Returns:
-        Dictionary mapping rsIDs to genotype strings.
+        GenotypeStore mapping rsIDs to genotype strings, with chromosome
+        and position columns.
 
     Raises:
         IOError: If file cannot be read.
-        ValueError: If file format is invalid.
+        ValueError: If the sample is not in the file.
     """
-    genotypes: Dict[str, str] = {}
-    filepath_str = str(filepath)
+    try:
+        reader = VCFReader(filepath)
+        if not reader.samples:
+            logger.warning(f"No sample columns in {filepath}")
+            return GenotypeStoreBuilder().build()
+        stores = reader.read(samples=0 if sample is None else sample, rsids=rsids)
+    except IOError as e:
+        logger.error(f"Error reading VCF file: {e}")
+        raise
 
-    opener = gzip.open if filepath_str.endswith('.gz') else open
-    mode = 'rt' if filepath_str.endswith('.gz') else 'r'
+    genotypes = next(iter(stores.values()))
+    logger.info(f"Loaded {len(genotypes):,} variants from VCF")
+    return genotypes
 
-    line_count = 0
-    error_count = 0
 
-    try:
-        with opener(filepath_str, mode, encoding='utf-8', errors='replace') as f:
-            for line in f:
-                line_count += 1
+def load_vcf_samples(
+    filepath: Union[str, Path],
+    samples: Optional[Sequence[Union[str, int]]] = None,
+    rsids: Optional[Iterable[str]] = None,
+) -> Dict[str, GenotypeStore]:
+    """
+    Load several (default: all) samples of a multi-sample VCF in one pass.
 
-                if line.startswith('#'):
-                    continue
+    Args:
+        filepath: Path to VCF file (.vcf or .vcf.gz).
+        samples: Sample names or column indices (default: all samples).
+        rsids: Only load these rsIDs.
 
-                parts = line.strip().split('\t')
-                if len(parts) < 10:
-                    continue
+    Returns:
+        Dict of sample name -> GenotypeStore.
 
-                try:
-                    chrom, pos, rsid, ref, alt, qual, filt, info, fmt, sample = parts[:10]
+    Raises:
+        IOError: If file cannot be read.
+        ValueError: If a sample is not in the file.
+    """
+    stores = VCFReader(filepath).read(samples=samples, rsids=rsids)
+    logger.info(f"Loaded {len(stores)} samples from VCF")
+    return stores
 
-                    if not validate_rsid(rsid):
-                        continue
 
-                    # Parse genotype
-                    fmt_fields = fmt.split(':')
-                    sample_fields = sample.split(':')
+def _parse_consumer_line(
+    line: str,
+    keep_no_calls: bool = False,
+) -> Optional[Tuple[str, str, str, str]]:
+    """
+    Parse one line of a consumer DNA file.
 
-                    gt_idx = fmt_fields.index('GT') if 'GT' in fmt_fields else 0
-                    gt = sample_fields[gt_idx] if gt_idx < len(sample_fields) else './.'
+    Args:
+        line: Raw text line.
+        keep_no_calls: Return no-calls with an empty genotype instead of None.
 
-                    # Convert GT to alleles
-                    alleles = [ref] + alt.split(',')
-                    gt_parts = gt.replace('|', '/').split('/')
+    Returns:
+        Tuple of (rsid, genotype, chromosome, position), or None for
+        comments, blank lines, invalid rsIDs and (unless ``keep_no_calls``)
+        no-calls.
+    """
+    # Skip comments and empty lines
+    if line.startswith('#') or not line.strip():
+        return None
 
-                    a1 = alleles[int(gt_parts[0])] if gt_parts[0] not in ('.', '') else '?'
-                    a2 = alleles[int(gt_parts[1])] if len(gt_parts) > 1 and gt_parts[1] not in ('.', '') else a1
+    # Try tab-separated first, then comma
+    parts = line.strip().split('\t')
+    if len(parts) < 4:
+        parts = line.strip().split(',')
 
-                    geno = sanitize_genotype(a1 + a2)
-                    if geno:
-                        genotypes[rsid] = geno
+    if len(parts) >= 4:
+        rsid = parts[0].strip()
 
-                except (ValueError, IndexError) as e:
-                    error_count += 1
-                    if error_count <= 5:
-                        logger.debug(f"Line {line_count}: Parse error - {e}")
-                    continue
+        if not validate_rsid(rsid):
+            return None
+
+        # Format varies:
+        # 4 columns: rsid, chrom, pos, genotype (23andMe)
+        # 5 columns: rsid, chrom, pos, allele1, allele2 (Ancestry)
+        if len(parts) >= 5:
+            # Ancestry format: combine allele1 + allele2
+            raw_genotype = parts[3].strip() + parts[4].strip()
+        else:
+            # 23andMe format: genotype in column 4
+            raw_genotype = parts[3].strip()
+        genotype = sanitize_genotype(raw_genotype)
+
+        if genotype or keep_no_calls:
+            return rsid, genotype, parts[1].strip(), parts[2].strip()
+
+    elif len(parts) >= 2:
+        # Alternative format: rsid, genotype
+        rsid = parts[0].strip()
+        if validate_rsid(rsid):
+            genotype = sanitize_genotype(parts[1])
+            if genotype or keep_no_calls:
+                return rsid, genotype, '', ''
+
+    return None
+
+
+# Byte -> 2-bit allele code (255 for anything that isn't a plain nucleotide)
+_ALLELE_BYTE_TABLE = np.full(256, 255, dtype=np.uint8)
+for _code, _base in enumerate(b'ACGT'):
+    _ALLELE_BYTE_TABLE[_base] = _code
+    _ALLELE_BYTE_TABLE[_base | 0x20] = _code
+
+# (first byte << 8 | second byte) -> chromosome code for 1-2 character labels
+_CHROMOSOME_BYTE_TABLE = np.zeros(1 << 16, dtype=np.uint8)
+for _label in [str(i) for i in range(1, 27)] + ['X', 'Y', 'XY', 'MT', 'M']:
+    for _variant in {_label, _label.lower()}:
+        _raw = _variant.encode('ascii')
+        _CHROMOSOME_BYTE_TABLE[(_raw[0] << 8) | (_raw[1] if len(_raw) > 1 else 0)] = \
+            chromosome_code(_label)
+
+# Give up on the fast path when more lines than this need per-line parsing
+FAST_PARSE_MAX_IRREGULAR = 0.1
+
+
+def _parse_digit_fields(
+    buf: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    max_digits: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parse unsigned decimal fields buf[starts:ends] for many rows at once.
 
-    except IOError as e:
-        logger.error(f"Error reading VCF file: {e}")
-        raise
+    Returns:
+        Tuple of (int64 values, bool mask of rows that were all digits).
+    """
+    lengths = ends - starts
+    ok = (lengths > 0) & (lengths <= max_digits)
+    values = np.zeros(len(starts), dtype=np.int64)
+    for j in range(max_digits):
+        active = ok & (lengths > j)
+        if not active.any():
+            break
+        digit = buf[np.where(active, starts + j, 0)].astype(np.int64) - 48
+        ok &= ~(active & ((digit < 0) | (digit > 9)))
+        values = np.where(active, values * 10 + digit, values)
+    return values, ok
 
-    if error_count > 5:
-        logger.warning(f"Skipped {error_count} lines with parse errors")
 
-    logger.info(f"Loaded {len(genotypes):,} variants from VCF")
+def _position_value(position: str) -> int:
+    """Parse a position column, returning 0 when it isn't a valid uint32."""
+    try:
+        value = int(position)
+    except ValueError:
+        return 0
+    return value if 0 <= value < 2 ** 32 else 0
+
+
+def parse_consumer_buffer(data: bytes) -> Optional[GenotypeStore]:
+    """
+    Vectorized parser for tab-delimited consumer DNA files.
+
+    Locates every line and tab in the whole buffer with NumPy, parses the
+    rsID and position columns as digit arrays, and maps alleles through a
+    byte translation table straight into genotype codes. Only unusual
+    lines (wrong column count, odd genotypes such as indels or half
+    calls) go through the per-line rules, so results are identical to
+    the line-by-line loader.
+
+    Args:
+        data: Raw (decompressed) file contents.
+
+    Returns:
+        GenotypeStore, or None if the file doesn't have a regular 4- or
+        5-column tab-delimited layout and should be parsed line by line.
+    """
+    data = data.replace(b'\r', b'')
+    if not data:
+        return None
+    buf = np.frombuffer(data, dtype=np.uint8)
+    n_bytes = len(buf)
+
+    # Line boundaries and tabs per line
+    newlines = np.flatnonzero(buf == 10)
+    starts = np.concatenate(([0], newlines + 1)).astype(np.int64)
+    ends = np.concatenate((newlines, [n_bytes])).astype(np.int64)
+    tabs = np.flatnonzero(buf == 9).astype(np.int64)
+    tab_counts = np.bincount(
+        np.searchsorted(starts, tabs, side='right') - 1, minlength=len(starts)
+    )
+
+    nonempty = ends > starts
+    is_data = nonempty.copy()
+    is_data[nonempty] = buf[starts[nonempty]] != ord('#')
+    data_lines = np.flatnonzero(is_data)
+    if len(data_lines) == 0:
+        return None
+
+    n_tabs = int(np.bincount(tab_counts[data_lines]).argmax())
+    if n_tabs not in (3, 4):
+        return None
+    regular = data_lines[tab_counts[data_lines] == n_tabs]
+    irregular = data_lines[tab_counts[data_lines] != n_tabs]
+
+    s = starts[regular]
+    e = ends[regular]
+    first_tab = np.searchsorted(tabs, s)
+    t = [tabs[first_tab + j] for j in range(n_tabs)]
+
+    # rsID column: "rs" / "RS" followed by digits
+    prefix_ok = ((buf[s] | 0x20) == ord('r')) & ((buf[s + 1] | 0x20) == ord('s'))
+    ids, id_ok = _parse_digit_fields(buf, s + 2, t[0], 18)
+    id_ok &= prefix_ok & (ids > 0)
+    # Lines whose first byte isn't a letter (e.g. leading blanks) get the
+    # per-line treatment; lettered junk ids ("i700", "invalid") are dropped.
+    first = buf[s] | 0x20
+    odd_start = ~id_ok & ((first < ord('a')) | (first > ord('z')))
+    # So do lines with blanks in the ID, chromosome or position field
+    # ("rs43 "), which the per-line parser strips.
+    spaces = np.flatnonzero(buf == 32)
+    if len(spaces):
+        row_of_line = np.full(len(starts), -1, dtype=np.int64)
+        row_of_line[regular] = np.arange(len(regular))
+        rows = row_of_line[np.searchsorted(starts, spaces, side='right') - 1]
+        hit = rows >= 0
+        rows = rows[hit]
+        odd_start[rows[spaces[hit] < t[2][rows]]] = True
+    id_ok &= ~odd_start
+    irregular = np.concatenate((irregular, regular[odd_start]))
+    ids = np.where(id_ok, ids, 0)
+    if len(irregular) > FAST_PARSE_MAX_IRREGULAR * len(data_lines):
+        return None
+
+    # Chromosome column (optional "chr" prefix)
+    c_start = t[0] + 1
+    c_len = t[1] - c_start
+    has_chr = (c_len > 3) & (
+        ((buf[np.where(c_len > 3, c_start, 0)] | 0x20) == ord('c'))
+        & ((buf[np.where(c_len > 3, c_start + 1, 0)] | 0x20) == ord('h'))
+        & ((buf[np.where(c_len > 3, c_start + 2, 0)] | 0x20) == ord('r'))
+    )
+    c_start = c_start + 3 * has_chr
+    c_len = t[1] - c_start
+    second = np.where(c_len == 2, buf[np.minimum(c_start + 1, n_bytes - 1)], 0)
+    chromosomes = np.where(
+        (c_len == 1) | (c_len == 2),
+        _CHROMOSOME_BYTE_TABLE[(buf[c_start].astype(np.int64) << 8) | second],
+        0,
+    ).astype(np.uint8)
+
+    # Position column
+    positions, pos_ok = _parse_digit_fields(buf, t[1] + 1, t[2], 10)
+    positions = np.where(pos_ok & (positions < 2 ** 32), positions, 0).astype(np.uint32)
+
+    # Genotype column(s) through the allele byte table
+    if n_tabs == 3:
+        g1 = t[2] + 1
+        g2 = g1 + 1
+        g_len = e - g1
+        pair = g_len == 2
+        single = g_len == 1
+    else:
+        g1 = t[2] + 1
+        g2 = t[3] + 1
+        pair = ((t[3] - g1) == 1) & ((e - g2) == 1)
+        single = np.zeros(len(s), dtype=bool)
+    raw1 = buf[np.minimum(g1, n_bytes - 1)]
+    raw2 = buf[np.minimum(g2, n_bytes - 1)]
+    a1 = _ALLELE_BYTE_TABLE[raw1]
+    a2 = _ALLELE_BYTE_TABLE[raw2]
+
+    codes = np.full(len(s), MISSING_CODE, dtype=np.uint8)
+    diploid = pair & (a1 < 4) & (a2 < 4)
+    haploid = single & (a1 < 4)
+    codes[diploid] = a1[diploid] * 4 + a2[diploid]
+    codes[haploid] = HAPLOID_BASE + a1[haploid]
+
+    # "--", "00" and friends are no-calls; everything else that isn't a
+    # plain call (indels, half calls, padding) goes through sanitize_genotype
+    no_call_byte = (raw1 == ord('-')) | (raw1 == ord('0'))
+    no_call = pair & no_call_byte & ((raw2 == ord('-')) | (raw2 == ord('0')))
+    other: Dict[int, str] = {}
+    for row in np.flatnonzero(~diploid & ~haploid & ~no_call & (ids != 0)):
+        if n_tabs == 3:
+            raw = data[g1[row]:e[row]].decode('utf-8', errors='replace').strip()
+        else:
+            raw = (data[g1[row]:t[3][row]].decode('utf-8', errors='replace').strip()
+                   + data[g2[row]:e[row]].decode('utf-8', errors='replace').strip())
+        genotype = sanitize_genotype(raw)
+        codes[row] = encode_genotype(genotype)
+        if codes[row] == OTHER_CODE:
+            other[int(row)] = genotype
+
+    # Irregular lines: same rules as the line-by-line loader
+    order = starts[regular]
+    if len(irregular):
+        extra = [
+            _parse_consumer_line(
+                data[starts[i]:ends[i]].decode('utf-8', errors='replace'),
+                keep_no_calls=True,
+            )
+            for i in irregular
+        ]
+        keep = [k for k, parsed in enumerate(extra) if parsed]
+        base = len(ids)
+        extra_codes = []
+        for offset, k in enumerate(keep):
+            rsid, genotype, chrom, pos = extra[k]
+            code = encode_genotype(genotype)
+            extra_codes.append(code)
+            if code == OTHER_CODE:
+                other[base + offset] = genotype
+        ids = np.concatenate((ids, [rsid_to_int(extra[k][0]) or 0 for k in keep]))
+        codes = np.concatenate((codes, np.asarray(extra_codes, dtype=np.uint8)))
+        chromosomes = np.concatenate((
+            chromosomes,
+            np.asarray([chromosome_code(extra[k][2]) for k in keep], dtype=np.uint8),
+        ))
+        positions = np.concatenate((
+            positions,
+            np.asarray([_position_value(extra[k][3]) for k in keep], dtype=np.uint32),
+        ))
+        order = np.concatenate((order, starts[irregular][keep]))
+
+        # Restore file order so the last duplicate still wins
+        perm = np.argsort(order, kind='stable')
+        rank = np.empty_like(perm)
+        rank[perm] = np.arange(len(perm))
+        ids, codes = ids[perm], codes[perm]
+        chromosomes, positions = chromosomes[perm], positions[perm]
+        other = {int(rank[row]): geno for row, geno in other.items()}
+
+    store = GenotypeStore.from_arrays(ids, codes, chromosomes, positions, other)
+    store.qc.set_header(
+        data[:starts[data_lines[0]]].decode('utf-8', errors='replace')
+    )
+    return store
+
+
+def _load_consumer_format_lines(filepath: Union[str, Path]) -> GenotypeStore:
+    """
+    Line-by-line consumer format loader.
+
+    Handles any mix of delimiters and malformed lines; used when the
+    vectorized parser declines a file.
+    """
+    builder = GenotypeStoreBuilder()
+    header: List[str] = []
+
+    for line in iter_text_lines(filepath):
+        if not len(builder) and line.startswith('#'):
+            header.append(line.rstrip('\r\n'))
+            continue
+        parsed = _parse_consumer_line(line, keep_no_calls=True)
+        if not parsed:
+            continue
+        if parsed[1]:
+            builder.add(*parsed)
+        else:
+            builder.add_no_call(parsed[0], parsed[2])
+
+    genotypes = builder.build()
+    genotypes.qc.set_header('\n'.join(header))
     return genotypes
 
 
-def load_consumer_format(filepath: Union[str, Path]) -> Dict[str, str]:
+def load_consumer_format(filepath: Union[str, Path]) -> GenotypeStore:
     """
-    Load consumer DNA format (23andMe, Ancestry, etc.) into dictionary.
+    Load consumer DNA format (23andMe, Ancestry, etc.) into a columnar store.
+
+    Regular tab-delimited files are parsed in one vectorized pass over the
+    whole buffer; anything else falls back to the line-by-line parser.
 
     Args:
         filepath: Path to DNA data file.
 
     Returns:
-        Dictionary mapping rsIDs to genotype strings.
+        GenotypeStore mapping rsIDs to genotype strings, with chromosome
+        and position columns.
 
     Raises:
         IOError: If file cannot be read.
     """
-    genotypes: Dict[str, str] = {}
     filepath_str = str(filepath)
 
-    opener = gzip.open if filepath_str.endswith('.gz') else open
-    mode = 'rt' if filepath_str.endswith('.gz') else 'r'
-
-    line_count = 0
-    error_count = 0
-
     try:
-        with opener(filepath_str, mode, encoding='utf-8', errors='replace') as f:
-            for line in f:
-                line_count += 1
+        # BGZF-compressed files inflate on a thread pool
+        data = read_file_bytes(filepath_str)
 
-                # Skip comments and empty lines
-                if line.startswith('#') or not line.strip():
-                    continue
-
-                # Try tab-separated first, then comma
-                parts = line.strip().split('\t')
-                if len(parts) < 4:
-                    parts = line.strip().split(',')
-
-                if len(parts) >= 4:
-                    rsid = parts[0].strip()
-
-                    if not validate_rsid(rsid):
-                        continue
-
-                    # Format varies:
-                    # 4 columns: rsid, chrom, pos, genotype (23andMe)
-                    # 5 columns: rsid, chrom, pos, allele1, allele2 (Ancestry)
-                    if len(parts) >= 5:
-                        # Ancestry format: combine allele1 + allele2
-                        raw_genotype = parts[3].strip() + parts[4].strip()
-                    else:
-                        # 23andMe format: genotype in column 4
-                        raw_genotype = parts[3].strip()
-                    genotype = sanitize_genotype(raw_genotype)
-
-                    if genotype:
-                        genotypes[rsid] = genotype
-
-                elif len(parts) >= 2:
-                    # Alternative format: rsid, genotype
-                    rsid = parts[0].strip()
-                    if validate_rsid(rsid):
-                        genotype = sanitize_genotype(parts[1])
-                        if genotype:
-                            genotypes[rsid] = genotype
+        genotypes = parse_consumer_buffer(data)
+        if genotypes is None:
+            logger.debug("Irregular layout, using line-by-line parser")
+            genotypes = _load_consumer_format_lines(filepath_str)
 
     except IOError as e:
         logger.error(f"Error reading DNA file: {e}")
         raise
 
-    if error_count > 0:
-        logger.warning(f"Skipped {error_count} lines with parse errors")
-
     logger.info(f"Loaded {len(genotypes):,} SNPs from consumer format")
     return genotypes
 
 
-def load_dna_file(filepath: Union[str, Path]) -> Tuple[Dict[str, str], str]:
+def load_dna_file(
+    filepath: Union[str, Path],
+    sample: Optional[Union[str, int]] = None,
+) -> Tuple[GenotypeStore, str]:
     """
     Load DNA data from any supported format.
 
     Args:
         filepath: Path to DNA data file.
+        sample: VCF sample name or column index (default: first sample).
 
     Returns:
-        Tuple of (genotypes dict, format string).
+        Tuple of (GenotypeStore, format string). The store supports the
+        same lookups as a ``Dict[str, str]``; ``store.qc`` holds call-rate
+        and per-chromosome counts collected while parsing.
 
     Raises:
         FileNotFoundError: If file doesn't exist.
@@ -540,7 +833,7 @@ def load_dna_file(filepath: Union[str, Path]) -> Tuple[Dict[str, str], str]:
     logger.info(f"Detected format: {fmt}")
 
     if fmt == 'vcf':
-        genotypes = load_vcf(path)
+        genotypes = load_vcf(path, sample=sample)
     else:
         genotypes = load_consumer_format(path)
 
@@ -557,7 +850,7 @@ def load_dna_file(filepath: Union[str, Path]) -> Tuple[Dict[str, str], str]:
 # APOE DETERMINATION
 # =============================================================================
 
-def determine_apoe(genotypes: Dict[str, str]) -> APOEResult:
+def determine_apoe(genotypes: Mapping[str, str]) -> APOEResult:
     """
     Determine APOE genotype from rs429358 and rs7412.
 
@@ -567,7 +860,7 @@ def determine_apoe(genotypes: Dict[str, str]) -> APOEResult:
         - ε4: rs429358=C, rs7412=C
 
     Args:
-        genotypes: Dictionary mapping rsIDs to genotype strings.
+        genotypes: Mapping of rsIDs to genotype strings (dict or GenotypeStore).
 
     Returns:
         APOEResult with genotype, risk level, interpretation, and recommendations.
@@ -651,16 +944,226 @@ def determine_apoe(genotypes: Dict[str, str]) -> APOEResult:
 # ANALYSIS FUNCTIONS
 # =============================================================================
 
+# Marker keys copied verbatim into each finding
+FINDING_METADATA_KEYS = ('variant', 'name', 'condition', 'conditions', 'trait', 'effect', 'note', 'evidence')
+
+# Risk allele codes in MarkerIndex (0-3 are A/C/G/T)
+_NO_RISK_ALLELE = 254
+_TEXT_RISK_ALLELE = 255  # "del", "D", "7_repeat", ... counted on the string
+
+
+class MarkerIndex:
+    """
+    Compiled index over several marker categories.
+
+    Every valid marker of every category becomes one row: an integer rsID
+    key, its category, a risk allele code and an offset into a metadata
+    table holding the finding template. rsID validation and risk allele
+    lookup happen once here instead of on every analysis, and a genome is
+    joined against all categories in one pass.
+
+    Args:
+        categories: Mapping of category name -> marker dict.
+
+    Example:
+        >>> index = MarkerIndex({"traits": TRAIT_MARKERS})
+        >>> index.analyze(genotypes)["traits"]["found_in_data"]
+    """
+
+    def __init__(self, categories: Mapping[str, Dict[str, MarkerInfo]]):
+        self.categories: List[str] = list(categories)
+        self.category_sizes: Dict[str, int] = {
+            name: len(markers) for name, markers in categories.items()
+        }
+        self._rows: Dict[str, Tuple[int, int]] = {}
+
+        ids: List[int] = []
+        risk_codes: List[int] = []
+        # (rsid, gene, risk_allele, metadata, actionable)
+        self._meta: List[Tuple[str, Any, Any, Dict[str, Any], Optional[Dict[str, Any]]]] = []
+
+        for name, markers in categories.items():
+            start = len(ids)
+            for rsid, info in markers.items():
+                if not validate_rsid(rsid):
+                    continue
+                risk_allele = info.get('risk_allele') or info.get('effect_allele', '')
+                if not risk_allele:
+                    risk_code = _NO_RISK_ALLELE
+                else:
+                    risk_code = ALLELE_CODES.get(risk_allele.upper(), _TEXT_RISK_ALLELE)
+                actionable = info.get('actionable')
+                self._meta.append((
+                    rsid,
+                    info.get('gene'),
+                    risk_allele,
+                    {key: info[key] for key in FINDING_METADATA_KEYS if key in info},
+                    actionable if isinstance(actionable, dict) else None,
+                ))
+                ids.append(rsid_to_int(rsid) or 0)
+                risk_codes.append(risk_code)
+            self._rows[name] = (start, len(ids))
+
+        self.ids = np.array(ids, dtype=np.int64)
+        self.risk_codes = np.array(risk_codes, dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return len(self._meta)
+
+    def _join(self, genotypes: Mapping[str, str], rows: np.ndarray) -> Dict[int, Tuple[str, int]]:
+        """Return {row: (genotype, risk copies)} for rows present in the genome."""
+        hits: Dict[int, Tuple[str, int]] = {}
+
+        if isinstance(genotypes, GenotypeStore):
+            idx = genotypes.indices(self.ids[rows])
+            found = idx >= 0
+            hit_rows = rows[found]
+            codes = genotypes.codes[idx[found]].astype(np.int16)
+            risk = self.risk_codes[hit_rows].astype(np.int16)
+            copies = np.where(
+                codes < HAPLOID_BASE,
+                ((codes >> 2) == risk).astype(np.int16) + ((codes & 3) == risk),
+                ((codes - HAPLOID_BASE) == risk).astype(np.int16),
+            )
+            for row, code, n in zip(hit_rows.tolist(), codes.tolist(), copies.tolist()):
+                geno = decode_genotype(code) if code < OTHER_CODE else genotypes[self._meta[row][0]]
+                if code >= OTHER_CODE or self.risk_codes[row] == _TEXT_RISK_ALLELE:
+                    n = self._count_risk(geno, row)
+                hits[row] = (geno, n)
+            return hits
+
+        for row in rows.tolist():
+            geno = genotypes.get(self._meta[row][0])
+            if geno:
+                hits[row] = (geno, self._count_risk(geno, row))
+        return hits
+
+    def _count_risk(self, genotype: str, row: int) -> int:
+        risk_allele = self._meta[row][2]
+        return genotype.upper().count(risk_allele.upper()) if risk_allele else 0
+
+    def analyze(
+        self,
+        genotypes: Mapping[str, str],
+        categories: Optional[Sequence[str]] = None
+    ) -> Dict[str, AnalysisResult]:
+        """
+        Produce every category's findings from one join against the genome.
+
+        Args:
+            genotypes: Mapping of rsIDs to genotype strings (dict or GenotypeStore).
+            categories: Subset of categories to analyze (default: all).
+
+        Returns:
+            Dict of category name -> AnalysisResult, identical to calling
+            analyze_markers per category.
+        """
+        names = self.categories if categories is None else list(categories)
+        spans = [self._rows[name] for name in names]
+        rows = np.concatenate(
+            [np.arange(start, end) for start, end in spans] or [np.zeros(0, dtype=np.int64)]
+        ).astype(np.int64)
+        hits = self._join(genotypes, rows)
+
+        results: Dict[str, AnalysisResult] = {}
+        for name, (start, end) in zip(names, spans):
+            result: AnalysisResult = {
+                "category": name,
+                "total_in_database": self.category_sizes[name],
+                "found_in_data": 0,
+                "risk_variants": 0,
+                "findings": [],
+                "actionable_items": []
+            }
+            for row in range(start, end):
+                hit = hits.get(row)
+                if hit is None:
+                    continue
+                geno, risk_count = hit
+                rsid, gene, risk_allele, metadata, actionable = self._meta[row]
+
+                result["found_in_data"] += 1
+                finding: Dict[str, Any] = {
+                    "rsid": rsid,
+                    "gene": gene if gene is not None else 'Unknown',
+                    "genotype": geno,
+                    "risk_allele": risk_allele,
+                    "risk_copies": risk_count,
+                    "is_risk": risk_count > 0,
+                    **metadata
+                }
+
+                if risk_count > 0:
+                    result["risk_variants"] += 1
+                    if actionable is not None:
+                        result["actionable_items"].append({
+                            "rsid": rsid,
+                            "gene": gene,
+                            "genotype": geno,
+                            **actionable
+                        })
+
+                result["findings"].append(finding)
+            results[name] = result
+
+        return results
+
+
+# Marker category -> marker table, as reported in the analysis output
+MARKER_CATEGORIES: Dict[str, Dict[str, MarkerInfo]] = {
+    "pharmacogenomics": PHARMACOGENOMICS_MARKERS,
+    "carrier_status": CARRIER_MARKERS,
+    "health_risks": HEALTH_RISK_MARKERS,
+    "traits": TRAIT_MARKERS,
+    "nutrition": NUTRITION_MARKERS,
+    "fitness": FITNESS_MARKERS,
+    "neurogenetics": NEURO_MARKERS,
+    "longevity": LONGEVITY_MARKERS,
+    "immunity": IMMUNITY_MARKERS,
+    "rare_diseases": RARE_DISEASE_MARKERS,
+    "mental_health": MENTAL_HEALTH_MARKERS,
+    "dermatology": DERMATOLOGY_MARKERS,
+    "vision_hearing": VISION_HEARING_MARKERS,
+    "fertility": FERTILITY_MARKERS,
+}
+
+_MARKER_INDEX: Optional[MarkerIndex] = None
+
+
+def get_marker_index() -> MarkerIndex:
+    """Return the MarkerIndex over all MARKER_CATEGORIES (compiled on first use)."""
+    global _MARKER_INDEX
+    if _MARKER_INDEX is None:
+        _MARKER_INDEX = MarkerIndex(MARKER_CATEGORIES)
+    return _MARKER_INDEX
+
+
+def analyze_all_markers(genotypes: Mapping[str, str]) -> Dict[str, AnalysisResult]:
+    """
+    Analyze every marker category in a single pass.
+
+    Args:
+        genotypes: Mapping of rsIDs to genotype strings (dict or GenotypeStore).
+
+    Returns:
+        Dict of category name -> AnalysisResult.
+    """
+    return get_marker_index().analyze(genotypes)
+
+
 def analyze_markers(
-    genotypes: Dict[str, str],
+    genotypes: Mapping[str, str],
     markers: Dict[str, MarkerInfo],
     category: str
 ) -> AnalysisResult:
     """
     Analyze a category of genetic markers.
 
+    Built-in categories use the precompiled marker index; other marker
+    dicts are compiled on the fly.
+
     Args:
-        genotypes: Dictionary mapping rsIDs to genotype strings.
+        genotypes: Mapping of rsIDs to genotype strings (dict or GenotypeStore).
         markers: Dictionary of marker definitions for this category.
         category: Name of the marker category.
 
@@ -671,7 +1174,7 @@ def analyze_markers(
         >>> result = analyze_markers(genotypes, TRAIT_MARKERS, "traits")
         >>> print(f"Found {result['found_in_data']} markers")
     """
-    if not isinstance(genotypes, dict):
+    if not isinstance(genotypes, Mapping):
         logger.error(f"Invalid genotypes type: {type(genotypes)}")
         return {
             "category": category,
@@ -686,69 +1189,31 @@ def analyze_markers(
         logger.warning(f"Invalid markers dict for {category}")
         markers = {}
 
-    results: AnalysisResult = {
-        "category": category,
-        "total_in_database": len(markers),
-        "found_in_data": 0,
-        "risk_variants": 0,
-        "findings": [],
-        "actionable_items": []
-    }
+    if MARKER_CATEGORIES.get(category) is markers:
+        return get_marker_index().analyze(genotypes, [category])[category]
+    return MarkerIndex({category: markers}).analyze(genotypes)[category]
 
-    for rsid, info in markers.items():
-        if not validate_rsid(rsid):
-            continue
 
-        geno = genotypes.get(rsid)
-        if not geno:
-            continue
+_PRS_MATRIX: Optional[PRSWeightMatrix] = None
 
-        results["found_in_data"] += 1
-
-        # Determine if risk allele present
-        risk_allele = info.get('risk_allele') or info.get('effect_allele', '')
-        risk_count = 0
-        if risk_allele:
-            risk_count = geno.upper().count(risk_allele.upper())
-
-        finding: Dict[str, Any] = {
-            "rsid": rsid,
-            "gene": info.get('gene', 'Unknown'),
-            "genotype": geno,
-            "risk_allele": risk_allele,
-            "risk_copies": risk_count,
-            "is_risk": risk_count > 0
-        }
-
-        # Add variant-specific info
-        for key in ['variant', 'name', 'condition', 'conditions', 'trait', 'effect', 'note', 'evidence']:
-            if key in info:
-                finding[key] = info[key]
-
-        if risk_count > 0:
-            results["risk_variants"] += 1
 
-            # Check for actionable items
-            if 'actionable' in info and isinstance(info['actionable'], dict):
-                action = {
-                    "rsid": rsid,
-                    "gene": info.get('gene'),
-                    "genotype": geno,
-                    **info['actionable']
-                }
-                results["actionable_items"].append(action)
+def get_prs_matrix() -> PRSWeightMatrix:
+    """Return the PRS_WEIGHTS weight matrix (compiled on first use)."""
+    global _PRS_MATRIX
+    if _PRS_MATRIX is None:
+        _PRS_MATRIX = PRSWeightMatrix.from_weight_table(PRS_WEIGHTS)
+    return _PRS_MATRIX
 
-        results["findings"].append(finding)
 
-    return results
-
-
-def calculate_all_prs(genotypes: Dict[str, str]) -> Dict[str, PRSResult]:
+def calculate_all_prs(genotypes: Mapping[str, str]) -> Dict[str, PRSResult]:
     """
     Calculate polygenic risk scores for all conditions.
 
+    All conditions are scored at once against the compiled PRS weight
+    matrix (see ``get_prs_matrix``).
+
     Args:
-        genotypes: Dictionary mapping rsIDs to genotype strings.
+        genotypes: Mapping of rsIDs to genotype strings (dict or GenotypeStore).
 
     Returns:
         Dictionary mapping condition names to PRSResult.
@@ -761,40 +1226,21 @@ def calculate_all_prs(genotypes: Dict[str, str]) -> Dict[str, PRSResult]:
         return {"error": {"raw_score": 0, "snps_found": 0, "snps_total": 0, "coverage": 0, "confidence": "none"}}
 
     scores: Dict[str, PRSResult] = {}
-    conditions = set(v.get('condition', '') for v in PRS_WEIGHTS.values() if 'condition' in v)
-
-    for condition in conditions:
-        if not condition:
-            continue
-
-        condition_snps = {k: v for k, v in PRS_WEIGHTS.items() if v.get('condition') == condition}
-
-        score = 0.0
-        found = 0
-
-        for rsid, info in condition_snps.items():
-            geno = genotypes.get(rsid)
-            if geno:
-                found += 1
-                effect_allele = info.get('effect', '')
-                beta = info.get('beta', 0)
-                if effect_allele:
-                    effect_count = geno.upper().count(effect_allele.upper())
-                    score += effect_count * beta
 
+    for condition, score, found, total in get_prs_matrix().score(genotypes):
         percentile: Optional[int] = None
         if found > 5:
             # Rough percentile estimation using z-score approximation
-            z = score / math.sqrt(found * 0.5) if found > 0 else 0
+            z = score / math.sqrt(found * 0.5)
             percentile = min(99, max(1, int(50 + z * 15)))
 
-        coverage = round(found / len(condition_snps), 2) if condition_snps else 0
-        confidence = "moderate" if found > len(condition_snps) * 0.5 else "low"
+        coverage = round(found / total, 2) if total else 0
+        confidence = "moderate" if found > total * 0.5 else "low"
 
         scores[condition] = {
             "raw_score": round(score, 3),
             "snps_found": found,
-            "snps_total": len(condition_snps),
+            "snps_total": total,
             "coverage": coverage,
             "percentile_estimate": percentile,
             "confidence": confidence
@@ -1332,15 +1778,153 @@ def generate_dashboard(
     return output_path
 
 
+# =============================================================================
+# RESULT CACHE
+# =============================================================================
+
+_RESULT_CACHE: Optional[ResultCache] = None
+_FINGERPRINTS: Dict[str, str] = {}
+
+
+def get_result_cache() -> ResultCache:
+    """Return the default on-disk result cache (~/dna-analysis/cache)."""
+    global _RESULT_CACHE
+    if _RESULT_CACHE is None:
+        _RESULT_CACHE = ResultCache()
+    return _RESULT_CACHE
+
+
+def _source_fingerprint(func: Any) -> str:
+    """Fingerprint of the source file defining ``func`` (its code and tables)."""
+    source = inspect.getsourcefile(func)
+    if source is None:
+        return VERSION
+    return hashlib.sha256(Path(source).read_bytes()).hexdigest()
+
+
+def _category_code_fingerprint() -> str:
+    """
+    Fingerprint of the code that turns a marker table into category results.
+
+    Covers the MarkerIndex source, the finding metadata keys and the
+    genotype coding module it decodes calls with.
+    """
+    digest = hashlib.sha256()
+    digest.update(inspect.getsource(MarkerIndex).encode("utf-8"))
+    digest.update(repr(FINDING_METADATA_KEYS).encode("utf-8"))
+    digest.update(_source_fingerprint(decode_genotype).encode("ascii"))
+    return digest.hexdigest()
+
+
+def analysis_fingerprints() -> Dict[str, str]:
+    """
+    Fingerprint of what each cacheable part of the analysis is computed from.
+
+    One entry per marker category (its marker table and the category
+    analysis code), "prs" (PRS_WEIGHTS), and "haplogroups" / "ancestry"
+    (the source of their marker modules), in the order the parts appear
+    in the analysis output.
+    """
+    if not _FINGERPRINTS:
+        code = _category_code_fingerprint()
+        fingerprints = {
+            name: cache_key(fingerprint(markers), code) for name, markers in MARKER_CATEGORIES.items()
+        }
+        fingerprints["prs"] = fingerprint(PRS_WEIGHTS)
+        if MODULES_LOADED:
+            fingerprints["haplogroups"] = _source_fingerprint(analyze_haplogroups)
+            fingerprints["ancestry"] = _source_fingerprint(get_ancestry_summary)
+        _FINGERPRINTS.update(fingerprints)
+    return dict(_FINGERPRINTS)
+
+
+def analyze_cached(
+    genotypes: Mapping[str, str],
+    input_key: str,
+    cache: ResultCache
+) -> Dict[str, Any]:
+    """
+    Marker categories, PRS, haplogroups and ancestry, reusing cached parts.
+
+    Each part is cached under (input_key, VERSION, part name, part
+    fingerprint), so after a marker database update only the parts whose
+    tables changed are recomputed; the missing categories still share one
+    marker index join.
+
+    Args:
+        genotypes: Mapping of rsIDs to genotype strings (dict or GenotypeStore).
+        input_key: Identifies the input genome (file digest and sample).
+        cache: Result store.
+
+    Returns:
+        Dict of part name -> result, as analyze_all_markers and the
+        individual analysis functions would return them.
+    """
+    keys = {
+        part: cache_key(input_key, VERSION, part, part_fingerprint)
+        for part, part_fingerprint in analysis_fingerprints().items()
+    }
+    results: Dict[str, Any] = {}
+    for part, key in keys.items():
+        value = cache.get(key)
+        if value is not None:
+            results[part] = value
+
+    fresh: Dict[str, Any] = {}
+    missing_categories = [name for name in MARKER_CATEGORIES if name not in results]
+    if missing_categories:
+        fresh.update(get_marker_index().analyze(genotypes, missing_categories))
+    compute = {"prs": calculate_all_prs}
+    if MODULES_LOADED:
+        compute["haplogroups"] = analyze_haplogroups
+        compute["ancestry"] = get_ancestry_summary
+    for part, func in compute.items():
+        if part not in results:
+            fresh[part] = func(genotypes)
+
+    for part, value in fresh.items():
+        cache.put(keys[part], value)
+    results.update(fresh)
+    logger.info(f"Result cache: {len(keys) - len(fresh)} of {len(keys)} parts reused")
+
+    return {part: results[part] for part in keys}
+
+
 # =============================================================================
 # MAIN ANALYSIS FUNCTION
 # =============================================================================
 
+# Results kept whole by analyze_dna_file for the lifestyle and drug
+# matrices, the agent summary and the report
+_RETAINED_WHOLE = frozenset({
+    "apoe", "prs", "haplogroups", "ancestry", "population_comparison",
+    "ancient_dna", "neanderthal", "lifestyle_recommendations", "drug_interaction_matrix",
+})
+# Marker categories whose findings those stages read
+_RETAINED_FINDINGS = frozenset({
+    "traits", "nutrition", "fitness", "dermatology", "vision_hearing", "pharmacogenomics",
+})
+_RETAINED_ANCIENT_MATCHES = ("top_matches", "culture_affinities", "statistics", "methodology")
+
+
+def _retained_result(key: str, value: Any) -> Any:
+    """The part of one emitted result that analyze_dna_file keeps in memory."""
+    if key in _RETAINED_WHOLE or not isinstance(value, dict):
+        return value
+    if key == "ancient_matches":
+        return {k: value[k] for k in _RETAINED_ANCIENT_MATCHES if k in value}
+    kept = ("actionable_items", "findings") if key in _RETAINED_FINDINGS else ("actionable_items",)
+    return {k: value[k] for k in kept if k in value}
+
+
 def analyze_dna_file(
     filepath: Union[str, Path],
     output_dir: Optional[Union[str, Path]] = None,
     generate_html_dashboard: bool = True,
-    auto_open_dashboard: bool = False
+    auto_open_dashboard: bool = False,
+    sample: Optional[Union[str, int]] = None,
+    cache: Union[ResultCache, bool] = True,
+    compact_json: bool = False
 ) -> Dict[str, Any]:
     """
     Run complete genetic analysis on a DNA data file.
@@ -1352,9 +1936,20 @@ def analyze_dna_file(
         output_dir: Directory for output files. Defaults to ~/dna-analysis/reports/.
         generate_html_dashboard: Whether to generate interactive HTML dashboard.
         auto_open_dashboard: Whether to open dashboard in browser.
+        sample: Sample to analyze in a multi-sample VCF (default: first).
+        cache: Reuse marker category, PRS, haplogroup and ancestry results
+            from earlier runs on the same file (see analyze_cached). True
+            uses the default cache in ~/dna-analysis/cache, False disables
+            caching, or pass a ResultCache.
+        compact_json: Write full_analysis.json and agent_summary.json
+            without indentation (smaller and faster, for machine consumers).
 
     Returns:
-        Complete analysis results dictionary.
+        Analysis results dictionary with every part of full_analysis.json.
+        Marker categories keep only their actionable items (and findings
+        where the lifestyle and drug matrices use them) and ancient
+        matches only their summary; the complete parts are in
+        full_analysis.json.
 
     Raises:
         FileNotFoundError: If input file not found.
@@ -1375,91 +1970,92 @@ def analyze_dna_file(
 
     # Load data
     logger.info(f"Loading {filepath}...")
-    genotypes, fmt = load_dna_file(filepath)
+    genotypes, fmt = load_dna_file(filepath, sample=sample)
     logger.info(f"Loaded {len(genotypes):,} SNPs")
 
-    # Initialize results
-    all_results: Dict[str, Any] = {
-        "total_snps": len(genotypes),
-        "format": fmt,
-        "apoe": determine_apoe(genotypes),
-        "version": VERSION
-    }
+    json_indent = None if compact_json else 2
+    full_json_path = output_dir / "full_analysis.json"
+    summary_json_path = output_dir / "agent_summary.json"
+    report_path = output_dir / "report.txt"
 
-    logger.info("Analyzing markers...")
+    # Each part is written to full_analysis.json as soon as it is finished;
+    # only what the later stages read is kept in memory
+    all_results: Dict[str, Any] = {}
+    full_json = JSONObjectWriter(full_json_path, indent=json_indent)
 
-    if MODULES_LOADED:
-        # Core categories
-        all_results["pharmacogenomics"] = analyze_markers(genotypes, PHARMACOGENOMICS_MARKERS, "pharmacogenomics")
-        all_results["carrier_status"] = analyze_markers(genotypes, CARRIER_MARKERS, "carrier_status")
-        all_results["health_risks"] = analyze_markers(genotypes, HEALTH_RISK_MARKERS, "health_risks")
-        all_results["traits"] = analyze_markers(genotypes, TRAIT_MARKERS, "traits")
-        all_results["nutrition"] = analyze_markers(genotypes, NUTRITION_MARKERS, "nutrition")
-        all_results["fitness"] = analyze_markers(genotypes, FITNESS_MARKERS, "fitness")
-        all_results["neurogenetics"] = analyze_markers(genotypes, NEURO_MARKERS, "neurogenetics")
-        all_results["longevity"] = analyze_markers(genotypes, LONGEVITY_MARKERS, "longevity")
-        all_results["immunity"] = analyze_markers(genotypes, IMMUNITY_MARKERS, "immunity")
-        all_results["prs"] = calculate_all_prs(genotypes)
-
-        # Extended categories
-        all_results["rare_diseases"] = analyze_markers(genotypes, RARE_DISEASE_MARKERS, "rare_diseases")
-        all_results["mental_health"] = analyze_markers(genotypes, MENTAL_HEALTH_MARKERS, "mental_health")
-        all_results["dermatology"] = analyze_markers(genotypes, DERMATOLOGY_MARKERS, "dermatology")
-        all_results["vision_hearing"] = analyze_markers(genotypes, VISION_HEARING_MARKERS, "vision_hearing")
-        all_results["fertility"] = analyze_markers(genotypes, FERTILITY_MARKERS, "fertility")
-
-        # Ancestry & Haplogroups (with proper disclaimers)
-        all_results["haplogroups"] = analyze_haplogroups(genotypes)
-        all_results["ancestry"] = get_ancestry_summary(genotypes)
-        
-        # Population Comparison (1000 Genomes) & Ancient DNA
-        all_results["population_comparison"] = get_population_comparison_json(genotypes)
-        all_results["ancient_dna"] = get_ancient_dna_json(genotypes)
-        all_results["neanderthal"] = get_neanderthal_report(genotypes)
-        
-        # Ancient Individual Matching (YourTrueAncestry alternative)
-        try:
-            ancient_matches = get_ancient_matches_json(genotypes)
-            
-            # Add premium features
-            try:
-                from markers.ancient_premium import get_premium_ancient_analysis
-                matches_for_premium = ancient_matches.get("all_matches", ancient_matches.get("top_matches", []))
-                user_haplogroups = all_results.get("haplogroups", {})
-                ancient_matches["premium"] = get_premium_ancient_analysis(
-                    genotypes, matches_for_premium, user_haplogroups
-                )
-            except ImportError:
-                logger.debug("Premium ancient features not available")
-            except Exception as pe:
-                logger.debug(f"Premium ancient features error: {pe}")
-            
-            all_results["ancient_matches"] = ancient_matches
-        except Exception as e:
-            logger.warning(f"Could not run ancient DNA matching: {e}")
-            all_results["ancient_matches"] = {}
+    def emit(members: Dict[str, Any]) -> None:
+        full_json.update(members)
+        for key, value in members.items():
+            all_results[key] = _retained_result(key, value)
 
-        # Advanced features
-        all_results["lifestyle_recommendations"] = generate_lifestyle_recommendations(all_results)
-        all_results["drug_interaction_matrix"] = generate_drug_interaction_matrix(all_results)
+    try:
+        emit({
+            "total_snps": len(genotypes),
+            "format": fmt,
+            "apoe": determine_apoe(genotypes),
+            "version": VERSION
+        })
 
-    # Generate outputs
-    logger.info("Generating reports...")
+        logger.info("Analyzing markers...")
 
-    agent_summary = generate_agent_summary(all_results)
-    report = generate_report(all_results, agent_summary)
+        if MODULES_LOADED:
+            # An empty ResultCache is falsy, so check the type before truthiness
+            result_cache = cache if isinstance(cache, ResultCache) else (get_result_cache() if cache else None)
+            if result_cache is not None:
+                # Marker categories, PRS, ancestry & haplogroups, reusing the
+                # parts whose tables haven't changed since the last run
+                input_key = cache_key(file_digest(filepath), sample)
+                emit(analyze_cached(genotypes, input_key, result_cache))
+            else:
+                # Core and extended marker categories (one join over all of them)
+                emit(analyze_all_markers(genotypes))
+                emit({"prs": calculate_all_prs(genotypes)})
+
+                # Ancestry & Haplogroups (with proper disclaimers)
+                emit({"haplogroups": analyze_haplogroups(genotypes)})
+                emit({"ancestry": get_ancestry_summary(genotypes)})
+
+            # Population Comparison (1000 Genomes) & Ancient DNA
+            emit({"population_comparison": get_population_comparison_json(genotypes)})
+            emit({"ancient_dna": get_ancient_dna_json(genotypes)})
+            emit({"neanderthal": get_neanderthal_report(genotypes)})
+
+            # Ancient Individual Matching (YourTrueAncestry alternative)
+            try:
+                ancient_matches = get_ancient_matches_json(genotypes)
 
-    # Save files
-    full_json_path = output_dir / "full_analysis.json"
-    summary_json_path = output_dir / "agent_summary.json"
-    report_path = output_dir / "report.txt"
+                # Add premium features
+                try:
+                    from markers.ancient_premium import get_premium_ancient_analysis
+                    matches_for_premium = ancient_matches.get("all_matches", ancient_matches.get("top_matches", []))
+                    user_haplogroups = all_results.get("haplogroups", {})
+                    ancient_matches["premium"] = get_premium_ancient_analysis(
+                        genotypes, matches_for_premium, user_haplogroups
+                    )
+                except ImportError:
+                    logger.debug("Premium ancient features not available")
+                except Exception as pe:
+                    logger.debug(f"Premium ancient features error: {pe}")
+            except Exception as e:
+                logger.warning(f"Could not run ancient DNA matching: {e}")
+                ancient_matches = {}
+            emit({"ancient_matches": ancient_matches})
+
+            # Advanced features
+            emit({"lifestyle_recommendations": generate_lifestyle_recommendations(all_results)})
+            emit({"drug_interaction_matrix": generate_drug_interaction_matrix(all_results)})
+    except BaseException:
+        full_json.abort()
+        raise
+    full_json.close()
 
-    with open(full_json_path, 'w', encoding='utf-8') as f:
-        json.dump(all_results, f, indent=2, default=str)
+    # Generate outputs (once; main() prints the saved report)
+    logger.info("Generating reports...")
 
-    with open(summary_json_path, 'w', encoding='utf-8') as f:
-        json.dump(agent_summary, f, indent=2, default=str)
+    agent_summary = generate_agent_summary(all_results)
+    write_json(summary_json_path, agent_summary, indent=json_indent)
 
+    report = generate_report(all_results, agent_summary)
     with open(report_path, 'w', encoding='utf-8') as f:
         f.write(report)
 
@@ -1480,10 +2076,634 @@ def analyze_dna_file(
     return all_results
 
 
+# =============================================================================
+# BATCH ANALYSIS
+# =============================================================================
+
+# File extensions picked up when --batch points at a directory
+BATCH_EXTENSIONS = ('.txt', '.csv', '.tsv', '.vcf', '.gz', '.zip')
+
+BATCH_RESULTS_FILE = "batch_results.jsonl"
+
+
+class BatchFileResult(TypedDict, total=False):
+    """Type definition for one file's outcome in a batch run."""
+    path: str
+    output_dir: str
+    status: str
+    error: str
+    seconds: float
+    total_snps: int
+    format: str
+
+
+def collect_batch_inputs(source: Union[str, Path]) -> List[Path]:
+    """
+    Resolve a --batch argument to a list of DNA files.
+
+    Args:
+        source: A directory (all DNA files inside it, sorted) or a manifest
+            file with one path per line. Blank lines and '#' comments are
+            ignored; relative paths are resolved against the manifest's
+            directory.
+
+    Returns:
+        List of file paths.
+
+    Raises:
+        FileNotFoundError: If source doesn't exist.
+    """
+    source = Path(source).expanduser().resolve()
+    if not source.exists():
+        raise FileNotFoundError(f"Batch source not found: {source}")
+
+    if source.is_dir():
+        return sorted(
+            p for p in source.iterdir()
+            if p.is_file() and p.name.lower().endswith(BATCH_EXTENSIONS)
+        )
+
+    paths = []
+    with open(source, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            path = Path(line).expanduser()
+            paths.append(path if path.is_absolute() else source.parent / path)
+    return paths
+
+
+def _batch_output_dirs(paths: Sequence[Path], output_dir: Path) -> List[Path]:
+    """One output directory per input, named after the file (deduplicated)."""
+    seen: Dict[str, int] = defaultdict(int)
+    used = set()
+    dirs = []
+    for path in paths:
+        name = path.name
+        for suffix in ('.gz', '.zip', '.txt', '.csv', '.tsv', '.vcf'):
+            if name.lower().endswith(suffix):
+                name = name[:-len(suffix)]
+        name = name or "genome"
+        seen[name] += 1
+        unique = name if seen[name] == 1 else f"{name}-{seen[name]}"
+        # A renamed duplicate can match another input's own name ("a-2")
+        while unique in used:
+            seen[name] += 1
+            unique = f"{name}-{seen[name]}"
+        used.add(unique)
+        dirs.append(output_dir / unique)
+    return dirs
+
+
+def _batch_worker_init() -> None:
+    """Process pool initializer: keep per-file INFO logging out of the console."""
+    logging.getLogger().setLevel(logging.WARNING)
+    logger.setLevel(logging.WARNING)
+
+
+def _analyze_one(
+    filepath: str,
+    output_dir: str,
+    generate_html_dashboard: bool,
+    cache: Union[ResultCache, bool] = True,
+    compact_json: bool = False
+) -> BatchFileResult:
+    """Analyze one file for analyze_many; never raises."""
+    start = time.perf_counter()
+    result: BatchFileResult = {"path": filepath, "output_dir": output_dir}
+    try:
+        all_results = analyze_dna_file(
+            filepath,
+            output_dir=output_dir,
+            generate_html_dashboard=generate_html_dashboard,
+            cache=cache,
+            compact_json=compact_json
+        )
+        result["status"] = "ok"
+        result["total_snps"] = all_results.get("total_snps", 0)
+        result["format"] = all_results.get("format", "")
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, int(math.ceil(q * len(sorted_values))) - 1))
+    return sorted_values[k]
+
+
+def analyze_many(
+    paths: Sequence[Union[str, Path]],
+    output_dir: Optional[Union[str, Path]] = None,
+    workers: Optional[int] = None,
+    generate_html_dashboard: bool = False,
+    cache: Union[ResultCache, bool] = True,
+    compact_json: bool = False
+) -> Dict[str, Any]:
+    """
+    Analyze many DNA files in a process pool.
+
+    Each file is analyzed by analyze_dna_file into its own subdirectory of
+    output_dir. Marker tables are imported once per worker process, and
+    each file's outcome is appended to ``batch_results.jsonl`` as soon as
+    it finishes. A failing file is recorded and does not stop the batch.
+
+    Args:
+        paths: DNA data files.
+        output_dir: Root directory for per-file outputs. Defaults to
+            ~/dna-analysis/reports/.
+        workers: Worker processes (default: CPU count). 1 runs in-process.
+        generate_html_dashboard: Whether to build a dashboard per file.
+        cache: Result cache shared by all workers (see analyze_dna_file).
+        compact_json: Write non-indented JSON outputs.
+
+    Returns:
+        Summary dict with counts, wall time, throughput (files/sec),
+        per-file latency statistics and the per-file results.
+
+    Examples:
+        >>> summary = analyze_many(["kit1.txt", "kit2.txt"], workers=4)
+        >>> print(f"{summary['succeeded']}/{summary['files']} ok")
+    """
+    if output_dir is None:
+        output_dir = OUTPUT_DIR
+    else:
+        output_dir = Path(output_dir).expanduser().resolve()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    paths = [Path(p).expanduser() for p in paths]
+    out_dirs = _batch_output_dirs(paths, output_dir)
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(paths) or 1))
+
+    results: List[BatchFileResult] = []
+    results_path = output_dir / BATCH_RESULTS_FILE
+    start = time.perf_counter()
+
+    with open(results_path, 'w', encoding='utf-8') as results_file:
+        def record(result: BatchFileResult) -> None:
+            results.append(result)
+            results_file.write(json.dumps(result, default=str) + "\n")
+            results_file.flush()
+            if result["status"] == "ok":
+                logger.info(f"[{len(results)}/{len(paths)}] {result['path']} ({result['seconds']:.2f}s)")
+            else:
+                logger.warning(f"[{len(results)}/{len(paths)}] {result['path']} failed: {result['error']}")
+
+        if workers == 1:
+            for path, out_dir in zip(paths, out_dirs):
+                record(_analyze_one(str(path), str(out_dir), generate_html_dashboard, cache, compact_json))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_batch_worker_init) as pool:
+                futures = {
+                    pool.submit(
+                        _analyze_one, str(path), str(out_dir), generate_html_dashboard, cache, compact_json
+                    ):
+                        (path, out_dir)
+                    for path, out_dir in zip(paths, out_dirs)
+                }
+                for future in as_completed(futures):
+                    try:
+                        record(future.result())
+                    except Exception as e:
+                        # Worker died (e.g. killed or out of memory)
+                        path, out_dir = futures[future]
+                        record({
+                            "path": str(path), "output_dir": str(out_dir),
+                            "status": "error", "error": f"{type(e).__name__}: {e}",
+                            "seconds": 0.0,
+                        })
+
+    wall = time.perf_counter() - start
+    latencies = sorted(r["seconds"] for r in results if r["status"] == "ok")
+    succeeded = len(latencies)
+
+    return {
+        "files": len(paths),
+        "succeeded": succeeded,
+        "failed": len(paths) - succeeded,
+        "workers": workers,
+        "wall_seconds": round(wall, 3),
+        "files_per_second": round(len(paths) / wall, 3) if wall > 0 else 0.0,
+        "latency_seconds": {
+            "mean": round(sum(latencies) / succeeded, 3) if succeeded else 0.0,
+            "p50": _percentile(latencies, 0.50),
+            "p95": _percentile(latencies, 0.95),
+            "max": latencies[-1] if latencies else 0.0,
+        },
+        "results_file": str(results_path),
+        "results": results,
+    }
+
+
+def format_batch_summary(summary: Dict[str, Any]) -> str:
+    """
+    Format an analyze_many summary for the console.
+
+    Args:
+        summary: Dict returned by analyze_many.
+
+    Returns:
+        Multi-line summary string.
+    """
+    latency = summary["latency_seconds"]
+    lines = [
+        "BATCH SUMMARY",
+        "=" * 40,
+        f"Files:       {summary['files']} ({summary['succeeded']} ok, {summary['failed']} failed)",
+        f"Workers:     {summary['workers']}",
+        f"Wall time:   {summary['wall_seconds']:.1f}s",
+        f"Throughput:  {summary['files_per_second']:.2f} files/sec",
+        f"Latency:     mean {latency['mean']:.2f}s, p50 {latency['p50']:.2f}s, "
+        f"p95 {latency['p95']:.2f}s, max {latency['max']:.2f}s",
+        f"Results:     {summary['results_file']}",
+    ]
+    failures = [r for r in summary["results"] if r["status"] != "ok"]
+    if failures:
+        lines.append("\nFailed files:")
+        for r in failures:
+            lines.append(f"  {r['path']}: {r.get('error', '')}")
+    return "\n".join(lines)
+
+
+# =============================================================================
+# COHORT RELATEDNESS
+# =============================================================================
+
+RELATIVES_RESULTS_FILE = "relatives.jsonl"
+COHORT_MATRIX_FILE = "cohort.npz"
+
+
+def _load_for_cohort(filepath: str) -> Tuple[Optional[GenotypeStore], str]:
+    """Load one file for build_cohort_matrix; never raises."""
+    try:
+        genotypes, _ = load_dna_file(filepath)
+        return genotypes, ""
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def build_cohort_matrix(
+    paths: Sequence[Union[str, Path]],
+    workers: Optional[int] = None,
+    snp_ids: Optional[Sequence[str]] = None,
+    autosomes_only: bool = True,
+    haploid_as_homozygous: bool = False
+) -> Tuple[CohortMatrix, List[BatchFileResult]]:
+    """
+    Load many DNA files and pack them into one CohortMatrix.
+
+    Files are parsed in a process pool and packed in input order by the
+    parent, with at most ``2 * workers`` loaded genomes in flight, so
+    memory stays at the packed matrix (~SNPs/4 bytes per kit) plus a few
+    stores. Samples are named like --batch output directories.
+
+    Args:
+        paths: DNA data files.
+        workers: Worker processes (default: CPU count). 1 runs in-process.
+        snp_ids: Shared SNP order (default: every autosomal SNP called in any file).
+        autosomes_only: Restrict the default SNP order to chromosomes 1-22.
+        haploid_as_homozygous: Keep haploid calls as homozygous genotypes.
+
+    Returns:
+        Tuple of (CohortMatrix, per-file failures).
+    """
+    paths = [Path(p).expanduser() for p in paths]
+    names = [d.name for d in _batch_output_dirs(paths, Path())]
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(paths) or 1))
+
+    builder = CohortBuilder(snp_ids, autosomes_only, haploid_as_homozygous)
+    failures: List[BatchFileResult] = []
+
+    def pack(path: Path, name: str, genotypes: Optional[GenotypeStore], error: str) -> None:
+        if genotypes is None:
+            failures.append({"path": str(path), "status": "error", "error": error})
+            logger.warning(f"{path} failed: {error}")
+            return
+        builder.add(name, genotypes)
+        logger.info(f"[{len(builder)}/{len(paths)}] packed {path}")
+
+    if workers == 1:
+        for path, name in zip(paths, names):
+            pack(path, name, *_load_for_cohort(str(path)))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_batch_worker_init) as pool:
+            pending = deque()
+            for path, name in zip(paths, names):
+                pending.append((path, name, pool.submit(_load_for_cohort, str(path))))
+                if len(pending) >= 2 * workers:
+                    path, name, future = pending.popleft()
+                    pack(path, name, *future.result())
+            while pending:
+                path, name, future = pending.popleft()
+                pack(path, name, *future.result())
+
+    return builder.build(), failures
+
+
+def find_cohort_relatives(
+    paths: Sequence[Union[str, Path]],
+    output_dir: Optional[Union[str, Path]] = None,
+    workers: Optional[int] = None,
+    min_kinship: float = KINSHIP_THIRD_DEGREE
+) -> Dict[str, Any]:
+    """
+    Find duplicate samples and relatives among many DNA files.
+
+    Builds a CohortMatrix (see build_cohort_matrix), saves it to
+    ``cohort.npz`` and writes every pair at or above ``min_kinship`` to
+    ``relatives.jsonl``, closest first.
+
+    Args:
+        paths: DNA data files.
+        output_dir: Output directory. Defaults to ~/dna-analysis/reports/.
+        workers: Worker processes used to load files.
+        min_kinship: KING kinship threshold (default: third degree).
+
+    Returns:
+        Summary dict with sample/SNP counts, pair counts per relationship,
+        timings and output paths.
+    """
+    if output_dir is None:
+        output_dir = OUTPUT_DIR
+    else:
+        output_dir = Path(output_dir).expanduser().resolve()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    cohort, failures = build_cohort_matrix(paths, workers=workers)
+    load_seconds = time.perf_counter() - start
+    cohort_path = cohort.save(output_dir / COHORT_MATRIX_FILE)
+
+    relatives = cohort.find_relatives(min_kinship=min_kinship)
+    results_path = output_dir / RELATIVES_RESULTS_FILE
+    with open(results_path, 'w', encoding='utf-8') as f:
+        for record in relatives:
+            f.write(json.dumps(record) + "\n")
+
+    relationships: Dict[str, int] = defaultdict(int)
+    for record in relatives:
+        relationships[record["relationship"]] += 1
+    n = len(cohort)
+    return {
+        "samples": n,
+        "snps": cohort.n_snps,
+        "failed": failures,
+        "pairs_compared": n * (n - 1) // 2,
+        "related_pairs": len(relatives),
+        "relationships": dict(relationships),
+        "load_seconds": round(load_seconds, 3),
+        "wall_seconds": round(time.perf_counter() - start, 3),
+        "cohort_file": str(cohort_path),
+        "results_file": str(results_path),
+    }
+
+
+def format_relatives_summary(summary: Dict[str, Any]) -> str:
+    """Human-readable summary of a find_cohort_relatives run."""
+    lines = [
+        f"Cohort: {summary['samples']:,} samples x {summary['snps']:,} SNPs "
+        f"({summary['pairs_compared']:,} pairs)",
+        f"Wall time: {summary['wall_seconds']:.2f}s (loading {summary['load_seconds']:.2f}s)",
+        f"Related pairs: {summary['related_pairs']:,}",
+    ]
+    for relationship, count in sorted(summary["relationships"].items()):
+        lines.append(f"  {relationship}: {count:,}")
+    lines.append(f"Results: {summary['results_file']}")
+    if summary["failed"]:
+        lines.append(f"Failed files ({len(summary['failed'])}):")
+        for r in summary["failed"]:
+            lines.append(f"  {r['path']}: {r.get('error', '')}")
+    return "\n".join(lines)
+
+
+IBD_RESULTS_FILE = "ibd_matches.jsonl"
+
+
+def find_ibd_matches(
+    query: Union[str, Path],
+    source: Union[str, Path],
+    output_dir: Optional[Union[str, Path]] = None,
+    workers: Optional[int] = None,
+    genetic_map: Optional[Union[str, Path]] = None,
+    params: Optional[IBDParams] = None
+) -> Dict[str, Any]:
+    """
+    Find IBD segments shared between one DNA file and many others.
+
+    Args:
+        query: DNA file to match.
+        source: A ``cohort.npz`` written by find_cohort_relatives, or a
+            directory/manifest of DNA files (packed on the fly).
+        output_dir: Output directory. Defaults to ~/dna-analysis/reports/.
+        workers: Worker processes (loading files and scanning chromosomes).
+        genetic_map: PLINK or HapMap genetic map file (default: 1 cM/Mb).
+        params: Segment thresholds (default: 7 cM, 500 SNPs).
+
+    Returns:
+        Summary dict with match counts, timings and the results path.
+        Each match (largest total cM first) is one line of
+        ``ibd_matches.jsonl``.
+    """
+    if output_dir is None:
+        output_dir = OUTPUT_DIR
+    else:
+        output_dir = Path(output_dir).expanduser().resolve()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    source = Path(source).expanduser()
+    failures: List[BatchFileResult] = []
+    if source.suffix == '.npz':
+        cohort = CohortMatrix.load(source)
+    else:
+        query_path = Path(query).expanduser().resolve()
+        paths = [p for p in collect_batch_inputs(source) if p.resolve() != query_path]
+        cohort, failures = build_cohort_matrix(paths, workers=workers)
+    genotypes, _ = load_dna_file(query)
+    load_seconds = time.perf_counter() - start
+
+    matches = match_cohort(
+        cohort,
+        genotypes,
+        params=params,
+        genetic_map=GeneticMap.load(genetic_map) if genetic_map else None,
+        workers=workers,
+        query_name=Path(query).name,
+    )
+    results_path = output_dir / IBD_RESULTS_FILE
+    with open(results_path, 'w', encoding='utf-8') as f:
+        for match in matches:
+            f.write(json.dumps(match.to_dict()) + "\n")
+
+    return {
+        "query": str(query),
+        "samples": len(cohort),
+        "snps": cohort.n_snps,
+        "failed": failures,
+        "matches": len(matches),
+        "top_matches": [
+            {"sample": m.sample_2, "total_cm": round(m.total_cm, 2),
+             "largest_cm": round(m.largest_cm, 2), "segments": len(m.segments)}
+            for m in matches[:10]
+        ],
+        "load_seconds": round(load_seconds, 3),
+        "wall_seconds": round(time.perf_counter() - start, 3),
+        "results_file": str(results_path),
+    }
+
+
+def format_ibd_summary(summary: Dict[str, Any]) -> str:
+    """Human-readable summary of a find_ibd_matches run."""
+    lines = [
+        f"Query: {summary['query']}",
+        f"Cohort: {summary['samples']:,} samples x {summary['snps']:,} SNPs",
+        f"Wall time: {summary['wall_seconds']:.2f}s (loading {summary['load_seconds']:.2f}s)",
+        f"Matches: {summary['matches']:,}",
+    ]
+    for m in summary["top_matches"]:
+        lines.append(
+            f"  {m['sample']}: {m['total_cm']:.1f} cM in {m['segments']} segments "
+            f"(largest {m['largest_cm']:.1f} cM)"
+        )
+    lines.append(f"Results: {summary['results_file']}")
+    if summary["failed"]:
+        lines.append(f"Failed files ({len(summary['failed'])}):")
+        for r in summary["failed"]:
+            lines.append(f"  {r['path']}: {r.get('error', '')}")
+    return "\n".join(lines)
+
+
 # =============================================================================
 # CLI MAIN
 # =============================================================================
 
+def _cli_option(flag: str) -> Optional[str]:
+    """Return the value following a CLI flag (e.g. ``--workers 4``), if any."""
+    if flag in sys.argv:
+        i = sys.argv.index(flag)
+        if i + 1 < len(sys.argv):
+            return sys.argv[i + 1]
+    return None
+
+
+def _run_batch_cli(
+    source: str,
+    generate_dashboard_flag: bool,
+    use_cache: bool,
+    compact_json: bool
+) -> int:
+    """
+    Run --batch mode.
+
+    Returns:
+        Exit code (0 if every file succeeded, 1 otherwise).
+    """
+    try:
+        paths = collect_batch_inputs(source)
+    except FileNotFoundError as e:
+        print(f"\nError: {e}")
+        return 1
+
+    if not paths:
+        print(f"\nError: No DNA files found in {source}")
+        return 1
+
+    workers_arg = _cli_option('--workers')
+    try:
+        workers = int(workers_arg) if workers_arg else None
+    except ValueError:
+        print(f"\nError: --workers expects a number, got {workers_arg!r}")
+        return 1
+
+    summary = analyze_many(
+        paths,
+        output_dir=_cli_option('--output'),
+        workers=workers,
+        generate_html_dashboard=generate_dashboard_flag,
+        cache=use_cache,
+        compact_json=compact_json
+    )
+    print("\n" + format_batch_summary(summary))
+    return 0 if summary["failed"] == 0 else 1
+
+
+def _run_relatives_cli(source: str) -> int:
+    """
+    Run --relatives mode.
+
+    Returns:
+        Exit code (0 if every file loaded, 1 otherwise).
+    """
+    try:
+        paths = collect_batch_inputs(source)
+    except FileNotFoundError as e:
+        print(f"\nError: {e}")
+        return 1
+
+    if len(paths) < 2:
+        print(f"\nError: --relatives needs at least two DNA files in {source}")
+        return 1
+
+    workers_arg = _cli_option('--workers')
+    kinship_arg = _cli_option('--min-kinship')
+    try:
+        workers = int(workers_arg) if workers_arg else None
+        min_kinship = float(kinship_arg) if kinship_arg else KINSHIP_THIRD_DEGREE
+    except ValueError:
+        print("\nError: --workers and --min-kinship expect numbers")
+        return 1
+
+    summary = find_cohort_relatives(
+        paths,
+        output_dir=_cli_option('--output'),
+        workers=workers,
+        min_kinship=min_kinship
+    )
+    print("\n" + format_relatives_summary(summary))
+    return 0 if not summary["failed"] else 1
+
+
+def _run_ibd_cli(query: str) -> int:
+    """
+    Run --ibd mode.
+
+    Returns:
+        Exit code (0 on success, 1 otherwise).
+    """
+    source = _cli_option('--against')
+    if source is None:
+        print("\nError: --ibd needs --against <dir|manifest|cohort.npz>")
+        return 1
+
+    workers_arg = _cli_option('--workers')
+    try:
+        workers = int(workers_arg) if workers_arg else None
+    except ValueError:
+        print(f"\nError: --workers expects a number, got {workers_arg!r}")
+        return 1
+
+    try:
+        summary = find_ibd_matches(
+            query,
+            source,
+            output_dir=_cli_option('--output'),
+            workers=workers,
+            genetic_map=_cli_option('--genetic-map')
+        )
+    except (FileNotFoundError, ValueError) as e:
+        print(f"\nError: {e}")
+        return 1
+    print("\n" + format_ibd_summary(summary))
+    return 0
+
+
 def main() -> int:
     """
     Command-line interface entry point.
@@ -1494,7 +2714,10 @@ def main() -> int:
     if len(sys.argv) < 2:
         print(f"Personal Genomics Analysis Tool v{VERSION}")
         print("=" * 40)
-        print("\nUsage: python comprehensive_analysis.py <dna_file> [--no-dashboard] [--open]")
+        print("\nUsage: python comprehensive_analysis.py <dna_file> [--no-dashboard] [--open] [--sample NAME]")
+        print("       python comprehensive_analysis.py --batch <dir|manifest> [--workers N] [--output DIR]")
+        print("       python comprehensive_analysis.py --relatives <dir|manifest> [--workers N] [--min-kinship K]")
+        print("       python comprehensive_analysis.py --ibd <dna_file> --against <dir|manifest|cohort.npz> [--genetic-map FILE]")
         print("\nSupported formats:")
         print("  - 23andMe (v3, v4, v5)")
         print("  - AncestryDNA")
@@ -1505,6 +2728,16 @@ def main() -> int:
         print("\nOptions:")
         print("  --no-dashboard  Skip HTML dashboard generation")
         print("  --open          Auto-open dashboard in browser")
+        print("  --sample NAME   Sample to analyze in a multi-sample VCF (default: first)")
+        print("  --batch SOURCE  Analyze every DNA file in a directory or listed in a manifest")
+        print("  --workers N     Worker processes for --batch (default: CPU count)")
+        print("  --output DIR    Output root for --batch (one subdirectory per file)")
+        print("  --relatives SOURCE  Find duplicate kits and relatives among many DNA files")
+        print("  --min-kinship K     Kinship threshold for --relatives (default: 0.0442, third degree)")
+        print("  --ibd FILE          Find IBD segments shared with the kits given by --against")
+        print("  --genetic-map FILE  PLINK or HapMap genetic map for --ibd (default: 1 cM/Mb)")
+        print("  --no-cache      Recompute everything instead of reusing cached results")
+        print("  --compact       Write the JSON outputs without indentation")
         print(f"\nMarker modules loaded: {MODULES_LOADED}")
         if MODULES_LOADED:
             counts = get_marker_counts()
@@ -1515,20 +2748,37 @@ def main() -> int:
                     print(f"  {k}: {v}")
         return 1
 
-    filepath = sys.argv[1]
     generate_dashboard_flag = '--no-dashboard' not in sys.argv
     auto_open = '--open' in sys.argv
+    use_cache = '--no-cache' not in sys.argv
+    compact_json = '--compact' in sys.argv
+
+    batch_source = _cli_option('--batch')
+    if batch_source is not None:
+        return _run_batch_cli(batch_source, generate_dashboard_flag, use_cache, compact_json)
+
+    relatives_source = _cli_option('--relatives')
+    if relatives_source is not None:
+        return _run_relatives_cli(relatives_source)
+
+    ibd_query = _cli_option('--ibd')
+    if ibd_query is not None:
+        return _run_ibd_cli(ibd_query)
+
+    filepath = sys.argv[1]
 
     try:
-        all_results = analyze_dna_file(
+        analyze_dna_file(
             filepath,
             generate_html_dashboard=generate_dashboard_flag,
-            auto_open_dashboard=auto_open
+            auto_open_dashboard=auto_open,
+            sample=_cli_option('--sample'),
+            cache=use_cache,
+            compact_json=compact_json
         )
 
-        # Generate and print report
-        agent_summary = generate_agent_summary(all_results)
-        report = generate_report(all_results, agent_summary)
+        # Print the report analyze_dna_file already generated
+        report = (OUTPUT_DIR / "report.txt").read_text(encoding='utf-8')
         print("\n" + report)
 
         print(f"\nOutput files saved to: {OUTPUT_DIR}/")
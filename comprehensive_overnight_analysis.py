@@ -63,6 +63,8 @@ from datasets import (
     HGDP_POPULATIONS,
     HGDP_REGIONS,
 )
+from personal_genomics.genotypes import GenotypeStore, GenotypeStoreBuilder
+from personal_genomics.scheduler import Stage, StageScheduler
 
 
 # =============================================================================
@@ -164,13 +166,16 @@ class ComprehensiveAnalysisResult:
     # GWAS
     gwas_findings: List[GWASFinding] = field(default_factory=list)
     notable_traits: List[str] = field(default_factory=list)
+    
+    # Run statistics: stage name -> wall time, peak memory, error
+    stage_timings: Dict[str, Dict[str, Any]] = field(default_factory=dict)
 
 
 # =============================================================================
 # DNA FILE LOADING
 # =============================================================================
 
-def load_dna_file(filepath: str) -> Dict[str, str]:
+def load_dna_file(filepath: str) -> GenotypeStore:
     """
     Load genotype data from DNA file.
     
@@ -180,15 +185,18 @@ def load_dna_file(filepath: str) -> Dict[str, str]:
         filepath: Path to the DNA data file
         
     Returns:
-        Dict mapping rsID to genotype (e.g., {"rs1426654": "AA"})
+        GenotypeStore mapping rsID to genotype (e.g., store["rs1426654"] == "AA")
     """
     logger.info(f"Loading DNA file: {filepath}")
-    genotypes: Dict[str, str] = {}
+    builder = GenotypeStoreBuilder()
+    header = []
     
     with open(filepath, 'r') as f:
         for line in f:
             # Skip comments and headers
             if line.startswith('#') or line.startswith('rsid'):
+                if line.startswith('#') and not len(builder):
+                    header.append(line)
                 continue
             
             parts = line.strip().split('\t')
@@ -197,12 +205,15 @@ def load_dna_file(filepath: str) -> Dict[str, str]:
                 allele1 = parts[3]
                 allele2 = parts[4]
                 
-                # Skip invalid/missing genotypes
+                # Missing genotypes only count towards the QC totals
                 if allele1 in ('0', '-', '') or allele2 in ('0', '-', ''):
+                    builder.add_no_call(rsid, parts[1])
                     continue
                 
-                genotypes[rsid] = f"{allele1}{allele2}"
+                builder.add(rsid, f"{allele1}{allele2}", parts[1], parts[2])
     
+    genotypes = builder.build()
+    genotypes.qc.set_header(''.join(header))
     logger.info(f"Loaded {len(genotypes)} genotypes")
     return genotypes
 
@@ -657,19 +668,72 @@ def analyze_gwas_traits(
 # MAIN ANALYSIS FUNCTION
 # =============================================================================
 
+#: Analysis stages (each depends only on the loaded genotypes)
+ANALYSIS_STAGES = ("1kg", "hgdp", "sgdp", "ancient", "clinvar", "pharmgkb", "pgs", "gwas")
+
+#: Result fields filled from each stage's return tuple
+STAGE_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "1kg": ("top_1kg_populations", "superpopulation_breakdown"),
+    "hgdp": ("top_hgdp_populations", "hgdp_region_breakdown"),
+    "sgdp": ("top_sgdp_populations", "sgdp_region_breakdown"),
+    "ancient": ("ancient_signals", "neanderthal_markers", "neanderthal_total"),
+    "clinvar": ("clinvar_findings", "pathogenic_count", "vus_count"),
+    "pharmgkb": ("pharmacogenomics", "actionable_pgx"),
+    "pgs": ("prs_results", "high_risk_conditions"),
+    "gwas": ("gwas_findings", "notable_traits"),
+}
+
+
+def build_analysis_stages(dna_filepath: str) -> List[Stage]:
+    """
+    Stage graph for one analysis: load the DNA file, then run every
+    analysis stage against the (read-only) genotypes.
+    """
+    analyses = {
+        "1kg": analyze_1kg_populations,
+        "hgdp": analyze_hgdp_populations,
+        "sgdp": analyze_sgdp_populations,
+        "ancient": analyze_ancient_ancestry,
+        "clinvar": analyze_clinvar,
+        "pharmgkb": analyze_pharmacogenomics,
+        "pgs": analyze_polygenic_scores,
+        "gwas": analyze_gwas_traits,
+    }
+    stages = [Stage("genotypes", load_dna_file, args=(dna_filepath,))]
+    stages += [
+        Stage(name, analyses[name], depends=("genotypes",))
+        for name in ANALYSIS_STAGES
+    ]
+    return stages
+
+
 def run_comprehensive_analysis(
     dna_filepath: str,
-    output_dir: Optional[str] = None
+    output_dir: Optional[str] = None,
+    stages: Optional[List[str]] = None,
+    executor: str = "thread",
+    max_workers: Optional[int] = None,
 ) -> ComprehensiveAnalysisResult:
     """
     Run complete analysis on DNA file using all 9 datasets.
     
+    The analysis stages only read the loaded genotypes, so they run
+    concurrently; the run takes about as long as its slowest stage.
+    Per-stage wall time and peak memory are recorded in
+    ``result.stage_timings``.
+    
     Args:
         dna_filepath: Path to the DNA data file
         output_dir: Optional output directory for reports
+        stages: Subset of ``ANALYSIS_STAGES`` to run (default: all)
+        executor: "thread" (default), "process" or "serial"
+        max_workers: Concurrent stages (default: all at once)
         
     Returns:
         ComprehensiveAnalysisResult with all findings
+        
+    Raises:
+        ValueError: For unknown stage names or executors
     """
     logger.info("=" * 60)
     logger.info("STARTING COMPREHENSIVE DNA ANALYSIS")
@@ -683,71 +747,49 @@ def run_comprehensive_analysis(
         dna_file=dna_filepath,
     )
     
-    # Step 1: Ensure all datasets are ready
-    logger.info("\n[1/8] Initializing datasets...")
+    scheduler = StageScheduler(
+        build_analysis_stages(dna_filepath),
+        executor=executor,
+        max_workers=max_workers,
+    )
+    selected = scheduler.closure(stages)
+    
+    # Step 1: Ensure all datasets are ready (downloads write, so run them first)
+    logger.info("\n[1/3] Initializing datasets...")
     dataset_status = ensure_datasets_downloaded()
     logger.info(f"Dataset status: {dataset_status}")
     
-    # Step 2: Load DNA data
-    logger.info("\n[2/8] Loading DNA data...")
-    genotypes = load_dna_file(dna_filepath)
-    result.total_snps = len(genotypes)
-    
-    # Step 3: 1000 Genomes population analysis
-    logger.info("\n[3/8] Analyzing 1000 Genomes populations...")
-    top_1kg, superpop = analyze_1kg_populations(genotypes)
-    result.top_1kg_populations = top_1kg
-    result.superpopulation_breakdown = superpop
-    
-    # Step 4: HGDP analysis
-    logger.info("\n[4/8] Analyzing HGDP populations...")
-    top_hgdp, hgdp_regions = analyze_hgdp_populations(genotypes)
-    result.top_hgdp_populations = top_hgdp
-    result.hgdp_region_breakdown = hgdp_regions
-    
-    # Step 5: SGDP analysis
-    logger.info("\n[5/8] Analyzing SGDP populations...")
-    top_sgdp, sgdp_regions = analyze_sgdp_populations(genotypes)
-    result.top_sgdp_populations = top_sgdp
-    result.sgdp_region_breakdown = sgdp_regions
-    
-    # Step 6: Ancient ancestry
-    logger.info("\n[6/8] Analyzing ancient ancestry...")
-    ancient, neand_found, neand_total = analyze_ancient_ancestry(genotypes)
-    result.ancient_signals = ancient
-    result.neanderthal_markers = neand_found
-    result.neanderthal_total = neand_total
-    
-    # Step 7: Clinical analysis
-    logger.info("\n[7/8] Analyzing clinical variants...")
-    clinvar_findings, pathogenic, vus = analyze_clinvar(genotypes)
-    result.clinvar_findings = clinvar_findings
-    result.pathogenic_count = pathogenic
-    result.vus_count = vus
-    
-    pgx_results, actionable_pgx = analyze_pharmacogenomics(genotypes)
-    result.pharmacogenomics = pgx_results
-    result.actionable_pgx = actionable_pgx
-    
-    # Step 8: Risk assessment
-    logger.info("\n[8/8] Calculating risk scores and trait associations...")
-    prs_results, high_risk = analyze_polygenic_scores(genotypes)
-    result.prs_results = prs_results
-    result.high_risk_conditions = high_risk
-    
-    gwas_findings, notable_traits = analyze_gwas_traits(genotypes)
-    result.gwas_findings = gwas_findings
-    result.notable_traits = notable_traits
+    # Step 2: Load DNA data, then run the analysis stages concurrently
+    logger.info(f"\n[2/3] Running stages ({executor}): {', '.join(selected)}")
+    stage_results, timings = scheduler.run(selected)
+    
+    # Step 3: Collect results
+    logger.info("\n[3/3] Collecting stage results...")
+    if "genotypes" in timings and not timings["genotypes"].ok:
+        raise IOError(f"Could not load {dna_filepath}: {timings['genotypes'].error}")
+    for name, timing in timings.items():
+        result.stage_timings[name] = timing.to_dict()
+        if not timing.ok:
+            logger.error(f"Stage {name} failed: {timing.error}")
+            continue
+        logger.info(f"Stage {name}: {timing.seconds:.2f}s, peak {timing.peak_memory_mb} MB")
+        value = stage_results[name]
+        if name == "genotypes":
+            result.total_snps = len(value)
+        else:
+            for field_name, field_value in zip(STAGE_FIELDS[name], value):
+                setattr(result, field_name, field_value)
     
     # Calculate analysis stats
     result.snps_analyzed = len(set(
-        [f["rsid"] for f in clinvar_findings] +
-        [f["rsid"] for f in gwas_findings]
+        [f["rsid"] for f in result.clinvar_findings] +
+        [f["rsid"] for f in result.gwas_findings]
     ))
     
     # Timing
     elapsed = (datetime.now() - start_time).total_seconds()
-    logger.info(f"\nAnalysis completed in {elapsed:.1f} seconds")
+    stage_total = sum(t.seconds for t in timings.values())
+    logger.info(f"\nAnalysis completed in {elapsed:.1f} seconds ({stage_total:.1f}s of stage time)")
     
     # Save results
     if output_dir:
@@ -2,69 +2,103 @@
 """
 Convert consumer DNA data to PLINK format for advanced analysis.
 Works with any ancestry/ethnic background.
+
+One or many kits (files, a directory or a manifest) are loaded in a
+process pool, packed into a CohortMatrix and written as one SNP-major
+PLINK 1 binary fileset (.bed/.bim/.fam), or a PLINK 2 .pgen/.pvar/.psam
+fileset with --pgen. Haploid calls (male X/Y, MT) are written as
+homozygous genotypes, as PLINK does.
 """
 
 import sys
-import pandas as pd
+import time
 from pathlib import Path
+from typing import List, Optional, Sequence, Union
+
+from comprehensive_analysis import build_cohort_matrix, collect_batch_inputs
+from personal_genomics.plink import PLINKFiles, write_bed, write_pgen
+
+
+def _resolve_inputs(inputs: Sequence[Union[str, Path]]) -> List[Path]:
+    """Expand directories and manifests (one path per line) to DNA files."""
+    paths: List[Path] = []
+    for item in inputs:
+        path = Path(item).expanduser()
+        if path.is_dir() or path.suffix.lower() in ('.list', '.manifest'):
+            paths.extend(collect_batch_inputs(path))
+        else:
+            paths.append(path)
+    return paths
+
+
+def convert_to_plink(
+    input_files: Union[str, Path, Sequence[Union[str, Path]]],
+    output_prefix: Union[str, Path],
+    workers: Optional[int] = None,
+    pgen: bool = False,
+    snp_ids: Optional[Sequence[str]] = None
+) -> PLINKFiles:
+    """
+    Convert one or more DNA files to a single PLINK fileset.
+
+    Args:
+        input_files: DNA file, directory or manifest, or a list of them.
+        output_prefix: Output path without extension.
+        workers: Worker processes used to load files (default: CPU count).
+        pgen: Write .pgen/.pvar/.psam instead of .bed/.bim/.fam.
+        snp_ids: Variant order (default: every SNP called in any file,
+            by chromosome and position).
+
+    Returns:
+        PLINKFiles with the written paths and dimensions.
+
+    Raises:
+        ValueError: If no input file could be loaded.
+    """
+    if isinstance(input_files, (str, Path)):
+        input_files = [input_files]
+    paths = _resolve_inputs(input_files)
+
+    print(f"Loading {len(paths)} file(s)...")
+    start = time.perf_counter()
+    cohort, failures = build_cohort_matrix(
+        paths, workers=workers, snp_ids=snp_ids, autosomes_only=False, haploid_as_homozygous=True
+    )
+    for failure in failures:
+        print(f"  Skipped {failure['path']}: {failure['error']}")
+    if not len(cohort):
+        raise ValueError("No input file could be loaded")
+    print(f"Packed {len(cohort)} sample(s) x {cohort.n_snps:,} SNPs "
+          f"in {time.perf_counter() - start:.1f}s")
+
+    written = (write_pgen if pgen else write_bed)(cohort, output_prefix)
+    for path in written.files:
+        print(f"Created {path}")
+    return written
 
-def convert_to_plink(input_file, output_prefix):
-    """Convert DNA file to PLINK .map and .ped format."""
-    
-    print(f"Loading {input_file}...")
-    
-    # Load data
-    try:
-        df = pd.read_csv(input_file, sep='\t', comment='#', dtype=str, low_memory=False)
-        
-        # Standardize column names
-        col_map = {
-            'rsID': 'rsid',
-            'chromosome': 'chromosome', 
-            'position': 'position',
-            'allele1': 'allele1',
-            'allele2': 'allele2'
-        }
-        df = df.rename(columns={k: v for k, v in col_map.items() if k in df.columns})
-        
-        if 'genotype' in df.columns and 'allele1' not in df.columns:
-            # 23andMe format
-            df['allele1'] = df['genotype'].str[0]
-            df['allele2'] = df['genotype'].str[1] if df['genotype'].str.len().max() > 1 else df['genotype'].str[0]
-    except Exception as e:
-        print(f"Error loading file: {e}")
-        sys.exit(1)
-    
-    print(f"Loaded {len(df):,} SNPs")
-    
-    # Create MAP file (chromosome, rsid, genetic_distance, position)
-    map_df = df[['chromosome', 'rsid', 'position']].copy()
-    map_df.insert(2, 'genetic_distance', 0)
-    map_df.to_csv(f'{output_prefix}.map', sep='\t', header=False, index=False)
-    print(f"Created {output_prefix}.map")
-    
-    # Create PED file (family, individual, father, mother, sex, phenotype, genotypes...)
-    genotypes = []
-    for _, row in df.iterrows():
-        a1 = row['allele1'] if pd.notna(row['allele1']) else '0'
-        a2 = row['allele2'] if pd.notna(row['allele2']) else '0'
-        genotypes.extend([a1, a2])
-    
-    # Use generic identifiers
-    ped_line = ['FAM001', 'IND001', '0', '0', '0', '-9'] + genotypes
-    
-    with open(f'{output_prefix}.ped', 'w') as f:
-        f.write('\t'.join(ped_line) + '\n')
-    print(f"Created {output_prefix}.ped")
-    
-    print(f"\nDone! Created {output_prefix}.map and {output_prefix}.ped")
-    print("\nTo convert to binary format (recommended for large analyses):")
-    print(f"  plink --file {output_prefix} --make-bed --out {output_prefix}_binary")
 
 if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print("Usage: python convert_to_plink.py <input_dna_file> <output_prefix>")
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    workers_arg = None
+    if '--workers' in sys.argv:
+        i = sys.argv.index('--workers')
+        workers_arg = sys.argv[i + 1] if i + 1 < len(sys.argv) else None
+        if workers_arg in args:
+            args.remove(workers_arg)
+
+    if len(args) < 2:
+        print("Usage: python convert_to_plink.py <input>... <output_prefix> [--pgen] [--workers N]")
+        print("  <input> is a DNA file, a directory of DNA files or a manifest (.list)")
         print("Example: python convert_to_plink.py ~/Downloads/AncestryDNA.txt my_genome")
+        print("         python convert_to_plink.py kits/ cohort --pgen")
+        sys.exit(1)
+
+    try:
+        convert_to_plink(
+            args[:-1], args[-1],
+            workers=int(workers_arg) if workers_arg else None,
+            pgen='--pgen' in sys.argv
+        )
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
         sys.exit(1)
-    
-    convert_to_plink(sys.argv[1], sys.argv[2])
@@ -9,12 +9,19 @@ This module provides:
 - Platform/chip detection
 - Quality warnings
 - Confidence scoring for variants
+
+Loaded ``GenotypeStore`` objects carry a ``QCStats`` accumulator
+(``store.qc``) filled while the file was parsed; when it is available the
+call-rate, chromosome coverage and platform checks read their counts from
+it instead of iterating over every genotype again.
 """
 
 from typing import Dict, List, Optional, Any, Tuple
 from collections import defaultdict
 import re
 
+from personal_genomics.qc import QCStats, get_qc
+
 
 # =============================================================================
 # PLATFORM DETECTION SIGNATURES
@@ -118,7 +125,8 @@ CHROMOSOME_EXPECTED_SNPS = {
 def detect_platform(
     genotypes: Dict[str, str],
     header_content: str = "",
-    chromosome_counts: Dict[str, int] = None
+    chromosome_counts: Dict[str, int] = None,
+    qc: Optional[QCStats] = None
 ) -> Dict[str, Any]:
     """
     Detect the genotyping platform/chip used.
@@ -127,11 +135,16 @@ def detect_platform(
         genotypes: Dict of rsid -> genotype
         header_content: File header content for pattern matching
         chromosome_counts: Pre-computed chromosome SNP counts
+        qc: Load-time QC counts (default: ``genotypes.qc`` if present);
+            supplies the marker count (no-calls included) and header
         
     Returns:
         Dict with platform detection results
     """
-    total_snps = len(genotypes)
+    qc = get_qc(genotypes, qc)
+    total_snps = qc.total_snps if qc is not None else len(genotypes)
+    if not header_content and qc is not None:
+        header_content = qc.header
     
     result = {
         "detected_platform": "unknown",
@@ -184,13 +197,8 @@ def detect_platform(
     return result
 
 
-def analyze_call_rate(genotypes: Dict[str, str]) -> Dict[str, Any]:
-    """
-    Analyze genotype call rate and quality.
-    
-    Returns:
-        Dict with call rate metrics
-    """
+def _count_calls(genotypes: Dict[str, str]) -> Tuple[int, int, int, int, int, int]:
+    """Count (total, valid, no-call, het, hom, indel) calls in a genotype dict."""
     total = len(genotypes)
     
     # Count various call types
@@ -222,6 +230,37 @@ def analyze_call_rate(genotypes: Dict[str, str]) -> Dict[str, Any]:
             valid_calls += 1
             homozygous += 1
     
+    return total, valid_calls, no_calls, heterozygous, homozygous, insertions_deletions
+
+
+def analyze_call_rate(
+    genotypes: Dict[str, str],
+    qc: Optional[QCStats] = None
+) -> Dict[str, Any]:
+    """
+    Analyze genotype call rate and quality.
+    
+    Args:
+        genotypes: Dict of rsid -> genotype
+        qc: Load-time QC counts (default: ``genotypes.qc`` if present).
+            Used instead of iterating over ``genotypes``; unlike the
+            loaded store it still includes the file's no-calls.
+    
+    Returns:
+        Dict with call rate metrics
+    """
+    qc = get_qc(genotypes, qc)
+    if qc is not None:
+        total = qc.total_snps
+        valid_calls = qc.called_snps
+        no_calls = qc.no_call_count
+        heterozygous = qc.heterozygous_count
+        homozygous = qc.homozygous_count + qc.hemizygous_count
+        insertions_deletions = qc.indel_count
+    else:
+        (total, valid_calls, no_calls,
+         heterozygous, homozygous, insertions_deletions) = _count_calls(genotypes)
+    
     call_rate = valid_calls / total if total > 0 else 0
     het_rate = heterozygous / valid_calls if valid_calls > 0 else 0
     
@@ -283,7 +322,8 @@ def _generate_call_rate_warnings(call_rate: float, het_rate: float, no_calls: in
 
 def analyze_chromosome_coverage(
     genotypes: Dict[str, str],
-    rsid_positions: Dict[str, Tuple[str, int]] = None
+    rsid_positions: Dict[str, Tuple[str, int]] = None,
+    qc: Optional[QCStats] = None
 ) -> Dict[str, Any]:
     """
     Analyze SNP coverage by chromosome.
@@ -291,6 +331,8 @@ def analyze_chromosome_coverage(
     Args:
         genotypes: Dict of rsid -> genotype
         rsid_positions: Optional dict of rsid -> (chromosome, position)
+        qc: Load-time QC counts (default: ``genotypes.qc`` if present);
+            used when ``rsid_positions`` isn't given
         
     Returns:
         Dict with chromosome coverage analysis
@@ -299,25 +341,32 @@ def analyze_chromosome_coverage(
     chrom_counts = defaultdict(int)
     chrom_no_calls = defaultdict(int)
     
+    qc = get_qc(genotypes, qc) if rsid_positions is None else None
+    if qc is not None and qc.has_chromosomes:
+        for chrom, counts in qc.chromosome_counts().items():
+            chrom_counts[chrom] = counts["total"]
+            chrom_no_calls[chrom] = counts["no_calls"]
+    
     # If we don't have position data, we can't do chromosome analysis
-    if rsid_positions is None:
+    elif rsid_positions is None:
         return {
             "status": "position_data_unavailable",
             "note": "Chromosome coverage analysis requires position mapping"
         }
     
-    no_call_patterns = ['--', '00', 'NC', 'NO CALL', '??']
-    
-    for rsid, geno in genotypes.items():
-        if rsid in rsid_positions:
-            chrom, pos = rsid_positions[rsid]
-            # Normalize chromosome name
-            chrom = str(chrom).replace("chr", "").upper()
-            
-            chrom_counts[chrom] += 1
-            
-            if geno.upper() in no_call_patterns:
-                chrom_no_calls[chrom] += 1
+    else:
+        no_call_patterns = ['--', '00', 'NC', 'NO CALL', '??']
+        
+        for rsid, geno in genotypes.items():
+            if rsid in rsid_positions:
+                chrom, pos = rsid_positions[rsid]
+                # Normalize chromosome name
+                chrom = str(chrom).replace("chr", "").upper()
+                
+                chrom_counts[chrom] += 1
+                
+                if geno.upper() in no_call_patterns:
+                    chrom_no_calls[chrom] += 1
     
     # Analyze coverage
     coverage_results = {}
@@ -447,22 +496,29 @@ def calculate_confidence_score(
 def generate_quality_report(
     genotypes: Dict[str, str],
     header_content: str = "",
-    rsid_positions: Dict[str, Tuple[str, int]] = None
+    rsid_positions: Dict[str, Tuple[str, int]] = None,
+    qc: Optional[QCStats] = None
 ) -> Dict[str, Any]:
     """
     Generate comprehensive quality report for the genetic data.
     
+    With load-time QC counts (``qc`` or ``genotypes.qc``) the report is
+    built from those counts and the file header they carry, without
+    iterating over the genotypes.
+    
     Returns:
         Dict with complete quality analysis
     """
+    qc = get_qc(genotypes, qc)
+    
     # Platform detection
-    platform = detect_platform(genotypes, header_content)
+    platform = detect_platform(genotypes, header_content, qc=qc)
     
     # Call rate analysis
-    call_rate = analyze_call_rate(genotypes)
+    call_rate = analyze_call_rate(genotypes, qc=qc)
     
     # Chromosome coverage (if position data available)
-    chromosome_coverage = analyze_chromosome_coverage(genotypes, rsid_positions)
+    chromosome_coverage = analyze_chromosome_coverage(genotypes, rsid_positions, qc=qc)
     
     # Overall quality assessment
     all_warnings = []
@@ -488,7 +544,7 @@ def generate_quality_report(
         "summary": {
             "overall_grade": overall_grade,
             "description": overall_description,
-            "total_snps": len(genotypes),
+            "total_snps": call_rate["total_snps"],
             "call_rate_percent": call_rate["call_rate_percent"],
             "platform": platform["detected_platform"],
             "platform_confidence": platform["confidence"],
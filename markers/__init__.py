@@ -47,126 +47,178 @@ NEW in v4.1.0:
 30. Runs of Homozygosity - Homozygosity analysis
 """
 
-from .pharmacogenomics import PHARMACOGENOMICS_MARKERS, DRUG_INTERACTIONS
-from .pharmacogenomics_extended import PHARMACOGENOMICS_EXTENDED
-from .polygenic_scores import PRS_WEIGHTS, PRS_CONDITIONS, calculate_prs
-from .prs_extended import PRS_EXTENDED
-from .carrier_status import CARRIER_MARKERS, CARRIER_SCREENING_PANELS
-from .carrier_extended import CARRIER_EXTENDED
-from .health_risks import HEALTH_RISK_MARKERS
-from .health_extended import HEALTH_EXTENDED
-from .traits import TRAIT_MARKERS
-from .traits_extended import TRAITS_EXTENDED
-from .nutrition import NUTRITION_MARKERS
-from .fitness import FITNESS_MARKERS
-from .neurogenetics import NEURO_MARKERS
-from .longevity import LONGEVITY_MARKERS
-from .immunity import IMMUNITY_MARKERS, HLA_DRUG_ALERTS
-from .ancestry import ANCESTRY_MARKERS, POPULATION_CODES
+import importlib
 
-# v3.0 categories
-from .rare_diseases import RARE_DISEASE_MARKERS, RARE_DISEASE_PANELS
-from .mental_health import MENTAL_HEALTH_MARKERS, MENTAL_HEALTH_NOTES
-from .dermatology import DERMATOLOGY_MARKERS, DERMATOLOGY_SUMMARY
-from .vision_hearing import VISION_MARKERS, HEARING_MARKERS, VISION_HEARING_MARKERS, CLINICAL_NOTES as SENSORY_NOTES
-from .fertility import FERTILITY_MARKERS, REPRODUCTIVE_NOTES
+# Category modules are imported on first attribute access (PEP 562), so
+# ``from markers import TRAIT_MARKERS`` loads one module instead of all of
+# them. Maps submodule -> public names it provides.
+_LAZY_SUBMODULES = {
+    "pharmacogenomics": ("PHARMACOGENOMICS_MARKERS", "DRUG_INTERACTIONS"),
+    "pharmacogenomics_extended": ("PHARMACOGENOMICS_EXTENDED",),
+    "polygenic_scores": ("PRS_WEIGHTS", "PRS_CONDITIONS", "calculate_prs"),
+    "prs_extended": ("PRS_EXTENDED",),
+    "carrier_status": ("CARRIER_MARKERS", "CARRIER_SCREENING_PANELS"),
+    "carrier_extended": ("CARRIER_EXTENDED",),
+    "health_risks": ("HEALTH_RISK_MARKERS",),
+    "health_extended": ("HEALTH_EXTENDED",),
+    "traits": ("TRAIT_MARKERS",),
+    "traits_extended": ("TRAITS_EXTENDED",),
+    "nutrition": ("NUTRITION_MARKERS",),
+    "fitness": ("FITNESS_MARKERS",),
+    "neurogenetics": ("NEURO_MARKERS",),
+    "longevity": ("LONGEVITY_MARKERS",),
+    "immunity": ("IMMUNITY_MARKERS", "HLA_DRUG_ALERTS"),
+    "ancestry": ("ANCESTRY_MARKERS", "POPULATION_CODES"),
 
-# NEW v4.0 categories
-from .haplogroups import (
-    MTDNA_MARKERS, YCHROMOSOME_MARKERS, HAPLOGROUP_HISTORY,
-    determine_mtdna_haplogroup, determine_y_haplogroup, analyze_haplogroups
-)
-from .ancestry_composition import (
-    ANCIENT_POPULATIONS, ANCIENT_ANCESTRY_MARKERS,
-    ANCESTRY_INFORMATIVE_MARKERS, POPULATION_DESCRIPTIONS,  # For backwards compat
-    detect_ancient_signals, get_ancestry_summary,
-    estimate_ancestry, detect_admixture,  # Legacy compatibility
-    calculate_wilson_confidence_interval
-)
+    # v3.0 categories
+    "rare_diseases": ("RARE_DISEASE_MARKERS", "RARE_DISEASE_PANELS"),
+    "mental_health": ("MENTAL_HEALTH_MARKERS", "MENTAL_HEALTH_NOTES"),
+    "dermatology": ("DERMATOLOGY_MARKERS", "DERMATOLOGY_SUMMARY"),
+    "vision_hearing": ("VISION_MARKERS", "HEARING_MARKERS", "VISION_HEARING_MARKERS"),
+    "fertility": ("FERTILITY_MARKERS", "REPRODUCTIVE_NOTES"),
 
-# NEW v4.4.0 population comparison and ancient DNA
-from .population_comparison import (
-    get_population_comparison_json, compare_to_populations,
-    find_most_similar_populations, get_marker_population_context,
-    generate_population_comparison_report
-)
-from .ancient_ancestry import (
-    get_ancient_dna_json, detect_ancient_signals as detect_ancient_signals_v44,
-    generate_ancient_dna_report, get_neanderthal_report
-)
-from .ancient_matching import (
-    find_closest_ancients, match_to_cultures,
-    generate_ancient_matches_report, get_ancient_matches_json,
-    analyze_ancient_ancestry, calculate_genetic_distance
-)
-from .cancer_panel import (
-    BRCA1_MARKERS, BRCA2_MARKERS, LYNCH_SYNDROME_MARKERS, OTHER_CANCER_MARKERS,
-    HEREDITARY_CANCER_MARKERS, CANCER_SCREENING_PANELS, analyze_cancer_panel
-)
-from .autoimmune_hla import (
-    CELIAC_HLA_MARKERS, TYPE1_DIABETES_HLA_MARKERS, ANKYLOSING_SPONDYLITIS_MARKERS,
-    RHEUMATOID_ARTHRITIS_MARKERS, LUPUS_MARKERS, OTHER_AUTOIMMUNE_MARKERS,
-    AUTOIMMUNE_HLA_MARKERS, AUTOIMMUNE_CONDITIONS, analyze_autoimmune_risk
-)
-from .pain_sensitivity import (
-    COMT_MARKERS, OPRM1_MARKERS, SCN9A_MARKERS, TRPV1_MARKERS,
-    OPIOID_METABOLISM_MARKERS, MIGRAINE_MARKERS, NSAID_RESPONSE_MARKERS,
-    PAIN_SENSITIVITY_MARKERS, analyze_pain_sensitivity
-)
+    # NEW v4.0 categories
+    "haplogroups": (
+        "MTDNA_MARKERS", "YCHROMOSOME_MARKERS", "HAPLOGROUP_HISTORY",
+        "determine_mtdna_haplogroup", "determine_y_haplogroup", "analyze_haplogroups",
+    ),
+    "ancestry_composition": (
+        "ANCIENT_POPULATIONS", "ANCIENT_ANCESTRY_MARKERS",
+        "ANCESTRY_INFORMATIVE_MARKERS", "POPULATION_DESCRIPTIONS",
+        "detect_ancient_signals", "get_ancestry_summary", "estimate_ancestry",
+        "detect_admixture", "calculate_wilson_confidence_interval",
+    ),
 
-# NEW v4.1.0 modules
-from .medication_interactions import (
-    DRUG_DATABASE, GENE_DRUG_INTERACTIONS,
-    check_medication_interactions, normalize_drug_name,
-    get_drug_info, list_all_drugs, search_drugs,
-    InteractionSeverity
-)
-from .sleep_optimization import (
-    CHRONOTYPE_MARKERS, CAFFEINE_METABOLISM_MARKERS,
-    ADENOSINE_RECEPTOR_MARKERS, SLEEP_DURATION_MARKERS, SLEEP_MARKERS,
-    determine_chronotype, determine_caffeine_metabolism,
-    generate_sleep_profile, get_sleep_optimization_summary,
-    Chronotype, CaffeineMetabolism
-)
-from .dietary_interactions import (
-    DIETARY_MARKERS, CAFFEINE_DIET_MARKERS, ALCOHOL_DIET_MARKERS,
-    SATURATED_FAT_MARKERS, LACTOSE_MARKERS, GLUTEN_SENSITIVITY_MARKERS,
-    BITTER_TASTE_MARKERS, ADDITIONAL_DIET_MARKERS,
-    analyze_dietary_interactions, determine_apoe_diet_recommendations,
-    generate_dietary_matrix_report, get_food_specific_guidance,
-    ToleranceLevel
-)
-from .athletic_profile import (
-    POWER_ENDURANCE_MARKERS, VO2MAX_MARKERS, RECOVERY_MARKERS, INJURY_MARKERS,
-    calculate_athletic_profile, generate_training_recommendations,
-    generate_athletic_report, get_sport_suitability,
-    AthleticType, RecoveryProfile, InjuryRisk
-)
-from .uv_sensitivity import (
-    MC1R_MARKERS, PIGMENTATION_MARKERS, VITAMIN_D_MARKERS,
-    calculate_pigmentation_score, estimate_skin_type,
-    calculate_spf_recommendation, calculate_vitamin_d_synthesis,
-    calculate_melanoma_risk, generate_uv_sensitivity_report,
-    generate_uv_report_text, SkinType, MelanomaRisk
-)
-from .explanations import (
-    PUBMED_REFERENCES, RESEARCH_VARIANTS, EXPLANATION_TEMPLATES,
-    generate_plain_english_explanation, explain_risk_in_context,
-    generate_uncertainty_statement, flag_research_variants,
-    get_pubmed_links, generate_full_explanation_report,
-    EvidenceLevel, CertaintyLevel
-)
-from .advanced_genetics import (
-    TELOMERE_MARKERS, LONGEVITY_RELATED_MARKERS,
-    calculate_heterozygosity_rate, detect_roh_regions,
-    generate_roh_report, estimate_telomere_length,
-    estimate_longevity_associations, generate_telomere_report,
-    ROHLevel
+    # NEW v4.4.0 population comparison and ancient DNA
+    "population_comparison": (
+        "get_population_comparison_json", "compare_to_populations",
+        "find_most_similar_populations", "get_marker_population_context",
+        "generate_population_comparison_report",
+    ),
+    "ancient_ancestry": (
+        "get_ancient_dna_json", "generate_ancient_dna_report",
+        "get_neanderthal_report",
+    ),
+    "ancient_matching": (
+        "find_closest_ancients", "match_to_cultures",
+        "generate_ancient_matches_report", "get_ancient_matches_json",
+        "analyze_ancient_ancestry", "calculate_genetic_distance",
+        "AncientPanel", "get_ancient_panel",
+    ),
+    "cancer_panel": (
+        "BRCA1_MARKERS", "BRCA2_MARKERS", "LYNCH_SYNDROME_MARKERS",
+        "OTHER_CANCER_MARKERS", "HEREDITARY_CANCER_MARKERS", "CANCER_SCREENING_PANELS",
+        "analyze_cancer_panel",
+    ),
+    "autoimmune_hla": (
+        "CELIAC_HLA_MARKERS", "TYPE1_DIABETES_HLA_MARKERS",
+        "ANKYLOSING_SPONDYLITIS_MARKERS", "RHEUMATOID_ARTHRITIS_MARKERS",
+        "LUPUS_MARKERS", "OTHER_AUTOIMMUNE_MARKERS", "AUTOIMMUNE_HLA_MARKERS",
+        "AUTOIMMUNE_CONDITIONS", "analyze_autoimmune_risk",
+    ),
+    "pain_sensitivity": (
+        "COMT_MARKERS", "OPRM1_MARKERS", "SCN9A_MARKERS", "TRPV1_MARKERS",
+        "OPIOID_METABOLISM_MARKERS", "MIGRAINE_MARKERS", "NSAID_RESPONSE_MARKERS",
+        "PAIN_SENSITIVITY_MARKERS", "analyze_pain_sensitivity",
+    ),
+
+    # NEW v4.1.0 modules
+    "medication_interactions": (
+        "DRUG_DATABASE", "GENE_DRUG_INTERACTIONS", "check_medication_interactions",
+        "normalize_drug_name", "get_drug_info", "list_all_drugs", "search_drugs",
+        "InteractionSeverity",
+    ),
+    "sleep_optimization": (
+        "CHRONOTYPE_MARKERS", "CAFFEINE_METABOLISM_MARKERS",
+        "ADENOSINE_RECEPTOR_MARKERS", "SLEEP_DURATION_MARKERS", "SLEEP_MARKERS",
+        "determine_chronotype", "determine_caffeine_metabolism",
+        "generate_sleep_profile", "get_sleep_optimization_summary", "Chronotype",
+        "CaffeineMetabolism",
+    ),
+    "dietary_interactions": (
+        "DIETARY_MARKERS", "CAFFEINE_DIET_MARKERS", "ALCOHOL_DIET_MARKERS",
+        "SATURATED_FAT_MARKERS", "LACTOSE_MARKERS", "GLUTEN_SENSITIVITY_MARKERS",
+        "BITTER_TASTE_MARKERS", "ADDITIONAL_DIET_MARKERS",
+        "analyze_dietary_interactions", "determine_apoe_diet_recommendations",
+        "generate_dietary_matrix_report", "get_food_specific_guidance",
+        "ToleranceLevel",
+    ),
+    "athletic_profile": (
+        "POWER_ENDURANCE_MARKERS", "VO2MAX_MARKERS", "RECOVERY_MARKERS",
+        "INJURY_MARKERS", "calculate_athletic_profile",
+        "generate_training_recommendations", "generate_athletic_report",
+        "get_sport_suitability", "AthleticType", "RecoveryProfile", "InjuryRisk",
+    ),
+    "uv_sensitivity": (
+        "MC1R_MARKERS", "PIGMENTATION_MARKERS", "VITAMIN_D_MARKERS",
+        "calculate_pigmentation_score", "estimate_skin_type",
+        "calculate_spf_recommendation", "calculate_vitamin_d_synthesis",
+        "calculate_melanoma_risk", "generate_uv_sensitivity_report",
+        "generate_uv_report_text", "SkinType", "MelanomaRisk",
+    ),
+    "explanations": (
+        "PUBMED_REFERENCES", "RESEARCH_VARIANTS", "EXPLANATION_TEMPLATES",
+        "generate_plain_english_explanation", "explain_risk_in_context",
+        "generate_uncertainty_statement", "flag_research_variants", "get_pubmed_links",
+        "generate_full_explanation_report", "EvidenceLevel", "CertaintyLevel",
+    ),
+    "advanced_genetics": (
+        "TELOMERE_MARKERS", "LONGEVITY_RELATED_MARKERS",
+        "calculate_heterozygosity_rate", "detect_roh_regions", "generate_roh_report",
+        "estimate_telomere_length", "estimate_longevity_associations",
+        "generate_telomere_report", "ROHLevel",
+    ),
+}
+
+# Re-exported under a different name: alias -> (submodule, attribute)
+_LAZY_ALIASES = {
+    "SENSORY_NOTES": ("vision_hearing", "CLINICAL_NOTES"),
+    "detect_ancient_signals_v44": ("ancient_ancestry", "detect_ancient_signals"),
+}
+
+_LAZY_ATTRIBUTES = {
+    name: (module, name)
+    for module, names in _LAZY_SUBMODULES.items()
+    for name in names
+}
+_LAZY_ATTRIBUTES.update(_LAZY_ALIASES)
+
+# Merged dictionaries, built together on first access to any of them
+_MERGED_NAMES = (
+    "ALL_PHARMACOGENOMICS", "ALL_HEALTH_RISKS", "ALL_TRAITS",
+    "ALL_PRS", "ALL_CARRIER", "ALL_ANCESTRY",
 )
 
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module, attr = _LAZY_ATTRIBUTES[name]
+        value = getattr(importlib.import_module(f".{module}", __name__), attr)
+        globals()[name] = value
+        return value
+    if name in _MERGED_NAMES:
+        merged = dict(zip(_MERGED_NAMES, _merge_markers()))
+        globals().update(merged)
+        return merged[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | set(_MERGED_NAMES))
+
+
 # Merge extended markers into main dictionaries
 def _merge_markers():
     """Merge extended markers into main dictionaries."""
+    from . import (
+        PHARMACOGENOMICS_MARKERS, PHARMACOGENOMICS_EXTENDED,
+        HEALTH_RISK_MARKERS, HEALTH_EXTENDED, AUTOIMMUNE_HLA_MARKERS,
+        TRAIT_MARKERS, TRAITS_EXTENDED,
+        PRS_WEIGHTS, PRS_EXTENDED,
+        CARRIER_MARKERS, CARRIER_EXTENDED, RARE_DISEASE_MARKERS, HEREDITARY_CANCER_MARKERS,
+        ANCESTRY_MARKERS, ANCIENT_ANCESTRY_MARKERS, MTDNA_MARKERS, YCHROMOSOME_MARKERS,
+    )
+    
     # Merge pharmacogenomics
     all_pharma = {**PHARMACOGENOMICS_MARKERS, **PHARMACOGENOMICS_EXTENDED}
     
@@ -187,11 +239,22 @@ def _merge_markers():
     
     return all_pharma, all_health, all_traits, all_prs, all_carrier, all_ancestry
 
-ALL_PHARMACOGENOMICS, ALL_HEALTH_RISKS, ALL_TRAITS, ALL_PRS, ALL_CARRIER, ALL_ANCESTRY = _merge_markers()
-
 # Combined marker count
 def get_marker_counts():
     """Get counts of markers in each category."""
+    from . import (
+        ALL_PHARMACOGENOMICS, ALL_PRS, ALL_CARRIER, ALL_HEALTH_RISKS, ALL_TRAITS,
+        ALL_ANCESTRY, NUTRITION_MARKERS, FITNESS_MARKERS, NEURO_MARKERS,
+        LONGEVITY_MARKERS, IMMUNITY_MARKERS, RARE_DISEASE_MARKERS,
+        MENTAL_HEALTH_MARKERS, DERMATOLOGY_MARKERS, VISION_HEARING_MARKERS,
+        FERTILITY_MARKERS, MTDNA_MARKERS, YCHROMOSOME_MARKERS,
+        ANCESTRY_INFORMATIVE_MARKERS, HEREDITARY_CANCER_MARKERS,
+        AUTOIMMUNE_HLA_MARKERS, PAIN_SENSITIVITY_MARKERS, SLEEP_MARKERS,
+        DIETARY_MARKERS, POWER_ENDURANCE_MARKERS, RECOVERY_MARKERS,
+        INJURY_MARKERS, VO2MAX_MARKERS, PIGMENTATION_MARKERS, TELOMERE_MARKERS,
+        LONGEVITY_RELATED_MARKERS, GENE_DRUG_INTERACTIONS,
+    )
+    
     # v4.1.0 marker counts
     v41_sleep = len(SLEEP_MARKERS)
     v41_dietary = len(DIETARY_MARKERS)
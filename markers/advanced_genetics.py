@@ -9,15 +9,24 @@ These analyses require careful interpretation and sensitive handling.
 """
 
 from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from enum import Enum
 import math
 
+import numpy as np
+
+from personal_genomics.genotypes import CHROMOSOME_NAMES, chromosome_code
+from personal_genomics.roh import AUTOSOMES, ROHCaller, ROHParams, ROHResult, call_roh
+
 
 # =============================================================================
 # RUNS OF HOMOZYGOSITY (ROH)
 # =============================================================================
 
+# Genotype strings consumer files use for a failed call
+NO_CALLS = ('--', '00', 'NC', 'N/A')
+
+
 class ROHLevel(Enum):
     """Classification of ROH findings."""
     MINIMAL = "minimal"      # Very low homozygosity
@@ -34,37 +43,52 @@ class ROHRegion:
     end_position: int
     length_mb: float
     snp_count: int
-    density: float
+    density: float  # SNPs per Mb
 
 
-def calculate_heterozygosity_rate(genotypes: Dict[str, str]) -> Dict[str, Any]:
+def calculate_heterozygosity_rate(
+    genotypes: Dict[str, str],
+    qc: Optional[Any] = None
+) -> Dict[str, Any]:
     """
     Calculate overall heterozygosity rate from genotype data.
     
     Expected heterozygosity in outbred populations: ~0.30-0.35 for autosomal SNPs
     Lower values suggest increased homozygosity (possibly consanguinity or population isolate)
-    """
-    total = 0
-    heterozygous = 0
-    homozygous = 0
-    missing = 0
     
-    for rsid, geno in genotypes.items():
-        if not geno or geno in ['--', '00', 'NC', 'N/A']:
-            missing += 1
-            continue
-        
-        total += 1
+    Load-time QC counts (``qc``, or ``genotypes.qc`` on a loaded
+    GenotypeStore) are used instead of iterating over the genotypes.
+    """
+    if qc is None:
+        qc = getattr(genotypes, "qc", None)
+    
+    if qc is not None:
+        total = qc.called_snps
+        heterozygous = qc.heterozygous_count
+        homozygous = qc.homozygous_count
+        missing = qc.no_call_count
+    else:
+        total = 0
+        heterozygous = 0
+        homozygous = 0
+        missing = 0
         
-        # Check if heterozygous (different alleles)
-        if len(geno) >= 2:
-            allele1 = geno[0].upper()
-            allele2 = geno[1].upper() if len(geno) > 1 else geno[0].upper()
+        for rsid, geno in genotypes.items():
+            if not geno or geno in NO_CALLS:
+                missing += 1
+                continue
             
-            if allele1 != allele2:
-                heterozygous += 1
-            else:
-                homozygous += 1
+            total += 1
+            
+            # Check if heterozygous (different alleles)
+            if len(geno) >= 2:
+                allele1 = geno[0].upper()
+                allele2 = geno[1].upper() if len(geno) > 1 else geno[0].upper()
+                
+                if allele1 != allele2:
+                    heterozygous += 1
+                else:
+                    homozygous += 1
     
     het_rate = heterozygous / total if total > 0 else 0
     hom_rate = homozygous / total if total > 0 else 0
@@ -96,24 +120,84 @@ def calculate_heterozygosity_rate(genotypes: Dict[str, str]) -> Dict[str, Any]:
     }
 
 
+def _interpret_froh(froh: float) -> str:
+    """Plain-language reading of an (estimated or measured) F_ROH."""
+    if froh < 0.01:
+        return "Homozygosity levels consistent with outbred population."
+    elif froh < 0.03:
+        return (
+            "Slightly elevated homozygosity. May indicate ancestry from "
+            "a population isolate or very distant shared ancestry."
+        )
+    elif froh < 0.0625:  # First cousin level
+        return (
+            "Elevated homozygosity detected. This may indicate shared ancestry "
+            "in recent generations. Consider discussing with a genetic counselor."
+        )
+    return (
+        "High homozygosity detected. This warrants clinical evaluation "
+        "to assess implications. Please consult a genetic counselor."
+    )
+
+
+def _call_roh_at_positions(
+    genotypes: Dict[str, str],
+    snp_positions: Dict[str, Tuple[str, int]],
+    params: ROHParams
+) -> ROHResult:
+    """
+    Call ROH on a genotype dict placed with ``snp_positions``.
+
+    No-calls keep their positions and are passed to the caller as missing,
+    so ``window_missing`` applies to them.
+    """
+    rows: Dict[str, List[Tuple[int, bool, bool]]] = {}
+    for rsid, geno in genotypes.items():
+        if rsid not in snp_positions:
+            continue
+        chrom, pos = snp_positions[rsid]
+        name = CHROMOSOME_NAMES[chromosome_code(str(chrom))]
+        try:
+            pos = int(pos)
+        except (TypeError, ValueError):
+            continue
+        if name not in AUTOSOMES or pos <= 0:
+            continue
+        missing = not geno or geno in NO_CALLS
+        het = not missing and len(geno) >= 2 and geno[0].upper() != geno[1].upper()
+        rows.setdefault(name, []).append((pos, het, missing))
+
+    caller = ROHCaller(params)
+    for name in sorted(rows, key=chromosome_code):
+        positions, het, missing = (np.array(column) for column in zip(*rows[name]))
+        caller.add_chromosome(name, positions, het, missing)
+    return caller.result()
+
+
 def detect_roh_regions(
     genotypes: Dict[str, str],
     snp_positions: Optional[Dict[str, Tuple[str, int]]] = None,
     min_snps: int = 100,
-    max_het_allowed: int = 2
+    max_het_allowed: Optional[int] = 2,
+    params: Optional[ROHParams] = None
 ) -> Dict[str, Any]:
     """
     Detect runs of homozygosity from genotype data.
     
-    Note: This is a simplified detection. Clinical ROH analysis requires
-    dense SNP data with known chromosomal positions (not available in all
-    consumer tests).
+    Uses a PLINK ``--homozyg``-style sliding-window caller (see
+    ``personal_genomics.roh``) on position-sorted autosomal SNPs. Needs
+    chromosome positions: a loaded GenotypeStore carries them, otherwise
+    pass ``snp_positions``. Without positions F_ROH is estimated from the
+    heterozygosity rate instead.
     
     Args:
-        genotypes: Dict of rsid -> genotype
+        genotypes: Dict of rsid -> genotype, or a GenotypeStore
         snp_positions: Optional dict of rsid -> (chromosome, position)
         min_snps: Minimum SNPs in a row to consider an ROH
         max_het_allowed: Maximum heterozygous calls allowed in an ROH
+            (None for no limit, as in PLINK)
+        params: Full calling parameters (overrides ``min_snps`` and
+            ``max_het_allowed``)
     """
     results = {
         "analysis_possible": False,
@@ -126,7 +210,7 @@ def detect_roh_regions(
     }
     
     # Check if we have position data
-    if not snp_positions:
+    if not snp_positions and not getattr(genotypes, "has_positions", False):
         results["note"] = (
             "ROH analysis requires SNP position data which is not included in standard "
             "consumer genetic tests. Heterozygosity rate is calculated instead."
@@ -139,30 +223,45 @@ def detect_roh_regions(
         # Lower het rate suggests more homozygosity
         estimated_froh = max(0, (0.32 - het_stats["heterozygosity_rate"]) / 0.32)
         results["estimated_froh"] = round(estimated_froh, 4)
-        
-        if estimated_froh < 0.01:
-            results["interpretation"] = "Homozygosity levels consistent with outbred population."
-        elif estimated_froh < 0.03:
-            results["interpretation"] = (
-                "Slightly elevated homozygosity. May indicate ancestry from "
-                "a population isolate or very distant shared ancestry."
-            )
-        elif estimated_froh < 0.0625:  # First cousin level
-            results["interpretation"] = (
-                "Elevated homozygosity detected. This may indicate shared ancestry "
-                "in recent generations. Consider discussing with a genetic counselor."
-            )
-        else:
-            results["interpretation"] = (
-                "High homozygosity detected. This warrants clinical evaluation "
-                "to assess implications. Please consult a genetic counselor."
-            )
+        results["interpretation"] = _interpret_froh(estimated_froh)
         
         return results
     
-    # If we have positions, do actual ROH detection
+    # Positional ROH calling
+    if params is None:
+        params = ROHParams(min_snps=min_snps, max_het=max_het_allowed)
+    if snp_positions:
+        roh = _call_roh_at_positions(genotypes, snp_positions, params)
+    else:
+        roh = call_roh(genotypes, params)
+    
+    regions = [
+        ROHRegion(
+            chromosome=seg.chromosome,
+            start_position=seg.start,
+            end_position=seg.end,
+            length_mb=round(seg.length_kb / 1000, 3),
+            snp_count=seg.n_snps,
+            density=round(seg.n_snps / (seg.length_kb / 1000), 1) if seg.length_kb else 0.0
+        )
+        for seg in roh.segments
+    ]
+    
     results["analysis_possible"] = True
-    # [Full ROH detection would go here with positional data]
+    results["note"] = (
+        f"Scanned {sum(roh.snps_scanned.values()):,} autosomal SNPs "
+        f"({params.window_snps}-SNP windows, runs of >= {params.min_snps} SNPs and "
+        f">= {params.min_kb / 1000:g} Mb)."
+    )
+    results["roh_regions"] = [asdict(r) for r in regions]
+    results["segment_count"] = len(regions)
+    results["longest_roh_mb"] = max((r.length_mb for r in regions), default=0)
+    results["total_roh_length_mb"] = round(roh.total_kb / 1000, 2)
+    results["froh"] = round(roh.froh, 4)
+    results["roh_percentage"] = round(roh.froh * 100, 2)
+    results["by_chromosome"] = roh.by_chromosome()
+    results["parameters"] = asdict(params)
+    results["interpretation"] = _interpret_froh(roh.froh)
     
     return results
 
@@ -183,8 +282,16 @@ def generate_roh_report(genotypes: Dict[str, str]) -> Dict[str, Any]:
         "resources": []
     }
     
-    # Determine summary
+    # Determine summary (measured F_ROH when positions were available)
     level = het_stats.get("level", "normal")
+    if roh_analysis["analysis_possible"]:
+        froh = roh_analysis["froh"]
+        if froh < 0.03:
+            level = ROHLevel.NORMAL.value
+        elif froh < 0.0625:
+            level = ROHLevel.ELEVATED.value
+        else:
+            level = ROHLevel.HIGH.value
     
     if level in ["minimal", "normal"]:
         report["summary"] = {
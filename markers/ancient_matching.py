@@ -21,9 +21,13 @@ Sources:
 from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 from collections import defaultdict
+from dataclasses import dataclass
+from itertools import chain
 import json
 import math
 
+import numpy as np
+
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
@@ -34,6 +38,27 @@ CONFIDENCE_MEDIUM = 20    # Medium confidence: 20-29 shared SNPs
 CONFIDENCE_LOW = 10       # Low confidence: 10-19 shared SNPs
 MINIMUM_SNPS = 5          # Below this, don't report match
 
+# SNP weights (ancestry-informative markers weighted higher)
+INFORMATIVE_SNP_WEIGHTS = {
+    # Pigmentation - highly ancestry-informative
+    "rs1426654": 2.0,   # SLC24A5 - highly informative
+    "rs16891982": 2.0,  # SLC45A2 - highly informative
+    "rs12913832": 1.5,  # HERC2 - eye color
+    "rs1042602": 1.3,   # TYR - pigmentation
+    "rs1800407": 1.3,   # OCA2 - eyes
+    "rs7495174": 1.3,   # OCA2 - eyes
+    # Diet/metabolism
+    "rs4988235": 1.5,   # LCT - lactase
+    "rs174546": 1.3,    # FADS1 - fatty acids
+    # Population-specific
+    "rs3827760": 2.0,   # EDAR - East Asian specific
+    "rs2814778": 2.0,   # DARC - African specific
+    "rs1800414": 1.5,   # OCA2 - East Asian
+}
+
+# Individuals scored per block by AncientPanel.score (bounds temporaries)
+PANEL_BLOCK_ROWS = 4096
+
 # =============================================================================
 # LOAD REFERENCE DATA
 # =============================================================================
@@ -137,12 +162,13 @@ def calculate_genetic_distance(
         Dict with distance, shared_snps, ibs_score, confidence, and details
         Returns None if insufficient shared SNPs
     """
-    # Find shared SNPs (excluding null/missing in ancient)
+    # Find shared SNPs (excluding null/missing in ancient). The ancient
+    # panel is a few dozen SNPs, so walk it rather than the user's genome.
     shared_snps = []
-    for rsid in user_genos:
-        if rsid in ancient_genos and ancient_genos[rsid]:
+    for rsid, ancient_geno in ancient_genos.items():
+        if ancient_geno and rsid in user_genos:
             user_geno = normalize_genotype(user_genos[rsid])
-            ancient_geno = normalize_genotype(ancient_genos[rsid])
+            ancient_geno = normalize_genotype(ancient_geno)
             if user_geno and ancient_geno and "del" not in ancient_geno.lower():
                 shared_snps.append(rsid)
     
@@ -157,29 +183,11 @@ def calculate_genetic_distance(
     different_count = 0
     details = []
     
-    # SNP weights (ancestry-informative markers weighted higher)
-    informative_snps = {
-        # Pigmentation - highly ancestry-informative
-        "rs1426654": 2.0,   # SLC24A5 - highly informative
-        "rs16891982": 2.0,  # SLC45A2 - highly informative
-        "rs12913832": 1.5,  # HERC2 - eye color
-        "rs1042602": 1.3,   # TYR - pigmentation
-        "rs1800407": 1.3,   # OCA2 - eyes
-        "rs7495174": 1.3,   # OCA2 - eyes
-        # Diet/metabolism
-        "rs4988235": 1.5,   # LCT - lactase
-        "rs174546": 1.3,    # FADS1 - fatty acids
-        # Population-specific
-        "rs3827760": 2.0,   # EDAR - East Asian specific
-        "rs2814778": 2.0,   # DARC - African specific
-        "rs1800414": 1.5,   # OCA2 - East Asian
-    }
-    
     for rsid in shared_snps:
         user_geno = normalize_genotype(user_genos[rsid])
         ancient_geno = normalize_genotype(ancient_genos[rsid])
         
-        weight = informative_snps.get(rsid, 1.0) if weighted else 1.0
+        weight = INFORMATIVE_SNP_WEIGHTS.get(rsid, 1.0) if weighted else 1.0
         
         # Calculate IBS (0, 1, or 2)
         if user_geno == ancient_geno:
@@ -335,6 +343,225 @@ def calculate_trait_matches(
     return matches
 
 
+# =============================================================================
+# ANCIENT PANEL MATRIX
+# =============================================================================
+
+@dataclass
+class AncientScores:
+    """IBS comparison of one user against every individual in a panel."""
+    
+    ids: List[str]
+    shared_snps: np.ndarray
+    identical_snps: np.ndarray
+    partial_snps: np.ndarray
+    total_ibs: np.ndarray
+    max_ibs: np.ndarray
+    
+    @property
+    def different_snps(self) -> np.ndarray:
+        return self.shared_snps - self.identical_snps - self.partial_snps
+    
+    @property
+    def ibs_score(self) -> np.ndarray:
+        """Weighted IBS / maximum possible IBS (0 where nothing is shared)."""
+        return np.divide(
+            self.total_ibs, self.max_ibs,
+            out=np.zeros_like(self.total_ibs), where=self.max_ibs > 0,
+        )
+    
+    def as_dict(self, row: int) -> Dict[str, Any]:
+        """Result for one individual, in ``calculate_genetic_distance`` form (no details)."""
+        ibs_score = float(self.total_ibs[row] / self.max_ibs[row]) if self.max_ibs[row] > 0 else 0
+        shared = int(self.shared_snps[row])
+        return {
+            "distance": round(1 - ibs_score, 4),
+            "similarity": round(ibs_score * 100, 1),
+            "shared_snps": shared,
+            "identical_snps": int(self.identical_snps[row]),
+            "partial_snps": int(self.partial_snps[row]),
+            "different_snps": int(self.different_snps[row]),
+            "total_ibs": float(self.total_ibs[row]),
+            "max_ibs": float(self.max_ibs[row]),
+            "confidence": get_confidence_level(shared),
+        }
+
+
+class AncientPanel:
+    """
+    Ancient reference genotypes compiled into an individuals x SNPs matrix.
+    
+    Every normalized genotype string gets a small integer code (0 = missing
+    or deletion call) and an allele bitmask, so IBS against a user's panel
+    slice is a few array comparisons for all individuals at once instead of
+    one ``calculate_genetic_distance`` call per individual. Scores match
+    ``calculate_genetic_distance``: IBS 2 for identical normalized
+    genotypes, 1 when any allele is shared, weighted by
+    ``INFORMATIVE_SNP_WEIGHTS``.
+    
+    Args:
+        individuals: Mapping of individual id -> {rsid: genotype}
+        weights: Per-rsid weights (default ``INFORMATIVE_SNP_WEIGHTS``;
+            unlisted SNPs weigh 1.0)
+    """
+    
+    def __init__(
+        self,
+        individuals: Dict[str, Dict[str, str]],
+        weights: Optional[Dict[str, float]] = None
+    ):
+        if weights is None:
+            weights = INFORMATIVE_SNP_WEIGHTS
+        
+        self.ids = list(individuals)
+        self.rsids = list(dict.fromkeys(chain.from_iterable(individuals.values())))
+        columns = {rsid: col for col, rsid in enumerate(self.rsids)}
+        
+        self._genotypes = [""]          # code -> normalized genotype
+        self._genotype_codes = {"": 0}  # normalized genotype -> code
+        self._allele_bits: Dict[str, int] = {}
+        
+        # Raw genotype strings repeat heavily; encode each distinct one once
+        # and map whole rows through the lookup.
+        raw_codes: Dict[str, int] = {}
+        codes = np.zeros((len(self.ids), len(self.rsids)), dtype=np.int32)
+        row_keys, cols = None, None
+        for row, snps in enumerate(individuals.values()):
+            keys = tuple(snps)
+            if keys != row_keys:  # usually every individual lists the same SNPs
+                row_keys = keys
+                cols = np.fromiter(map(columns.__getitem__, keys), dtype=np.intp, count=len(keys))
+            try:
+                values = np.fromiter(map(raw_codes.__getitem__, snps.values()), dtype=np.int32, count=len(keys))
+            except KeyError:
+                for genotype in snps.values():
+                    if genotype not in raw_codes:
+                        raw_codes[genotype] = self._encode(genotype)
+                values = np.fromiter(map(raw_codes.__getitem__, snps.values()), dtype=np.int32, count=len(keys))
+            codes[row, cols] = values
+        self.codes = codes.astype(np.min_scalar_type(len(self._genotypes)))
+        masks = [self._mask(genotype) for genotype in self._genotypes]
+        self._masks = np.array(masks, dtype=np.min_scalar_type(max(masks)))
+        self.weights = np.array([weights.get(rsid, 1.0) for rsid in self.rsids])
+    
+    @classmethod
+    def from_reference(cls, ancient_data: Optional[Dict[str, Any]] = None) -> "AncientPanel":
+        """Build from ``ancient_individuals.json``-style data (default: bundled file)."""
+        if ancient_data is None:
+            ancient_data = get_ancient_individuals()
+        return cls({
+            ancient_id: individual.get("snps", {})
+            for ancient_id, individual in ancient_data.items()
+            if not ancient_id.startswith("_")
+        })
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def _encode(self, genotype: str) -> int:
+        """Code for an ancient genotype; 0 for missing and deletion calls."""
+        genotype = normalize_genotype(genotype or "")
+        if not genotype or "del" in genotype.lower():
+            return 0
+        code = self._genotype_codes.get(genotype)
+        if code is None:
+            code = self._genotype_codes[genotype] = len(self._genotypes)
+            self._genotypes.append(genotype)
+            for allele in genotype:
+                if allele not in self._allele_bits:
+                    if len(self._allele_bits) == 64:
+                        raise ValueError("Ancient panel uses more than 64 distinct allele symbols")
+                    self._allele_bits[allele] = len(self._allele_bits)
+        return code
+    
+    def _mask(self, genotype: str) -> int:
+        """Bitmask of the panel alleles present in a genotype string."""
+        mask = 0
+        for allele in genotype:
+            bit = self._allele_bits.get(allele)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+    
+    def user_slice(self, user_genos: Dict[str, str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The user's genotypes at the panel SNPs.
+        
+        Returns:
+            (codes, masks): genotype code per panel SNP (0 = no call,
+            -1 = genotype no ancient individual carries) and allele bitmasks
+        """
+        codes = np.zeros(len(self.rsids), dtype=np.int64)
+        masks = np.zeros(len(self.rsids), dtype=self._masks.dtype)
+        for col, rsid in enumerate(self.rsids):
+            genotype = normalize_genotype(user_genos.get(rsid) or "")
+            if genotype:
+                codes[col] = self._genotype_codes.get(genotype, -1)
+                masks[col] = self._mask(genotype)
+        return codes, masks
+    
+    def score(
+        self,
+        user_genos: Dict[str, str],
+        weighted: bool = True,
+        block_rows: int = PANEL_BLOCK_ROWS
+    ) -> AncientScores:
+        """
+        IBS of the user against every individual in the panel.
+        
+        Args:
+            user_genos: User's genotypes (dict or GenotypeStore)
+            weighted: Whether to weight informative SNPs more heavily
+            block_rows: Individuals compared per block
+            
+        Returns:
+            AncientScores with one entry per panel individual
+        """
+        user_codes, user_masks = self.user_slice(user_genos)
+        called = user_codes != 0
+        weights = self.weights if weighted else np.ones(len(self.rsids))
+        
+        n = len(self.ids)
+        shared_snps = np.zeros(n, dtype=np.int64)
+        identical_snps = np.zeros(n, dtype=np.int64)
+        partial_snps = np.zeros(n, dtype=np.int64)
+        total_ibs = np.zeros(n)
+        max_ibs = np.zeros(n)
+        
+        for start in range(0, n, block_rows):
+            stop = min(start + block_rows, n)
+            codes = self.codes[start:stop]
+            shared = (codes != 0) & called
+            identical = shared & (codes == user_codes)
+            partial = shared & ~identical & ((self._masks[codes] & user_masks) != 0)
+            
+            shared_snps[start:stop] = shared.sum(axis=1)
+            identical_snps[start:stop] = identical.sum(axis=1)
+            partial_snps[start:stop] = partial.sum(axis=1)
+            total_ibs[start:stop] = (2.0 * identical + partial) @ weights
+            max_ibs[start:stop] = shared @ (2.0 * weights)
+        
+        return AncientScores(
+            ids=self.ids,
+            shared_snps=shared_snps,
+            identical_snps=identical_snps,
+            partial_snps=partial_snps,
+            total_ibs=total_ibs,
+            max_ibs=max_ibs,
+        )
+
+
+_ANCIENT_PANEL = None
+
+
+def get_ancient_panel() -> AncientPanel:
+    """Get the cached panel compiled from the bundled ancient individuals."""
+    global _ANCIENT_PANEL
+    if _ANCIENT_PANEL is None:
+        _ANCIENT_PANEL = AncientPanel.from_reference()
+    return _ANCIENT_PANEL
+
+
 # =============================================================================
 # ANCIENT INDIVIDUAL MATCHING
 # =============================================================================
@@ -356,31 +583,41 @@ def find_closest_ancients(
         List of ancient matches sorted by similarity, with percentile rankings
     """
     ancient_data = get_ancient_individuals()
-    results = []
+    panel = get_ancient_panel()
+    scores = panel.score(user_genos)
     
     # Confidence level ordering
     confidence_order = {"insufficient": 0, "very_low": 1, "low": 2, "medium": 3, "high": 4}
     min_conf_value = confidence_order.get(min_confidence, 1)
     
-    for ancient_id, individual in ancient_data.items():
-        if ancient_id.startswith("_"):  # Skip metadata
-            continue
-        
-        ancient_snps = individual.get("snps", {})
-        if not ancient_snps:
-            continue
-        
-        distance_result = calculate_genetic_distance(user_genos, ancient_snps)
-        
-        if distance_result is None:
-            continue
+    # Rank every individual from the score vectors; full result dicts
+    # (trait comparison, per-SNP details) are only built for the top_n.
+    ranked = []
+    for row in np.flatnonzero(scores.shared_snps >= MINIMUM_SNPS):
+        distance_result = scores.as_dict(row)
         
         # Filter by confidence
         conf_value = confidence_order.get(distance_result["confidence"], 0)
         if conf_value < min_conf_value:
             continue
         
+        ranked.append((row, distance_result))
+    
+    # Sort by similarity (highest first)
+    ranked.sort(key=lambda x: x[1]["similarity"], reverse=True)
+    
+    total_matches = len(ranked)
+    results = []
+    for i, (row, distance_result) in enumerate(ranked[:top_n]):
+        ancient_id = panel.ids[row]
+        individual = ancient_data[ancient_id]
+        ancient_snps = individual.get("snps", {})
+        
         trait_matches = calculate_trait_matches(user_genos, individual)
+        details = calculate_genetic_distance(user_genos, ancient_snps)["details"]
+        
+        # Percentile: how many are BELOW this individual
+        percentile = ((total_matches - i - 1) / total_matches) * 100 if total_matches > 1 else 50
         
         results.append({
             "id": ancient_id,
@@ -410,23 +647,16 @@ def find_closest_ancients(
             "different_snps": distance_result["different_snps"],
             "confidence": distance_result["confidence"],
             "trait_comparison": trait_matches,
-            "snp_details": distance_result["details"]
+            "snp_details": details,
+            
+            # Percentile rankings
+            "rank": i + 1,
+            "total_compared": total_matches,
+            "percentile": round(percentile, 1),
+            "rank_display": f"#{i + 1} of {total_matches}",
         })
     
-    # Sort by similarity (highest first)
-    results.sort(key=lambda x: x["similarity_percent"], reverse=True)
-    
-    # Calculate percentile rankings
-    total_matches = len(results)
-    for i, result in enumerate(results):
-        # Percentile: how many are BELOW this individual
-        percentile = ((total_matches - i - 1) / total_matches) * 100 if total_matches > 1 else 50
-        result["rank"] = i + 1
-        result["total_compared"] = total_matches
-        result["percentile"] = round(percentile, 1)
-        result["rank_display"] = f"#{i + 1} of {total_matches}"
-    
-    return results[:top_n]
+    return results
 
 
 # =============================================================================
@@ -458,19 +688,18 @@ def match_to_cultures(user_genos: Dict[str, str]) -> List[Dict[str, Any]]:
         "max_shared": 0
     })
     
-    for ancient_id, individual in ancient_individuals.items():
-        if ancient_id.startswith("_"):
-            continue
+    panel = get_ancient_panel()
+    panel_scores = panel.score(user_genos)
+    
+    for row in np.flatnonzero(panel_scores.shared_snps >= MINIMUM_SNPS):
+        ancient_id = panel.ids[row]
+        individual = ancient_individuals[ancient_id]
         
         culture = individual.get("culture", "")
         if not culture:
             continue
         
-        ancient_snps = individual.get("snps", {})
-        distance_result = calculate_genetic_distance(user_genos, ancient_snps)
-        
-        if distance_result is None:
-            continue
+        distance_result = panel_scores.as_dict(row)
         
         scores = culture_scores[culture]
         scores["total_similarity"] += distance_result["similarity"]
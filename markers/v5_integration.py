@@ -19,6 +19,12 @@ Import this module to access all v5.0 features.
 
 from typing import Dict, List, Any, Optional
 from pathlib import Path
+import sys
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from personal_genomics.genotypes import GenotypeStore, GenotypeStoreBuilder
 
 # =============================================================================
 # IMPORT ALL V5.0 MODULES
@@ -156,9 +162,9 @@ V5_ALL_MARKERS = {
 # MASTER ANALYSIS FUNCTION
 # =============================================================================
 
-def parse_dna_file(filepath: str) -> Dict[str, str]:
-    """Parse DNA file (23andMe or AncestryDNA format) into genotypes dict."""
-    genotypes = {}
+def parse_dna_file(filepath: str) -> GenotypeStore:
+    """Parse DNA file (23andMe or AncestryDNA format) into a genotype store."""
+    builder = GenotypeStoreBuilder()
     
     with open(filepath, 'r') as f:
         for line in f:
@@ -174,11 +180,11 @@ def parse_dna_file(filepath: str) -> Dict[str, str]:
                 allele2 = parts[4] if len(parts) > 4 else ''
                 
                 if allele1 and allele2:
-                    genotypes[rsid] = allele1 + allele2
+                    builder.add(rsid, allele1 + allele2, parts[1], parts[2])
                 elif allele1:
-                    genotypes[rsid] = allele1
+                    builder.add(rsid, allele1, parts[1], parts[2])
     
-    return genotypes
+    return builder.build()
 
 def generate_comprehensive_v5_report(genotypes: Dict[str, str]) -> Dict[str, Any]:
     """Generate complete v5.0 genomics report."""
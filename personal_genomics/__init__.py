@@ -1,7 +1,7 @@
 """
 Personal Genomics Package
 
-Statistical functions and data quality tools for genetic analysis.
+Statistical functions, genotype storage and data quality tools for genetic analysis.
 """
 
 from .statistics import (
@@ -15,6 +15,7 @@ from .statistics import (
     wilson_score_interval,
     bayesian_posterior,
     bootstrap_ci,
+    bootstrap_distribution,
     effect_size_ci,
     marker_coverage_weight,
     
@@ -36,6 +37,90 @@ from .statistics import (
     format_ci_string,
 )
 
+from .genotypes import (
+    GenotypeStore,
+    GenotypeStoreBuilder,
+    rsid_to_int,
+    int_to_rsid,
+    locus_id,
+    encode_genotype,
+    decode_genotype,
+    chromosome_code,
+    CHROMOSOME_NAMES,
+)
+
+from .prs_engine import (
+    PRSWeightMatrix,
+    PRSScores,
+)
+
+from .bgzf import (
+    compress_bgzf,
+    iter_file_chunks,
+    iter_text_lines,
+    read_file_bytes,
+)
+
+from .vcf import (
+    VCFReader,
+    BGZFIndex,
+    read_vcf,
+)
+
+from .json_stream import (
+    JSONObjectWriter,
+    write_json,
+)
+
+from .result_cache import (
+    ResultCache,
+    file_digest,
+    fingerprint,
+)
+
+from .scheduler import (
+    Stage,
+    StageScheduler,
+    StageTiming,
+)
+
+from .roh import (
+    ROHParams,
+    ROHSegment,
+    ROHResult,
+    ROHCaller,
+    call_roh,
+    call_roh_chromosome,
+)
+
+from .qc import (
+    QCStats,
+    get_qc,
+)
+
+from .cohort import (
+    CohortBuilder,
+    CohortMatrix,
+    PairCounts,
+    build_cohort,
+    classify_kinship,
+)
+
+from .ibd import (
+    GeneticMap,
+    IBDParams,
+    IBDSegment,
+    IBDResult,
+    find_ibd_segments,
+    match_cohort,
+)
+
+from .plink import (
+    PLINKFiles,
+    write_bed,
+    write_pgen,
+)
+
 from .quality import (
     # Types
     QualityGrade,
@@ -69,6 +154,7 @@ __all__ = [
     "wilson_score_interval",
     "bayesian_posterior",
     "bootstrap_ci",
+    "bootstrap_distribution",
     "effect_size_ci",
     "marker_coverage_weight",
     "proportion_test_pvalue",
@@ -83,6 +169,76 @@ __all__ = [
     "confidence_to_color",
     "format_ci_string",
     
+    # Genotype storage
+    "GenotypeStore",
+    "GenotypeStoreBuilder",
+    "rsid_to_int",
+    "int_to_rsid",
+    "locus_id",
+    "encode_genotype",
+    "decode_genotype",
+    "chromosome_code",
+    "CHROMOSOME_NAMES",
+    
+    # PRS engine
+    "PRSWeightMatrix",
+    "PRSScores",
+    
+    # VCF reading
+    "VCFReader",
+    "BGZFIndex",
+    "read_vcf",
+    "compress_bgzf",
+    "iter_file_chunks",
+    "iter_text_lines",
+    "read_file_bytes",
+    
+    # JSON output
+    "JSONObjectWriter",
+    "write_json",
+    
+    # Result cache
+    "ResultCache",
+    "file_digest",
+    "fingerprint",
+    
+    # Stage scheduling
+    "Stage",
+    "StageScheduler",
+    "StageTiming",
+    
+    # Runs of homozygosity
+    "ROHParams",
+    "ROHSegment",
+    "ROHResult",
+    "ROHCaller",
+    "call_roh",
+    "call_roh_chromosome",
+    
+    # Load-time QC
+    "QCStats",
+    "get_qc",
+    
+    # Cohort relatedness
+    "CohortBuilder",
+    "CohortMatrix",
+    "PairCounts",
+    "build_cohort",
+    "classify_kinship",
+    
+    # Identity by descent
+    "GeneticMap",
+    "IBDParams",
+    "IBDSegment",
+    "IBDResult",
+    "find_ibd_segments",
+    "match_cohort",
+    
+    # PLINK binary output
+    "PLINKFiles",
+    "write_bed",
+    "write_pgen",
+    
     # Quality
     "QualityGrade",
     "ChromosomeQuality",
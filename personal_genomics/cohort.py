@@ -0,0 +1,650 @@
+"""
+Bit-Packed Cohort Genotype Matrix
+
+Many genomes aligned to one SNP order, two bits per call, for all-pairs
+relatedness (duplicate kits, parent/child, siblings, cousins).
+
+Each SNP gets a reference and an alternate allele, taken from the first
+two alleles seen in the cohort. A call is stored as two bit planes, packed
+64 SNPs per ``uint64`` word:
+
+    ============  =======  =======
+    call          has_alt  has_ref
+    ============  =======  =======
+    hom ref       0        1
+    het           1        1
+    hom alt       1        0
+    missing       0        0
+    ============  =======  =======
+
+Calls that carry a third allele, haploid calls, indels and absent SNPs
+are missing. For a pair of samples every count is a popcount of word-wise
+logic over the planes:
+
+    observed   = (alt_i | ref_i) & (alt_j | ref_j)
+    IBS0       = (alt_i & ~ref_i & ~alt_j & ref_j) | (~alt_i & ref_i & alt_j & ~ref_j)
+    IBS2       = ~(alt_i ^ alt_j) & ~(ref_i ^ ref_j) & observed
+    het/het    = alt_i & ref_i & alt_j & ref_j
+
+Kinship is the KING-robust estimator
+``(N_het,het - 2 * N_IBS0) / (N_het,i + N_het,j)``. Pairs are processed
+in blocks of samples and SNP words, so the temporary arrays never exceed
+``max_elements`` words, whatever the cohort size.
+
+Example:
+    >>> builder = CohortBuilder()
+    >>> for name, store in kits.items():
+    ...     builder.add(name, store)
+    >>> cohort = builder.build()
+    >>> cohort.find_relatives()
+    [{'sample_1': 'child', 'sample_2': 'mother', 'kinship': 0.2481,
+      'relationship': 'first_degree', ...}]
+
+Author: OpenClaw AI
+Date: 2026-02-07
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .genotypes import ALLELES, CHROMOSOME_NAMES, HAPLOID_BASE, GenotypeStore, rsids_to_array
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+#: KING kinship lower bounds for each relationship degree
+KINSHIP_DUPLICATE = 0.354
+KINSHIP_FIRST_DEGREE = 0.177
+KINSHIP_SECOND_DEGREE = 0.0884
+KINSHIP_THIRD_DEGREE = 0.0442
+
+#: Words per temporary array when comparing blocks of samples
+PAIR_MAX_ELEMENTS = 1 << 18
+
+#: Minimum SNPs observed in both samples for a kinship estimate
+MIN_SHARED_SNPS = 1000
+
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _popcount(words: np.ndarray) -> np.ndarray:
+    """Set bits per row along the last axis of a uint64 array."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.uint32)
+    as_bytes = np.ascontiguousarray(words).view(np.uint8)
+    return _POPCOUNT_TABLE[as_bytes].sum(axis=-1, dtype=np.uint32)
+
+
+def classify_kinship(kinship: float) -> str:
+    """Relationship degree for a KING kinship coefficient."""
+    if kinship >= KINSHIP_DUPLICATE:
+        return "duplicate_or_twin"
+    if kinship >= KINSHIP_FIRST_DEGREE:
+        return "first_degree"
+    if kinship >= KINSHIP_SECOND_DEGREE:
+        return "second_degree"
+    if kinship >= KINSHIP_THIRD_DEGREE:
+        return "third_degree"
+    return "unrelated"
+
+
+def _pack(bits: np.ndarray, n_words: int) -> np.ndarray:
+    """Pack a boolean vector into little-endian uint64 words."""
+    packed = np.zeros(n_words * 8, dtype=np.uint8)
+    raw = np.packbits(bits, bitorder="little")
+    packed[:len(raw)] = raw
+    return packed.view(np.uint64)
+
+
+def _unpack(words: np.ndarray, n_bits: int) -> np.ndarray:
+    return np.unpackbits(words.view(np.uint8), bitorder="little")[:n_bits].astype(bool)
+
+
+def unpack_bits(words: np.ndarray, rows: Union[slice, np.ndarray], offset: int, n_bits: int) -> np.ndarray:
+    """
+    Boolean masks of ``n_bits`` bits from bit ``offset`` of each row.
+
+    Args:
+        words: (samples x words) uint64 bit plane, or a column slice of one
+        rows: Rows to unpack
+        offset: First bit within the first word
+        n_bits: Bits per row
+    """
+    block = np.ascontiguousarray(words[rows])
+    unpacked = np.unpackbits(block.view(np.uint8), axis=1, bitorder="little")
+    return unpacked[:, offset:offset + n_bits].view(bool)
+
+
+def _diploid_alleles(
+    store: GenotypeStore,
+    snp_ids: np.ndarray,
+    haploid_as_homozygous: bool = False,
+) -> Tuple[np.ndarray, ...]:
+    """
+    Row index and both allele codes of each panel SNP in a store.
+
+    Returns:
+        (idx, a1, a2): idx is -1 where absent; a1/a2 are int8 allele codes,
+        -1 unless the call is a diploid A/C/G/T genotype (or a haploid
+        one, doubled, with ``haploid_as_homozygous``)
+    """
+    idx = store.indices(snp_ids)
+    codes = np.full(len(snp_ids), 255, dtype=np.uint8)
+    codes[idx >= 0] = store.codes[idx[idx >= 0]]
+    if haploid_as_homozygous:
+        haploid = (codes >= HAPLOID_BASE) & (codes < HAPLOID_BASE + 4)
+        codes[haploid] = (codes[haploid] - HAPLOID_BASE) * 5
+    diploid = codes < HAPLOID_BASE
+    a1 = np.where(diploid, codes >> 2, -1).astype(np.int8)
+    a2 = np.where(diploid, codes & 3, -1).astype(np.int8)
+    return idx, a1, a2
+
+
+def _allele_bits(a1: np.ndarray, a2: np.ndarray, ref: np.ndarray, alt: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """has_alt / has_ref masks; calls with an allele other than ref/alt are missing."""
+    ok = (a1 >= 0) & ((a1 == ref) | (a1 == alt)) & ((a2 == ref) | (a2 == alt))
+    return ok & ((a1 == alt) | (a2 == alt)), ok & ((a1 == ref) | (a2 == ref))
+
+
+# =============================================================================
+# PAIR COUNTS
+# =============================================================================
+
+@dataclass
+class PairCounts:
+    """
+    IBS counts and kinship for a set of sample pairs (aligned arrays).
+
+    Attributes:
+        i, j: Sample indices (i < j)
+        n_snps: SNPs called in both samples
+        ibs0, ibs1, ibs2: SNPs sharing 0, 1 or 2 alleles
+        het_het: SNPs heterozygous in both
+        kinship: KING-robust kinship (NaN below MIN_SHARED_SNPS)
+    """
+    i: np.ndarray
+    j: np.ndarray
+    n_snps: np.ndarray
+    ibs0: np.ndarray
+    ibs1: np.ndarray
+    ibs2: np.ndarray
+    het_het: np.ndarray
+    kinship: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.i)
+
+    def to_records(self, samples: Sequence[str]) -> List[Dict[str, Any]]:
+        """One dict per pair, with sample names and relationship degree."""
+        records = []
+        for k in range(len(self.i)):
+            kinship = float(self.kinship[k])
+            n_snps = int(self.n_snps[k])
+            records.append({
+                "sample_1": samples[int(self.i[k])],
+                "sample_2": samples[int(self.j[k])],
+                "shared_snps": n_snps,
+                "ibs0": int(self.ibs0[k]),
+                "ibs1": int(self.ibs1[k]),
+                "ibs2": int(self.ibs2[k]),
+                "ibs0_rate": round(int(self.ibs0[k]) / n_snps, 6) if n_snps else None,
+                "kinship": None if np.isnan(kinship) else round(kinship, 4),
+                "relationship": "insufficient_data" if np.isnan(kinship) else classify_kinship(kinship),
+            })
+        return records
+
+
+# =============================================================================
+# COHORT MATRIX
+# =============================================================================
+
+class CohortMatrix:
+    """
+    Genotypes of many samples as 2-bit planes over a shared SNP order.
+
+    Attributes:
+        samples: Sample names, row order
+        snp_ids: int64 rsID keys (``genotypes.rsid_to_int``), column order
+        chromosomes: uint8 chromosome codes per SNP (0 if unknown)
+        positions: uint32 positions per SNP (0 if unknown)
+        ref, alt: int8 allele codes (0-3 for A/C/G/T, -1 if never seen)
+        has_alt, has_ref: (samples x words) uint64 bit planes
+    """
+
+    def __init__(
+        self,
+        samples: Sequence[str],
+        snp_ids: np.ndarray,
+        chromosomes: np.ndarray,
+        positions: np.ndarray,
+        ref: np.ndarray,
+        alt: np.ndarray,
+        has_alt: np.ndarray,
+        has_ref: np.ndarray,
+    ):
+        self.samples = list(samples)
+        self.snp_ids = np.asarray(snp_ids, dtype=np.int64)
+        self.chromosomes = np.asarray(chromosomes, dtype=np.uint8)
+        self.positions = np.asarray(positions, dtype=np.uint32)
+        self.ref = np.asarray(ref, dtype=np.int8)
+        self.alt = np.asarray(alt, dtype=np.int8)
+        self.has_alt = np.asarray(has_alt, dtype=np.uint64)
+        self.has_ref = np.asarray(has_ref, dtype=np.uint64)
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def __repr__(self) -> str:
+        return (
+            f"CohortMatrix({len(self.samples):,} samples x {self.n_snps:,} SNPs, "
+            f"{self.nbytes / 1e6:.1f} MB)"
+        )
+
+    @property
+    def n_snps(self) -> int:
+        return len(self.snp_ids)
+
+    @property
+    def n_words(self) -> int:
+        return self.has_alt.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.has_alt.nbytes + self.has_ref.nbytes)
+
+    def allele(self, codes: np.ndarray) -> List[str]:
+        """Allele letters for ``ref``/``alt`` codes ("0" where unknown)."""
+        return [ALLELES[c] if c >= 0 else "0" for c in np.asarray(codes).tolist()]
+
+    def dosages(self, sample: Union[int, str]) -> np.ndarray:
+        """Alternate-allele counts for one sample (int8, -1 for missing)."""
+        row = self.samples.index(sample) if isinstance(sample, str) else sample
+        has_alt = _unpack(self.has_alt[row], self.n_snps)
+        has_ref = _unpack(self.has_ref[row], self.n_snps)
+        dosage = np.where(has_alt, np.where(has_ref, 1, 2), 0).astype(np.int8)
+        dosage[~has_alt & ~has_ref] = -1
+        return dosage
+
+    def encode(self, genotypes: Mapping[str, str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        A genome not in the cohort as (has_alt, has_ref) masks over its SNPs.
+
+        Uses the cohort's ref/alt alleles; calls with any other allele are
+        missing.
+        """
+        _, a1, a2 = _diploid_alleles(GenotypeStore.from_dict(genotypes), self.snp_ids)
+        return _allele_bits(a1, a2, self.ref, self.alt)
+
+    def unpack(self, rows: slice, lo: int = 0, hi: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (has_alt, has_ref) boolean masks for a block of samples.
+
+        Only the words covering SNP columns ``lo:hi`` are unpacked.
+        """
+        hi = self.n_snps if hi is None else hi
+        first, last = lo // 64, (hi + 63) // 64
+        return (
+            unpack_bits(self.has_alt[:, first:last], rows, lo - first * 64, hi - lo),
+            unpack_bits(self.has_ref[:, first:last], rows, lo - first * 64, hi - lo),
+        )
+
+    def chromosome_ranges(self) -> Optional[List[Tuple[str, int, int]]]:
+        """
+        Column range of each chromosome as (name, lo, hi).
+
+        Returns None unless SNPs are grouped by chromosome and sorted by
+        position within each (see ``sorted_by_position``). SNPs without a
+        chromosome are left out.
+        """
+        chromosomes = self.chromosomes.astype(np.int64)
+        if np.any(np.diff(chromosomes) < 0):
+            return None
+        bounds = np.flatnonzero(np.diff(chromosomes)) + 1
+        ranges = []
+        for lo, hi in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [self.n_snps]))):
+            if hi <= lo or chromosomes[lo] == 0:
+                continue
+            if np.any(np.diff(self.positions[lo:hi].astype(np.int64)) < 0):
+                return None
+            ranges.append((CHROMOSOME_NAMES[chromosomes[lo]], int(lo), int(hi)))
+        return ranges
+
+    def sorted_by_position(self) -> "CohortMatrix":
+        """The same cohort with SNPs ordered by chromosome and position."""
+        order = np.lexsort((self.positions, self.chromosomes))
+        if np.array_equal(order, np.arange(self.n_snps)):
+            return self
+        n_words = self.n_words
+        has_alt = np.zeros_like(self.has_alt)
+        has_ref = np.zeros_like(self.has_ref)
+        for row in range(len(self.samples)):
+            alt, ref = self.unpack(slice(row, row + 1))
+            has_alt[row] = _pack(alt[0, order], n_words)
+            has_ref[row] = _pack(ref[0, order], n_words)
+        return CohortMatrix(
+            self.samples, self.snp_ids[order], self.chromosomes[order], self.positions[order],
+            self.ref[order], self.alt[order], has_alt, has_ref,
+        )
+
+    def call_rates(self) -> np.ndarray:
+        """Fraction of SNPs called, per sample."""
+        if not self.n_snps:
+            return np.zeros(len(self), dtype=np.float64)
+        return _popcount(self.has_alt | self.has_ref) / self.n_snps
+
+    # -------------------------------------------------------------------------
+    # Pairwise relatedness
+    # -------------------------------------------------------------------------
+
+    def _block_counts(
+        self,
+        rows_i: slice,
+        rows_j: slice,
+        word_step: int,
+    ) -> Tuple[np.ndarray, ...]:
+        """
+        IBS and het counts for every (i, j) in two sample blocks.
+
+        Five pairwise popcounts per word: SNPs called in both, opposite
+        homozygotes (IBS0), het/het and each sample's hets where the other
+        is called. IBS1 = het_i + het_j - 2 * het_het over shared SNPs,
+        and IBS2 is the remainder.
+        """
+        n_i = rows_i.stop - rows_i.start
+        n_j = rows_j.stop - rows_j.start
+        n_snps, ibs0, het_het, het_i, het_j = (np.zeros((n_i, n_j), np.int64) for _ in range(5))
+        buffer = np.empty((n_i, n_j, word_step), dtype=np.uint64)
+        scratch = np.empty_like(buffer)
+
+        def planes(rows: slice, words: slice) -> Tuple[np.ndarray, ...]:
+            alt = self.has_alt[rows, words]
+            ref = self.has_ref[rows, words]
+            return alt | ref, alt & ref, alt & ~ref, ref & ~alt
+
+        for w in range(0, self.n_words, word_step):
+            words = slice(w, w + word_step)
+            n_w = len(range(*words.indices(self.n_words)))
+            out = buffer[:, :, :n_w]
+            tmp = scratch[:, :, :n_w]
+            called_i, het_words_i, hom_alt_i, hom_ref_i = (p[:, None, :] for p in planes(rows_i, words))
+            called_j, het_words_j, hom_alt_j, hom_ref_j = (p[None, :, :] for p in planes(rows_j, words))
+
+            n_snps += _popcount(np.bitwise_and(called_i, called_j, out=out))
+            np.bitwise_and(hom_alt_i, hom_ref_j, out=out)
+            np.bitwise_and(hom_ref_i, hom_alt_j, out=tmp)
+            ibs0 += _popcount(np.bitwise_or(out, tmp, out=out))
+            het_het += _popcount(np.bitwise_and(het_words_i, het_words_j, out=out))
+            het_i += _popcount(np.bitwise_and(het_words_i, called_j, out=out))
+            het_j += _popcount(np.bitwise_and(het_words_j, called_i, out=out))
+
+        ibs1 = het_i + het_j - 2 * het_het
+        ibs2 = n_snps - ibs0 - ibs1
+        return n_snps, ibs0, ibs2, het_het, het_i, het_j
+
+    def iter_pairs(
+        self,
+        min_kinship: Optional[float] = None,
+        max_elements: int = PAIR_MAX_ELEMENTS,
+        min_shared_snps: int = MIN_SHARED_SNPS,
+    ) -> Iterator[PairCounts]:
+        """
+        Compare every pair of samples, one block of pairs at a time.
+
+        Args:
+            min_kinship: Only yield pairs at or above this kinship
+                (None yields all pairs)
+            max_elements: Upper bound on the words in a temporary array
+            min_shared_snps: Kinship is NaN for pairs sharing fewer SNPs
+
+        Yields:
+            PairCounts for each block (pairs with i < j)
+        """
+        n = len(self.samples)
+        if n < 2 or not self.n_words:
+            return
+        word_step = min(self.n_words, max_elements)
+        block = max(1, min(n, int((max_elements // word_step) ** 0.5)))
+
+        for start_i in range(0, n, block):
+            rows_i = slice(start_i, min(start_i + block, n))
+            for start_j in range(start_i, n, block):
+                rows_j = slice(start_j, min(start_j + block, n))
+                n_snps, ibs0, ibs2, het_het, het_i, het_j = self._block_counts(rows_i, rows_j, word_step)
+
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    kinship = (het_het - 2 * ibs0) / (het_i + het_j)
+                kinship = np.where(n_snps >= min_shared_snps, kinship, np.nan)
+
+                ii, jj = np.meshgrid(
+                    np.arange(rows_i.start, rows_i.stop),
+                    np.arange(rows_j.start, rows_j.stop),
+                    indexing="ij",
+                )
+                keep = ii < jj
+                if min_kinship is not None:
+                    keep &= kinship >= min_kinship
+                if not keep.any():
+                    continue
+                yield PairCounts(
+                    i=ii[keep],
+                    j=jj[keep],
+                    n_snps=n_snps[keep],
+                    ibs0=ibs0[keep],
+                    ibs1=(n_snps - ibs0 - ibs2)[keep],
+                    ibs2=ibs2[keep],
+                    het_het=het_het[keep],
+                    kinship=kinship[keep],
+                )
+
+    def pair_counts(self, sample_1: Union[int, str], sample_2: Union[int, str]) -> Dict[str, Any]:
+        """IBS counts and kinship for one pair of samples."""
+        i = self.samples.index(sample_1) if isinstance(sample_1, str) else sample_1
+        j = self.samples.index(sample_2) if isinstance(sample_2, str) else sample_2
+        n_snps, ibs0, ibs2, het_het, het_i, het_j = (
+            c[0, 0] for c in self._block_counts(slice(i, i + 1), slice(j, j + 1), self.n_words)
+        )
+        kinship = (het_het - 2 * ibs0) / (het_i + het_j) if het_i + het_j else float("nan")
+        counts = PairCounts(
+            i=np.array([i]), j=np.array([j]), n_snps=np.array([n_snps]),
+            ibs0=np.array([ibs0]), ibs1=np.array([n_snps - ibs0 - ibs2]), ibs2=np.array([ibs2]),
+            het_het=np.array([het_het]), kinship=np.array([kinship], dtype=np.float64),
+        )
+        return counts.to_records(self.samples)[0]
+
+    def find_relatives(
+        self,
+        min_kinship: float = KINSHIP_THIRD_DEGREE,
+        max_elements: int = PAIR_MAX_ELEMENTS,
+    ) -> List[Dict[str, Any]]:
+        """
+        Pairs related at third degree or closer (duplicates first).
+
+        Returns:
+            List of pair records (see ``PairCounts.to_records``), sorted
+            by kinship, highest first
+        """
+        records: List[Dict[str, Any]] = []
+        for counts in self.iter_pairs(min_kinship=min_kinship, max_elements=max_elements):
+            records.extend(counts.to_records(self.samples))
+        records.sort(key=lambda r: r["kinship"], reverse=True)
+        return records
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Write the cohort to an ``.npz`` file."""
+        path = Path(path)
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                samples=np.array(self.samples, dtype=str),
+                snp_ids=self.snp_ids,
+                chromosomes=self.chromosomes,
+                positions=self.positions,
+                ref=self.ref,
+                alt=self.alt,
+                has_alt=self.has_alt,
+                has_ref=self.has_ref,
+            )
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "CohortMatrix":
+        with np.load(path) as data:
+            return cls(
+                data["samples"].tolist(),
+                data["snp_ids"],
+                data["chromosomes"],
+                data["positions"],
+                data["ref"],
+                data["alt"],
+                data["has_alt"],
+                data["has_ref"],
+            )
+
+
+# =============================================================================
+# BUILDER
+# =============================================================================
+
+class CohortBuilder:
+    """
+    Pack genomes into a CohortMatrix one at a time.
+
+    The SNP order is ``snp_ids`` if given. Otherwise the panel is the
+    union of every added genome's called SNPs (autosomal only when a
+    genome has chromosome columns and ``autosomes_only`` is set), so a
+    SNP one kit failed to call is kept as missing for that kit; ``build``
+    orders it by chromosome and position. Each added genome is packed
+    immediately against the panel so far, so memory grows by ~SNPs/4
+    bytes per sample.
+
+    Args:
+        snp_ids: Shared SNP order (rsID strings or int64 keys)
+        autosomes_only: Restrict a default SNP order to chromosomes 1-22
+        haploid_as_homozygous: Store haploid calls (male X/Y, MT) as
+            homozygous, as PLINK does, instead of missing
+    """
+
+    def __init__(
+        self,
+        snp_ids: Optional[Union[Sequence[str], np.ndarray]] = None,
+        autosomes_only: bool = True,
+        haploid_as_homozygous: bool = False,
+    ):
+        self.autosomes_only = autosomes_only
+        self.haploid_as_homozygous = haploid_as_homozygous
+        self.samples: List[str] = []
+        self._alt_rows: List[np.ndarray] = []
+        self._ref_rows: List[np.ndarray] = []
+        self.union_panel = snp_ids is None
+        self.snp_ids = np.zeros(0, dtype=np.int64)
+        self.chromosomes = np.zeros(0, dtype=np.uint8)
+        self.positions = np.zeros(0, dtype=np.uint32)
+        self.ref = np.zeros(0, dtype=np.int8)
+        self.alt = np.zeros(0, dtype=np.int8)
+        self.n_words = 0
+        if snp_ids is not None:
+            keys = _as_keys(snp_ids)
+            keys = keys[keys != 0]
+            _, first = np.unique(keys, return_index=True)
+            self._extend_panel(keys[np.sort(first)])
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def _extend_panel(self, snp_ids: np.ndarray) -> None:
+        """Append SNPs to the panel (missing for genomes packed so far)."""
+        n = len(snp_ids)
+        self.snp_ids = np.concatenate((self.snp_ids, snp_ids))
+        self.chromosomes = np.concatenate((self.chromosomes, np.zeros(n, dtype=np.uint8)))
+        self.positions = np.concatenate((self.positions, np.zeros(n, dtype=np.uint32)))
+        self.ref = np.concatenate((self.ref, np.full(n, -1, dtype=np.int8)))
+        self.alt = np.concatenate((self.alt, np.full(n, -1, dtype=np.int8)))
+        self.n_words = (len(self.snp_ids) + 63) // 64
+
+    def add(self, name: str, genotypes: Mapping[str, str]) -> None:
+        """Pack one genome (a GenotypeStore or any rsid -> genotype mapping)."""
+        store = GenotypeStore.from_dict(genotypes)
+        if self.union_panel:
+            rows = np.arange(len(store))
+            if self.autosomes_only and store.chromosomes.any():
+                rows = np.flatnonzero((store.chromosomes >= 1) & (store.chromosomes <= 22))
+            idx = store.indices(self.snp_ids)
+            in_panel = np.zeros(len(store), dtype=bool)
+            in_panel[idx[idx >= 0]] = True
+            rows = rows[~in_panel[rows]]
+            if len(rows):
+                rows = rows[np.lexsort((store.positions[rows], store.chromosomes[rows]))]
+                self._extend_panel(store.ids[rows])
+
+        idx, a1, a2 = _diploid_alleles(store, self.snp_ids, self.haploid_as_homozygous)
+        found = idx >= 0
+
+        # Fill in chromosome/position columns the panel doesn't have yet
+        unknown = found.copy()
+        unknown[found] = self.chromosomes[found] == 0
+        self.chromosomes[unknown] = store.chromosomes[idx[unknown]]
+        self.positions[unknown] = store.positions[idx[unknown]]
+
+        # First alleles seen become ref, then alt
+        diploid = a1 >= 0
+        new_ref = diploid & (self.ref < 0)
+        self.ref[new_ref] = a1[new_ref]
+        for allele in (a1, a2):
+            new_alt = diploid & (self.alt < 0) & (allele != self.ref)
+            self.alt[new_alt] = allele[new_alt]
+
+        has_alt, has_ref = _allele_bits(a1, a2, self.ref, self.alt)
+
+        self.samples.append(str(name))
+        self._alt_rows.append(_pack(has_alt, self.n_words))
+        self._ref_rows.append(_pack(has_ref, self.n_words))
+
+    def _stack(self, rows: List[np.ndarray]) -> np.ndarray:
+        """Rows packed against a shorter panel are padded with missing calls."""
+        plane = np.zeros((len(rows), self.n_words), dtype=np.uint64)
+        for i, words in enumerate(rows):
+            plane[i, :len(words)] = words
+        return plane
+
+    def build(self) -> CohortMatrix:
+        cohort = CohortMatrix(
+            self.samples,
+            self.snp_ids,
+            self.chromosomes,
+            self.positions,
+            self.ref,
+            self.alt,
+            self._stack(self._alt_rows),
+            self._stack(self._ref_rows),
+        )
+        return cohort.sorted_by_position() if self.union_panel else cohort
+
+
+def _as_keys(snp_ids: Union[Sequence[str], np.ndarray]) -> np.ndarray:
+    if isinstance(snp_ids, np.ndarray) and snp_ids.dtype.kind == "i":
+        return snp_ids.astype(np.int64)
+    return rsids_to_array(snp_ids)
+
+
+def build_cohort(
+    genomes: Mapping[str, Mapping[str, str]],
+    snp_ids: Optional[Union[Sequence[str], np.ndarray]] = None,
+    autosomes_only: bool = True,
+    haploid_as_homozygous: bool = False,
+) -> CohortMatrix:
+    """Pack a dict of sample name -> genotypes into a CohortMatrix."""
+    builder = CohortBuilder(snp_ids, autosomes_only, haploid_as_homozygous)
+    for name, genotypes in genomes.items():
+        builder.add(name, genotypes)
+    return builder.build()
@@ -22,7 +22,9 @@ No data is sent to external servers during analysis.
 
 from .base import (
     BaseDataset,
+    IndexedDataset,
     SQLiteDataset,
+    SQLiteConnectionPool,
     DatasetVersion,
     VariantInfo,
     PopulationFrequency,
@@ -32,8 +34,17 @@ from .base import (
     get_all_datasets,
     download_all_datasets,
     get_dataset_status,
+    LookupCache,
+    DEFAULT_LOOKUP_CACHE_SIZE,
+    get_dataset,
+    configure_lookup_cache,
+    get_lookup_cache_stats,
+    reset_dataset_registry,
 )
 
+from .frequency_matrix import FrequencyMatrix
+from .rsid_index import RsidIndex
+
 from .thousand_genomes import (
     ThousandGenomes,
     get_1kg_frequencies,
@@ -100,6 +111,12 @@ from .pgs_catalog import (
     calculate_disease_risk,
 )
 
+from .pgs_scoring import (
+    ScoringFileStore,
+    ScoringFileInfo,
+    read_scoring_header,
+)
+
 from .gwas_catalog import (
     GWASCatalog,
     GWASAssociation,
@@ -109,7 +126,9 @@ from .gwas_catalog import (
 __all__ = [
     # Base classes
     "BaseDataset",
+    "IndexedDataset",
     "SQLiteDataset", 
+    "SQLiteConnectionPool",
     "DatasetVersion",
     "VariantInfo",
     "PopulationFrequency",
@@ -117,6 +136,14 @@ __all__ = [
     "get_all_datasets",
     "download_all_datasets",
     "get_dataset_status",
+    "LookupCache",
+    "DEFAULT_LOOKUP_CACHE_SIZE",
+    "get_dataset",
+    "configure_lookup_cache",
+    "get_lookup_cache_stats",
+    "reset_dataset_registry",
+    "FrequencyMatrix",
+    "RsidIndex",
     
     # 1000 Genomes
     "ThousandGenomes",
@@ -175,6 +202,9 @@ __all__ = [
     "PolygenticScore",
     "PRSResult",
     "calculate_disease_risk",
+    "ScoringFileStore",
+    "ScoringFileInfo",
+    "read_scoring_header",
     
     # GWAS Catalog
     "GWASCatalog",
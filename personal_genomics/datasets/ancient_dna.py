@@ -29,6 +29,7 @@ from .base import (
     DatasetVersion,
     VariantInfo,
     DATASETS_BASE_PATH,
+    get_dataset,
 )
 
 logger = logging.getLogger(__name__)
@@ -542,7 +543,7 @@ def analyze_ancient_ancestry(genotypes: Dict[str, str]) -> Dict[str, AncestralSi
     Returns:
         Dict of population -> AncestralSignal
     """
-    dataset = AncientDNADataset()
+    dataset = get_dataset(AncientDNADataset, download=False)
     return dataset.analyze_ancestral_signals(genotypes)
 
 
@@ -5,18 +5,21 @@ All datasets are downloaded and cached locally for privacy-first analysis.
 """
 
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple, Union
 import hashlib
 import json
-import gzip
 import logging
 import os
+import threading
 import urllib.request
 import ssl
 
+from .rsid_index import RsidIndex
+
 logger = logging.getLogger(__name__)
 
 # =============================================================================
@@ -26,6 +29,20 @@ logger = logging.getLogger(__name__)
 # Base path for all reference datasets
 DATASETS_BASE_PATH = Path.home() / ".openclaw" / "workspace" / "skills" / "personal-genomics" / "references" / "datasets"
 
+# Entries kept in each dataset's per-rsID lookup cache
+DEFAULT_LOOKUP_CACHE_SIZE = 4096
+
+# Pragmas for read-only connections to reference databases
+SQLITE_READ_PRAGMAS = (
+    "PRAGMA query_only = ON",
+    "PRAGMA mmap_size = 268435456",  # map up to 256 MB of the file
+    "PRAGMA cache_size = -65536",    # 64 MB page cache
+    "PRAGMA temp_store = MEMORY",
+)
+
+# Prepared statements kept per connection (sqlite3 default: 128)
+SQLITE_CACHED_STATEMENTS = 512
+
 
 @dataclass
 class DatasetVersion:
@@ -97,6 +114,180 @@ class PopulationFrequency:
         return self.total_alleles // 2
 
 
+# =============================================================================
+# LOOKUP CACHE
+# =============================================================================
+
+class LookupCache:
+    """
+    Bounded, thread-safe LRU cache for per-variant dataset lookups.
+    
+    ``None`` results are cached too, so repeated lookups of variants that
+    are absent from a dataset also skip the query.
+    
+    Example:
+        >>> cache = LookupCache(maxsize=2)
+        >>> cache.put("rs1", 0.5)
+        >>> cache.get("rs1")
+        (True, 0.5)
+    """
+    
+    def __init__(self, maxsize: int = DEFAULT_LOOKUP_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Any, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def get(self, key: Any) -> Tuple[bool, Any]:
+        """Return (found, value) and count the hit or miss."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return True, self._data[key]
+            self.misses += 1
+            return False, None
+    
+    def put(self, key: Any, value: Any) -> None:
+        """Store a value, evicting the least recently used entries."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def resize(self, maxsize: int) -> None:
+        """Change the capacity, evicting entries if it shrinks."""
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._data) > max(maxsize, 0):
+                self._data.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and occupancy."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+
+# =============================================================================
+# SQLITE CONNECTION POOL
+# =============================================================================
+
+class SQLiteConnectionPool:
+    """
+    Per-thread SQLite connections to one database file.
+    
+    Each thread gets its own connection, so datasets can be queried from a
+    thread pool. Read connections open the file read-only and immutable
+    (no file locking or change detection) with ``SQLITE_READ_PRAGMAS``;
+    each keeps ``cached_statements`` prepared statements, so repeated
+    lookups skip SQL compilation.
+    
+    Write connections are ordinary. Requesting one retires every read
+    connection, since immutable readers would not see the changes: each
+    thread reopens its reader on its next read.
+    
+    Example:
+        >>> pool = SQLiteConnectionPool(Path("data.db"))
+        >>> pool.get().execute("SELECT COUNT(*) FROM variants").fetchone()
+    """
+    
+    def __init__(self, path: Path, cached_statements: int = SQLITE_CACHED_STATEMENTS):
+        self.path = Path(path)
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[Any] = []
+        self._generation = 0
+    
+    def __len__(self) -> int:
+        return len(self._connections)
+    
+    def get(self, write: bool = False):
+        """
+        Connection for the calling thread.
+        
+        Args:
+            write: Writable connection; otherwise read-only and immutable
+                (writable if the database file does not exist yet)
+        """
+        if write:
+            with self._lock:
+                self._generation += 1
+        slot = "writer" if write else "reader"
+        cached = getattr(self._local, slot, None)
+        if cached is not None:
+            generation, conn = cached
+            if write or generation == self._generation:
+                return conn
+            self._discard(conn)
+        
+        conn = self._connect(write)
+        with self._lock:
+            self._connections.append(conn)
+            setattr(self._local, slot, (self._generation, conn))
+        return conn
+    
+    def _connect(self, write: bool):
+        import sqlite3
+        if write or not self.path.exists():
+            conn = sqlite3.connect(
+                str(self.path),
+                check_same_thread=False,
+                cached_statements=self.cached_statements,
+            )
+        else:
+            conn = sqlite3.connect(
+                self.path.resolve().as_uri() + "?mode=ro&immutable=1",
+                uri=True,
+                check_same_thread=False,
+                cached_statements=self.cached_statements,
+            )
+            for pragma in SQLITE_READ_PRAGMAS:
+                conn.execute(pragma)
+        conn.row_factory = sqlite3.Row
+        return conn
+    
+    def _discard(self, conn) -> None:
+        with self._lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        conn.close()
+    
+    def close(self) -> None:
+        """
+        Close every thread's connections.
+        
+        Connections are opened with ``check_same_thread=False`` so they can
+        be closed here; callers must not close while other threads query.
+        """
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._generation += 1
+            self._local = threading.local()
+        for conn in connections:
+            conn.close()
+
+
 # =============================================================================
 # BASE DATASET CLASS
 # =============================================================================
@@ -115,12 +306,14 @@ class BaseDataset(ABC):
     version: str = "unknown"
     description: str = ""
     source_url: str = ""
+    lookup_cache_size: int = DEFAULT_LOOKUP_CACHE_SIZE
     
     def __init__(self, data_dir: Optional[Path] = None):
         self.data_dir = data_dir or DATASETS_BASE_PATH / self.name
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self._version_info: Optional[DatasetVersion] = None
         self._cache: Dict[str, Any] = {}
+        self.lookups = LookupCache(self.lookup_cache_size)
         
     @property
     def version_file(self) -> Path:
@@ -144,6 +337,26 @@ class BaseDataset(ABC):
         with open(self.version_file, "w") as f:
             json.dump(version_info.to_dict(), f, indent=2)
         self._version_info = version_info
+        # Cached lookups may predate the new data
+        self.lookups.clear()
+    
+    def cached_lookup(self, method: str, *args: Any) -> Any:
+        """
+        Call a lookup method through the instance's LRU cache.
+        
+        Args:
+            method: Name of a lookup method (e.g., "lookup_variant")
+            *args: Hashable arguments (e.g., the rsID)
+            
+        Returns:
+            The method's (possibly cached) result; treat it as read-only
+        """
+        key = (method,) + args
+        found, value = self.lookups.get(key)
+        if not found:
+            value = getattr(self, method)(*args)
+            self.lookups.put(key, value)
+        return value
     
     @abstractmethod
     def download(self, force: bool = False) -> bool:
@@ -244,59 +457,88 @@ class IndexedDataset(BaseDataset):
     Base class for large datasets using index files for fast lookups.
     
     Uses a two-level index:
-    1. rsID -> file offset (stored in index file)
-    2. Seek to offset to read record
+    1. rsID -> record offset (memory-mapped ``RsidIndex`` in ``rsid_index.bin``)
+    2. Seek to offset to read record (BGZF virtual offsets for bgzipped data)
+    
+    Subclasses implement ``_parse_record`` to turn a record's tab-split
+    fields into a ``VariantInfo``.
     """
     
+    #: Column of ``data_file`` holding the rsID
+    rsid_col: int = 0
+    
     @property
     def index_file(self) -> Path:
-        return self.data_dir / "rsid_index.json"
+        return self.data_dir / "rsid_index.bin"
     
     @property
     def data_file(self) -> Path:
         return self.data_dir / "data.tsv.gz"
     
-    def _build_index(self, data_file: Path, rsid_col: int = 0) -> Dict[str, int]:
+    def _build_index(self, data_file: Path, rsid_col: int = 0) -> RsidIndex:
         """
-        Build an index mapping rsID to line number.
+        Build an index mapping rsID to record offset.
         
-        For compressed files, we index by line number since seeking
-        in gzip files is not efficient.
+        Plain files are indexed by byte offset and bgzipped files by BGZF
+        virtual offset, so lookups seek straight to the record.
         """
-        index = {}
-        line_num = 0
-        
-        opener = gzip.open if str(data_file).endswith(".gz") else open
-        mode = "rt" if str(data_file).endswith(".gz") else "r"
-        
-        with opener(data_file, mode) as f:
-            for line in f:
-                if line.startswith("#"):
-                    continue
-                parts = line.strip().split("\t")
-                if len(parts) > rsid_col:
-                    rsid = parts[rsid_col]
-                    if rsid.startswith("rs"):
-                        index[rsid] = line_num
-                line_num += 1
-        
-        return index
+        return RsidIndex.build(data_file, rsid_col=rsid_col)
     
-    def _load_index(self) -> Dict[str, int]:
-        """Load the rsID index from disk."""
+    def _load_index(self) -> Optional[RsidIndex]:
+        """Memory-map the rsID index, (re)building it if missing or stale."""
         if "index" not in self._cache:
-            if self.index_file.exists():
-                with open(self.index_file) as f:
-                    self._cache["index"] = json.load(f)
-            else:
-                self._cache["index"] = {}
+            index = RsidIndex.load(self.index_file)
+            if self.data_file.exists():
+                if index is None or not index.matches(self.data_file):
+                    index = self._build_index(self.data_file, self.rsid_col)
+                    self._save_index(index)
+            self._cache["index"] = index
         return self._cache["index"]
     
-    def _save_index(self, index: Dict[str, int]) -> None:
+    def _save_index(self, index: RsidIndex) -> None:
         """Save the rsID index to disk."""
-        with open(self.index_file, "w") as f:
-            json.dump(index, f)
+        index.save(self.index_file)
         self._cache["index"] = index
+    
+    def _read_records(self, rsids: List[str]) -> Dict[str, Optional[List[str]]]:
+        """Tab-split records for many rsIDs, read in file order."""
+        index = self._load_index()
+        if index is None:
+            return {rsid: None for rsid in rsids}
+        return index.read_records(self.data_file, rsids)
+    
+    @abstractmethod
+    def _parse_record(self, rsid: str, fields: List[str]) -> Optional[VariantInfo]:
+        """
+        Convert a record's fields to a VariantInfo.
+        
+        Args:
+            rsid: The variant identifier
+            fields: Tab-split fields of the record
+            
+        Returns:
+            VariantInfo, or None if the record can't be used
+        """
+        pass
+    
+    def lookup_variant(self, rsid: str) -> Optional[VariantInfo]:
+        return self.lookup_variants([rsid])[rsid]
+    
+    def lookup_variants(self, rsids: List[str]) -> Dict[str, Optional[VariantInfo]]:
+        """
+        Look up multiple variants with one sorted pass over the data file.
+        
+        Args:
+            rsids: List of variant identifiers
+            
+        Returns:
+            Dict mapping rsid to VariantInfo (or None if not found)
+        """
+        records = self._read_records(list(rsids))
+        return {
+            rsid: self._parse_record(rsid, fields) if fields else None
+            for rsid, fields in records.items()
+        }
 
 
 # =============================================================================
@@ -308,25 +550,49 @@ class SQLiteDataset(BaseDataset):
     Base class for datasets using SQLite for storage.
     
     Better for complex queries and large datasets with multiple lookup patterns.
+    Connections come from a per-thread ``SQLiteConnectionPool``, so lookups
+    are safe from worker threads. Code that builds or updates the database
+    asks for ``_get_connection(write=True)``.
     """
     
+    def __init__(self, data_dir: Optional[Path] = None):
+        super().__init__(data_dir)
+        self._pool = SQLiteConnectionPool(self.db_file)
+    
     @property
     def db_file(self) -> Path:
         return self.data_dir / "data.db"
     
-    def _get_connection(self):
-        """Get SQLite connection."""
-        import sqlite3
-        if "conn" not in self._cache:
-            self._cache["conn"] = sqlite3.connect(str(self.db_file))
-            self._cache["conn"].row_factory = sqlite3.Row
-        return self._cache["conn"]
+    def _get_connection(self, write: bool = False):
+        """
+        Get the calling thread's SQLite connection.
+        
+        Args:
+            write: Writable connection for loading data; otherwise a
+                read-only, immutable connection tuned for lookups
+        """
+        return self._pool.get(write=write)
     
     def close(self):
-        """Close database connection."""
-        if "conn" in self._cache:
-            self._cache["conn"].close()
-            del self._cache["conn"]
+        """Close all database connections."""
+        self._pool.close()
+    
+    def frequency_matrix(self):
+        """
+        Allele-frequency matrix for vectorized population scoring.
+        
+        Built once from the ``variants``/``frequencies`` tables of the
+        population datasets and cached on the instance.
+        
+        Returns:
+            FrequencyMatrix
+        """
+        if "frequency_matrix" not in self._cache:
+            from .frequency_matrix import FrequencyMatrix
+            self._cache["frequency_matrix"] = FrequencyMatrix.from_connection(
+                self._get_connection()
+            )
+        return self._cache["frequency_matrix"]
 
 
 # =============================================================================
@@ -411,6 +677,111 @@ def get_all_datasets() -> Dict[str, type]:
     }
 
 
+# =============================================================================
+# DATASET REGISTRY
+# =============================================================================
+
+_REGISTRY: Dict[type, BaseDataset] = {}
+# Classes whose download has been attempted (successful or not)
+_REGISTRY_SETTLED: set = set()
+# Guards the registry dicts only; never held while constructing or downloading
+_REGISTRY_LOCK = threading.Lock()
+# One lock per class serializes its construction and download
+_REGISTRY_CLASS_LOCKS: Dict[type, threading.Lock] = {}
+
+
+def _registry_entry(cls: type, download: bool) -> Optional[BaseDataset]:
+    """The registered instance if it needs no further setup, else None."""
+    with _REGISTRY_LOCK:
+        instance = _REGISTRY.get(cls)
+        if instance is not None and (not download or cls in _REGISTRY_SETTLED):
+            return instance
+        return None
+
+
+def get_dataset(dataset: Union[str, type], download: bool = True) -> BaseDataset:
+    """
+    Shared, process-wide instance of a dataset.
+    
+    The first call constructs the dataset (and downloads it if needed);
+    later calls return the same object, so its SQLite connection, derived
+    matrices and lookup cache are reused across callers.
+    
+    Construction and download hold a lock for that dataset class only, so
+    a slow download doesn't block lookups in other datasets. A download is
+    attempted once: if it fails, later calls return the (not downloaded)
+    instance until ``reset_dataset_registry``.
+    
+    Args:
+        dataset: Dataset class or registry name (e.g., "clinvar")
+        download: Download the dataset on first use if it is missing
+        
+    Returns:
+        The singleton dataset instance
+    """
+    cls = get_all_datasets()[dataset] if isinstance(dataset, str) else dataset
+    instance = _registry_entry(cls, download)
+    if instance is not None:
+        return instance
+
+    with _REGISTRY_LOCK:
+        class_lock = _REGISTRY_CLASS_LOCKS.setdefault(cls, threading.Lock())
+    with class_lock:
+        # Another thread may have finished the setup while we waited
+        instance = _registry_entry(cls, download)
+        if instance is not None:
+            return instance
+        with _REGISTRY_LOCK:
+            instance = _REGISTRY.get(cls)
+        if instance is None:
+            instance = cls()
+            with _REGISTRY_LOCK:
+                instance = _REGISTRY.setdefault(cls, instance)
+        if download:
+            try:
+                if not instance.is_downloaded:
+                    instance.download()
+            finally:
+                with _REGISTRY_LOCK:
+                    _REGISTRY_SETTLED.add(cls)
+    return instance
+
+
+def configure_lookup_cache(maxsize: int, dataset: Optional[Union[str, type]] = None) -> None:
+    """
+    Set the lookup cache size for one dataset class, or for all of them.
+    
+    Applies to registered instances immediately and to instances created
+    later.
+    """
+    if dataset is None:
+        classes = list(get_all_datasets().values())
+    else:
+        classes = [get_all_datasets()[dataset] if isinstance(dataset, str) else dataset]
+    with _REGISTRY_LOCK:
+        for cls in classes:
+            cls.lookup_cache_size = maxsize
+            if cls in _REGISTRY:
+                _REGISTRY[cls].lookups.resize(maxsize)
+
+
+def get_lookup_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Lookup cache hit/miss counters for every registered dataset."""
+    with _REGISTRY_LOCK:
+        return {cls.name: ds.lookups.stats() for cls, ds in _REGISTRY.items()}
+
+
+def reset_dataset_registry() -> None:
+    """Close and forget all registered dataset instances."""
+    with _REGISTRY_LOCK:
+        for instance in _REGISTRY.values():
+            close = getattr(instance, "close", None)
+            if close:
+                close()
+        _REGISTRY.clear()
+        _REGISTRY_SETTLED.clear()
+
+
 def download_all_datasets(force: bool = False) -> Dict[str, bool]:
     """Download all datasets."""
     results = {}
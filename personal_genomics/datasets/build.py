@@ -0,0 +1,611 @@
+"""
+Dataset Build Pipeline
+
+Builds the ClinVar, gnomAD and GWAS Catalog databases from full local
+copies of their public dumps instead of the small built-in subsets that
+``download()`` installs:
+
+    python -m personal_genomics.datasets.build clinvar variant_summary.txt.gz
+    python -m personal_genomics.datasets.build gnomad gnomad.genomes.v4.1.sites.chr*.vcf.bgz
+    python -m personal_genomics.datasets.build gwas_catalog gwas_catalog_v1.0.2-associations.tsv
+
+Sources are streamed line by line (plain, gzip or BGZF; BGZF blocks are
+inflated on a thread pool) and inserted with ``executemany`` in batches of
+``batch_rows``, committing every ``commit_rows`` rows, so memory stays
+bounded for dumps with tens of millions of rows. The dataset's secondary
+indexes are created once after the load rather than maintained row by
+row. The database is built next to the live one and moved into place when
+complete; processes that already hold the dataset (``get_dataset``)
+should call ``reset_dataset_registry()`` to see the new data.
+
+Author: OpenClaw AI
+Date: 2026-02-07
+"""
+
+import argparse
+import logging
+import os
+import re
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+try:
+    from ..bgzf import iter_text_lines
+except ImportError:  # loaded as the top-level "datasets" package
+    from personal_genomics.bgzf import iter_text_lines
+
+from .base import DatasetVersion, SQLiteDataset, get_all_datasets
+from .clinvar import CLINICAL_SIGNIFICANCE
+from .gnomad import GNOMAD_POPULATIONS
+
+logger = logging.getLogger(__name__)
+
+
+# Rows per executemany call
+DEFAULT_BATCH_ROWS = 50_000
+
+# Rows per transaction
+DEFAULT_COMMIT_ROWS = 1_000_000
+
+# The database under construction is private until it is moved into place,
+# so durability can be traded for load speed
+SQLITE_BULK_PRAGMAS = (
+    "PRAGMA journal_mode = OFF",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA locking_mode = EXCLUSIVE",
+    "PRAGMA cache_size = -262144",   # 256 MB page cache
+    "PRAGMA temp_store = MEMORY",
+)
+
+_CREATE_INDEX = re.compile(r"CREATE\s+(?:UNIQUE\s+)?INDEX\b", re.IGNORECASE)
+
+# (table, row) pairs produced by the source parsers
+Row = Tuple[str, tuple]
+
+
+@dataclass
+class BuildStats:
+    """Outcome of one dataset build."""
+    dataset: str
+    sources: List[str]
+    rows: Dict[str, int] = field(default_factory=dict)
+    skipped: int = 0
+    load_seconds: float = 0.0
+    index_seconds: float = 0.0
+
+    @property
+    def total_rows(self) -> int:
+        return sum(self.rows.values())
+
+    @property
+    def seconds(self) -> float:
+        return self.load_seconds + self.index_seconds
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.total_rows / self.load_seconds if self.load_seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "dataset": self.dataset,
+            "sources": self.sources,
+            "rows": dict(self.rows),
+            "total_rows": self.total_rows,
+            "skipped": self.skipped,
+            "load_seconds": round(self.load_seconds, 3),
+            "index_seconds": round(self.index_seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+def split_schema(schema: str) -> Tuple[str, List[str]]:
+    """
+    Split a dataset SCHEMA into table DDL and its CREATE INDEX statements.
+
+    Returns:
+        (script creating the tables, list of index statements)
+    """
+    tables, indexes = [], []
+    for statement in schema.split(";"):
+        statement = statement.strip()
+        if not statement:
+            continue
+        (indexes if _CREATE_INDEX.match(statement) else tables).append(statement)
+    return ";\n".join(tables) + ";", indexes
+
+
+class BulkLoader:
+    """
+    Buffers rows per table and writes them with ``executemany``.
+
+    Args:
+        conn: Connection to the database being built
+        statements: Table name -> INSERT statement
+        batch_rows: Rows buffered per table before an executemany call
+        commit_rows: Rows written per transaction
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        statements: Dict[str, str],
+        batch_rows: int = DEFAULT_BATCH_ROWS,
+        commit_rows: int = DEFAULT_COMMIT_ROWS,
+    ):
+        self.conn = conn
+        self.statements = statements
+        self.batch_rows = batch_rows
+        self.commit_rows = commit_rows
+        self.counts: Dict[str, int] = {table: 0 for table in statements}
+        self._buffers: Dict[str, List[tuple]] = {table: [] for table in statements}
+        self._uncommitted = 0
+        self._started = time.perf_counter()
+
+    def add(self, table: str, row: tuple) -> None:
+        buffer = self._buffers[table]
+        buffer.append(row)
+        if len(buffer) >= self.batch_rows:
+            self._write(table)
+
+    def _write(self, table: str) -> None:
+        buffer = self._buffers[table]
+        if not buffer:
+            return
+        self.conn.executemany(self.statements[table], buffer)
+        self.counts[table] += len(buffer)
+        self._uncommitted += len(buffer)
+        buffer.clear()
+        if self._uncommitted >= self.commit_rows:
+            self.commit()
+
+    def commit(self) -> None:
+        self.conn.commit()
+        self._uncommitted = 0
+        total = sum(self.counts.values())
+        elapsed = time.perf_counter() - self._started
+        logger.info(f"  {total:,} rows ({total / elapsed if elapsed else 0:,.0f} rows/sec)")
+
+    def flush(self) -> None:
+        """Write every buffered row and commit."""
+        for table in self._buffers:
+            self._write(table)
+        self.commit()
+
+
+# =============================================================================
+# SOURCE PARSERS
+# =============================================================================
+
+def _header_columns(line: str) -> Dict[str, int]:
+    return {name.strip(): i for i, name in enumerate(line.lstrip("#").split("\t"))}
+
+
+def _float(value: str) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _int(value: str) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def clinvar_significance_level(significance: str) -> int:
+    """
+    Numeric level (5 = pathogenic ... 1 = benign) of a ClinVar
+    ClinicalSignificance value; conflicting or unrecognized values are VUS.
+    """
+    sig = significance.lower()
+    if "conflicting" in sig:
+        return 3
+    # "Pathogenic/Likely pathogenic" -> the first, strongest term
+    primary = re.split(r"[/,;]", sig)[0].strip()
+    for term in sorted(CLINICAL_SIGNIFICANCE, key=len, reverse=True):
+        if term in primary:
+            return CLINICAL_SIGNIFICANCE[term]
+    return 3
+
+
+def parse_clinvar_summary(
+    path: Union[str, Path],
+    stats: BuildStats,
+    assembly: str = "GRCh38",
+) -> Iterator[Row]:
+    """
+    Rows for the ClinVar ``variants`` and ``conditions`` tables from
+    ``variant_summary.txt(.gz)``, keeping one genome assembly.
+    """
+    lines = iter_text_lines(path)
+    cols = _header_columns(next(lines, ""))
+    required = ("VariationID", "Assembly", "Chromosome", "ClinicalSignificance")
+    missing = [name for name in required if name not in cols]
+    if missing:
+        raise ValueError(f"{path}: not a ClinVar variant_summary file (missing {', '.join(missing)})")
+
+    def column(name: str, default: int = -1) -> int:
+        return cols.get(name, default)
+
+    c_id, c_asm, c_chr = cols["VariationID"], cols["Assembly"], cols["Chromosome"]
+    c_sig = cols["ClinicalSignificance"]
+    c_rs, c_gene = column("RS# (dbSNP)"), column("GeneSymbol")
+    c_review, c_evaluated = column("ReviewStatus"), column("LastEvaluated")
+    c_phen = column("PhenotypeList")
+    c_pos_vcf, c_ref_vcf, c_alt_vcf = column("PositionVCF"), column("ReferenceAlleleVCF"), column("AlternateAlleleVCF")
+    c_start, c_ref, c_alt = column("Start"), column("ReferenceAllele"), column("AlternateAllele")
+    width = max(cols.values()) + 1
+
+    for line in lines:
+        if not line or line.startswith("#"):
+            continue
+        f = line.split("\t")
+        if len(f) < width:
+            stats.skipped += 1
+            continue
+        if f[c_asm] != assembly:
+            continue
+
+        variation_id = f[c_id]
+        rs = f[c_rs] if c_rs >= 0 else "-1"
+        rsid = f"rs{rs}" if rs not in ("", "-1") else None
+
+        position = _int(f[c_pos_vcf]) if c_pos_vcf >= 0 else None
+        if position is not None and position > 0 and f[c_ref_vcf] not in ("", "na"):
+            ref, alt = f[c_ref_vcf], f[c_alt_vcf]
+        else:
+            position = _int(f[c_start]) if c_start >= 0 else None
+            ref = f[c_ref] if c_ref >= 0 else None
+            alt = f[c_alt] if c_alt >= 0 else None
+
+        significance = f[c_sig]
+        yield "variants", (
+            variation_id, rsid, f[c_chr], position, ref, alt,
+            f[c_gene] if c_gene >= 0 else None,
+            significance, clinvar_significance_level(significance),
+            f[c_review] if c_review >= 0 else None,
+            f[c_evaluated] if c_evaluated >= 0 and f[c_evaluated] != "-" else None,
+        )
+
+        if c_phen >= 0:
+            for condition in f[c_phen].split("|"):
+                if condition and condition not in ("not provided", "not specified", "-"):
+                    yield "conditions", (variation_id, condition)
+
+
+def _info_fields(info: str, keys: frozenset) -> Dict[str, str]:
+    values = {}
+    for item in info.split(";"):
+        key, _, value = item.partition("=")
+        if key in keys:
+            values[key] = value
+    return values
+
+
+# Per-population INFO suffixes in gnomAD v2-v4 (v4 calls "oth" "remaining")
+_GNOMAD_POPULATION_KEYS = {pop: pop for pop in GNOMAD_POPULATIONS}
+_GNOMAD_POPULATION_KEYS["remaining"] = "oth"
+
+
+def parse_gnomad_vcf(
+    path: Union[str, Path],
+    stats: BuildStats,
+    pass_only: bool = True,
+) -> Iterator[Row]:
+    """
+    Rows for the gnomAD ``variants`` and ``population_frequencies`` tables
+    from a sites VCF (one row per ALT allele).
+    """
+    keys = {"AC", "AN", "AF", "nhomalt"}
+    for suffix in _GNOMAD_POPULATION_KEYS:
+        keys.update((f"AC_{suffix}", f"AN_{suffix}", f"AF_{suffix}"))
+    keys = frozenset(keys)
+    updated = datetime.now().isoformat()
+
+    for line in iter_text_lines(path):
+        if not line or line.startswith("#"):
+            continue
+        f = line.split("\t", 8)
+        if len(f) < 8:
+            stats.skipped += 1
+            continue
+        chrom, pos, ids, ref, alts, _, filt, info = f[:8]
+        if pass_only and filt not in ("PASS", "."):
+            stats.skipped += 1
+            continue
+        position = _int(pos)
+        if position is None:
+            stats.skipped += 1
+            continue
+
+        chrom = chrom[3:] if chrom.startswith("chr") else chrom
+        rsid = next((i for i in ids.split(";") if i.startswith("rs")), None)
+        values = _info_fields(info, keys)
+        an = _int(values.get("AN"))
+
+        for a, alt in enumerate(alts.split(",")):
+            def per_allele(key: str) -> Optional[str]:
+                value = values.get(key)
+                if value is None:
+                    return None
+                parts = value.split(",")
+                return parts[a] if a < len(parts) else None
+
+            variant_id = f"{chrom}-{position}-{ref}-{alt}"
+            yield "variants", (
+                variant_id, rsid, chrom, position, ref, alt, None, None,
+                _float(per_allele("AF")), an, _int(per_allele("AC")),
+                _int(per_allele("nhomalt")), updated,
+            )
+            for suffix, population in _GNOMAD_POPULATION_KEYS.items():
+                af = _float(per_allele(f"AF_{suffix}"))
+                if af is None:
+                    continue
+                yield "population_frequencies", (
+                    variant_id, population, af,
+                    _int(values.get(f"AN_{suffix}")), _int(per_allele(f"AC_{suffix}")),
+                )
+
+
+_CI_RANGE = re.compile(r"\[\s*(-?[\d.]+(?:[eE]-?\d+)?)\s*-\s*(-?[\d.]+(?:[eE]-?\d+)?)\s*\]")
+_SAMPLE_COUNT = re.compile(r"\d[\d,]*")
+_ANCESTRY = re.compile(r"((?:[A-Z][a-z]+[ -]?)+?) ancestry")
+
+
+def _sample_size(text: str) -> Optional[int]:
+    counts = [int(n.replace(",", "")) for n in _SAMPLE_COUNT.findall(text)]
+    return sum(counts) if counts else None
+
+
+def _sample_ancestry(text: str) -> Optional[str]:
+    groups = []
+    for match in _ANCESTRY.findall(text):
+        match = match.strip()
+        if match not in groups:
+            groups.append(match)
+    return ", ".join(groups) if groups else None
+
+
+def parse_gwas_catalog(path: Union[str, Path], stats: BuildStats) -> Iterator[Row]:
+    """
+    Rows for the GWAS Catalog ``associations`` table from the "All
+    associations" TSV, one row per rsID in STRONGEST SNP-RISK ALLELE.
+    """
+    lines = iter_text_lines(path)
+    cols = _header_columns(next(lines, ""))
+    required = ("STRONGEST SNP-RISK ALLELE", "DISEASE/TRAIT", "P-VALUE")
+    missing = [name for name in required if name not in cols]
+    if missing:
+        raise ValueError(f"{path}: not a GWAS Catalog associations file (missing {', '.join(missing)})")
+
+    def get(fields: List[str], name: str) -> str:
+        i = cols.get(name, -1)
+        return fields[i].strip() if 0 <= i < len(fields) else ""
+
+    for line in lines:
+        if not line:
+            continue
+        f = line.split("\t")
+        p_value = _float(get(f, "P-VALUE"))
+        if p_value is None:
+            stats.skipped += 1
+            continue
+
+        effect = _float(get(f, "OR or BETA"))
+        ci_text = get(f, "95% CI (TEXT)")
+        odds_ratio = beta = None
+        if effect is not None:
+            if "decrease" in ci_text:
+                beta = -effect
+            elif "increase" in ci_text:
+                beta = effect
+            else:
+                odds_ratio = effect
+        ci = _CI_RANGE.search(ci_text)
+        ci_lower, ci_upper = (float(ci.group(1)), float(ci.group(2))) if ci else (None, None)
+
+        uri = get(f, "MAPPED_TRAIT_URI").split(",")[0].strip()
+        ontology = uri.rsplit("/", 1)[-1].replace("_", ":") if uri else None
+        sample_text = get(f, "INITIAL SAMPLE SIZE")
+        gene = get(f, "MAPPED_GENE") or get(f, "REPORTED GENE(S)") or None
+        trait = get(f, "DISEASE/TRAIT")
+        pmid = get(f, "PUBMEDID") or None
+        sample_size, ancestry = _sample_size(sample_text), _sample_ancestry(sample_text)
+
+        found = False
+        for snp_allele in re.split(r"[;,]| x ", get(f, "STRONGEST SNP-RISK ALLELE")):
+            rsid, _, allele = snp_allele.strip().partition("-")
+            if not rsid.startswith("rs"):
+                continue
+            found = True
+            yield "associations", (
+                rsid, trait, ontology, p_value, odds_ratio, beta, ci_lower, ci_upper,
+                allele if allele and allele != "?" else None,
+                gene, pmid, sample_size, ancestry,
+            )
+        if not found:
+            stats.skipped += 1
+
+
+@dataclass
+class SourceFormat:
+    """How to load one dataset from its dump."""
+    parse: Callable[..., Iterator[Row]]
+    statements: Dict[str, str]
+    record_table: str
+
+
+SOURCE_FORMATS: Dict[str, SourceFormat] = {
+    "clinvar": SourceFormat(
+        parse=parse_clinvar_summary,
+        statements={
+            "variants": """
+                INSERT OR REPLACE INTO variants
+                (variation_id, rsid, chromosome, position, ref_allele, alt_allele,
+                 gene, clinical_significance, significance_level, review_status, last_evaluated)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            "conditions": "INSERT INTO conditions (variation_id, condition) VALUES (?, ?)",
+        },
+        record_table="variants",
+    ),
+    "gnomad": SourceFormat(
+        parse=parse_gnomad_vcf,
+        statements={
+            "variants": """
+                INSERT OR REPLACE INTO variants
+                (variant_id, rsid, chromosome, position, ref_allele, alt_allele, gene,
+                 consequence, af_global, an_global, ac_global, homozygote_count, last_updated)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            "population_frequencies": """
+                INSERT OR REPLACE INTO population_frequencies
+                (variant_id, population, af, an, ac)
+                VALUES (?, ?, ?, ?, ?)
+            """,
+        },
+        record_table="variants",
+    ),
+    "gwas_catalog": SourceFormat(
+        parse=parse_gwas_catalog,
+        statements={
+            "associations": """
+                INSERT INTO associations
+                (rsid, trait, trait_ontology, p_value, odds_ratio, beta, ci_lower, ci_upper,
+                 risk_allele, gene, pmid, study_sample_size, ancestry)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+        },
+        record_table="associations",
+    ),
+}
+
+
+# =============================================================================
+# BUILD
+# =============================================================================
+
+def build_dataset(
+    name: str,
+    sources: Sequence[Union[str, Path]],
+    data_dir: Optional[Path] = None,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    commit_rows: int = DEFAULT_COMMIT_ROWS,
+) -> BuildStats:
+    """
+    Build a dataset's SQLite database from local source dumps.
+
+    Args:
+        name: "clinvar", "gnomad" or "gwas_catalog"
+        sources: Dump files, loaded in order (e.g. one gnomAD VCF per chromosome)
+        data_dir: Dataset directory (default: the dataset's usual location)
+        batch_rows: Rows per executemany call
+        commit_rows: Rows per transaction
+
+    Returns:
+        BuildStats with per-table row counts and load rate
+
+    Raises:
+        ValueError: For datasets without a build format or unrecognized sources
+        FileNotFoundError: If a source is missing
+    """
+    if name not in SOURCE_FORMATS:
+        raise ValueError(f"No build format for {name!r} (available: {', '.join(SOURCE_FORMATS)})")
+    source_format = SOURCE_FORMATS[name]
+    paths = [Path(s).expanduser() for s in sources]
+    for path in paths:
+        if not path.exists():
+            raise FileNotFoundError(f"Source not found: {path}")
+
+    dataset: SQLiteDataset = get_all_datasets()[name](data_dir)
+    stats = BuildStats(dataset=name, sources=[str(p) for p in paths])
+    table_sql, index_sql = split_schema(dataset.SCHEMA)
+
+    building = dataset.db_file.with_name(dataset.db_file.name + ".building")
+    if building.exists():
+        building.unlink()
+
+    conn = sqlite3.connect(building)
+    try:
+        for pragma in SQLITE_BULK_PRAGMAS:
+            conn.execute(pragma)
+        conn.executescript(table_sql)
+
+        loader = BulkLoader(conn, source_format.statements, batch_rows, commit_rows)
+        start = time.perf_counter()
+        for path in paths:
+            logger.info(f"Loading {path} into {name}...")
+            for table, row in source_format.parse(path, stats):
+                loader.add(table, row)
+        loader.flush()
+        stats.load_seconds = time.perf_counter() - start
+        stats.rows = dict(loader.counts)
+
+        logger.info(f"Creating {len(index_sql)} indexes...")
+        start = time.perf_counter()
+        for statement in index_sql:
+            conn.execute(statement)
+        conn.execute("ANALYZE")
+        conn.commit()
+        stats.index_seconds = time.perf_counter() - start
+    except BaseException:
+        conn.close()
+        building.unlink(missing_ok=True)
+        raise
+    conn.close()
+
+    dataset.close()
+    os.replace(building, dataset.db_file)
+    dataset.save_version_info(DatasetVersion(
+        name=name,
+        version=datetime.now().strftime("%Y-%m-%d"),
+        downloaded=datetime.now(),
+        source_url=", ".join(stats.sources),
+        record_count=stats.rows.get(source_format.record_table, 0),
+    ))
+
+    logger.info(
+        f"Built {name}: {stats.total_rows:,} rows in {stats.seconds:.1f}s "
+        f"({stats.rows_per_second:,.0f} rows/sec, {stats.skipped:,} lines skipped)"
+    )
+    return stats
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m personal_genomics.datasets.build",
+        description="Build a reference database from local source dumps.",
+    )
+    parser.add_argument("dataset", choices=sorted(SOURCE_FORMATS))
+    parser.add_argument("sources", nargs="+", help="dump files (plain, gzip or BGZF)")
+    parser.add_argument("--data-dir", type=Path, default=None,
+                        help="dataset directory (default: the standard datasets path)")
+    parser.add_argument("--batch-rows", type=int, default=DEFAULT_BATCH_ROWS,
+                        help=f"rows per executemany call (default {DEFAULT_BATCH_ROWS:,})")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    try:
+        stats = build_dataset(args.dataset, args.sources, args.data_dir, batch_rows=args.batch_rows)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    for table, count in stats.rows.items():
+        print(f"{table:<24} {count:>12,} rows")
+    print(f"{'load':<24} {stats.load_seconds:>11.1f}s ({stats.rows_per_second:,.0f} rows/sec)")
+    print(f"{'indexes':<24} {stats.index_seconds:>11.1f}s")
+    if stats.skipped:
+        print(f"{'skipped lines':<24} {stats.skipped:>12,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,9 +7,10 @@ Essential for health-related variant interpretation.
 Data source: https://www.ncbi.nlm.nih.gov/clinvar/
 """
 
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Set
+from typing import Dict, Iterable, List, Optional, Any, Sequence, Set
 from dataclasses import dataclass
 import gzip
 import json
@@ -20,6 +21,7 @@ from .base import (
     SQLiteDataset,
     DatasetVersion,
     VariantInfo,
+    get_dataset,
 )
 
 logger = logging.getLogger(__name__)
@@ -30,6 +32,10 @@ CLINVAR_SUMMARY_URL = "https://ftp.ncbi.nlm.nih.gov/pub/clinvar/tab_delimited/va
 CLINVAR_VCF_URL = "https://ftp.ncbi.nlm.nih.gov/pub/clinvar/vcf_GRCh38/clinvar.vcf.gz"
 
 
+# Max bound parameters per IN (...) query (SQLite's default limit is 999)
+SQL_CHUNK_SIZE = 900
+
+
 # Clinical significance categories (ACMG/AMP guidelines)
 CLINICAL_SIGNIFICANCE = {
     "pathogenic": 5,
@@ -133,6 +139,8 @@ class ClinVar(SQLiteDataset):
     CREATE INDEX IF NOT EXISTS idx_clinvar_rsid ON variants(rsid);
     CREATE INDEX IF NOT EXISTS idx_clinvar_gene ON variants(gene);
     CREATE INDEX IF NOT EXISTS idx_clinvar_sig ON variants(significance_level);
+    CREATE INDEX IF NOT EXISTS idx_clinvar_conditions ON conditions(variation_id);
+    CREATE INDEX IF NOT EXISTS idx_clinvar_pmids ON pmids(variation_id);
     """
     
     def download(self, force: bool = False) -> bool:
@@ -145,7 +153,7 @@ class ClinVar(SQLiteDataset):
         
         try:
             # Initialize database
-            conn = self._get_connection()
+            conn = self._get_connection(write=True)
             conn.executescript(self.SCHEMA)
             conn.commit()
             
@@ -303,7 +311,7 @@ class ClinVar(SQLiteDataset):
             },
         }
         
-        conn = self._get_connection()
+        conn = self._get_connection(write=True)
         cursor = conn.cursor()
         
         for var_id, data in BUILTIN_VARIANTS.items():
@@ -441,13 +449,8 @@ class ClinVar(SQLiteDataset):
                 SELECT variation_id FROM variants WHERE significance_level >= 4
             """)
         
-        results = []
-        for row in cursor.fetchall():
-            var = self.get_clinvar_annotation_by_id(row["variation_id"])
-            if var:
-                results.append(var)
-        
-        return results
+        variation_ids = [row["variation_id"] for row in cursor.fetchall()]
+        return self._annotations_by_id(variation_ids)
     
     def get_clinvar_annotation_by_id(self, variation_id: str) -> Optional[ClinVarVariant]:
         """Get ClinVar annotation by variation ID."""
@@ -487,6 +490,115 @@ class ClinVar(SQLiteDataset):
             variation_id=row["variation_id"],
         )
     
+    # =========================================================================
+    # BULK ANNOTATION
+    # =========================================================================
+    
+    def _fetch_chunked(self, sql: str, values: Sequence[str]) -> List[sqlite3.Row]:
+        """Run ``sql`` (containing one ``IN ({})``) over ``values`` in chunks."""
+        cursor = self._get_connection().cursor()
+        rows: List[sqlite3.Row] = []
+        for start in range(0, len(values), SQL_CHUNK_SIZE):
+            chunk = values[start:start + SQL_CHUNK_SIZE]
+            cursor.execute(sql.format(",".join("?" * len(chunk))), chunk)
+            rows.extend(cursor.fetchall())
+        return rows
+    
+    def _build_annotations(self, rows: List[sqlite3.Row]) -> List[ClinVarVariant]:
+        """Attach conditions and PMIDs to variant rows with one query each."""
+        variation_ids = [row["variation_id"] for row in rows]
+        
+        conditions: Dict[str, List[str]] = defaultdict(list)
+        for r in self._fetch_chunked("""
+            SELECT variation_id, condition FROM conditions
+            WHERE variation_id IN ({}) ORDER BY rowid
+        """, variation_ids):
+            conditions[r["variation_id"]].append(r["condition"])
+        
+        pmids: Dict[str, List[str]] = defaultdict(list)
+        for r in self._fetch_chunked("""
+            SELECT variation_id, pmid FROM pmids
+            WHERE variation_id IN ({}) ORDER BY rowid
+        """, variation_ids):
+            pmids[r["variation_id"]].append(r["pmid"])
+        
+        return [
+            ClinVarVariant(
+                rsid=row["rsid"],
+                chromosome=row["chromosome"],
+                position=row["position"],
+                ref_allele=row["ref_allele"],
+                alt_allele=row["alt_allele"],
+                gene=row["gene"],
+                clinical_significance=row["clinical_significance"],
+                review_status=row["review_status"],
+                conditions=conditions.get(row["variation_id"], []),
+                pmids=pmids.get(row["variation_id"], []),
+                last_evaluated=row["last_evaluated"],
+                variation_id=row["variation_id"],
+            )
+            for row in rows
+        ]
+    
+    def _annotations_by_id(self, variation_ids: Sequence[str]) -> List[ClinVarVariant]:
+        """Bulk version of get_clinvar_annotation_by_id (input order kept)."""
+        rows = self._fetch_chunked(
+            "SELECT * FROM variants WHERE variation_id IN ({})", list(variation_ids)
+        )
+        by_id = {row["variation_id"]: row for row in rows}
+        return self._build_annotations(
+            [by_id[v] for v in variation_ids if v in by_id]
+        )
+    
+    def get_clinvar_annotations(self, rsids: Iterable[str]) -> Dict[str, ClinVarVariant]:
+        """
+        Annotate many rsIDs at once.
+        
+        Same result as calling get_clinvar_annotation for each rsID, but
+        uses a few chunked ``IN`` queries over variants, conditions and
+        pmids instead of three queries per SNP.
+        
+        Args:
+            rsids: rsIDs to look up (e.g. a whole genome's keys)
+        
+        Returns:
+            Dict of rsid -> ClinVarVariant for rsIDs present in ClinVar,
+            in input order
+        """
+        query = list(dict.fromkeys(rsids))
+        rows = self._fetch_chunked("""
+            SELECT * FROM variants WHERE rsid IN ({}) ORDER BY rowid
+        """, query)
+        
+        # Keep the first row per rsID, as fetchone() does for single lookups
+        first_rows: Dict[str, sqlite3.Row] = {}
+        for row in rows:
+            first_rows.setdefault(row["rsid"], row)
+        
+        annotations = {
+            a.rsid: a for a in self._build_annotations(list(first_rows.values()))
+        }
+        return {rsid: annotations[rsid] for rsid in query if rsid in annotations}
+    
+    def lookup_variants(self, rsids: List[str]) -> Dict[str, Optional[VariantInfo]]:
+        """Look up multiple variants with bulk queries."""
+        annotations = self.get_clinvar_annotations(rsids)
+        results: Dict[str, Optional[VariantInfo]] = {}
+        for rsid in rsids:
+            a = annotations.get(rsid)
+            results[rsid] = VariantInfo(
+                rsid=a.rsid,
+                chromosome=a.chromosome,
+                position=a.position,
+                ref_allele=a.ref_allele,
+                alt_allele=a.alt_allele,
+                gene=a.gene,
+                clinical_significance=a.clinical_significance,
+                conditions=a.conditions,
+                pmids=a.pmids,
+            ) if a else None
+        return results
+    
     def check_user_variants(
         self, 
         genotypes: Dict[str, str]
@@ -496,14 +608,7 @@ class ClinVar(SQLiteDataset):
         
         Returns dict of rsid -> ClinVarVariant for any variants found in ClinVar.
         """
-        results = {}
-        
-        for rsid in genotypes:
-            annotation = self.get_clinvar_annotation(rsid)
-            if annotation:
-                results[rsid] = annotation
-        
-        return results
+        return self.get_clinvar_annotations(genotypes)
     
     def get_pathogenic_findings(
         self, 
@@ -514,16 +619,13 @@ class ClinVar(SQLiteDataset):
         
         Returns list of pathogenic ClinVar variants found in user's data.
         """
-        results = []
-        
-        for rsid, geno in genotypes.items():
-            annotation = self.get_clinvar_annotation(rsid)
-            if annotation and annotation.is_pathogenic:
-                # Check if user actually carries the variant
-                # (need to know which allele is pathogenic)
-                results.append(annotation)
-        
-        return results
+        # Check if user actually carries the variant
+        # (need to know which allele is pathogenic)
+        return [
+            annotation
+            for annotation in self.get_clinvar_annotations(genotypes).values()
+            if annotation.is_pathogenic
+        ]
 
 
 # =============================================================================
@@ -532,19 +634,13 @@ class ClinVar(SQLiteDataset):
 
 def get_clinical_significance(rsid: str) -> Optional[str]:
     """Get ClinVar clinical significance for a variant."""
-    clinvar = ClinVar()
-    if not clinvar.is_downloaded:
-        clinvar.download()
-    
-    annotation = clinvar.get_clinvar_annotation(rsid)
+    clinvar = get_dataset(ClinVar)
+    annotation = clinvar.cached_lookup("get_clinvar_annotation", rsid)
     return annotation.clinical_significance if annotation else None
 
 
 def is_pathogenic(rsid: str) -> Optional[bool]:
     """Check if variant is classified as pathogenic in ClinVar."""
-    clinvar = ClinVar()
-    if not clinvar.is_downloaded:
-        clinvar.download()
-    
-    annotation = clinvar.get_clinvar_annotation(rsid)
+    clinvar = get_dataset(ClinVar)
+    annotation = clinvar.cached_lookup("get_clinvar_annotation", rsid)
     return annotation.is_pathogenic if annotation else None
@@ -0,0 +1,245 @@
+"""
+Precompiled Allele-Frequency Matrix
+
+Vectorized population likelihood scoring for the population reference
+datasets (1000 Genomes, HGDP, SGDP).
+
+The datasets store one row per (rsid, population) in SQLite. Scoring a
+genome row by row costs two queries per SNP plus a Python loop over
+populations. ``FrequencyMatrix`` reads the tables once into a float32
+(n_markers x n_populations) alt-allele frequency matrix and an alt allele
+table; a genome's Hardy-Weinberg log-likelihood for every population is
+then two matrix-vector products:
+
+    LL = c · log(p) + (2 - c) · log(1 - p) + n_het · log(2)
+
+where ``c`` is the vector of alt-allele counts. A batch of genomes is
+scored the same way with a (genomes x markers) count matrix.
+
+Author: OpenClaw AI
+Date: 2026-02-07
+"""
+
+from __future__ import annotations
+
+import math
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from ..genotypes import (
+        ALLELE_CODES, HAPLOID_BASE, OTHER_CODE, GenotypeStore, rsids_to_array,
+    )
+except ImportError:  # loaded as the top-level "datasets" package
+    from personal_genomics.genotypes import (
+        ALLELE_CODES, HAPLOID_BASE, OTHER_CODE, GenotypeStore, rsids_to_array,
+    )
+
+
+# Frequencies are clipped to this range before taking logs (avoids log(0))
+MIN_FREQUENCY = 0.001
+MAX_FREQUENCY = 0.999
+
+# Frequency assumed for populations with no data at a marker
+DEFAULT_FREQUENCY = 0.5
+
+_LOG2 = math.log(2.0)
+
+
+@dataclass
+class FrequencyMatrix:
+    """
+    Alt-allele frequencies for every marker x population in a dataset.
+
+    Attributes:
+        rsids: Marker rsIDs (matrix rows)
+        alt_alleles: Upper-cased alt allele per marker
+        populations: Population codes (matrix columns)
+        frequencies: float32 array (n_markers, n_populations); NaN where a
+            population has no frequency for the marker
+    """
+    rsids: List[str]
+    alt_alleles: List[str]
+    populations: List[str]
+    frequencies: np.ndarray
+    _log_tables: Dict[Tuple[str, ...], Tuple[np.ndarray, np.ndarray]] = field(
+        default_factory=dict, repr=False
+    )
+
+    def __post_init__(self):
+        self._marker_ids = rsids_to_array(self.rsids)
+        self._alt_codes = np.array(
+            [ALLELE_CODES.get(a, 255) for a in self.alt_alleles], dtype=np.int16
+        )
+        self._columns = {pop: i for i, pop in enumerate(self.populations)}
+
+    @classmethod
+    def from_connection(cls, conn: sqlite3.Connection) -> "FrequencyMatrix":
+        """
+        Build the matrix from a dataset's ``variants``/``frequencies`` tables.
+
+        Only markers with an alt allele and at least one frequency row are
+        included, matching the row-by-row scorer.
+        """
+        cursor = conn.cursor()
+        cursor.execute("SELECT rsid, alt_allele FROM variants ORDER BY rowid")
+        alts = {row[0]: row[1] for row in cursor.fetchall() if row[1]}
+
+        cursor.execute(
+            "SELECT rsid, population, frequency FROM frequencies ORDER BY rowid"
+        )
+        freq_rows = [row for row in cursor.fetchall() if row[0] in alts]
+
+        rsids = list(dict.fromkeys(row[0] for row in freq_rows))
+        populations = list(dict.fromkeys(row[1] for row in freq_rows))
+        row_index = {rsid: i for i, rsid in enumerate(rsids)}
+        col_index = {pop: j for j, pop in enumerate(populations)}
+
+        frequencies = np.full((len(rsids), len(populations)), np.nan, dtype=np.float32)
+        if freq_rows:
+            # Later rows overwrite earlier ones, as dict(...) did per SNP
+            rows = np.fromiter((row_index[r[0]] for r in freq_rows), dtype=np.int64)
+            cols = np.fromiter((col_index[r[1]] for r in freq_rows), dtype=np.int64)
+            values = np.array(
+                [np.nan if r[2] is None else r[2] for r in freq_rows], dtype=np.float32
+            )
+            frequencies[rows, cols] = values
+
+        return cls(
+            rsids=rsids,
+            alt_alleles=[alts[rsid].upper() for rsid in rsids],
+            populations=populations,
+            frequencies=frequencies,
+        )
+
+    @property
+    def n_markers(self) -> int:
+        return len(self.rsids)
+
+    # -------------------------------------------------------------------------
+    # Genotype encoding
+    # -------------------------------------------------------------------------
+
+    def alt_counts(self, genotypes: Mapping[str, str]) -> np.ndarray:
+        """
+        Alt-allele count (0, 1, 2) per marker; NaN where the genotype is
+        missing or not a two-allele call.
+        """
+        counts = np.full(self.n_markers, np.nan, dtype=np.float32)
+
+        if isinstance(genotypes, GenotypeStore):
+            idx = genotypes.indices(self._marker_ids)
+            present = np.flatnonzero(idx >= 0)
+            codes = genotypes.codes[idx[present]].astype(np.int16)
+            diploid = codes < HAPLOID_BASE
+            alt = self._alt_codes[present]
+            counts[present[diploid]] = (
+                ((codes[diploid] >> 2) == alt[diploid]).astype(np.float32)
+                + ((codes[diploid] & 3) == alt[diploid])
+            )
+            # Indels and other verbatim calls
+            for i in present[codes == OTHER_CODE]:
+                counts[i] = self._count_alt(genotypes[self.rsids[i]], i)
+            return counts
+
+        for i, rsid in enumerate(self.rsids):
+            geno = genotypes.get(rsid)
+            if geno:
+                counts[i] = self._count_alt(geno, i)
+        return counts
+
+    def _count_alt(self, genotype: str, i: int) -> float:
+        if len(genotype) != 2:
+            return np.nan
+        alt = self.alt_alleles[i]
+        return float(sum(1 for a in genotype.upper() if a == alt))
+
+    # -------------------------------------------------------------------------
+    # Scoring
+    # -------------------------------------------------------------------------
+
+    def _log_frequencies(self, populations: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Cached (log p, log(1 - p)) tables for the requested populations."""
+        key = tuple(populations)
+        if key not in self._log_tables:
+            p = np.full((self.n_markers, len(key)), DEFAULT_FREQUENCY, dtype=np.float64)
+            for j, pop in enumerate(key):
+                col = self._columns.get(pop)
+                if col is not None:
+                    p[:, j] = self.frequencies[:, col]
+            p = np.where(np.isnan(p), DEFAULT_FREQUENCY, p)
+            p = np.clip(p, MIN_FREQUENCY, MAX_FREQUENCY)
+            self._log_tables[key] = (np.log(p), np.log1p(-p))
+        return self._log_tables[key]
+
+    def log_likelihoods(
+        self,
+        counts: np.ndarray,
+        populations: Sequence[str],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Hardy-Weinberg log-likelihood of each genome under each population.
+
+        Args:
+            counts: Alt counts, shape (n_markers,) or (n_genomes, n_markers),
+                NaN for unused markers
+            populations: Population codes to score
+
+        Returns:
+            Tuple of (log-likelihoods (n_genomes, n_populations),
+            markers used per genome (n_genomes,))
+        """
+        counts = np.atleast_2d(counts)
+        used = ~np.isnan(counts)
+        c = np.where(used, counts, 0.0).astype(np.float64)
+        log_p, log_q = self._log_frequencies(populations)
+
+        ll = c @ log_p + (2.0 * used - c) @ log_q
+        ll += (c == 1).sum(axis=1, keepdims=True) * _LOG2
+        return ll, used.sum(axis=1)
+
+    def similarity(
+        self,
+        genotypes: Mapping[str, str],
+        populations: Sequence[str],
+    ) -> Dict[str, float]:
+        """Normalized population similarities (sum to 1) for one genome."""
+        return self.similarity_many([genotypes], populations)[0]
+
+    def similarity_many(
+        self,
+        genotype_sets: Sequence[Mapping[str, str]],
+        populations: Sequence[str],
+    ) -> List[Dict[str, float]]:
+        """
+        Score many genomes with a single matrix multiply.
+
+        Args:
+            genotype_sets: Genomes (rsid -> genotype mappings)
+            populations: Population codes to score
+
+        Returns:
+            One {population: similarity} dict per genome
+        """
+        populations = list(populations)
+        if not populations:
+            return [{} for _ in genotype_sets]
+        if not genotype_sets:
+            return []
+
+        counts = np.vstack([self.alt_counts(g) for g in genotype_sets])
+        ll, n_used = self.log_likelihoods(counts, populations)
+
+        uniform = 1.0 / len(populations)
+        results = []
+        for row, used in zip(ll, n_used):
+            if used == 0:
+                results.append({pop: uniform for pop in populations})
+                continue
+            scores = np.exp(row - row.max())
+            scores /= scores.sum()
+            results.append(dict(zip(populations, scores.tolist())))
+        return results
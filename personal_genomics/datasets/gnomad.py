@@ -20,6 +20,7 @@ from .base import (
     SQLiteDataset,
     DatasetVersion,
     VariantInfo,
+    get_dataset,
 )
 
 logger = logging.getLogger(__name__)
@@ -107,7 +108,7 @@ class GnomAD(SQLiteDataset):
         
         try:
             # Initialize database
-            conn = self._get_connection()
+            conn = self._get_connection(write=True)
             conn.executescript(self.SCHEMA)
             conn.commit()
             
@@ -185,7 +186,7 @@ class GnomAD(SQLiteDataset):
                          "af_global": 0.05, "consequence": "intron_variant"},
         }
         
-        conn = self._get_connection()
+        conn = self._get_connection(write=True)
         cursor = conn.cursor()
         
         for rsid, data in COMMON_VARIANTS.items():
@@ -279,15 +280,11 @@ class GnomAD(SQLiteDataset):
 
 def get_gnomad_frequency(rsid: str) -> Optional[float]:
     """Quick lookup of gnomAD global allele frequency."""
-    gnomad = GnomAD()
-    if not gnomad.is_downloaded:
-        gnomad.download()
-    return gnomad.get_allele_frequency(rsid)
+    gnomad = get_dataset(GnomAD)
+    return gnomad.cached_lookup("get_allele_frequency", rsid)
 
 
 def is_rare_in_gnomad(rsid: str, threshold: float = 0.01) -> Optional[bool]:
     """Check if variant is rare in gnomAD."""
-    gnomad = GnomAD()
-    if not gnomad.is_downloaded:
-        gnomad.download()
-    return gnomad.is_rare_variant(rsid, threshold)
+    gnomad = get_dataset(GnomAD)
+    return gnomad.cached_lookup("is_rare_variant", rsid, threshold)
@@ -19,6 +19,7 @@ from .base import (
     SQLiteDataset,
     DatasetVersion,
     VariantInfo,
+    get_dataset,
 )
 
 logger = logging.getLogger(__name__)
@@ -100,7 +101,7 @@ class GWASCatalog(SQLiteDataset):
         logger.info("Initializing GWAS Catalog...")
         
         try:
-            conn = self._get_connection()
+            conn = self._get_connection(write=True)
             conn.executescript(self.SCHEMA)
             conn.commit()
             
@@ -251,7 +252,7 @@ class GWASCatalog(SQLiteDataset):
              "pmid": "22927436", "n": 30000, "ancestry": "European"},
         ]
         
-        conn = self._get_connection()
+        conn = self._get_connection(write=True)
         cursor = conn.cursor()
         
         for assoc in ASSOCIATIONS:
@@ -377,7 +378,5 @@ class GWASCatalog(SQLiteDataset):
 
 def get_trait_associations(rsid: str) -> List[GWASAssociation]:
     """Get GWAS associations for a variant."""
-    gwas = GWASCatalog()
-    if not gwas.is_downloaded:
-        gwas.download()
-    return gwas.get_variant_associations(rsid)
+    gwas = get_dataset(GWASCatalog)
+    return list(gwas.cached_lookup("get_variant_associations", rsid))
@@ -20,6 +20,7 @@ from .base import (
     DatasetVersion,
     VariantInfo,
     PopulationFrequency,
+    get_dataset,
 )
 
 logger = logging.getLogger(__name__)
@@ -157,11 +158,12 @@ class HGDP(SQLiteDataset):
         logger.info("Initializing HGDP data...")
         
         try:
-            conn = self._get_connection()
+            conn = self._get_connection(write=True)
             conn.executescript(self.SCHEMA)
             conn.commit()
             
             self._load_aim_frequencies()
+            self._cache.pop("frequency_matrix", None)
             
             version_info = DatasetVersion(
                 name=self.name,
@@ -266,7 +268,7 @@ class HGDP(SQLiteDataset):
             },
         }
         
-        conn = self._get_connection()
+        conn = self._get_connection(write=True)
         cursor = conn.cursor()
         
         for rsid, data in HGDP_AIMS.items():
@@ -335,61 +337,34 @@ class HGDP(SQLiteDataset):
         Returns:
             Dict mapping population name to similarity score
         """
+        return self.frequency_matrix().similarity(
+            genotypes, self._region_populations(region)
+        )
+    
+    def calculate_population_similarity_batch(
+        self,
+        genotype_sets: List[Dict[str, str]],
+        region: Optional[str] = None
+    ) -> List[Dict[str, float]]:
+        """
+        Score many genomes against HGDP populations at once.
+        
+        Args:
+            genotype_sets: List of rsid -> genotype mappings
+            region: Optional filter by region (Africa, Europe, etc.)
+            
+        Returns:
+            List of population similarity dicts, one per genome
+        """
+        return self.frequency_matrix().similarity_many(
+            genotype_sets, self._region_populations(region)
+        )
+    
+    def _region_populations(self, region: Optional[str]) -> List[str]:
         populations = list(HGDP_POPULATIONS.keys())
         if region:
             populations = HGDP_REGIONS.get(region, populations)
-        
-        log_likelihoods = {pop: 0.0 for pop in populations}
-        markers_used = 0
-        
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        for rsid, geno in genotypes.items():
-            if not geno or len(geno) != 2:
-                continue
-            
-            cursor.execute("SELECT alt_allele FROM variants WHERE rsid = ?", (rsid,))
-            var_row = cursor.fetchone()
-            if not var_row:
-                continue
-            
-            alt = var_row["alt_allele"].upper()
-            alt_count = sum(1 for a in geno.upper() if a == alt)
-            
-            cursor.execute("""
-                SELECT population, frequency FROM frequencies WHERE rsid = ?
-            """, (rsid,))
-            
-            freq_map = {r["population"]: r["frequency"] for r in cursor.fetchall()}
-            if not freq_map:
-                continue
-            
-            markers_used += 1
-            
-            import math
-            for pop in populations:
-                p = freq_map.get(pop, 0.5)
-                p = max(0.001, min(0.999, p))
-                
-                if alt_count == 0:
-                    prob = (1 - p) ** 2
-                elif alt_count == 1:
-                    prob = 2 * p * (1 - p)
-                else:
-                    prob = p ** 2
-                
-                log_likelihoods[pop] += math.log(prob)
-        
-        if markers_used == 0:
-            return {pop: 1.0 / len(populations) for pop in populations}
-        
-        import math
-        max_ll = max(log_likelihoods.values())
-        exp_scores = {pop: math.exp(ll - max_ll) for pop, ll in log_likelihoods.items()}
-        total = sum(exp_scores.values())
-        
-        return {pop: score / total for pop, score in exp_scores.items()}
+        return populations
     
     def get_region_summary(
         self, 
@@ -413,7 +388,5 @@ class HGDP(SQLiteDataset):
 
 def compare_to_hgdp(genotypes: Dict[str, str]) -> Dict[str, float]:
     """Compare genotypes to HGDP populations."""
-    hgdp = HGDP()
-    if not hgdp.is_downloaded:
-        hgdp.download()
+    hgdp = get_dataset(HGDP)
     return hgdp.calculate_population_similarity(genotypes)
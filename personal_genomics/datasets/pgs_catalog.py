@@ -20,8 +20,18 @@ from .base import (
     SQLiteDataset,
     DatasetVersion,
     VariantInfo,
+    get_dataset,
 )
 
+from .pgs_scoring import DEFAULT_CHUNK_ROWS, ScoringFileStore
+
+try:
+    from ..genotypes import GenotypeStore
+    from ..prs_engine import PRSWeightMatrix
+except ImportError:  # loaded as the top-level "datasets" package
+    from personal_genomics.genotypes import GenotypeStore
+    from personal_genomics.prs_engine import PRSWeightMatrix
+
 logger = logging.getLogger(__name__)
 
 
@@ -116,12 +126,13 @@ class PGSCatalog(SQLiteDataset):
         logger.info("Initializing PGS Catalog...")
         
         try:
-            conn = self._get_connection()
+            conn = self._get_connection(write=True)
             conn.executescript(self.SCHEMA)
             conn.commit()
             
             # Load curated PRS models
             self._load_prs_models()
+            self._cache.pop("prs_matrix", None)
             
             version_info = DatasetVersion(
                 name=self.name,
@@ -291,7 +302,7 @@ class PGSCatalog(SQLiteDataset):
             },
         }
         
-        conn = self._get_connection()
+        conn = self._get_connection(write=True)
         cursor = conn.cursor()
         
         for pgs_id, model in MODELS.items():
@@ -329,6 +340,70 @@ class PGSCatalog(SQLiteDataset):
         cursor.execute("SELECT COUNT(*) FROM prs_models")
         return cursor.fetchone()[0]
     
+    # =========================================================================
+    # SCORING FILES
+    # =========================================================================
+    
+    @property
+    def scoring_files(self) -> ScoringFileStore:
+        """Memory-mapped store of ingested PGS Catalog scoring files."""
+        if "scoring_files" not in self._cache:
+            self._cache["scoring_files"] = ScoringFileStore(
+                self.data_dir / "scoring_files"
+            )
+        return self._cache["scoring_files"]
+    
+    def load_scoring_files(
+        self,
+        directory: Path,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    ) -> Dict[str, int]:
+        """
+        Ingest PGS Catalog scoring files (.txt / .txt.gz) from a local directory.
+        
+        Files are streamed ``chunk_rows`` lines at a time into memory-mapped
+        columns, so multi-million-variant scores load in bounded memory.
+        Each score is registered in ``prs_models`` and replaces any curated
+        model with the same PGS ID.
+        
+        Args:
+            directory: Directory of downloaded scoring files
+            chunk_rows: Rows parsed per chunk
+            
+        Returns:
+            Dict mapping pgs_id -> variants loaded
+        """
+        conn = self._get_connection(write=True)
+        conn.executescript(self.SCHEMA)
+        
+        loaded = {}
+        for info in self.scoring_files.ingest_directory(directory, chunk_rows):
+            conn.execute("DELETE FROM prs_variants WHERE pgs_id = ?", (info.pgs_id,))
+            conn.execute("""
+                INSERT OR REPLACE INTO prs_models
+                (pgs_id, trait, trait_ontology, publication_pmid, n_variants,
+                 ancestry_evaluated, effect_size, auc)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (info.pgs_id, info.trait, info.trait_ontology, "",
+                  info.n_variants, "", None, None))
+            loaded[info.pgs_id] = info.n_variants
+        conn.commit()
+        
+        self._cache.pop("prs_matrix", None)
+        logger.info(f"Loaded {len(loaded)} PGS Catalog scoring files")
+        return loaded
+    
+    def _score_model(self, pgs_id: str, genotypes: Dict[str, str]) -> Tuple[float, int, int]:
+        """(raw score, variants found, total variants) for one model."""
+        if pgs_id in self.scoring_files:
+            return self.scoring_files.score(pgs_id, genotypes)
+        scores = self.weight_matrix().score(genotypes, score_ids=[pgs_id])
+        return (
+            float(scores.raw_scores[0]),
+            int(scores.variants_found[0]),
+            int(scores.variants_total[0]),
+        )
+    
     def lookup_variant(self, rsid: str) -> Optional[VariantInfo]:
         """Look up if a variant is in any PRS model."""
         conn = self._get_connection()
@@ -373,6 +448,18 @@ class PGSCatalog(SQLiteDataset):
         
         return results
     
+    def weight_matrix(self) -> PRSWeightMatrix:
+        """
+        Sparse variants x models weight matrix for all PRS models.
+        
+        Built once from ``prs_variants`` and cached on the instance.
+        """
+        if "prs_matrix" not in self._cache:
+            self._cache["prs_matrix"] = PRSWeightMatrix.from_connection(
+                self._get_connection()
+            )
+        return self._cache["prs_matrix"]
+    
     def calculate_prs(
         self, 
         pgs_id: str, 
@@ -397,33 +484,23 @@ class PGSCatalog(SQLiteDataset):
         if not model_row:
             return None
         
-        # Get variants
-        cursor.execute("""
-            SELECT rsid, effect_allele, effect_weight
-            FROM prs_variants WHERE pgs_id = ?
-        """, (pgs_id,))
-        
-        total_score = 0.0
-        variants_used = 0
-        total_variants = 0
-        
-        for row in cursor.fetchall():
-            total_variants += 1
-            rsid = row["rsid"]
-            effect_allele = row["effect_allele"].upper()
-            weight = row["effect_weight"]
-            
-            geno = genotypes.get(rsid)
-            if not geno:
-                continue
-            
-            # Count effect alleles
-            allele1, allele2 = geno[0].upper(), geno[1].upper()
-            effect_count = sum(1 for a in [allele1, allele2] if a == effect_allele)
-            
-            total_score += effect_count * weight
-            variants_used += 1
-        
+        return self._prs_result(
+            model_row["pgs_id"],
+            model_row["trait"],
+            model_row["publication_pmid"],
+            *self._score_model(pgs_id, genotypes),
+        )
+    
+    def _prs_result(
+        self,
+        pgs_id: str,
+        trait: str,
+        pmid: str,
+        total_score: float,
+        variants_used: int,
+        total_variants: int,
+    ) -> Optional[PRSResult]:
+        """Turn a raw score into a PRSResult (None if no variants were found)."""
         if variants_used == 0:
             return None
         
@@ -436,27 +513,27 @@ class PGSCatalog(SQLiteDataset):
         # Determine risk category
         if percentile >= 90:
             category = "High"
-            interpretation = f"Top 10% of genetic risk for {model_row['trait']}"
+            interpretation = f"Top 10% of genetic risk for {trait}"
         elif percentile >= 75:
             category = "Elevated"
-            interpretation = f"Above average genetic risk for {model_row['trait']}"
+            interpretation = f"Above average genetic risk for {trait}"
         elif percentile >= 25:
             category = "Average"
-            interpretation = f"Average genetic risk for {model_row['trait']}"
+            interpretation = f"Average genetic risk for {trait}"
         else:
             category = "Low"
-            interpretation = f"Below average genetic risk for {model_row['trait']}"
+            interpretation = f"Below average genetic risk for {trait}"
         
         return PRSResult(
             pgs_id=pgs_id,
-            trait=model_row["trait"],
+            trait=trait,
             raw_score=total_score,
             percentile=percentile,
             risk_category=category,
             variants_used=variants_used,
             total_variants=total_variants,
             interpretation=interpretation,
-            pmid=model_row["publication_pmid"],
+            pmid=pmid,
         )
     
     def _z_to_percentile(self, z: float) -> float:
@@ -469,11 +546,32 @@ class PGSCatalog(SQLiteDataset):
         self, 
         genotypes: Dict[str, str]
     ) -> Dict[str, PRSResult]:
-        """Calculate all available PRS for given genotypes."""
+        """
+        Calculate all available PRS for given genotypes.
+        
+        Curated models are scored with one product against the weight
+        matrix; ingested scoring files are scored from their memory maps.
+        """
         results = {}
+        if self.scoring_files.pgs_ids():
+            # Encode once for all memory-mapped models
+            genotypes = GenotypeStore.from_dict(genotypes)
+        scores = self.weight_matrix().score(genotypes)
+        columns = {pgs_id: j for j, pgs_id in enumerate(scores.score_ids)}
         
         for model in self.get_available_prs():
-            result = self.calculate_prs(model.pgs_id, genotypes)
+            if model.pgs_id in self.scoring_files:
+                score = self.scoring_files.score(model.pgs_id, genotypes)
+            else:
+                j = columns[model.pgs_id]
+                score = (
+                    float(scores.raw_scores[j]),
+                    int(scores.variants_found[j]),
+                    int(scores.variants_total[j]),
+                )
+            result = self._prs_result(
+                model.pgs_id, model.trait, model.publication_pmid, *score
+            )
             if result:
                 results[model.trait] = result
         
@@ -489,9 +587,7 @@ def calculate_disease_risk(
     genotypes: Dict[str, str]
 ) -> Optional[PRSResult]:
     """Calculate PRS for a specific trait."""
-    pgs = PGSCatalog()
-    if not pgs.is_downloaded:
-        pgs.download()
+    pgs = get_dataset(PGSCatalog)
     
     # Find model for trait
     models = pgs.get_available_prs()
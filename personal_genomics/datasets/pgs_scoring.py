@@ -0,0 +1,400 @@
+"""
+PGS Catalog Scoring File Store
+
+Streams PGS Catalog scoring files (``PGS000018.txt.gz``, harmonized
+``PGS000018_hmPOS_GRCh38.txt.gz``) into a compact on-disk format and scores
+genomes against them through memory maps.
+
+Published scores such as CAD or T2D carry millions of variants. Loading them
+into SQLite rows or Python dicts costs gigabytes, so each score is stored as
+three flat binary columns next to a JSON manifest:
+
+    <pgs_id>.ids.bin      int64    rsID keys (rs123 -> 123)
+    <pgs_id>.effect.bin   uint8    effect allele codes (A/C/G/T = 0-3)
+    <pgs_id>.weight.bin   float32  effect weights
+
+Ingestion reads ``chunk_rows`` lines at a time and appends each chunk to the
+column files, so peak memory is bounded by the chunk size rather than the
+score size. Scoring memory-maps the columns and walks them in chunks too.
+
+Author: OpenClaw AI
+Date: 2026-02-07
+"""
+
+import gzip
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    from ..genotypes import GenotypeStore, rsid_to_int
+    from ..prs_engine import (
+        TEXT_EFFECT_CODE, allele_dosages, effect_allele_code, genome_rows,
+    )
+except ImportError:  # loaded as the top-level "datasets" package
+    from personal_genomics.genotypes import GenotypeStore, rsid_to_int
+    from personal_genomics.prs_engine import (
+        TEXT_EFFECT_CODE, allele_dosages, effect_allele_code, genome_rows,
+    )
+
+logger = logging.getLogger(__name__)
+
+
+# Rows read (and scored) per chunk; ~13 bytes per row on disk
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+MANIFEST_FILE = "manifest.json"
+
+_COLUMNS = {
+    "ids": np.int64,
+    "effect": np.uint8,
+    "weight": np.float32,
+}
+
+
+@dataclass
+class ScoringFileInfo:
+    """Manifest entry for one ingested scoring file."""
+    pgs_id: str
+    trait: str
+    n_variants: int
+    skipped: int = 0
+    trait_ontology: str = ""
+    genome_build: str = ""
+    weight_type: str = ""
+    source_file: str = ""
+    # Row -> allele for indel/multi-base effect alleles
+    text_alleles: Dict[int, str] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict:
+        data = dict(self.__dict__)
+        data["text_alleles"] = {str(k): v for k, v in self.text_alleles.items()}
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ScoringFileInfo":
+        data = dict(data)
+        data["text_alleles"] = {
+            int(k): v for k, v in data.get("text_alleles", {}).items()
+        }
+        return cls(**data)
+
+
+# =============================================================================
+# PARSING
+# =============================================================================
+
+def _open_text(path: Path):
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, encoding="utf-8", errors="replace")
+
+
+def read_scoring_header(path: Union[str, Path]) -> Dict[str, str]:
+    """
+    Read the ``#key=value`` metadata block of a scoring file.
+
+    Returns:
+        Dict such as {"pgs_id": "PGS000018", "trait_reported": ..., ...}
+    """
+    header: Dict[str, str] = {}
+    with _open_text(Path(path)) as f:
+        for line in f:
+            if not line.startswith("#"):
+                break
+            key, sep, value = line[1:].strip().partition("=")
+            if sep:
+                header[key.strip()] = value.strip()
+    return header
+
+
+def iter_scoring_chunks(
+    path: Union[str, Path],
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> Iterator[Tuple[List[str], List[str], List[str]]]:
+    """
+    Stream (rsids, effect_alleles, weights) column chunks from a scoring file.
+
+    The harmonized ``hm_rsID`` column is preferred when present and
+    non-empty, falling back to the author-reported ``rsID``.
+
+    Raises:
+        ValueError: If the file has no effect_allele/effect_weight columns
+    """
+    with _open_text(Path(path)) as f:
+        columns: Optional[List[str]] = None
+        for line in f:
+            if line.startswith("#") or not line.strip():
+                continue
+            columns = line.rstrip("\r\n").split("\t")
+            break
+        if columns is None:
+            return
+
+        col = {name: i for i, name in enumerate(columns)}
+        if "effect_allele" not in col or "effect_weight" not in col:
+            raise ValueError(f"{path}: not a PGS Catalog scoring file")
+        i_effect = col["effect_allele"]
+        i_weight = col["effect_weight"]
+        i_rsid = col.get("rsID", -1)
+        i_hm_rsid = col.get("hm_rsID", -1)
+        width = len(columns)
+
+        rsids: List[str] = []
+        effects: List[str] = []
+        weights: List[str] = []
+        for line in f:
+            fields = line.rstrip("\r\n").split("\t")
+            if len(fields) < width:
+                fields += [""] * (width - len(fields))
+            rsid = fields[i_hm_rsid] if i_hm_rsid >= 0 else ""
+            if not rsid and i_rsid >= 0:
+                rsid = fields[i_rsid]
+            rsids.append(rsid)
+            effects.append(fields[i_effect])
+            weights.append(fields[i_weight])
+            if len(rsids) >= chunk_rows:
+                yield rsids, effects, weights
+                rsids, effects, weights = [], [], []
+        if rsids:
+            yield rsids, effects, weights
+
+
+def _parse_weight(text: str) -> float:
+    """Effect weight (blank = 0), or NaN for non-numeric values (``NA``)."""
+    try:
+        return float(text or 0)
+    except ValueError:
+        return float("nan")
+
+
+def _pgs_id_from_filename(path: Path) -> str:
+    name = path.name.split(".")[0]
+    return name.split("_")[0]
+
+
+# =============================================================================
+# STORE
+# =============================================================================
+
+class ScoringFileStore:
+    """
+    Directory of memory-mappable PGS Catalog scores.
+
+    Example:
+        >>> store = ScoringFileStore(Path("~/.pgs/scoring_files"))
+        >>> store.ingest("PGS000018.txt.gz")
+        >>> raw, found, total = store.score("PGS000018", genotypes)
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._manifest: Optional[Dict[str, ScoringFileInfo]] = None
+
+    # -------------------------------------------------------------------------
+    # Manifest
+    # -------------------------------------------------------------------------
+
+    @property
+    def manifest_file(self) -> Path:
+        return self.directory / MANIFEST_FILE
+
+    def _load_manifest(self) -> Dict[str, ScoringFileInfo]:
+        if self._manifest is None:
+            self._manifest = {}
+            if self.manifest_file.exists():
+                with open(self.manifest_file) as f:
+                    self._manifest = {
+                        pgs_id: ScoringFileInfo.from_dict(entry)
+                        for pgs_id, entry in json.load(f).items()
+                    }
+        return self._manifest
+
+    def _save_manifest(self) -> None:
+        manifest = self._load_manifest()
+        tmp = self.manifest_file.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump({k: v.to_dict() for k, v in manifest.items()}, f, indent=2)
+        os.replace(tmp, self.manifest_file)
+
+    def __contains__(self, pgs_id: object) -> bool:
+        return pgs_id in self._load_manifest()
+
+    def pgs_ids(self) -> List[str]:
+        """IDs of all ingested scores."""
+        return list(self._load_manifest())
+
+    def info(self, pgs_id: str) -> ScoringFileInfo:
+        """Manifest entry for a score (KeyError if not ingested)."""
+        return self._load_manifest()[pgs_id]
+
+    def _column_path(self, pgs_id: str, column: str) -> Path:
+        return self.directory / f"{pgs_id}.{column}.bin"
+
+    # -------------------------------------------------------------------------
+    # Ingestion
+    # -------------------------------------------------------------------------
+
+    def ingest(
+        self,
+        path: Union[str, Path],
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    ) -> ScoringFileInfo:
+        """
+        Stream one scoring file into the store.
+
+        Rows without an rsID (position-only variants) or without a
+        numeric weight (``NA``) are counted in ``skipped``; consumer
+        genomes are keyed by rsID.
+
+        Args:
+            path: ``.txt`` or ``.txt.gz`` scoring file
+            chunk_rows: Rows parsed per chunk (bounds peak memory)
+
+        Returns:
+            ScoringFileInfo for the ingested score
+        """
+        path = Path(path)
+        header = read_scoring_header(path)
+        pgs_id = header.get("pgs_id") or _pgs_id_from_filename(path)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        n_rows = 0
+        skipped = 0
+        text_alleles: Dict[int, str] = {}
+        tmp_paths = {c: self._column_path(pgs_id, c).with_suffix(".tmp") for c in _COLUMNS}
+        handles = {c: open(p, "wb") for c, p in tmp_paths.items()}
+        try:
+            for rsids, effects, weights in iter_scoring_chunks(path, chunk_rows):
+                ids = np.fromiter(
+                    (rsid_to_int(r.strip()) or 0 for r in rsids),
+                    dtype=np.int64, count=len(rsids),
+                )
+                values = np.fromiter(
+                    (_parse_weight(w) for w in weights), dtype=np.float64, count=len(weights),
+                )
+                keep = np.flatnonzero((ids > 0) & np.isfinite(values))
+                skipped += len(ids) - len(keep)
+                values = values[keep].astype(np.float32)
+
+                codes = np.fromiter(
+                    (effect_allele_code(effects[i].strip()) for i in keep.tolist()),
+                    dtype=np.uint8, count=len(keep),
+                )
+                for j in np.flatnonzero(codes == TEXT_EFFECT_CODE).tolist():
+                    text_alleles[n_rows + j] = effects[keep[j]].strip().upper()
+
+                handles["ids"].write(ids[keep].tobytes())
+                handles["effect"].write(codes.tobytes())
+                handles["weight"].write(values.tobytes())
+                n_rows += len(keep)
+        except BaseException:
+            for handle in handles.values():
+                handle.close()
+            for tmp in tmp_paths.values():
+                tmp.unlink(missing_ok=True)
+            raise
+
+        for column, handle in handles.items():
+            handle.close()
+            os.replace(tmp_paths[column], self._column_path(pgs_id, column))
+
+        info = ScoringFileInfo(
+            pgs_id=pgs_id,
+            trait=header.get("trait_reported") or header.get("trait_mapped") or pgs_id,
+            n_variants=n_rows,
+            skipped=skipped,
+            trait_ontology=header.get("trait_efo", ""),
+            genome_build=header.get("HmPOS_build") or header.get("genome_build", ""),
+            weight_type=header.get("weight_type", ""),
+            source_file=path.name,
+            text_alleles=text_alleles,
+        )
+        self._load_manifest()[pgs_id] = info
+        self._save_manifest()
+
+        if skipped:
+            logger.warning(f"{pgs_id}: skipped {skipped:,} rows without an rsID or numeric weight")
+        logger.info(f"Ingested {pgs_id}: {n_rows:,} variants")
+        return info
+
+    def ingest_directory(
+        self,
+        directory: Union[str, Path],
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    ) -> List[ScoringFileInfo]:
+        """
+        Ingest every ``*.txt`` / ``*.txt.gz`` scoring file in a directory.
+
+        Files that can't be ingested (READMEs, truncated downloads) are
+        logged and skipped.
+        """
+        directory = Path(directory)
+        paths = sorted(directory.glob("*.txt.gz")) + sorted(directory.glob("*.txt"))
+        ingested = []
+        for path in paths:
+            try:
+                ingested.append(self.ingest(path, chunk_rows))
+            except (ValueError, OSError, EOFError) as e:
+                logger.warning(f"Skipping {path.name}: {e}")
+        return ingested
+
+    # -------------------------------------------------------------------------
+    # Scoring
+    # -------------------------------------------------------------------------
+
+    def open(self, pgs_id: str) -> Dict[str, np.memmap]:
+        """Memory-map a score's columns (read-only)."""
+        n = self.info(pgs_id).n_variants
+        return {
+            column: np.memmap(
+                self._column_path(pgs_id, column), dtype=dtype, mode="r", shape=(n,)
+            ) if n else np.zeros(0, dtype=dtype)
+            for column, dtype in _COLUMNS.items()
+        }
+
+    def score(
+        self,
+        pgs_id: str,
+        genotypes: Mapping[str, str],
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    ) -> Tuple[float, int, int]:
+        """
+        Score a genome against an ingested model.
+
+        Args:
+            pgs_id: Ingested PGS ID
+            genotypes: rsid -> genotype mapping (dict or GenotypeStore)
+            chunk_rows: Weight rows held in memory at a time
+
+        Returns:
+            Tuple of (raw score, variants found, total variants)
+        """
+        info = self.info(pgs_id)
+        store = GenotypeStore.from_dict(genotypes)
+        columns = self.open(pgs_id)
+
+        total_score = 0.0
+        found = 0
+        for start in range(0, info.n_variants, chunk_rows):
+            stop = min(start + chunk_rows, info.n_variants)
+            ids = np.asarray(columns["ids"][start:stop])
+            text_alleles = {
+                row - start: allele for row, allele in info.text_alleles.items()
+                if start <= row < stop
+            }
+            idx = genome_rows(store, ids)
+            dosage, present = allele_dosages(
+                store, idx, np.asarray(columns["effect"][start:stop]), text_alleles
+            )
+            total_score += float(
+                dosage @ np.asarray(columns["weight"][start:stop], dtype=np.float64)
+            )
+            found += int(present.sum())
+
+        return total_score, found, info.n_variants
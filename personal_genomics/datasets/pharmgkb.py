@@ -19,6 +19,7 @@ from .base import (
     SQLiteDataset,
     DatasetVersion,
     VariantInfo,
+    get_dataset,
 )
 
 logger = logging.getLogger(__name__)
@@ -172,7 +173,7 @@ class PharmGKB(SQLiteDataset):
         logger.info("Initializing PharmGKB data...")
         
         try:
-            conn = self._get_connection()
+            conn = self._get_connection(write=True)
             conn.executescript(self.SCHEMA)
             conn.commit()
             
@@ -375,7 +376,7 @@ class PharmGKB(SQLiteDataset):
             },
         ]
         
-        conn = self._get_connection()
+        conn = self._get_connection(write=True)
         cursor = conn.cursor()
         
         for guideline in GUIDELINES:
@@ -441,7 +442,7 @@ class PharmGKB(SQLiteDataset):
             "rs8175347": {"gene": "UGT1A1", "star": "*28", "function": "Decreased function", "activity": 0.3},
         }
         
-        conn = self._get_connection()
+        conn = self._get_connection(write=True)
         cursor = conn.cursor()
         
         for rsid, data in VARIANTS.items():
@@ -637,10 +638,8 @@ class PharmGKB(SQLiteDataset):
 
 def get_drug_recommendations(gene: str) -> List[DosingGuideline]:
     """Get CPIC dosing recommendations for a gene."""
-    pgkb = PharmGKB()
-    if not pgkb.is_downloaded:
-        pgkb.download()
-    return pgkb.get_drug_interactions(gene)
+    pgkb = get_dataset(PharmGKB)
+    return list(pgkb.cached_lookup("get_drug_interactions", gene))
 
 
 def check_medication_safety(
@@ -648,10 +647,7 @@ def check_medication_safety(
     genotypes: Dict[str, str]
 ) -> Dict[str, List[DosingGuideline]]:
     """Check medications against pharmacogenomics guidelines."""
-    pgkb = PharmGKB()
-    if not pgkb.is_downloaded:
-        pgkb.download()
-    
+    pgkb = get_dataset(PharmGKB)
     results = {}
     
     for gene in CPIC_GUIDELINES:
@@ -0,0 +1,380 @@
+"""
+Binary rsID Index
+
+Maps rsIDs to the position of their record in a tab-delimited data file
+(plain, gzip or BGZF) for ``IndexedDataset``.
+
+dbSNP-sized tables hold tens of millions of rows, so an rsID -> line
+number dict saved as JSON costs gigabytes and a multi-second load. The
+index is instead one binary file of two sorted columns after a fixed
+header:
+
+    header    40 bytes  magic, version, offset kind, rows, source size/mtime
+    rsids     uint32    rsID numbers (rs123 -> 123), ascending
+    offsets   uint64    start of each record
+
+Both columns are memory-mapped and binary-searched. Offsets are byte
+offsets for plain files and BGZF virtual offsets
+(``block_offset << 16 | offset_in_block``) for bgzipped files, so a lookup
+is one seek plus one block inflate. Plain gzip files cannot seek; their
+offsets are uncompressed positions, and batched reads visit them in
+ascending order so one forward pass serves the whole batch.
+
+Author: OpenClaw AI
+Date: 2026-02-07
+"""
+
+import gzip
+import logging
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    from ..bgzf import CHUNK_SIZE, is_bgzf, iter_bgzf_blocks, read_bgzf_block
+    from ..genotypes import rsid_to_int
+except ImportError:  # loaded as the top-level "datasets" package
+    from personal_genomics.bgzf import CHUNK_SIZE, is_bgzf, iter_bgzf_blocks, read_bgzf_block
+    from personal_genomics.genotypes import rsid_to_int
+
+logger = logging.getLogger(__name__)
+
+
+INDEX_MAGIC = b"PGRSIDX\x00"
+
+#: Bumped when the on-disk layout changes
+INDEX_VERSION = 1
+
+#: magic, version, offset kind, rows, source size, source mtime_ns
+_HEADER = struct.Struct("<8sIIQQq")
+
+#: How ``offsets`` address records
+OFFSET_PLAIN = 0   # byte offset in an uncompressed file
+OFFSET_BGZF = 1    # BGZF virtual offset
+OFFSET_GZIP = 2    # uncompressed offset in a (non-seekable) gzip file
+
+_MAX_RSID = 0xFFFFFFFF
+
+
+def offset_kind(path: Union[str, Path]) -> int:
+    """Offset kind used to index ``path``."""
+    if is_bgzf(path):
+        return OFFSET_BGZF
+    with open(path, "rb") as fh:
+        return OFFSET_GZIP if fh.read(2) == b"\x1f\x8b" else OFFSET_PLAIN
+
+
+def _iter_chunks(path: Path, kind: int, workers: Optional[int]) -> Iterator[Tuple[int, bytes]]:
+    """``(base, data)`` pairs; the offset of ``data[i]`` is ``base + i``."""
+    if kind == OFFSET_BGZF:
+        with open(path, "rb") as fh:
+            for block_offset, data in iter_bgzf_blocks(fh, workers=workers):
+                yield block_offset << 16, data
+        return
+    position = 0
+    opener = gzip.open if kind == OFFSET_GZIP else open
+    with opener(path, "rb") as fh:
+        while True:
+            chunk = fh.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield position, chunk
+            position += len(chunk)
+
+
+def iter_line_offsets(
+    path: Union[str, Path],
+    kind: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> Iterator[Tuple[int, bytes]]:
+    """
+    Yield ``(offset, line)`` for every line of a plain, gzip or BGZF file.
+
+    Lines are bytes without the newline. A line spanning several BGZF
+    blocks gets the virtual offset of the block it starts in.
+    """
+    path = Path(path)
+    kind = offset_kind(path) if kind is None else kind
+    carry = b""
+    start: Optional[int] = None   # offset of the line being carried
+
+    for base, data in _iter_chunks(path, kind, workers):
+        if not data:
+            continue
+        if start is None:
+            start = base
+        pieces = data.split(b"\n")
+        if len(pieces) == 1:
+            carry += data
+            continue
+        yield start, carry + pieces[0]
+        carry = b""
+        pos = len(pieces[0]) + 1
+        for piece in pieces[1:-1]:
+            yield base + pos, piece
+            pos += len(piece) + 1
+        if pieces[-1]:
+            carry, start = pieces[-1], base + pos
+        else:
+            start = None
+    if carry:
+        yield start, carry
+
+
+class RsidIndex:
+    """
+    Sorted rsID -> record offset index over one data file.
+
+    Attributes:
+        rsids: uint32 rsID numbers, ascending
+        offsets: uint64 record offsets, in ``rsids`` order
+        kind: ``OFFSET_PLAIN``, ``OFFSET_BGZF`` or ``OFFSET_GZIP``
+        source_size / source_mtime_ns: identity of the indexed file
+
+    Example:
+        >>> index = RsidIndex.build("data.tsv.gz")
+        >>> index.save("rsid_index.bin")
+        >>> index = RsidIndex.load("rsid_index.bin")   # memory-mapped
+        >>> index.read_records("data.tsv.gz", ["rs429358"])
+        {'rs429358': ['rs429358', '19', '44908684', ...]}
+    """
+
+    def __init__(
+        self,
+        rsids: np.ndarray,
+        offsets: np.ndarray,
+        kind: int = OFFSET_PLAIN,
+        source_size: int = 0,
+        source_mtime_ns: int = 0,
+    ):
+        self.rsids = rsids
+        self.offsets = offsets
+        self.kind = kind
+        self.source_size = int(source_size)
+        self.source_mtime_ns = int(source_mtime_ns)
+
+    def __len__(self) -> int:
+        return len(self.rsids)
+
+    def __repr__(self) -> str:
+        return f"RsidIndex({len(self):,} rsIDs)"
+
+    # -------------------------------------------------------------------------
+    # Build / persist
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def build(
+        cls,
+        path: Union[str, Path],
+        rsid_col: int = 0,
+        workers: Optional[int] = None,
+    ) -> "RsidIndex":
+        """
+        Scan a tab-delimited data file once, recording where each rsID's
+        record starts. Lines starting with ``#`` are skipped; for repeated
+        rsIDs the first record wins.
+        """
+        path = Path(path)
+        stat = path.stat()
+        kind = offset_kind(path)
+        rsids = array("I")
+        offsets = array("Q")
+        too_large = 0
+
+        for offset, line in iter_line_offsets(path, kind, workers):
+            if line[:1] == b"#":
+                continue
+            if rsid_col:
+                parts = line.split(b"\t", rsid_col + 1)
+                if len(parts) <= rsid_col:
+                    continue
+                field = parts[rsid_col]
+            else:
+                tab = line.find(b"\t")
+                field = line if tab < 0 else line[:tab]
+            if field[:2] != b"rs" or not field[2:].isdigit():
+                continue
+            number = int(field[2:])
+            if number > _MAX_RSID:
+                too_large += 1
+                continue
+            rsids.append(number)
+            offsets.append(offset)
+
+        if too_large:
+            logger.warning(f"{path.name}: skipped {too_large:,} rsIDs above {_MAX_RSID:,}")
+
+        keys = np.frombuffer(rsids, dtype=np.uint32) if rsids else np.zeros(0, dtype=np.uint32)
+        starts = np.frombuffer(offsets, dtype=np.uint64) if offsets else np.zeros(0, dtype=np.uint64)
+        order = np.argsort(keys, kind="stable")
+        index = cls(keys[order], starts[order], kind, stat.st_size, stat.st_mtime_ns)
+        logger.info(f"Indexed {path.name}: {len(index):,} rsIDs")
+        return index
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Write the index to ``path`` and return it."""
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as fh:
+            fh.write(_HEADER.pack(
+                INDEX_MAGIC, INDEX_VERSION, self.kind, len(self),
+                self.source_size, self.source_mtime_ns,
+            ))
+            fh.write(np.ascontiguousarray(self.rsids, dtype="<u4").tobytes())
+            fh.write(b"\x00" * (-fh.tell() % 8))
+            fh.write(np.ascontiguousarray(self.offsets, dtype="<u8").tobytes())
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> Optional["RsidIndex"]:
+        """Memory-map a saved index, or None if it is missing or from another version."""
+        try:
+            with open(path, "rb") as fh:
+                header = fh.read(_HEADER.size)
+        except OSError:
+            return None
+        if len(header) < _HEADER.size:
+            return None
+        magic, version, kind, n, size, mtime_ns = _HEADER.unpack(header)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            return None
+        if not n:
+            return cls(np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.uint64), kind, size, mtime_ns)
+
+        offsets_at = _HEADER.size + 4 * n
+        offsets_at += -offsets_at % 8
+        try:
+            rsids = np.memmap(path, dtype="<u4", mode="r", offset=_HEADER.size, shape=(n,))
+            offsets = np.memmap(path, dtype="<u8", mode="r", offset=offsets_at, shape=(n,))
+        except (OSError, ValueError):
+            return None
+        return cls(rsids, offsets, kind, size, mtime_ns)
+
+    def matches(self, path: Union[str, Path]) -> bool:
+        """True if ``path`` is unchanged since this index was built."""
+        try:
+            stat = Path(path).stat()
+        except OSError:
+            return False
+        return (stat.st_size, stat.st_mtime_ns) == (self.source_size, self.source_mtime_ns)
+
+    # -------------------------------------------------------------------------
+    # Lookups
+    # -------------------------------------------------------------------------
+
+    def offsets_for(self, rsids: Sequence[str]) -> np.ndarray:
+        """Record offset for each rsID (int64, -1 if not indexed)."""
+        keys = np.fromiter(
+            (rsid_to_int(r) or 0 for r in rsids), dtype=np.int64, count=len(rsids)
+        )
+        result = np.full(len(keys), -1, dtype=np.int64)
+        valid = (keys > 0) & (keys <= _MAX_RSID)
+        if not len(self) or not valid.any():
+            return result
+        wanted = keys[valid].astype(np.uint32)
+        pos = np.searchsorted(self.rsids, wanted, side="left")
+        pos[pos == len(self)] = 0
+        hit = self.rsids[pos] == wanted
+        found = np.full(len(wanted), -1, dtype=np.int64)
+        found[hit] = self.offsets[pos[hit]].astype(np.int64)
+        result[valid] = found
+        return result
+
+    def offset_of(self, rsid: str) -> Optional[int]:
+        """Record offset for one rsID, or None if not indexed."""
+        offset = int(self.offsets_for([rsid])[0])
+        return offset if offset >= 0 else None
+
+    def read_records(
+        self,
+        path: Union[str, Path],
+        rsids: Iterable[str],
+    ) -> Dict[str, Optional[List[str]]]:
+        """
+        Read the records of many rsIDs in one pass over the file.
+
+        Offsets are sorted first, so reads move forward through the file
+        and neighbouring records share BGZF block inflates.
+
+        Returns:
+            Dict of rsID -> tab-split fields (None if not indexed)
+        """
+        rsids = list(rsids)
+        offsets = self.offsets_for(rsids)
+        lines = read_lines_at(path, offsets[offsets >= 0], self.kind)
+        return {
+            rsid: lines[int(offset)].split("\t") if offset >= 0 else None
+            for rsid, offset in zip(rsids, offsets.tolist())
+        }
+
+
+# =============================================================================
+# RECORD READS
+# =============================================================================
+
+def _bgzf_block(fh: BinaryIO, cache: Dict[int, Tuple[bytes, int]], block_offset: int) -> Tuple[bytes, int]:
+    """(data, next block offset) for a block, keeping the last few inflated."""
+    if block_offset not in cache:
+        fh.seek(block_offset)
+        data = read_bgzf_block(fh) or b""
+        if len(cache) >= 4:
+            cache.pop(next(iter(cache)))
+        cache[block_offset] = (data, fh.tell())
+    return cache[block_offset]
+
+
+def _read_bgzf_line(fh: BinaryIO, cache: Dict[int, Tuple[bytes, int]], voffset: int) -> bytes:
+    block_offset, within = voffset >> 16, voffset & 0xFFFF
+    parts = []
+    while True:
+        data, next_offset = _bgzf_block(fh, cache, block_offset)
+        if not data:
+            break
+        newline = data.find(b"\n", within)
+        if newline >= 0:
+            parts.append(data[within:newline])
+            break
+        parts.append(data[within:])
+        block_offset, within = next_offset, 0
+    return b"".join(parts)
+
+
+def read_lines_at(
+    path: Union[str, Path],
+    offsets: Iterable[int],
+    kind: int,
+) -> Dict[int, str]:
+    """
+    Read the lines starting at ``offsets``, visiting them in ascending order.
+
+    Returns:
+        Dict of offset -> line (decoded, without the line ending)
+    """
+    wanted = sorted(set(int(o) for o in offsets))
+    lines: Dict[int, bytes] = {}
+    if not wanted:
+        return {}
+
+    if kind == OFFSET_BGZF:
+        cache: Dict[int, Tuple[bytes, int]] = {}
+        with open(path, "rb") as fh:
+            for offset in wanted:
+                lines[offset] = _read_bgzf_line(fh, cache, offset)
+    else:
+        # Forward seeks in a gzip stream decompress only the gap
+        opener = gzip.open if kind == OFFSET_GZIP else open
+        with opener(path, "rb") as fh:
+            for offset in wanted:
+                fh.seek(offset)
+                lines[offset] = fh.readline().rstrip(b"\n")
+
+    return {
+        offset: line.decode("utf-8", "replace").rstrip("\r")
+        for offset, line in lines.items()
+    }
@@ -279,6 +279,7 @@ class SGDPDataset(SQLiteDataset):
         # This avoids massive downloads while still enabling comparisons
         self._build_curated_database()
         self._load_sgdp_aims()
+        self._cache.pop("frequency_matrix", None)
         
         version_info = DatasetVersion(
             name=self.name,
@@ -293,7 +294,7 @@ class SGDPDataset(SQLiteDataset):
     
     def _build_curated_database(self) -> None:
         """Build SQLite database with curated SGDP population metadata."""
-        conn = self._get_connection()
+        conn = self._get_connection(write=True)
         cursor = conn.cursor()
         
         # Create tables
@@ -428,7 +429,7 @@ class SGDPDataset(SQLiteDataset):
             },
         }
         
-        conn = self._get_connection()
+        conn = self._get_connection(write=True)
         cursor = conn.cursor()
         
         for rsid, data in SGDP_AIMS.items():
@@ -462,61 +463,33 @@ class SGDPDataset(SQLiteDataset):
         Returns:
             Dict mapping population code to similarity score
         """
-        import math
-        
-        populations = [p.code for p in ALL_SGDP_POPULATIONS]
-        if region:
-            populations = [p.code for p in SGDP_POPULATIONS.get(region, [])]
-        
-        log_likelihoods = {pop: 0.0 for pop in populations}
-        markers_used = 0
-        
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        return self.frequency_matrix().similarity(
+            genotypes, self._region_populations(region)
+        )
+    
+    def calculate_population_similarity_batch(
+        self,
+        genotype_sets: List[Dict[str, str]],
+        region: Optional[str] = None
+    ) -> List[Dict[str, float]]:
+        """
+        Score many genomes against SGDP populations at once.
         
-        for rsid, geno in genotypes.items():
-            if not geno or len(geno) != 2:
-                continue
-            
-            cursor.execute("SELECT alt_allele FROM variants WHERE rsid = ?", (rsid,))
-            var_row = cursor.fetchone()
-            if not var_row:
-                continue
-            
-            alt = var_row["alt_allele"].upper()
-            alt_count = sum(1 for a in geno.upper() if a == alt)
-            
-            cursor.execute("""
-                SELECT population, frequency FROM frequencies WHERE rsid = ?
-            """, (rsid,))
-            
-            freq_map = {r["population"]: r["frequency"] for r in cursor.fetchall()}
-            if not freq_map:
-                continue
-            
-            markers_used += 1
+        Args:
+            genotype_sets: List of rsid -> genotype mappings
+            region: Optional filter by region
             
-            for pop in populations:
-                p = freq_map.get(pop, 0.5)
-                p = max(0.001, min(0.999, p))
-                
-                if alt_count == 0:
-                    prob = (1 - p) ** 2
-                elif alt_count == 1:
-                    prob = 2 * p * (1 - p)
-                else:
-                    prob = p ** 2
-                
-                log_likelihoods[pop] += math.log(prob)
-        
-        if markers_used == 0:
-            return {pop: 1.0 / len(populations) for pop in populations}
-        
-        max_ll = max(log_likelihoods.values())
-        exp_scores = {pop: math.exp(ll - max_ll) for pop, ll in log_likelihoods.items()}
-        total = sum(exp_scores.values())
-        
-        return {pop: score / total for pop, score in exp_scores.items()}
+        Returns:
+            List of population similarity dicts, one per genome
+        """
+        return self.frequency_matrix().similarity_many(
+            genotype_sets, self._region_populations(region)
+        )
+    
+    def _region_populations(self, region: Optional[str]) -> List[str]:
+        if region:
+            return [p.code for p in SGDP_POPULATIONS.get(region, [])]
+        return [p.code for p in ALL_SGDP_POPULATIONS]
     
     def is_available(self) -> bool:
         """Check if database exists."""
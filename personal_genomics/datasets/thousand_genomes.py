@@ -25,6 +25,7 @@ from .base import (
     PopulationFrequency,
     THOUSAND_GENOMES_POPULATIONS,
     SUPERPOPULATIONS,
+    get_dataset,
 )
 
 logger = logging.getLogger(__name__)
@@ -109,6 +110,7 @@ class ThousandGenomes(SQLiteDataset):
         try:
             # Initialize database
             self._init_database()
+            self._cache.pop("frequency_matrix", None)
             
             # Download and parse population sample info
             sample_pop = self._download_population_info()
@@ -137,7 +139,7 @@ class ThousandGenomes(SQLiteDataset):
     
     def _init_database(self) -> None:
         """Initialize the SQLite database."""
-        conn = self._get_connection()
+        conn = self._get_connection(write=True)
         conn.executescript(self.SCHEMA)
         conn.commit()
     
@@ -407,7 +409,7 @@ class ThousandGenomes(SQLiteDataset):
             },
         }
         
-        conn = self._get_connection()
+        conn = self._get_connection(write=True)
         cursor = conn.cursor()
         
         for rsid, data in BUILTIN_AIMS.items():
@@ -513,7 +515,8 @@ class ThousandGenomes(SQLiteDataset):
         
         Uses a likelihood-based approach: for each population, calculates
         the probability of observing the given genotypes assuming they
-        came from that population.
+        came from that population (Hardy-Weinberg), scored as one
+        vectorized pass over the cached frequency matrix.
         
         Args:
             genotypes: Dict mapping rsid -> genotype (e.g., "AA", "AG", "GG")
@@ -524,76 +527,26 @@ class ThousandGenomes(SQLiteDataset):
         """
         if populations is None:
             populations = list(THOUSAND_GENOMES_POPULATIONS.keys())
+        return self.frequency_matrix().similarity(genotypes, populations)
+    
+    def calculate_population_similarity_batch(
+        self,
+        genotype_sets: List[Dict[str, str]],
+        populations: Optional[List[str]] = None
+    ) -> List[Dict[str, float]]:
+        """
+        Score many genomes against the reference populations at once.
         
-        # Initialize log-likelihood scores
-        log_likelihoods = {pop: 0.0 for pop in populations}
-        markers_used = 0
-        
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        for rsid, geno in genotypes.items():
-            if not geno or len(geno) != 2:
-                continue
-            
-            # Get variant info
-            cursor.execute("""
-                SELECT ref_allele, alt_allele FROM variants WHERE rsid = ?
-            """, (rsid,))
-            var_row = cursor.fetchone()
-            if not var_row:
-                continue
-            
-            ref = var_row["ref_allele"]
-            alt = var_row["alt_allele"]
-            
-            # Count alt alleles in genotype
-            allele1, allele2 = geno[0].upper(), geno[1].upper()
-            alt_count = sum(1 for a in [allele1, allele2] if a == alt.upper())
-            
-            # Get frequencies for all populations
-            cursor.execute("""
-                SELECT population, frequency FROM frequencies WHERE rsid = ?
-            """, (rsid,))
-            
-            freq_map = {row["population"]: row["frequency"] for row in cursor.fetchall()}
-            
-            if not freq_map:
-                continue
-            
-            markers_used += 1
+        Args:
+            genotype_sets: List of rsid -> genotype mappings
+            populations: List of population codes to compare (default: all)
             
-            # Calculate genotype probability for each population
-            # P(genotype | population) using Hardy-Weinberg
-            for pop in populations:
-                p = freq_map.get(pop, 0.5)  # alt allele frequency
-                p = max(0.001, min(0.999, p))  # Avoid log(0)
-                
-                # Hardy-Weinberg genotype probabilities
-                if alt_count == 0:
-                    prob = (1 - p) ** 2  # homozygous ref
-                elif alt_count == 1:
-                    prob = 2 * p * (1 - p)  # heterozygous
-                else:
-                    prob = p ** 2  # homozygous alt
-                
-                import math
-                log_likelihoods[pop] += math.log(prob)
-        
-        if markers_used == 0:
-            return {pop: 1.0 / len(populations) for pop in populations}
-        
-        # Convert log-likelihoods to normalized probabilities
-        import math
-        max_ll = max(log_likelihoods.values())
-        
-        # Subtract max for numerical stability
-        exp_scores = {pop: math.exp(ll - max_ll) for pop, ll in log_likelihoods.items()}
-        total = sum(exp_scores.values())
-        
-        similarities = {pop: score / total for pop, score in exp_scores.items()}
-        
-        return similarities
+        Returns:
+            List of population similarity dicts, one per genome
+        """
+        if populations is None:
+            populations = list(THOUSAND_GENOMES_POPULATIONS.keys())
+        return self.frequency_matrix().similarity_many(genotype_sets, populations)
     
     def get_superpopulation_summary(
         self, 
@@ -638,18 +591,12 @@ class ThousandGenomes(SQLiteDataset):
 
 def get_1kg_frequencies(rsid: str) -> Optional[Dict[str, float]]:
     """Quick lookup of 1000 Genomes frequencies for a variant."""
-    tg = ThousandGenomes()
-    if not tg.is_downloaded:
-        tg.download()
-    
-    var_info = tg.lookup_variant(rsid)
+    tg = get_dataset(ThousandGenomes)
+    var_info = tg.cached_lookup("lookup_variant", rsid)
     return var_info.frequencies if var_info else None
 
 
 def compare_to_1kg_populations(genotypes: Dict[str, str]) -> Dict[str, float]:
     """Compare genotypes to 1000 Genomes reference populations."""
-    tg = ThousandGenomes()
-    if not tg.is_downloaded:
-        tg.download()
-    
+    tg = get_dataset(ThousandGenomes)
     return tg.calculate_population_similarity(genotypes)
@@ -0,0 +1,620 @@
+"""
+Columnar Genotype Storage
+
+Compact, position-aware container for a single genome's genotype calls.
+
+A consumer chip file holds ~650k calls. Stored as a ``Dict[str, str]`` that
+costs hundreds of MB of Python objects and drops chromosome/position. The
+``GenotypeStore`` keeps the same calls in four NumPy columns (~14 bytes per
+call) while still behaving like a read-only ``rsid -> genotype`` mapping, so
+existing marker modules that call ``genotypes.get(rsid)`` keep working.
+
+Encoding:
+    - rsIDs are stored as integers in a sorted ``int64`` array
+      (``rs123`` -> 123, 23andMe internal ``i123`` -> -123); variants
+      without an rsID are keyed by locus (``"19:44908684"``) in a separate
+      negative range below -LOCUS_KEY_BASE
+    - Each allele uses a 2-bit code (A=0, C=1, G=2, T=3); a diploid call
+      packs both alleles into one byte, preserving allele order
+    - Haploid calls (X/Y/MT in males) use codes 16-19
+    - Indels and other non-ACGT calls are kept verbatim in a small side table
+
+Author: OpenClaw AI
+Date: 2026-02-07
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import ItemsView, Mapping, ValuesView
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .qc import QCStats
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+ALLELE_CODES: Dict[str, int] = {"A": 0, "C": 1, "G": 2, "T": 3}
+ALLELES = "ACGT"
+
+#: First code used for haploid calls (16 + allele code)
+HAPLOID_BASE = 16
+#: Call stored verbatim in the side table (indels, unusual alleles)
+OTHER_CODE = 254
+#: No call
+MISSING_CODE = 255
+
+#: Kind flags of calls counted in ``store.qc`` but not stored (0 = homozygous)
+UNSTORED_HETEROZYGOUS = 1
+UNSTORED_HEMIZYGOUS = 2
+UNSTORED_INDEL = 4
+
+#: Offset of chrom:pos keys (``-(LOCUS_KEY_BASE + (chromosome << 32 | pos))``)
+LOCUS_KEY_BASE = 1 << 40
+
+#: Chromosome labels indexed by their uint8 code (0 = unknown)
+CHROMOSOME_NAMES: Tuple[str, ...] = (
+    ("",) + tuple(str(i) for i in range(1, 23)) + ("X", "Y", "XY", "MT")
+)
+
+_CHROMOSOME_CODES: Dict[str, int] = {
+    name: code for code, name in enumerate(CHROMOSOME_NAMES) if name
+}
+_CHROMOSOME_CODES.update({
+    "23": 23, "24": 24, "25": 25, "26": 26,
+    "M": 26, "MTDNA": 26, "PAR": 25,
+})
+
+
+def _build_decode_table() -> List[Optional[str]]:
+    table: List[Optional[str]] = [None] * 256
+    for a1 in range(4):
+        for a2 in range(4):
+            table[a1 * 4 + a2] = ALLELES[a1] + ALLELES[a2]
+    for a in range(4):
+        table[HAPLOID_BASE + a] = ALLELES[a]
+    return table
+
+
+def _build_encode_table() -> Dict[str, int]:
+    table: Dict[str, int] = {}
+    for code, geno in enumerate(_DECODE_TABLE):
+        if geno is not None:
+            table[geno] = code
+    return table
+
+
+_DECODE_TABLE: List[Optional[str]] = _build_decode_table()
+_ENCODE_TABLE: Dict[str, int] = _build_encode_table()
+_DECODE_ARRAY = np.array(_DECODE_TABLE, dtype=object)
+
+
+# =============================================================================
+# ENCODING HELPERS
+# =============================================================================
+
+def rsid_to_int(rsid: str) -> Optional[int]:
+    """
+    Convert an rsID, 23andMe internal ID or chrom:pos locus to its integer key.
+
+    Args:
+        rsid: Identifier such as "rs429358", "i4000377" or "19:44908684"
+
+    Returns:
+        Positive integer for rsIDs, negative for internal IDs and loci,
+        None if invalid
+
+    Example:
+        >>> rsid_to_int("rs429358")
+        429358
+        >>> rsid_to_int("i4000377")
+        -4000377
+    """
+    if not isinstance(rsid, str):
+        return None
+    if rsid[:2] in ("rs", "RS", "Rs", "rS"):
+        digits = rsid[2:]
+        sign = 1
+    elif rsid[:1] in ("i", "I"):
+        digits = rsid[1:]
+        sign = -1
+    elif ":" in rsid:
+        chromosome, _, position = rsid.partition(":")
+        return locus_to_int(chromosome, position)
+    else:
+        return None
+    if not digits.isdigit() or not digits.isascii():
+        return None
+    value = int(digits)
+    if not value or (sign < 0 and value >= LOCUS_KEY_BASE):
+        return None
+    return sign * value
+
+
+def int_to_rsid(value: int) -> str:
+    """Convert an integer key back to its identifier string."""
+    if value > 0:
+        return f"rs{value}"
+    if value <= -LOCUS_KEY_BASE:
+        locus = -value - LOCUS_KEY_BASE
+        return f"{CHROMOSOME_NAMES[locus >> 32]}:{locus & 0xFFFFFFFF}"
+    return f"i{-value}"
+
+
+def locus_to_int(chromosome: str, position: object) -> Optional[int]:
+    """
+    Integer key for a variant identified only by chromosome and position.
+
+    Returns None for unknown chromosomes or positions outside 1..2^32-1.
+    """
+    code = chromosome_code(chromosome)
+    try:
+        pos = int(position)
+    except (TypeError, ValueError):
+        return None
+    if not code or not 0 < pos <= 0xFFFFFFFF:
+        return None
+    return -(LOCUS_KEY_BASE + (code << 32 | pos))
+
+
+def locus_id(chromosome: str, position: object) -> Optional[str]:
+    """
+    Canonical ``"chrom:pos"`` identifier (e.g. ``chr19`` -> ``"19:44908684"``).
+
+    Used as the key for VCF records whose ID column is ``.``.
+    """
+    key = locus_to_int(chromosome, position)
+    return None if key is None else int_to_rsid(key)
+
+
+def encode_genotype(genotype: str) -> int:
+    """
+    Encode a genotype string to its one-byte code.
+
+    Returns ``OTHER_CODE`` for calls that need the side table and
+    ``MISSING_CODE`` for empty strings.
+    """
+    if not genotype:
+        return MISSING_CODE
+    return _ENCODE_TABLE.get(genotype, OTHER_CODE)
+
+
+def decode_genotype(code: int) -> Optional[str]:
+    """Decode a one-byte genotype code (None for OTHER/MISSING codes)."""
+    return _DECODE_TABLE[code]
+
+
+def chromosome_code(chromosome: str) -> int:
+    """Map a chromosome label ("1".."22", "X", "chrY", "MT", ...) to its code."""
+    if not chromosome:
+        return 0
+    label = chromosome.strip().upper()
+    if label.startswith("CHR"):
+        label = label[3:]
+    return _CHROMOSOME_CODES.get(label, 0)
+
+
+def rsids_to_array(rsids: Iterable[str]) -> np.ndarray:
+    """Convert identifiers to an int64 key array (0 for invalid entries)."""
+    return np.fromiter(
+        (rsid_to_int(r) or 0 for r in rsids), dtype=np.int64
+    )
+
+
+# =============================================================================
+# GENOTYPE STORE
+# =============================================================================
+
+class GenotypeStore(Mapping):
+    """
+    Read-only columnar mapping of rsID -> genotype string.
+
+    Columns (aligned, sorted by ``ids``):
+        ids: int64 rsID keys
+        codes: uint8 genotype codes
+        chromosomes: uint8 chromosome codes (0 if unknown)
+        positions: uint32 base-pair positions (0 if unknown)
+
+    Behaves like ``Dict[str, str]`` for lookups (``store["rs7412"]``,
+    ``"rs7412" in store``, ``store.get(...)``, ``.items()``) and adds
+    vectorized helpers for marker-panel joins.
+
+    Example:
+        >>> store = GenotypeStore.from_dict({"rs7412": "CC", "rs429358": "TC"})
+        >>> store["rs7412"]
+        'CC'
+        >>> store.contains_many(["rs7412", "rs1"]).tolist()
+        [True, False]
+    """
+
+    __slots__ = ("ids", "codes", "chromosomes", "positions", "_other", "qc")
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        codes: np.ndarray,
+        chromosomes: Optional[np.ndarray] = None,
+        positions: Optional[np.ndarray] = None,
+        other: Optional[Dict[int, str]] = None,
+        qc: Optional[QCStats] = None,
+    ):
+        """
+        Wrap pre-sorted, de-duplicated columns.
+
+        Use ``from_arrays`` or ``GenotypeStoreBuilder`` for unsorted input.
+        ``other`` maps row index -> verbatim genotype for OTHER_CODE rows.
+        ``qc`` holds load-time counts for the source file (see ``qc.py``).
+        """
+        n = len(ids)
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.codes = np.asarray(codes, dtype=np.uint8)
+        self.chromosomes = (
+            np.zeros(n, dtype=np.uint8) if chromosomes is None
+            else np.asarray(chromosomes, dtype=np.uint8)
+        )
+        self.positions = (
+            np.zeros(n, dtype=np.uint32) if positions is None
+            else np.asarray(positions, dtype=np.uint32)
+        )
+        self._other: Dict[int, str] = other or {}
+        self.qc = qc
+
+    # -------------------------------------------------------------------------
+    # Construction
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def from_arrays(
+        cls,
+        ids: np.ndarray,
+        codes: np.ndarray,
+        chromosomes: Optional[np.ndarray] = None,
+        positions: Optional[np.ndarray] = None,
+        other: Optional[Dict[int, str]] = None,
+    ) -> "GenotypeStore":
+        """
+        Build a store from unsorted columns in file order.
+
+        Rows with invalid (zero) ids or MISSING_CODE are dropped. When an
+        rsID appears more than once the last row wins, matching dict
+        assignment semantics. ``other`` is keyed by input row index.
+
+        Call-rate and heterozygosity counts for all rows with a valid id,
+        no-calls included, are collected into ``store.qc`` on the way.
+        """
+        from .qc import QCStats  # qc imports this module
+        ids = np.asarray(ids, dtype=np.int64)
+        codes = np.asarray(codes, dtype=np.uint8)
+        n = len(ids)
+        chromosomes = (
+            np.zeros(n, dtype=np.uint8) if chromosomes is None
+            else np.asarray(chromosomes, dtype=np.uint8)
+        )
+        positions = (
+            np.zeros(n, dtype=np.uint32) if positions is None
+            else np.asarray(positions, dtype=np.uint32)
+        )
+
+        valid = ids != 0
+        valid_other: Dict[int, str] = {}
+        if other:
+            rank = np.cumsum(valid) - 1
+            valid_other = {int(rank[row]): geno for row, geno in other.items() if valid[row]}
+        qc = QCStats.from_codes(chromosomes[valid], codes[valid], valid_other)
+
+        rows = np.flatnonzero(valid & (codes != MISSING_CODE))
+        # Reverse so np.unique's first-occurrence pick keeps the last row
+        rows = rows[::-1]
+        _, first = np.unique(ids[rows], return_index=True)
+        keep = rows[first]
+
+        new_other: Dict[int, str] = {}
+        if other:
+            old_to_new = np.full(n, -1, dtype=np.int64)
+            old_to_new[keep] = np.arange(len(keep))
+            for old_row, geno in other.items():
+                new_row = int(old_to_new[old_row])
+                if new_row >= 0:
+                    new_other[new_row] = geno
+
+        return cls(
+            ids[keep], codes[keep], chromosomes[keep], positions[keep], new_other, qc
+        )
+
+    @classmethod
+    def from_dict(cls, genotypes: Mapping) -> "GenotypeStore":
+        """Build a store from an existing rsid -> genotype mapping."""
+        if isinstance(genotypes, GenotypeStore):
+            return genotypes
+        builder = GenotypeStoreBuilder()
+        for rsid, geno in genotypes.items():
+            builder.add(rsid, geno)
+        return builder.build()
+
+    # -------------------------------------------------------------------------
+    # Mapping protocol
+    # -------------------------------------------------------------------------
+
+    def _index(self, rsid: object) -> int:
+        key = rsid_to_int(rsid) if isinstance(rsid, str) else None
+        if key is None:
+            return -1
+        i = int(np.searchsorted(self.ids, key))
+        if i < len(self.ids) and self.ids[i] == key:
+            return i
+        return -1
+
+    def _decode(self, i: int) -> str:
+        code = self.codes[i]
+        if code == OTHER_CODE:
+            return self._other[i]
+        return _DECODE_TABLE[code]
+
+    def __getitem__(self, rsid: str) -> str:
+        i = self._index(rsid)
+        if i < 0:
+            raise KeyError(rsid)
+        return self._decode(i)
+
+    def __contains__(self, rsid: object) -> bool:
+        return self._index(rsid) >= 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[str]:
+        return (int_to_rsid(v) for v in self.ids.tolist())
+
+    def __repr__(self) -> str:
+        return f"GenotypeStore({len(self):,} calls, {self.nbytes / 1e6:.1f} MB)"
+
+    def __reduce__(self):
+        return (
+            _rebuild_store,
+            (self.ids, self.codes, self.chromosomes, self.positions,
+             self._other, self.qc),
+        )
+
+    def genotype_strings(self) -> List[str]:
+        """Decode all genotypes in id order."""
+        values = _DECODE_ARRAY[self.codes].tolist()
+        for i, geno in self._other.items():
+            values[i] = geno
+        return values
+
+    def items(self) -> "_StoreItemsView":
+        return _StoreItemsView(self)
+
+    def values(self) -> "_StoreValuesView":
+        return _StoreValuesView(self)
+
+    # -------------------------------------------------------------------------
+    # Vectorized helpers
+    # -------------------------------------------------------------------------
+
+    def indices(self, rsids: Sequence[str]) -> np.ndarray:
+        """
+        Row index for each requested rsID (-1 where absent).
+
+        Args:
+            rsids: Identifiers, or a pre-converted int64 key array
+
+        Returns:
+            int64 array aligned to ``rsids``
+        """
+        keys = (
+            rsids if isinstance(rsids, np.ndarray) and rsids.dtype.kind == "i"
+            else rsids_to_array(rsids)
+        )
+        keys = keys.astype(np.int64, copy=False)
+        if len(self.ids) == 0:
+            return np.full(len(keys), -1, dtype=np.int64)
+        pos = np.searchsorted(self.ids, keys)
+        pos_clipped = np.minimum(pos, len(self.ids) - 1)
+        found = (self.ids[pos_clipped] == keys) & (keys != 0)
+        return np.where(found, pos_clipped, -1).astype(np.int64)
+
+    def contains_many(self, rsids: Sequence[str]) -> np.ndarray:
+        """Boolean membership mask for a marker panel."""
+        return self.indices(rsids) >= 0
+
+    def subset(self, rsids: Iterable[str]) -> "GenotypeStore":
+        """Return a new store restricted to the given rsIDs."""
+        idx = self.indices(list(rsids))
+        rows = np.unique(idx[idx >= 0])
+        other = {
+            new: self._other[int(old)]
+            for new, old in enumerate(rows)
+            if self.codes[old] == OTHER_CODE
+        }
+        return GenotypeStore(
+            self.ids[rows], self.codes[rows],
+            self.chromosomes[rows], self.positions[rows], other,
+        )
+
+    def lookup_many(self, rsids: Sequence[str]) -> Dict[str, str]:
+        """Plain dict of rsid -> genotype for the present subset of ``rsids``."""
+        rsids = list(rsids)
+        idx = self.indices(rsids)
+        return {
+            rsid: self._decode(i)
+            for rsid, i in zip(rsids, idx.tolist())
+            if i >= 0
+        }
+
+    def chromosome(self, rsid: str) -> Optional[str]:
+        """Chromosome label for an rsID (None if absent or unknown)."""
+        i = self._index(rsid)
+        if i < 0 or self.chromosomes[i] == 0:
+            return None
+        return CHROMOSOME_NAMES[self.chromosomes[i]]
+
+    def position(self, rsid: str) -> Optional[int]:
+        """Base-pair position for an rsID (None if absent or unknown)."""
+        i = self._index(rsid)
+        if i < 0 or self.positions[i] == 0:
+            return None
+        return int(self.positions[i])
+
+    def heterozygous_mask(self) -> np.ndarray:
+        """Boolean mask of rows whose call has two different alleles."""
+        codes = self.codes
+        mask = (codes < HAPLOID_BASE) & ((codes >> 2) != (codes & 3))
+        for i, geno in self._other.items():
+            mask[i] = len(geno) >= 2 and geno[0] != geno[1]
+        return mask
+
+    @property
+    def has_positions(self) -> bool:
+        """True if the source file supplied chromosome/position columns."""
+        return bool(len(self.positions)) and bool(self.positions.any())
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory footprint of the columns in bytes."""
+        return int(
+            self.ids.nbytes + self.codes.nbytes
+            + self.chromosomes.nbytes + self.positions.nbytes
+            + sum(len(g) + 64 for g in self._other.values())
+        )
+
+    def to_dict(self) -> Dict[str, str]:
+        """Materialize as a plain ``Dict[str, str]``."""
+        return dict(zip(self, self.genotype_strings()))
+
+
+def _rebuild_store(ids, codes, chromosomes, positions, other, qc=None):
+    return GenotypeStore(ids, codes, chromosomes, positions, other, qc)
+
+
+class _StoreItemsView(ItemsView):
+    """Items view that decodes columns in bulk instead of per-key lookups."""
+
+    def __iter__(self):
+        store = self._mapping
+        return zip(iter(store), store.genotype_strings())
+
+
+class _StoreValuesView(ValuesView):
+    """Values view that decodes columns in bulk."""
+
+    def __iter__(self):
+        return iter(self._mapping.genotype_strings())
+
+
+# =============================================================================
+# BUILDER
+# =============================================================================
+
+class GenotypeStoreBuilder:
+    """
+    Incrementally collect calls while parsing, then freeze to a store.
+
+    Uses compact ``array`` buffers so peak memory during loading stays
+    close to the final store size.
+
+    Example:
+        >>> builder = GenotypeStoreBuilder()
+        >>> builder.add("rs7412", "CC", "19", 44908822)
+        >>> store = builder.build()
+    """
+
+    def __init__(self):
+        self._ids = array("q")
+        self._codes = array("B")
+        self._chromosomes = array("B")
+        self._positions = array("I")
+        self._other: Dict[int, str] = {}
+        # Calls counted in store.qc but not stored (see add_unstored_call)
+        self._unstored_chromosomes = array("B")
+        self._unstored_kinds = array("B")
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(
+        self,
+        rsid: str,
+        genotype: str,
+        chromosome: str = "",
+        position: int = 0,
+    ) -> bool:
+        """
+        Append one call. Returns False (and stores nothing) for invalid
+        identifiers or empty genotypes.
+        """
+        key = rsid_to_int(rsid)
+        if key is None or not genotype:
+            return False
+        code = _ENCODE_TABLE.get(genotype, OTHER_CODE)
+        if code == OTHER_CODE:
+            self._other[len(self._ids)] = genotype
+        self._ids.append(key)
+        self._codes.append(code)
+        self._chromosomes.append(chromosome_code(chromosome))
+        try:
+            self._positions.append(int(position) if position else 0)
+        except (TypeError, ValueError, OverflowError):
+            self._positions.append(0)
+        return True
+
+    def add_no_call(self, rsid: str, chromosome: str = "") -> bool:
+        """
+        Record a no-call. It isn't stored, but counts towards ``store.qc``.
+        Returns False for invalid identifiers.
+        """
+        key = rsid_to_int(rsid)
+        if key is None:
+            return False
+        self._ids.append(key)
+        self._codes.append(MISSING_CODE)
+        self._chromosomes.append(chromosome_code(chromosome))
+        self._positions.append(0)
+        return True
+
+    def add_unstored_call(
+        self,
+        rsid: str,
+        chromosome: str = "",
+        heterozygous: bool = False,
+        hemizygous: bool = False,
+        indel: bool = False,
+    ) -> bool:
+        """
+        Record a call the store can't hold (e.g. a VCF indel). It isn't
+        stored, but counts towards ``store.qc`` like a stored call.
+        Returns False for invalid identifiers.
+        """
+        if rsid_to_int(rsid) is None:
+            return False
+        self._unstored_chromosomes.append(chromosome_code(chromosome))
+        self._unstored_kinds.append(
+            (UNSTORED_HEMIZYGOUS if hemizygous else UNSTORED_HETEROZYGOUS if heterozygous else 0)
+            | (UNSTORED_INDEL if indel else 0)
+        )
+        return True
+
+    def build(self) -> GenotypeStore:
+        """Sort, de-duplicate (last call wins) and return the store."""
+        store = self._build_store()
+        if self._unstored_kinds:
+            from .qc import QCStats  # qc imports this module
+            store.qc = store.qc.merge(QCStats.from_unstored(
+                np.frombuffer(self._unstored_chromosomes, dtype=np.uint8),
+                np.frombuffer(self._unstored_kinds, dtype=np.uint8),
+            ))
+        return store
+
+    def _build_store(self) -> GenotypeStore:
+        return GenotypeStore.from_arrays(
+            np.frombuffer(self._ids, dtype=np.int64) if self._ids else np.zeros(0, np.int64),
+            np.frombuffer(self._codes, dtype=np.uint8) if self._codes else np.zeros(0, np.uint8),
+            np.frombuffer(self._chromosomes, dtype=np.uint8) if self._chromosomes else np.zeros(0, np.uint8),
+            np.asarray(self._positions, dtype=np.uint32),
+            self._other,
+        )
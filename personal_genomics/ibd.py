@@ -0,0 +1,482 @@
+"""
+Identity-by-Descent Segments
+
+Positional IBD segment finder between one genome and one or many others,
+working directly on ``CohortMatrix`` bit planes.
+
+Two genomes that share a segment IBD carry at least one identical allele
+at every SNP in it, so a segment can't contain an opposite homozygote
+(AA vs. GG). For each chromosome (SNPs sorted by position):
+
+    1. Mark opposite homozygotes; SNPs missing in either genome are
+       skipped.
+    2. Runs between opposite homozygotes (or SNP gaps longer than
+       ``max_gap_kb``) with at least ``seed_snps`` shared calls are seeds.
+    3. Neighbouring seeds are joined across up to ``join_max_mismatches``
+       opposite homozygotes within ``join_gap_kb`` (genotyping errors).
+    4. Segments with at least ``min_snps`` SNPs and ``min_cm`` cM are
+       reported.
+
+Every step is array-wide: a block of target genomes x one chromosome is
+scanned at once, with run boundaries found by ``np.flatnonzero`` over the
+flattened block and SNP counts from prefix sums. Matching one kit
+against a cohort takes a few bit operations per (kit, SNP) cell, and
+``workers`` shards the scan by chromosome across a process pool.
+
+Genetic distances come from a ``GeneticMap`` (PLINK ``.map`` or HapMap
+format); without one, 1 cM per Mb is assumed.
+
+Example:
+    >>> result = find_ibd_segments(child, parent)
+    >>> result.total_cm, result.largest_cm
+    (3412.6, 281.3)
+    >>> matches = match_cohort(cohort, "kit_0042", workers=8)
+
+Author: OpenClaw AI
+Date: 2026-02-07
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .bgzf import iter_text_lines
+from .cohort import CohortMatrix, build_cohort, unpack_bits
+from .roh import AUTOSOMES
+
+
+#: cM per Mb used when no genetic map is given
+CM_PER_MB = 1.0
+
+#: (genome, SNP) cells scanned per block
+IBD_MAX_ELEMENTS = 1 << 18
+
+
+# =============================================================================
+# GENETIC MAP
+# =============================================================================
+
+class GeneticMap:
+    """
+    Piecewise-linear base-pair -> centimorgan map per chromosome.
+
+    Chromosomes not in the map fall back to CM_PER_MB.
+    """
+
+    def __init__(self, maps: Optional[Mapping[str, Tuple[np.ndarray, np.ndarray]]] = None):
+        self.maps: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for chromosome, (positions, cm) in (maps or {}).items():
+            order = np.argsort(positions, kind="stable")
+            self.maps[str(chromosome)] = (
+                np.asarray(positions, dtype=np.float64)[order],
+                np.asarray(cm, dtype=np.float64)[order],
+            )
+
+    def __contains__(self, chromosome: str) -> bool:
+        return chromosome in self.maps
+
+    def cm(self, chromosome: str, positions: np.ndarray) -> np.ndarray:
+        """Genetic position (cM) of each base-pair position."""
+        positions = np.asarray(positions, dtype=np.float64)
+        if chromosome not in self.maps:
+            return positions * (CM_PER_MB / 1e6)
+        map_bp, map_cm = self.maps[chromosome]
+        return np.interp(positions, map_bp, map_cm)
+
+    @classmethod
+    def load(cls, *paths: Union[str, Path]) -> "GeneticMap":
+        """
+        Read one or more map files (plain or gzipped).
+
+        Two layouts are recognised, with or without a header line:
+
+        - PLINK ``.map``: chromosome, ID, cM, bp (e.g. Beagle's
+          ``plink.chr1.GRCh37.map``)
+        - HapMap: chromosome, bp, rate (cM/Mb), cM
+        """
+        columns: Dict[str, Tuple[List[float], List[float]]] = {}
+        for path in paths:
+            for line in iter_text_lines(path):
+                fields = line.split()
+                if len(fields) < 4 or line.startswith("#"):
+                    continue
+                chromosome = fields[0]
+                if chromosome.lower().startswith("chr"):
+                    chromosome = chromosome[3:]
+                try:
+                    if fields[1].isdigit():
+                        bp, cm = float(fields[1]), float(fields[3])
+                    else:
+                        bp, cm = float(fields[3]), float(fields[2])
+                except ValueError:
+                    continue    # header
+                entry = columns.setdefault(chromosome, ([], []))
+                entry[0].append(bp)
+                entry[1].append(cm)
+        return cls({c: (np.array(bp), np.array(cm)) for c, (bp, cm) in columns.items()})
+
+
+# =============================================================================
+# RESULTS
+# =============================================================================
+
+@dataclass(frozen=True)
+class IBDParams:
+    """
+    IBD segment parameters (minimums follow the usual 7 cM / 500 SNP
+    chip-matching thresholds).
+
+    Attributes:
+        min_snps: Minimum shared SNPs in a segment
+        min_cm: Minimum segment length in cM
+        seed_snps: Minimum shared SNPs in a run to seed or extend a segment
+        join_gap_kb: Join seeds separated by at most this many kb ...
+        join_max_mismatches: ... and at most this many opposite homozygotes
+        max_gap_kb: Never extend a segment across a SNP gap longer than this
+    """
+    min_snps: int = 500
+    min_cm: float = 7.0
+    seed_snps: int = 100
+    join_gap_kb: float = 100.0
+    join_max_mismatches: int = 1
+    max_gap_kb: float = 1000.0
+
+
+@dataclass
+class IBDSegment:
+    """One shared segment."""
+    chromosome: str
+    start: int
+    end: int
+    start_cm: float
+    end_cm: float
+    n_snps: int
+    mismatches: int
+
+    @property
+    def length_mb(self) -> float:
+        return (self.end - self.start) / 1e6
+
+    @property
+    def length_cm(self) -> float:
+        return self.end_cm - self.start_cm
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **asdict(self),
+            "start_cm": round(self.start_cm, 3),
+            "end_cm": round(self.end_cm, 3),
+            "length_cm": round(self.length_cm, 2),
+            "length_mb": round(self.length_mb, 3),
+        }
+
+
+@dataclass
+class IBDResult:
+    """IBD segments shared by two genomes."""
+    sample_1: str
+    sample_2: str
+    segments: List[IBDSegment] = field(default_factory=list)
+
+    @property
+    def total_cm(self) -> float:
+        return sum(s.length_cm for s in self.segments)
+
+    @property
+    def total_mb(self) -> float:
+        return sum(s.length_mb for s in self.segments)
+
+    @property
+    def largest_cm(self) -> float:
+        return max((s.length_cm for s in self.segments), default=0.0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "sample_1": self.sample_1,
+            "sample_2": self.sample_2,
+            "segment_count": len(self.segments),
+            "total_cm": round(self.total_cm, 2),
+            "largest_cm": round(self.largest_cm, 2),
+            "total_mb": round(self.total_mb, 3),
+            "segments": [s.to_dict() for s in self.segments],
+        }
+
+
+# =============================================================================
+# SCANNING
+# =============================================================================
+
+def _prefix_sum(mask: np.ndarray) -> np.ndarray:
+    """Counts of set cells before each flat index (length size + 1)."""
+    total = np.empty(mask.size + 1, dtype=np.int64)
+    total[0] = 0
+    total[1:] = np.cumsum(mask.ravel(), dtype=np.int64)
+    return total
+
+
+def _scan_segments(
+    query_alt: np.ndarray,
+    query_ref: np.ndarray,
+    alt: np.ndarray,
+    ref: np.ndarray,
+    positions: np.ndarray,
+    cm: np.ndarray,
+    params: IBDParams,
+) -> Tuple[np.ndarray, ...]:
+    """
+    Segments between one query and a block of genomes on one chromosome.
+
+    Args:
+        query_alt, query_ref: Query bit masks (n_snps,)
+        alt, ref: Target bit masks (n_rows, n_snps)
+        positions: Base-pair positions, sorted ascending
+        cm: Genetic positions aligned to ``positions``
+
+    Returns:
+        (row, start_col, end_col, n_snps, mismatches) arrays
+    """
+    n_rows, n = alt.shape
+    called = (alt | ref) & (query_alt | query_ref)
+    opposite = (alt & ~ref & (query_ref & ~query_alt)) | (ref & ~alt & (query_alt & ~query_ref))
+
+    gap = np.zeros(n, dtype=bool)
+    gap[1:] = np.diff(positions.astype(np.int64)) > params.max_gap_kb * 1000
+    gap_count = np.cumsum(gap)
+
+    # Runs of non-opposite SNPs within a row, split at SNP gaps
+    break_before = np.ones((n_rows, n), dtype=bool)
+    break_before[:, 1:] = opposite[:, :-1] | gap[1:]
+    break_after = np.ones((n_rows, n), dtype=bool)
+    break_after[:, :-1] = opposite[:, 1:] | gap[1:]
+    starts = np.flatnonzero(~opposite & break_before)
+    ends = np.flatnonzero(~opposite & break_after)
+
+    # Shared calls / opposite homozygotes before each cell
+    called_sum = _prefix_sum(called)
+    opposite_sum = _prefix_sum(opposite)
+    seed = called_sum[ends + 1] - called_sum[starts] >= max(params.seed_snps, 1)
+    starts, ends = starts[seed], ends[seed]
+    empty = np.zeros(0, dtype=np.int64)
+    if not len(starts):
+        return empty, empty, empty, empty, empty
+
+    # Trim seeds to their first/last shared call
+    starts = np.searchsorted(called_sum, called_sum[starts] + 1) - 1
+    ends = np.searchsorted(called_sum, called_sum[ends + 1]) - 1
+
+    # Join neighbouring seeds across short stretches with a few mismatches
+    rows = starts // n
+    start_cols, end_cols = starts % n, ends % n
+    join = (
+        (rows[1:] == rows[:-1])
+        & (positions[start_cols[1:]].astype(np.int64) - positions[end_cols[:-1]] <= params.join_gap_kb * 1000)
+        & (gap_count[start_cols[1:]] == gap_count[end_cols[:-1]])
+        & (opposite_sum[starts[1:]] - opposite_sum[ends[:-1] + 1] <= params.join_max_mismatches)
+    )
+    group_first = np.flatnonzero(np.concatenate(([True], ~join)))
+    group_last = np.concatenate((group_first[1:], [len(starts)])) - 1
+    starts, ends = starts[group_first], ends[group_last]
+
+    n_snps = called_sum[ends + 1] - called_sum[starts]
+    mismatches = opposite_sum[ends + 1] - opposite_sum[starts]
+    start_cols, end_cols = starts % n, ends % n
+    keep = (n_snps >= params.min_snps) & (cm[end_cols] - cm[start_cols] >= params.min_cm)
+    return starts[keep] // n, start_cols[keep], end_cols[keep], n_snps[keep], mismatches[keep]
+
+
+def _match_chromosome(
+    has_alt: np.ndarray,
+    has_ref: np.ndarray,
+    offset: int,
+    positions: np.ndarray,
+    query_alt: np.ndarray,
+    query_ref: np.ndarray,
+    targets: np.ndarray,
+    chromosome: str,
+    cm: np.ndarray,
+    params: IBDParams,
+    max_elements: int,
+) -> List[Tuple[int, IBDSegment]]:
+    """
+    (target row, segment) pairs on one chromosome, in blocks of targets.
+
+    ``has_alt``/``has_ref`` are the cohort's bit planes cut to the words
+    covering the chromosome, whose first SNP is bit ``offset``.
+    """
+    n = len(positions)
+    block = max(1, max_elements // max(n, 1))
+    found = []
+    for b in range(0, len(targets), block):
+        rows = targets[b:b + block]
+        alt = unpack_bits(has_alt, rows, offset, n)
+        ref = unpack_bits(has_ref, rows, offset, n)
+        for row, start, end, n_snps, mismatches in zip(*(
+            a.tolist() for a in _scan_segments(query_alt, query_ref, alt, ref, positions, cm, params)
+        )):
+            found.append((int(rows[row]), IBDSegment(
+                chromosome=chromosome,
+                start=int(positions[start]),
+                end=int(positions[end]),
+                start_cm=float(cm[start]),
+                end_cm=float(cm[end]),
+                n_snps=n_snps,
+                mismatches=mismatches,
+            )))
+    return found
+
+
+def _chromosome_tasks(
+    cohort: CohortMatrix,
+    query_alt: np.ndarray,
+    query_ref: np.ndarray,
+    ranges: List[Tuple[str, int, int, np.ndarray]],
+) -> Iterator[Tuple[Any, ...]]:
+    """
+    Per-chromosome arguments for _match_chromosome (before targets/params).
+
+    The bit planes are views of the chromosome's words only, so a pool
+    task pickles one chromosome's slice rather than the whole cohort.
+    """
+    for name, lo, hi, cm in ranges:
+        first, last = lo // 64, (hi + 63) // 64
+        yield (
+            cohort.has_alt[:, first:last], cohort.has_ref[:, first:last], lo - first * 64,
+            cohort.positions[lo:hi], query_alt[lo:hi], query_ref[lo:hi], name, cm,
+        )
+
+
+# Process pool workers get the targets and parameters through this module global
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _ibd_worker_init(state: Dict[str, Any]) -> None:
+    _WORKER_STATE.update(state)
+
+
+def _ibd_worker_chromosome(task: Tuple[Any, ...]) -> List[Tuple[int, IBDSegment]]:
+    has_alt, has_ref, offset, positions, query_alt, query_ref, chromosome, cm = task
+    s = _WORKER_STATE
+    return _match_chromosome(
+        has_alt, has_ref, offset, positions, query_alt, query_ref, s["targets"],
+        chromosome, cm, s["params"], s["max_elements"],
+    )
+
+
+# =============================================================================
+# PUBLIC API
+# =============================================================================
+
+def match_cohort(
+    cohort: CohortMatrix,
+    query: Union[int, str, Mapping[str, str]],
+    targets: Optional[Sequence[Union[int, str]]] = None,
+    params: Optional[IBDParams] = None,
+    genetic_map: Optional[GeneticMap] = None,
+    workers: Optional[int] = None,
+    autosomes_only: bool = True,
+    max_elements: int = IBD_MAX_ELEMENTS,
+    query_name: str = "query",
+) -> List[IBDResult]:
+    """
+    IBD segments between one genome and every other genome in a cohort.
+
+    Args:
+        cohort: Packed cohort (re-ordered by position if needed)
+        query: Sample name or row in ``cohort``, or a genome not in it
+            (encoded against the cohort's SNPs and alleles)
+        targets: Samples to compare against (default: all but the query)
+        params: Segment parameters
+        genetic_map: bp -> cM map (default: CM_PER_MB)
+        workers: Process pool size for sharding by chromosome
+            (None or 1 scans in-process)
+        autosomes_only: Skip X, Y, XY and MT
+        max_elements: (genome, SNP) cells scanned per block
+        query_name: Name reported for a query that isn't in the cohort
+
+    Returns:
+        One IBDResult per target sharing at least one segment, largest
+        total cM first
+    """
+    params = params or IBDParams()
+    if cohort.chromosome_ranges() is None:
+        cohort = cohort.sorted_by_position()
+
+    query_row = None
+    if isinstance(query, (int, np.integer, str)):
+        query_row = cohort.samples.index(query) if isinstance(query, str) else int(query)
+        query_name = cohort.samples[query_row]
+        query_alt, query_ref = (m[0] for m in cohort.unpack(slice(query_row, query_row + 1)))
+    else:
+        query_alt, query_ref = cohort.encode(query)
+
+    if targets is None:
+        rows = np.array([r for r in range(len(cohort)) if r != query_row], dtype=np.int64)
+    else:
+        rows = np.array(
+            [cohort.samples.index(t) if isinstance(t, str) else int(t) for t in targets],
+            dtype=np.int64,
+        )
+
+    genetic_map = genetic_map or GeneticMap()
+    ranges = [
+        (name, lo, hi, genetic_map.cm(name, cohort.positions[lo:hi]))
+        for name, lo, hi in cohort.chromosome_ranges()
+        if not autosomes_only or name in AUTOSOMES
+    ]
+
+    found: List[Tuple[int, IBDSegment]] = []
+    tasks = _chromosome_tasks(cohort, query_alt, query_ref, ranges)
+    if workers and workers > 1 and len(ranges) > 1 and len(rows):
+        state = {"targets": rows, "params": params, "max_elements": max_elements}
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(ranges)),
+            initializer=_ibd_worker_init,
+            initargs=(state,),
+        ) as pool:
+            for chromosome_found in pool.map(_ibd_worker_chromosome, tasks):
+                found.extend(chromosome_found)
+    elif len(rows):
+        for has_alt, has_ref, offset, positions, q_alt, q_ref, name, cm in tasks:
+            found.extend(_match_chromosome(
+                has_alt, has_ref, offset, positions, q_alt, q_ref, rows, name, cm, params, max_elements
+            ))
+
+    results: Dict[int, IBDResult] = {}
+    for row, segment in found:
+        result = results.setdefault(row, IBDResult(query_name, cohort.samples[row]))
+        result.segments.append(segment)
+    return sorted(results.values(), key=lambda r: r.total_cm, reverse=True)
+
+
+def find_ibd_segments(
+    genotypes_1: Mapping[str, str],
+    genotypes_2: Mapping[str, str],
+    params: Optional[IBDParams] = None,
+    genetic_map: Optional[GeneticMap] = None,
+    workers: Optional[int] = None,
+    names: Tuple[str, str] = ("sample_1", "sample_2"),
+) -> IBDResult:
+    """
+    IBD segments shared by two genomes.
+
+    Both genomes need chromosome/position columns (``GenotypeStore``
+    from any loader); the comparison uses SNPs typed in both.
+
+    Args:
+        genotypes_1, genotypes_2: Genomes to compare
+        params: Segment parameters
+        genetic_map: bp -> cM map (default: CM_PER_MB)
+        workers: Process pool size for sharding by chromosome
+        names: Sample names for the result
+
+    Returns:
+        IBDResult (segments in chromosome/position order)
+    """
+    cohort = build_cohort({names[0]: genotypes_1, names[1]: genotypes_2})
+    matches = match_cohort(cohort, 0, params=params, genetic_map=genetic_map, workers=workers)
+    return matches[0] if matches else IBDResult(names[0], names[1])
@@ -0,0 +1,129 @@
+"""
+Streaming JSON Output
+
+Writes a top-level JSON object one member at a time, so each part of an
+analysis is serialized (and can be dropped by the caller) as soon as it
+is finished instead of encoding one large dict at the end:
+
+    >>> with JSONObjectWriter("full_analysis.json") as out:
+    ...     out.write("total_snps", 638_531)
+    ...     out.write("traits", analyze_markers(...))
+
+With ``indent=2`` the file is byte-identical to ``json.dump(obj, f,
+indent=2)``. ``indent=None`` writes compact JSON (no whitespace). Like
+``json.dump``, each member is written chunk by chunk as
+``JSONEncoder.iterencode`` produces it, so no member is ever held as one
+encoded string.
+
+The object is written to a temporary file next to the target and moved
+into place on success, so a failed run leaves any previous output intact.
+
+Author: OpenClaw AI
+Date: 2026-02-07
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Mapping, Optional, Union
+
+
+class JSONObjectWriter:
+    """
+    Incremental writer for a JSON object file.
+
+    Args:
+        path: Output file
+        indent: Indent width, or None for compact output
+        default: Fallback serializer for non-JSON values (default: str)
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        indent: Optional[int] = 2,
+        default: Optional[Callable[[Any], Any]] = str,
+    ):
+        self.path = Path(path)
+        self.indent = indent
+        self.default = default
+        self._tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self._fh = open(self._tmp_path, "w", encoding="utf-8")
+        self._count = 0
+        self._closed = False
+        if indent is None:
+            self._separators = (",", ":")
+            self._newline = ""
+        else:
+            self._separators = (",", ": ")
+            self._newline = "\n" + " " * indent
+        self._encoder = json.JSONEncoder(
+            indent=indent, separators=self._separators, default=default
+        )
+
+    def write(self, key: str, value: Any) -> None:
+        """Append one member to the object."""
+        if self._closed:
+            raise ValueError(f"{self.path} is already closed")
+        prefix = "{" if self._count == 0 else self._separators[0]
+        write = self._fh.write
+        write(f"{prefix}{self._newline}{json.dumps(str(key))}{self._separators[1]}")
+        # Newlines only occur in indentation (strings escape them), so
+        # each chunk can be shifted one level in on its own
+        if self._newline:
+            for chunk in self._encoder.iterencode(value):
+                write(chunk.replace("\n", self._newline))
+        else:
+            for chunk in self._encoder.iterencode(value):
+                write(chunk)
+        self._count += 1
+
+    def update(self, members: Mapping[str, Any]) -> None:
+        for key, value in members.items():
+            self.write(key, value)
+
+    def close(self) -> None:
+        """Finish the object and move the file into place."""
+        if self._closed:
+            return
+        if self._count == 0:
+            self._fh.write("{}")
+        else:
+            self._fh.write("\n}" if self._newline else "}")
+        self._fh.close()
+        self._closed = True
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        """Discard the partial output."""
+        if self._closed:
+            return
+        self._fh.close()
+        self._closed = True
+        try:
+            os.remove(self._tmp_path)
+        except OSError:
+            pass
+
+    def __enter__(self) -> "JSONObjectWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_json(
+    path: Union[str, Path],
+    obj: Mapping[str, Any],
+    indent: Optional[int] = 2,
+    default: Optional[Callable[[Any], Any]] = str,
+) -> Path:
+    """Write a dict as a JSON object file member by member; returns the path."""
+    with JSONObjectWriter(path, indent=indent, default=default) as out:
+        out.update(obj)
+    return out.path
@@ -0,0 +1,453 @@
+"""
+Vectorized Polygenic Risk Score Engine
+
+Compiles PRS weight tables into one sparse (variants x scores) weight matrix
+so every score is computed in a single pass over the genome.
+
+Scoring a condition by scanning the whole weight table and counting alleles
+with ``str.count`` costs O(conditions x weights) Python operations per
+genome, and the PGS Catalog dataset issued one query per score. Here the
+weights (``PRS_WEIGHTS``, ``PRS_EXTENDED`` or PGS Catalog scoring files) are
+compiled once:
+
+    - one matrix row per (rsID, effect allele), so scores that disagree on
+      the effect allele at a SNP still share the genotype lookup
+    - one column per score (condition or PGS ID)
+    - a matching membership matrix with a 1 for every (row, score) entry
+
+A genome becomes an effect-allele dosage vector ``d`` (0, 1, 2) plus a
+presence mask ``m``; then for all scores at once:
+
+    raw_scores = d @ W        variants_found = m @ M
+
+Author: OpenClaw AI
+Date: 2026-02-07
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .genotypes import (
+    ALLELE_CODES,
+    ALLELES,
+    HAPLOID_BASE,
+    OTHER_CODE,
+    GenotypeStore,
+    int_to_rsid,
+    rsids_to_array,
+)
+
+
+#: Effect allele code for an empty allele (the SNP counts as found, scores 0)
+NO_EFFECT_CODE = 254
+#: Effect allele code for indel/multi-base alleles (counted on the genotype string)
+TEXT_EFFECT_CODE = 255
+
+
+def effect_allele_code(allele: str) -> int:
+    """Map an effect allele to its uint8 code (0-3 for A/C/G/T)."""
+    if not allele:
+        return NO_EFFECT_CODE
+    return ALLELE_CODES.get(allele.upper(), TEXT_EFFECT_CODE)
+
+
+# =============================================================================
+# DOSAGES
+# =============================================================================
+
+def genome_rows(
+    store: GenotypeStore,
+    ids: np.ndarray,
+    order: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Genome row index for each weight row (-1 where the SNP is not called).
+
+    Probes are searched in sorted order, which is several times faster than
+    probing a large unsorted weight table. Pass ``order`` (an argsort of
+    ``ids``) to reuse a precomputed sort.
+    """
+    if order is None:
+        order = np.argsort(ids, kind="stable")
+    idx = np.empty(len(ids), dtype=np.int64)
+    idx[order] = store.indices(ids[order])
+    return idx
+
+
+def allele_dosages(
+    store: GenotypeStore,
+    idx: np.ndarray,
+    effect_codes: np.ndarray,
+    text_alleles: Optional[Mapping[int, str]] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Effect-allele dosage for weight rows joined to a GenotypeStore.
+
+    Args:
+        store: Genome
+        idx: Genome row per weight row, from ``genome_rows``
+        effect_codes: Effect allele code per weight row
+        text_alleles: Weight row -> allele for TEXT_EFFECT_CODE rows
+
+    Returns:
+        Tuple of (float64 dosages, bool present mask)
+    """
+    dosage = np.zeros(len(idx), dtype=np.float64)
+    present = idx >= 0
+    rows = np.flatnonzero(present)
+    codes = store.codes[idx[rows]].astype(np.int16)
+    effect = effect_codes[rows].astype(np.int16)
+
+    diploid = codes < HAPLOID_BASE
+    dosage[rows[diploid]] = (
+        ((codes[diploid] >> 2) == effect[diploid]).astype(np.float64)
+        + ((codes[diploid] & 3) == effect[diploid])
+    )
+    haploid = (codes >= HAPLOID_BASE) & (codes < HAPLOID_BASE + 4)
+    dosage[rows[haploid]] = (codes[haploid] - HAPLOID_BASE) == effect[haploid]
+
+    # Verbatim calls and indel/multi-base effect alleles
+    slow = ((codes == OTHER_CODE) | (effect == TEXT_EFFECT_CODE)) & (effect != NO_EFFECT_CODE)
+    text_alleles = text_alleles or {}
+    for i in rows[slow].tolist():
+        code = int(effect_codes[i])
+        allele = text_alleles.get(i, "") if code == TEXT_EFFECT_CODE else ALLELES[code]
+        genotype = store[int_to_rsid(int(store.ids[idx[i]]))]
+        dosage[i] = genotype.upper().count(allele) if allele else 0
+    return dosage, present
+
+
+# =============================================================================
+# RESULTS
+# =============================================================================
+
+@dataclass
+class PRSScores:
+    """
+    Raw scores and coverage for every score in a weight matrix.
+
+    Attributes:
+        score_ids: Score labels (conditions or PGS IDs), matrix column order
+        raw_scores: float64 weighted effect-allele sums
+        variants_found: Score variants with a genotype call
+        variants_total: Variants in each score model
+    """
+    score_ids: List[str]
+    raw_scores: np.ndarray
+    variants_found: np.ndarray
+    variants_total: np.ndarray
+
+    @property
+    def coverage(self) -> np.ndarray:
+        """Fraction of each score's variants present (0 for empty models)."""
+        return np.divide(
+            self.variants_found, self.variants_total,
+            out=np.zeros(len(self.score_ids)),
+            where=self.variants_total > 0,
+        )
+
+    def __iter__(self):
+        """Yield (score_id, raw_score, variants_found, variants_total)."""
+        return zip(
+            self.score_ids,
+            self.raw_scores.tolist(),
+            self.variants_found.tolist(),
+            self.variants_total.tolist(),
+        )
+
+
+# =============================================================================
+# WEIGHT MATRIX
+# =============================================================================
+
+class PRSWeightMatrix:
+    """
+    Sparse (variants x scores) PRS weight matrix.
+
+    Effect alleles are counted case-insensitively; a genotype call counts as
+    found for every score that includes its rsID, whatever the allele.
+
+    Example:
+        >>> matrix = PRSWeightMatrix.from_weight_table(PRS_WEIGHTS)
+        >>> scores = matrix.score(genotypes)
+        >>> dict(zip(scores.score_ids, scores.raw_scores))
+    """
+
+    def __init__(
+        self,
+        score_ids: Sequence[str],
+        rsids: Sequence[str],
+        effect_alleles: Sequence[str],
+        rows: np.ndarray,
+        columns: np.ndarray,
+        weights: np.ndarray,
+    ):
+        """
+        Compile a matrix from (row, column, weight) entries.
+
+        ``rows`` index into ``rsids``/``effect_alleles`` and ``columns`` into
+        ``score_ids``. When a (row, column) pair repeats, the last entry wins.
+        """
+        self.score_ids = list(score_ids)
+        self.rsids = list(rsids)
+        self.effect_alleles = [a.upper() for a in effect_alleles]
+
+        rows = np.asarray(rows, dtype=np.int64)
+        columns = np.asarray(columns, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.float64)
+        shape = (len(self.rsids), len(self.score_ids))
+
+        # Keep the last entry per (row, column), as dict assignment would
+        flat = rows * max(shape[1], 1) + columns
+        _, last = np.unique(flat[::-1], return_index=True)
+        keep = np.sort(len(flat) - 1 - last)
+        rows, columns, weights = rows[keep], columns[keep], weights[keep]
+
+        from scipy import sparse  # deferred: ~0.2s import, only needed once compiled
+
+        self.weights = sparse.csr_matrix((weights, (rows, columns)), shape=shape)
+        self.membership = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, columns)), shape=shape
+        )
+        self.variants_total = np.bincount(
+            columns, minlength=shape[1]
+        ).astype(np.int64)
+
+        self._row_ids = rsids_to_array(self.rsids)
+        # Sorted probe keys keep the genome join cache-friendly on large models
+        self._row_order = np.argsort(self._row_ids, kind="stable")
+        self._effect_codes = np.array(
+            [effect_allele_code(a) for a in self.effect_alleles], dtype=np.uint8
+        )
+        self._text_alleles = {
+            i: a for i, a in enumerate(self.effect_alleles)
+            if self._effect_codes[i] == TEXT_EFFECT_CODE
+        }
+        self._columns = {score_id: j for j, score_id in enumerate(self.score_ids)}
+        # Column-major copies for scoring a subset of scores (built on demand)
+        self._csc: Optional[Tuple[Any, Any]] = None
+
+    # -------------------------------------------------------------------------
+    # Construction
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[Tuple[str, str, str, float]],
+        score_ids: Optional[Sequence[str]] = None,
+    ) -> "PRSWeightMatrix":
+        """
+        Build from (score_id, rsid, effect_allele, weight) records.
+
+        Args:
+            records: Weight records in any order
+            score_ids: Column order; scores that only appear in ``records``
+                are appended in first-seen order
+
+        Returns:
+            PRSWeightMatrix
+        """
+        columns_by_id: Dict[str, int] = {}
+        for score_id in score_ids or ():
+            columns_by_id.setdefault(score_id, len(columns_by_id))
+        row_index: Dict[Tuple[str, str], int] = {}
+        rows: List[int] = []
+        columns: List[int] = []
+        weights: List[float] = []
+
+        for score_id, rsid, effect, weight in records:
+            key = (rsid, (effect or "").upper())
+            row = row_index.setdefault(key, len(row_index))
+            rows.append(row)
+            columns.append(columns_by_id.setdefault(score_id, len(columns_by_id)))
+            weights.append(weight or 0.0)
+
+        return cls(
+            score_ids=list(columns_by_id),
+            rsids=[rsid for rsid, _ in row_index],
+            effect_alleles=[effect for _, effect in row_index],
+            rows=np.array(rows, dtype=np.int64),
+            columns=np.array(columns, dtype=np.int64),
+            weights=np.array(weights, dtype=np.float64),
+        )
+
+    @classmethod
+    def from_weight_table(
+        cls,
+        weights: Mapping[str, Mapping],
+        score_key: str = "condition",
+    ) -> "PRSWeightMatrix":
+        """
+        Build from a ``PRS_WEIGHTS``-style table.
+
+        Args:
+            weights: rsid -> {"effect": ..., "beta": ..., "condition": ...};
+                merge tables first (``{**PRS_WEIGHTS, **PRS_EXTENDED}``) to
+                score them together
+            score_key: Entry field naming the score column; entries without
+                it are skipped
+
+        Returns:
+            PRSWeightMatrix with one column per condition
+        """
+        return cls.from_records(
+            (info[score_key], rsid, info.get("effect", ""), info.get("beta", 0))
+            for rsid, info in weights.items()
+            if info.get(score_key)
+        )
+
+    @classmethod
+    def from_connection(cls, conn: sqlite3.Connection) -> "PRSWeightMatrix":
+        """
+        Build from the PGS Catalog ``prs_models``/``prs_variants`` tables.
+
+        Columns follow ``prs_models`` order, so models with no variant rows
+        still get a (zero-coverage) column.
+        """
+        cursor = conn.cursor()
+        cursor.execute("SELECT pgs_id FROM prs_models ORDER BY rowid")
+        score_ids = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT pgs_id, rsid, effect_allele, effect_weight "
+            "FROM prs_variants ORDER BY rowid"
+        )
+        return cls.from_records(
+            ((row[0], row[1], row[2], row[3]) for row in cursor),
+            score_ids=score_ids,
+        )
+
+    @property
+    def n_variants(self) -> int:
+        return len(self.rsids)
+
+    @property
+    def n_scores(self) -> int:
+        return len(self.score_ids)
+
+    def column(self, score_id: str) -> int:
+        """Column index of a score (KeyError if unknown)."""
+        return self._columns[score_id]
+
+    # -------------------------------------------------------------------------
+    # Genotype encoding
+    # -------------------------------------------------------------------------
+
+    def dosages(
+        self,
+        genotypes: Mapping[str, str],
+        rows: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Effect-allele dosage and presence mask for matrix rows.
+
+        Args:
+            genotypes: rsid -> genotype mapping (dict or GenotypeStore)
+            rows: Matrix rows to encode (default: all)
+
+        Returns:
+            Tuple of (float64 dosages, bool present mask), aligned to
+            ``rows`` (or (n_variants,))
+        """
+        if isinstance(genotypes, GenotypeStore):
+            if rows is None:
+                idx = genome_rows(genotypes, self._row_ids, self._row_order)
+                return allele_dosages(
+                    genotypes, idx, self._effect_codes, self._text_alleles
+                )
+            idx = genome_rows(genotypes, self._row_ids[rows])
+            text_alleles = {
+                k: self._text_alleles[i] for k, i in enumerate(rows.tolist())
+                if i in self._text_alleles
+            }
+            return allele_dosages(genotypes, idx, self._effect_codes[rows], text_alleles)
+
+        selected = range(self.n_variants) if rows is None else rows.tolist()
+        dosage = np.zeros(len(selected), dtype=np.float64)
+        present = np.zeros(len(selected), dtype=bool)
+        for k, i in enumerate(selected):
+            geno = genotypes.get(self.rsids[i])
+            if geno:
+                present[k] = True
+                dosage[k] = self._count_effect(geno, i)
+        return dosage, present
+
+    def _count_effect(self, genotype: str, i: int) -> int:
+        effect = self.effect_alleles[i]
+        return genotype.upper().count(effect) if effect else 0
+
+    # -------------------------------------------------------------------------
+    # Scoring
+    # -------------------------------------------------------------------------
+
+    def score(
+        self,
+        genotypes: Mapping[str, str],
+        score_ids: Optional[Sequence[str]] = None,
+    ) -> PRSScores:
+        """
+        Score one genome against every column, or only some.
+
+        Args:
+            genotypes: rsid -> genotype mapping (dict or GenotypeStore)
+            score_ids: Score only these columns (KeyError if unknown); only
+                their variants are joined against the genome
+
+        Returns:
+            PRSScores aligned to ``score_ids`` (default: the matrix's)
+        """
+        if score_ids is not None:
+            return self._score_columns(genotypes, list(score_ids))
+        dosage, present = self.dosages(genotypes)
+        return PRSScores(
+            score_ids=self.score_ids,
+            raw_scores=self.weights.T @ dosage,
+            variants_found=np.rint(
+                self.membership.T @ present.astype(np.float64)
+            ).astype(np.int64),
+            variants_total=self.variants_total,
+        )
+
+    def _score_columns(self, genotypes: Mapping[str, str], score_ids: List[str]) -> PRSScores:
+        if self._csc is None:
+            self._csc = (self.weights.tocsc(), self.membership.tocsc())
+        columns = [self._columns[score_id] for score_id in score_ids]
+        weights, membership = (m[:, columns] for m in self._csc)
+        rows = np.unique(membership.indices)
+        dosage, present = self.dosages(genotypes, rows)
+        return PRSScores(
+            score_ids=score_ids,
+            raw_scores=weights[rows].T @ dosage,
+            variants_found=np.rint(
+                membership[rows].T @ present.astype(np.float64)
+            ).astype(np.int64),
+            variants_total=self.variants_total[columns],
+        )
+
+    def score_many(self, genotype_sets: Sequence[Mapping[str, str]]) -> List[PRSScores]:
+        """
+        Score many genomes with one sparse matrix product.
+
+        Args:
+            genotype_sets: Genomes (rsid -> genotype mappings)
+
+        Returns:
+            One PRSScores per genome
+        """
+        if not genotype_sets:
+            return []
+        encoded = [self.dosages(g) for g in genotype_sets]
+        dosage = np.vstack([d for d, _ in encoded])
+        present = np.vstack([p for _, p in encoded]).astype(np.float64)
+
+        raw = np.asarray((self.weights.T @ dosage.T).T)
+        found = np.rint(np.asarray((self.membership.T @ present.T).T)).astype(np.int64)
+        return [
+            PRSScores(self.score_ids, raw[k], found[k], self.variants_total)
+            for k in range(len(genotype_sets))
+        ]
@@ -0,0 +1,261 @@
+"""
+Load-Time QC Accumulator
+
+Call-rate, heterozygosity and per-chromosome coverage counts collected
+while a genotype file is parsed, so quality reports don't need extra
+passes over the loaded calls.
+
+``GenotypeStore.from_arrays`` sees every parsed row (no-calls included,
+before they are dropped) together with its chromosome code, and fills a
+``QCStats`` with a handful of ``np.bincount`` calls over those columns.
+Loaders attach the file's header comments. The result is available as
+``store.qc``:
+
+    >>> genotypes, fmt = load_dna_file("genome.txt")
+    >>> genotypes.qc.call_rate
+    0.9931
+    >>> analyze_call_rate(genotypes)      # built from genotypes.qc
+
+Counts are per parsed row, so an rsID listed twice in a file counts
+twice (the store keeps the last call).
+
+Author: OpenClaw AI
+Date: 2026-02-07
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Mapping, Optional
+
+import numpy as np
+
+from .genotypes import (
+    CHROMOSOME_NAMES,
+    HAPLOID_BASE,
+    MISSING_CODE,
+    OTHER_CODE,
+    UNSTORED_HEMIZYGOUS,
+    UNSTORED_HETEROZYGOUS,
+    UNSTORED_INDEL,
+)
+
+
+N_CHROMOSOMES = len(CHROMOSOME_NAMES)
+
+#: Header lines kept from the input file
+HEADER_MAX_LINES = 100
+
+
+def _zeros() -> np.ndarray:
+    return np.zeros(N_CHROMOSOMES, dtype=np.int64)
+
+
+# Genotype code -> class (0 = no-call, 1 = hom, 2 = het, 3 = haploid,
+# 4 = verbatim side-table call)
+_NO_CALL, _HOM, _HET, _HAPLOID, _OTHER = range(5)
+_CODE_CLASS = np.zeros(256, dtype=np.uint8)
+for _code in range(16):
+    _CODE_CLASS[_code] = _HOM if _code >> 2 == _code & 3 else _HET
+_CODE_CLASS[HAPLOID_BASE:HAPLOID_BASE + 4] = _HAPLOID
+_CODE_CLASS[OTHER_CODE] = _OTHER
+_CODE_CLASS[MISSING_CODE] = _NO_CALL
+
+
+@dataclass
+class QCStats:
+    """
+    Per-chromosome call counts for one genome.
+
+    Each column is an int64 array indexed by chromosome code
+    (``CHROMOSOME_NAMES``; index 0 collects rows without a chromosome).
+
+    Attributes:
+        total: Parsed rows, no-calls included
+        no_calls: Rows without a call
+        heterozygous: Diploid calls with two different alleles
+        homozygous: Diploid calls with two identical alleles
+        hemizygous: Single-allele calls (male X/Y/MT)
+        indels: Insertion/deletion calls (also counted as het/hom)
+        header: Comment/meta lines from the top of the file
+    """
+    total: np.ndarray = field(default_factory=_zeros)
+    no_calls: np.ndarray = field(default_factory=_zeros)
+    heterozygous: np.ndarray = field(default_factory=_zeros)
+    homozygous: np.ndarray = field(default_factory=_zeros)
+    hemizygous: np.ndarray = field(default_factory=_zeros)
+    indels: np.ndarray = field(default_factory=_zeros)
+    header: str = ""
+
+    # -------------------------------------------------------------------------
+    # Construction
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def from_codes(
+        cls,
+        chromosomes: np.ndarray,
+        codes: np.ndarray,
+        other: Optional[Mapping[int, str]] = None,
+    ) -> "QCStats":
+        """
+        Count parsed rows.
+
+        Args:
+            chromosomes: uint8 chromosome code per row
+            codes: uint8 genotype code per row (MISSING_CODE for no-calls)
+            other: Row index -> verbatim genotype for OTHER_CODE rows
+        """
+        chromosomes = np.asarray(chromosomes, dtype=np.intp)
+        classes = _CODE_CLASS[np.asarray(codes, dtype=np.uint8)]
+        counts = np.bincount(
+            classes.astype(np.intp) * N_CHROMOSOMES + chromosomes,
+            minlength=5 * N_CHROMOSOMES,
+        ).reshape(5, N_CHROMOSOMES)
+        stats = cls(
+            total=counts.sum(axis=0),
+            no_calls=counts[_NO_CALL].copy(),
+            heterozygous=counts[_HET].copy(),
+            homozygous=counts[_HOM].copy(),
+            hemizygous=counts[_HAPLOID].copy(),
+        )
+        for row, genotype in (other or {}).items():
+            if codes[row] != OTHER_CODE:
+                continue
+            chrom = chromosomes[row]
+            upper = genotype.upper()
+            if "I" in upper or "D" in upper:
+                stats.indels[chrom] += 1
+            if len(upper) < 2:
+                stats.hemizygous[chrom] += 1
+            elif upper[0] != upper[1]:
+                stats.heterozygous[chrom] += 1
+            else:
+                stats.homozygous[chrom] += 1
+        return stats
+
+    @classmethod
+    def from_unstored(cls, chromosomes: np.ndarray, kinds: np.ndarray) -> "QCStats":
+        """
+        Count calls that were parsed but not stored (e.g. VCF indels).
+
+        Args:
+            chromosomes: uint8 chromosome code per call
+            kinds: uint8 ``UNSTORED_*`` flags per call (0 = homozygous)
+        """
+        chromosomes = np.asarray(chromosomes, dtype=np.intp)
+        kinds = np.asarray(kinds, dtype=np.uint8)
+
+        def count(mask: np.ndarray) -> np.ndarray:
+            return np.bincount(chromosomes[mask], minlength=N_CHROMOSOMES).astype(np.int64)
+
+        hemizygous = (kinds & UNSTORED_HEMIZYGOUS) != 0
+        heterozygous = ~hemizygous & ((kinds & UNSTORED_HETEROZYGOUS) != 0)
+        return cls(
+            total=count(np.ones(len(kinds), dtype=bool)),
+            heterozygous=count(heterozygous),
+            homozygous=count(~hemizygous & ~heterozygous),
+            hemizygous=count(hemizygous),
+            indels=count((kinds & UNSTORED_INDEL) != 0),
+        )
+
+    def merge(self, other: "QCStats") -> "QCStats":
+        """Combined counts of two inputs (e.g. per-chromosome files)."""
+        return QCStats(
+            total=self.total + other.total,
+            no_calls=self.no_calls + other.no_calls,
+            heterozygous=self.heterozygous + other.heterozygous,
+            homozygous=self.homozygous + other.homozygous,
+            hemizygous=self.hemizygous + other.hemizygous,
+            indels=self.indels + other.indels,
+            header=self.header or other.header,
+        )
+
+    def set_header(self, text: str) -> None:
+        """Keep the first HEADER_MAX_LINES lines of the file header."""
+        self.header = "\n".join(text.splitlines()[:HEADER_MAX_LINES])
+
+    # -------------------------------------------------------------------------
+    # Totals
+    # -------------------------------------------------------------------------
+
+    @property
+    def total_snps(self) -> int:
+        return int(self.total.sum())
+
+    @property
+    def no_call_count(self) -> int:
+        return int(self.no_calls.sum())
+
+    @property
+    def called_snps(self) -> int:
+        return self.total_snps - self.no_call_count
+
+    @property
+    def call_rate(self) -> float:
+        total = self.total_snps
+        return self.called_snps / total if total else 0.0
+
+    @property
+    def heterozygous_count(self) -> int:
+        return int(self.heterozygous.sum())
+
+    @property
+    def homozygous_count(self) -> int:
+        return int(self.homozygous.sum())
+
+    @property
+    def hemizygous_count(self) -> int:
+        return int(self.hemizygous.sum())
+
+    @property
+    def indel_count(self) -> int:
+        return int(self.indels.sum())
+
+    @property
+    def has_chromosomes(self) -> bool:
+        """True if any row carried a known chromosome."""
+        return bool(self.total[1:].any())
+
+    def chromosome_counts(self) -> Dict[str, Dict[str, int]]:
+        """
+        Counts per chromosome label, for chromosomes with at least one row.
+
+        Returns:
+            Dict of chromosome -> {"total", "called", "no_calls",
+            "heterozygous", "homozygous", "hemizygous", "indels"}
+        """
+        result = {}
+        for code in np.flatnonzero(self.total[1:]) + 1:
+            total = int(self.total[code])
+            no_calls = int(self.no_calls[code])
+            result[CHROMOSOME_NAMES[code]] = {
+                "total": total,
+                "called": total - no_calls,
+                "no_calls": no_calls,
+                "heterozygous": int(self.heterozygous[code]),
+                "homozygous": int(self.homozygous[code]),
+                "hemizygous": int(self.hemizygous[code]),
+                "indels": int(self.indels[code]),
+            }
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_snps": self.total_snps,
+            "called_snps": self.called_snps,
+            "no_calls": self.no_call_count,
+            "call_rate": round(self.call_rate, 4),
+            "heterozygous": self.heterozygous_count,
+            "homozygous": self.homozygous_count,
+            "hemizygous": self.hemizygous_count,
+            "indels": self.indel_count,
+            "chromosomes": self.chromosome_counts(),
+        }
+
+
+def get_qc(genotypes: Any, qc: Optional[QCStats] = None) -> Optional[QCStats]:
+    """The explicit ``qc`` if given, else the accumulator attached to a store."""
+    if qc is not None:
+        return qc
+    return getattr(genotypes, "qc", None)
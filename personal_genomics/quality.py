@@ -19,6 +19,7 @@ from enum import Enum
 from typing import Dict, List, Optional, Set, Tuple, Any
 from collections import defaultdict
 
+from .qc import QCStats, get_qc
 from .statistics import ConfidenceLevel, StatisticalResult, wilson_score_interval
 
 
@@ -270,7 +271,8 @@ CATEGORY_MARKER_COUNTS = {
 
 def assess_chromosome_quality(
     genotypes: Dict[str, str],
-    chromosome_map: Dict[str, str]  # rsid -> chromosome
+    chromosome_map: Optional[Dict[str, str]] = None,  # rsid -> chromosome
+    qc: Optional[QCStats] = None
 ) -> Dict[str, ChromosomeQuality]:
     """
     Assess quality metrics per chromosome.
@@ -278,6 +280,8 @@ def assess_chromosome_quality(
     Args:
         genotypes: Dict of rsid -> genotype
         chromosome_map: Dict of rsid -> chromosome number
+        qc: Load-time QC counts (default: ``genotypes.qc`` if present);
+            used when no ``chromosome_map`` is given
         
     Returns:
         Dict of chromosome -> ChromosomeQuality
@@ -285,20 +289,32 @@ def assess_chromosome_quality(
     # Count SNPs per chromosome
     chrom_counts: Dict[str, Dict[str, int]] = defaultdict(lambda: {"total": 0, "called": 0, "nocall": 0})
     
-    for rsid, geno in genotypes.items():
-        chrom = chromosome_map.get(rsid, "unknown")
-        if chrom == "unknown":
-            continue
-        
-        # Normalize chromosome name
-        chrom = str(chrom).upper().replace("CHR", "")
-        
-        chrom_counts[chrom]["total"] += 1
-        
-        if geno and geno not in ("--", "00", "??", "NC", ""):
-            chrom_counts[chrom]["called"] += 1
-        else:
-            chrom_counts[chrom]["nocall"] += 1
+    if chromosome_map is None:
+        qc = get_qc(genotypes, qc)
+        if qc is None:
+            return {}
+        for chrom, counts in qc.chromosome_counts().items():
+            chrom_counts[chrom] = {
+                "total": counts["total"],
+                "called": counts["called"],
+                "nocall": counts["no_calls"],
+            }
+    
+    else:
+        for rsid, geno in genotypes.items():
+            chrom = chromosome_map.get(rsid, "unknown")
+            if chrom == "unknown":
+                continue
+            
+            # Normalize chromosome name
+            chrom = str(chrom).upper().replace("CHR", "")
+            
+            chrom_counts[chrom]["total"] += 1
+            
+            if geno and geno not in ("--", "00", "??", "NC", ""):
+                chrom_counts[chrom]["called"] += 1
+            else:
+                chrom_counts[chrom]["nocall"] += 1
     
     # Build quality reports
     results = {}
@@ -541,7 +557,8 @@ def calculate_overall_score(
 def generate_quality_report(
     genotypes: Dict[str, str],
     chromosome_map: Dict[str, str] = None,
-    category_markers: Dict[str, Set[str]] = None
+    category_markers: Dict[str, Set[str]] = None,
+    qc: Optional[QCStats] = None
 ) -> QualityReport:
     """
     Generate comprehensive quality assessment report.
@@ -550,24 +567,35 @@ def generate_quality_report(
         genotypes: Dict of rsid -> genotype
         chromosome_map: Optional dict of rsid -> chromosome
         category_markers: Optional dict of category -> marker rsids
+        qc: Load-time QC counts (default: ``genotypes.qc`` if present).
+            Supplies the call counts (no-calls included) and the
+            per-chromosome breakdown without iterating over ``genotypes``.
         
     Returns:
         QualityReport object
     """
-    total_snps = len(genotypes)
+    qc = get_qc(genotypes, qc)
     
-    # Count called SNPs
-    called_snps = sum(
-        1 for geno in genotypes.values()
-        if geno and geno not in ("--", "00", "??", "NC", "")
-    )
+    if qc is not None:
+        total_snps = qc.total_snps
+        called_snps = qc.called_snps
+    else:
+        total_snps = len(genotypes)
+        
+        # Count called SNPs
+        called_snps = sum(
+            1 for geno in genotypes.values()
+            if geno and geno not in ("--", "00", "??", "NC", "")
+        )
     
     call_rate = called_snps / total_snps if total_snps > 0 else 0
     
-    # Chromosome quality (if map provided)
+    # Chromosome quality (if map or per-chromosome QC counts available)
     chrom_quality = {}
     if chromosome_map:
         chrom_quality = assess_chromosome_quality(genotypes, chromosome_map)
+    elif qc is not None and qc.has_chromosomes:
+        chrom_quality = assess_chromosome_quality(genotypes, qc=qc)
     
     # Category coverage (if markers provided)
     cat_coverage = {}
@@ -0,0 +1,194 @@
+"""
+Result Cache
+
+Content-addressed, size-bounded on-disk store for analysis results. Keys
+are built from the input file's SHA-256, the analysis version and a
+fingerprint of whatever the cached value was computed from (a marker
+table, a weight table, a module's source), so an entry is simply never
+looked up again once any of those change:
+
+    >>> cache = ResultCache("~/dna-analysis/cache")
+    >>> key = cache_key(file_digest("kit.txt"), "4.4.0", "traits", fingerprint(TRAIT_MARKERS))
+    >>> result = cache.get(key)
+    >>> if result is None:
+    ...     result = analyze(...)
+    ...     cache.put(key, result)
+
+Entries are zlib-compressed pickles in one SQLite file, so several
+processes (e.g. ``analyze_many`` workers) can share a cache. When the
+stored total exceeds ``max_bytes`` the least recently used entries are
+evicted.
+
+The cache only holds values this package wrote itself; do not point it
+at a database from an untrusted source (values are unpickled).
+
+Author: OpenClaw AI
+Date: 2026-02-07
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import pickle
+import sqlite3
+import time
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Union
+
+
+DEFAULT_CACHE_DIR = Path.home() / "dna-analysis" / "cache"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+CACHE_DB_NAME = "results.sqlite"
+
+_HASH_CHUNK = 1024 * 1024
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    """SHA-256 hex digest of a file's raw (still compressed) bytes."""
+    digest = hashlib.sha256()
+    with open(Path(path).expanduser(), "rb") as fh:
+        while True:
+            chunk = fh.read(_HASH_CHUNK)
+            if not chunk:
+                return digest.hexdigest()
+            digest.update(chunk)
+
+
+def fingerprint(obj: Any) -> str:
+    """
+    SHA-256 hex digest of a JSON-like object (marker or weight table).
+
+    Keys are sorted, so two tables with the same content fingerprint the
+    same regardless of insertion order; non-JSON values fall back to str().
+    """
+    canonical = json.dumps(obj, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def cache_key(*parts: Any) -> str:
+    """Combine key parts (digests, version, names) into one cache key."""
+    return hashlib.sha256("\x1f".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk key -> value store with least-recently-used eviction.
+
+    Args:
+        path: Cache directory (default: ~/dna-analysis/cache)
+        max_bytes: Bound on the total compressed size of stored values
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.path = Path(path).expanduser() if path is not None else DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.path.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON entries(last_used)")
+
+    @property
+    def db_path(self) -> Path:
+        return self.path / CACHE_DB_NAME
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A short-lived connection per call keeps the cache usable from
+        # threads and pool workers alike
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Stored value for ``key`` (None on a miss)."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+        if row is None:
+            self.misses += 1
+            return None
+        try:
+            value = pickle.loads(zlib.decompress(row[0]))
+        except Exception:
+            # Written by an incompatible version; treat as a miss
+            self.discard(key)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store ``value`` under ``key``, then evict down to ``max_bytes``."""
+        blob = zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), 6)
+        if len(blob) > self.max_bytes:
+            return
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, sqlite3.Binary(blob), len(blob), time.time()),
+            )
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        stale = []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_used"):
+            stale.append((key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+        conn.executemany("DELETE FROM entries WHERE key = ?", stale)
+
+    def discard(self, key: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries")
+        self.hits = self.misses = 0
+
+    def __contains__(self, key: str) -> bool:
+        with self._connect() as conn:
+            return conn.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    @property
+    def size_bytes(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self),
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
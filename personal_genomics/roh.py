@@ -0,0 +1,316 @@
+"""
+Runs of Homozygosity
+
+PLINK ``--homozyg``-style ROH caller over position-sorted, per-chromosome
+arrays.
+
+For each chromosome (SNPs sorted by position):
+
+    1. Slide a window of ``window_snps`` SNPs along the chromosome; a
+       window is homozygous if it holds at most ``window_het``
+       heterozygous and ``window_missing`` missing calls. Window counts
+       come from prefix sums, so every window is scored at once.
+    2. A SNP is in a candidate run if at least ``window_threshold`` of
+       the windows overlapping it are homozygous.
+    3. Consecutive candidate SNPs form a run, split wherever two SNPs
+       are more than ``max_gap_kb`` apart.
+    4. Runs are kept if they have at least ``min_snps`` SNPs, span at
+       least ``min_kb``, average no more than ``density_kb`` per SNP and
+       hold at most ``max_het`` heterozygous calls.
+
+F_ROH is the total ROH length over the autosomal span covered by the
+input.
+
+``ROHCaller`` takes one chromosome at a time, so WGS-density input can be
+streamed (``VCFReader.iter_chromosome_calls``) without loading the whole
+genome:
+
+    >>> caller = ROHCaller()
+    >>> for chrom, pos, het, missing in VCFReader("wgs.vcf.gz").iter_chromosome_calls():
+    ...     caller.add_chromosome(chrom, pos, het, missing)
+    >>> caller.result().froh
+
+Author: OpenClaw AI
+Date: 2026-02-07
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .genotypes import CHROMOSOME_NAMES, GenotypeStore
+
+
+#: Chromosome labels treated as autosomes (only these count towards F_ROH)
+AUTOSOMES = frozenset(str(i) for i in range(1, 23))
+
+
+@dataclass(frozen=True)
+class ROHParams:
+    """
+    ROH calling parameters (defaults follow PLINK 1.9 ``--homozyg``).
+
+    Attributes:
+        window_snps: SNPs per scanning window (``--homozyg-window-snp``)
+        window_het: Heterozygous calls allowed per window (``--homozyg-window-het``)
+        window_missing: Missing calls allowed per window (``--homozyg-window-missing``)
+        window_threshold: Fraction of overlapping homozygous windows a SNP
+            needs to be in a run (``--homozyg-window-threshold``)
+        min_snps: Minimum SNPs in a run (``--homozyg-snp``)
+        min_kb: Minimum run length in kb (``--homozyg-kb``)
+        density_kb: Maximum average kb per SNP in a run (``--homozyg-density``)
+        max_gap_kb: Split runs at gaps longer than this (``--homozyg-gap``)
+        max_het: Heterozygous calls allowed in a whole run (``--homozyg-het``),
+            None for no limit
+    """
+    window_snps: int = 50
+    window_het: int = 1
+    window_missing: int = 5
+    window_threshold: float = 0.05
+    min_snps: int = 100
+    min_kb: float = 1000.0
+    density_kb: float = 50.0
+    max_gap_kb: float = 1000.0
+    max_het: Optional[int] = None
+
+
+@dataclass
+class ROHSegment:
+    """One run of homozygosity."""
+    chromosome: str
+    start: int
+    end: int
+    n_snps: int
+    n_het: int
+
+    @property
+    def length_kb(self) -> float:
+        return (self.end - self.start) / 1000.0
+
+    @property
+    def kb_per_snp(self) -> float:
+        return self.length_kb / self.n_snps if self.n_snps else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **asdict(self),
+            "length_kb": round(self.length_kb, 1),
+            "kb_per_snp": round(self.kb_per_snp, 2),
+        }
+
+
+@dataclass
+class ROHResult:
+    """
+    ROH segments for one genome.
+
+    Attributes:
+        segments: Runs in chromosome/position order
+        covered_kb: Span covered by SNPs per chromosome (last - first position)
+        snps_scanned: SNPs per chromosome
+    """
+    segments: List[ROHSegment] = field(default_factory=list)
+    covered_kb: Dict[str, float] = field(default_factory=dict)
+    snps_scanned: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total_kb(self) -> float:
+        """Total ROH length over all chromosomes."""
+        return sum(s.length_kb for s in self.segments)
+
+    @property
+    def autosomal_kb(self) -> float:
+        return sum(s.length_kb for s in self.segments if s.chromosome in AUTOSOMES)
+
+    @property
+    def froh(self) -> float:
+        """Autosomal ROH length / autosomal span covered by the input."""
+        covered = sum(kb for chrom, kb in self.covered_kb.items() if chrom in AUTOSOMES)
+        return self.autosomal_kb / covered if covered else 0.0
+
+    def by_chromosome(self) -> Dict[str, Dict[str, float]]:
+        """Number and total length (kb) of runs per chromosome."""
+        summary: Dict[str, Dict[str, float]] = {}
+        for segment in self.segments:
+            entry = summary.setdefault(segment.chromosome, {"segments": 0, "total_kb": 0.0})
+            entry["segments"] += 1
+            entry["total_kb"] += segment.length_kb
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "segments": [s.to_dict() for s in self.segments],
+            "segment_count": len(self.segments),
+            "total_kb": round(self.total_kb, 1),
+            "froh": round(self.froh, 4),
+            "snps_scanned": sum(self.snps_scanned.values()),
+            "by_chromosome": self.by_chromosome(),
+        }
+
+
+# =============================================================================
+# CALLING
+# =============================================================================
+
+def call_roh_chromosome(
+    chromosome: str,
+    positions: np.ndarray,
+    het: np.ndarray,
+    missing: Optional[np.ndarray] = None,
+    params: ROHParams = ROHParams(),
+) -> List[ROHSegment]:
+    """
+    Call runs of homozygosity on one chromosome.
+
+    Args:
+        chromosome: Chromosome label for the returned segments
+        positions: Base-pair positions, sorted ascending
+        het: Boolean heterozygous-call mask aligned to ``positions``
+        missing: Boolean no-call mask (None if no-calls were dropped)
+        params: Calling parameters
+
+    Returns:
+        Segments in position order
+    """
+    positions = np.asarray(positions, dtype=np.int64)
+    n = len(positions)
+    if n < max(params.min_snps, 1):
+        return []
+    window = min(params.window_snps, n)
+
+    het_sum = np.concatenate(([0], np.cumsum(het, dtype=np.int64)))
+    hom_window = (het_sum[window:] - het_sum[:-window]) <= params.window_het
+    if missing is not None:
+        missing_sum = np.concatenate(([0], np.cumsum(missing, dtype=np.int64)))
+        hom_window &= (missing_sum[window:] - missing_sum[:-window]) <= params.window_missing
+
+    # Fraction of the windows overlapping each SNP that are homozygous
+    n_windows = n - window + 1
+    window_sum = np.concatenate(([0], np.cumsum(hom_window, dtype=np.int64)))
+    snp = np.arange(n)
+    first = np.maximum(snp - window + 1, 0)
+    last = np.minimum(snp, n_windows - 1) + 1
+    hom_count = window_sum[last] - window_sum[first]
+    in_run = (hom_count > 0) & (hom_count >= params.window_threshold * (last - first))
+
+    # Run boundaries: entering/leaving candidate SNPs or crossing a large gap
+    gap = np.diff(positions) > params.max_gap_kb * 1000
+    starts = np.flatnonzero(in_run & ~np.concatenate(([False], in_run[:-1] & ~gap)))
+    ends = np.flatnonzero(in_run & ~np.concatenate((in_run[1:] & ~gap, [False])))
+
+    segments = []
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        # A run shouldn't begin or end on a heterozygous call
+        while start < end and het[start]:
+            start += 1
+        while end > start and het[end]:
+            end -= 1
+        n_snps = end - start + 1
+        length_kb = (positions[end] - positions[start]) / 1000.0
+        n_het = int(het_sum[end + 1] - het_sum[start])
+        if (
+            n_snps < params.min_snps
+            or length_kb < params.min_kb
+            or length_kb > params.density_kb * n_snps
+            or (params.max_het is not None and n_het > params.max_het)
+        ):
+            continue
+        segments.append(ROHSegment(
+            chromosome=chromosome,
+            start=int(positions[start]),
+            end=int(positions[end]),
+            n_snps=n_snps,
+            n_het=n_het,
+        ))
+    return segments
+
+
+class ROHCaller:
+    """
+    Accumulate ROH calls one chromosome at a time.
+
+    Only the current chromosome's arrays are held in memory, so a
+    streamed WGS sample costs as much as its largest chromosome.
+    """
+
+    def __init__(self, params: Optional[ROHParams] = None):
+        self.params = params or ROHParams()
+        self._result = ROHResult()
+
+    def add_chromosome(
+        self,
+        chromosome: str,
+        positions: np.ndarray,
+        het: np.ndarray,
+        missing: Optional[np.ndarray] = None,
+    ) -> List[ROHSegment]:
+        """Call one chromosome and add it to the result; returns its segments."""
+        positions = np.asarray(positions)
+        het = np.asarray(het, dtype=bool)
+        if len(positions) > 1 and np.any(positions[1:] < positions[:-1]):
+            order = np.argsort(positions, kind="stable")
+            positions, het = positions[order], het[order]
+            missing = None if missing is None else np.asarray(missing, dtype=bool)[order]
+        segments = call_roh_chromosome(chromosome, positions, het, missing, self.params)
+        self._result.segments.extend(segments)
+        if len(positions):
+            span = (int(positions[-1]) - int(positions[0])) / 1000.0
+            self._result.covered_kb[chromosome] = self._result.covered_kb.get(chromosome, 0.0) + span
+        self._result.snps_scanned[chromosome] = (
+            self._result.snps_scanned.get(chromosome, 0) + len(positions)
+        )
+        return segments
+
+    def result(self) -> ROHResult:
+        return self._result
+
+
+def iter_store_chromosomes(
+    store: GenotypeStore,
+    autosomes_only: bool = True,
+) -> Iterator[Tuple[str, np.ndarray, np.ndarray]]:
+    """
+    Split a store into position-sorted per-chromosome arrays.
+
+    Yields:
+        (chromosome, positions, het) for each chromosome with calls;
+        rows without a chromosome or position are skipped
+    """
+    usable = np.flatnonzero((store.chromosomes > 0) & (store.positions > 0))
+    order = usable[np.lexsort((store.positions[usable], store.chromosomes[usable]))]
+    chromosomes = store.chromosomes[order]
+    positions = store.positions[order]
+    het = store.heterozygous_mask()[order]
+    bounds = np.flatnonzero(np.diff(chromosomes)) + 1
+    for lo, hi in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [len(order)]))):
+        if hi <= lo:
+            continue
+        name = CHROMOSOME_NAMES[chromosomes[lo]]
+        if autosomes_only and name not in AUTOSOMES:
+            continue
+        yield name, positions[lo:hi], het[lo:hi]
+
+
+def call_roh(
+    store: GenotypeStore,
+    params: Optional[ROHParams] = None,
+    autosomes_only: bool = True,
+) -> ROHResult:
+    """
+    Call runs of homozygosity on a genome with chromosome/position columns.
+
+    Args:
+        store: Loaded genome (``store.has_positions`` should be True)
+        params: Calling parameters (PLINK defaults)
+        autosomes_only: Skip X, Y, XY and MT
+
+    Returns:
+        ROHResult
+    """
+    caller = ROHCaller(params)
+    for chromosome, positions, het in iter_store_chromosomes(store, autosomes_only):
+        caller.add_chromosome(chromosome, positions, het)
+    return caller.result()
@@ -0,0 +1,321 @@
+"""
+Stage Scheduler
+
+Runs the stages of an analysis as a small dependency graph. Stages whose
+dependencies are done run concurrently in a thread or process pool, so a
+run takes about as long as its longest chain of stages rather than the sum
+of all of them.
+
+Each stage is called with its fixed ``args`` followed by the results of
+the stages it depends on, in ``depends`` order:
+
+    >>> scheduler = StageScheduler([
+    ...     Stage("genotypes", load_dna_file, args=("kit.txt",)),
+    ...     Stage("clinvar", analyze_clinvar, depends=("genotypes",)),
+    ...     Stage("gwas", analyze_gwas_traits, depends=("genotypes",)),
+    ... ])
+    >>> results, timings = scheduler.run()
+    >>> timings["clinvar"].seconds
+
+A stage that raises is recorded in its ``StageTiming.error``; stages that
+depend on it are skipped, independent stages still run.
+
+Each stage reports the peak RSS of the process that ran it
+(``memory_scope == "process"``). With ``trace_memory=True`` the "serial"
+and "process" executors, whose stages don't share a process with other
+running stages, measure the stage's own peak with ``tracemalloc`` instead
+(``memory_scope == "stage"``); tracing slows stages down, so it is off by
+default.
+
+Author: OpenClaw AI
+Date: 2026-02-07
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+EXECUTORS = ("thread", "process", "serial")
+
+
+@dataclass
+class Stage:
+    """One unit of work in a ``StageScheduler`` graph."""
+    name: str
+    func: Callable[..., Any]
+    depends: Tuple[str, ...] = ()
+    args: Tuple[Any, ...] = ()
+
+
+@dataclass
+class StageTiming:
+    """Wall time and peak memory of one stage run."""
+    name: str
+    seconds: float = 0.0
+    peak_memory_mb: Optional[float] = None
+    memory_scope: str = "stage"
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _process_peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None if unavailable)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, kilobytes elsewhere
+    return round(peak / 1e6 if sys.platform == "darwin" else peak / 1e3, 1)
+
+
+def _run_stage(
+    func: Callable[..., Any],
+    args: Tuple[Any, ...],
+    trace_memory: bool,
+) -> Tuple[Any, Optional[str], float, Optional[float]]:
+    """
+    Run one stage; never raises (runs in pool workers).
+
+    Returns:
+        (value, error, seconds, peak memory in MB): traced if
+        ``trace_memory``, else the process peak RSS
+    """
+    started = False
+    base = 0
+    if trace_memory:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started = True
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+
+    value, error = None, None
+    start = time.perf_counter()
+    try:
+        value = func(*args)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    seconds = time.perf_counter() - start
+
+    if trace_memory:
+        peak = round(max(tracemalloc.get_traced_memory()[1] - base, 0) / 1e6, 2)
+        if started:
+            tracemalloc.stop()
+    else:
+        peak = _process_peak_rss_mb()
+    return value, error, seconds, peak
+
+
+class StageScheduler:
+    """
+    Dependency-ordered, concurrent stage runner.
+
+    Args:
+        stages: Stages with unique names; dependencies must name stages
+            in the same list
+        executor: "thread" (default), "process" (stage functions, args and
+            results must be picklable) or "serial"
+        max_workers: Pool size (default: number of stages)
+        trace_memory: Measure per-stage peak memory with tracemalloc in
+            the "serial" and "process" executors (slower; default reports
+            process peak RSS)
+
+    Raises:
+        ValueError: For unknown executors, duplicate names, unknown
+            dependencies or dependency cycles
+    """
+
+    def __init__(
+        self,
+        stages: Iterable[Stage],
+        executor: str = "thread",
+        max_workers: Optional[int] = None,
+        trace_memory: bool = False,
+    ):
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor {executor!r} (expected one of {EXECUTORS})")
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage {stage.name!r}")
+            self.stages[stage.name] = stage
+        for stage in self.stages.values():
+            for dep in stage.depends:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage {stage.name!r} depends on unknown stage {dep!r}")
+        self.executor = executor
+        self.max_workers = max_workers
+        self.trace_memory = trace_memory
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        order: List[str] = []
+        state: Dict[str, int] = {}   # 1 = visiting, 2 = done
+
+        def visit(name: str, path: Tuple[str, ...]) -> None:
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Dependency cycle: {' -> '.join(path + (name,))}")
+            state[name] = 1
+            for dep in self.stages[name].depends:
+                visit(dep, path + (name,))
+            state[name] = 2
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, ())
+        return order
+
+    def closure(self, names: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Stages needed to run ``names`` (with their dependencies), in
+        dependency order; all stages if ``names`` is None.
+
+        Raises:
+            ValueError: For unknown stage names
+        """
+        if names is None:
+            return list(self.order)
+        needed = set()
+        stack = list(names)
+        while stack:
+            name = stack.pop()
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage {name!r} (available: {', '.join(self.stages)})")
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.stages[name].depends)
+        return [name for name in self.order if name in needed]
+
+    # -------------------------------------------------------------------------
+    # Running
+    # -------------------------------------------------------------------------
+
+    def run(
+        self,
+        only: Optional[Iterable[str]] = None,
+    ) -> Tuple[Dict[str, Any], Dict[str, StageTiming]]:
+        """
+        Run the selected stages (default: all) and their dependencies.
+
+        Returns:
+            (results, timings): stage name -> return value for stages that
+            succeeded, and stage name -> StageTiming for every selected stage
+        """
+        names = self.closure(only)
+        if self.executor == "serial" or len(names) <= 1:
+            return self._run_serial(names)
+        return self._run_pool(names)
+
+    def _args(self, name: str, results: Dict[str, Any]) -> Tuple[Any, ...]:
+        stage = self.stages[name]
+        return stage.args + tuple(results[dep] for dep in stage.depends)
+
+    def _failed_dependency(self, name: str, timings: Dict[str, StageTiming]) -> Optional[str]:
+        for dep in self.stages[name].depends:
+            if not timings[dep].ok:
+                return dep
+        return None
+
+    def _record(
+        self,
+        name: str,
+        outcome: Tuple[Any, Optional[str], float, Optional[float]],
+        results: Dict[str, Any],
+        timings: Dict[str, StageTiming],
+        memory_scope: str,
+    ) -> None:
+        value, error, seconds, peak = outcome
+        timings[name] = StageTiming(
+            name=name,
+            seconds=round(seconds, 4),
+            peak_memory_mb=peak,
+            memory_scope=memory_scope,
+            error=error,
+        )
+        if error is None:
+            results[name] = value
+
+    def _run_serial(self, names: Sequence[str]) -> Tuple[Dict[str, Any], Dict[str, StageTiming]]:
+        results: Dict[str, Any] = {}
+        timings: Dict[str, StageTiming] = {}
+        for name in names:
+            failed = self._failed_dependency(name, timings)
+            if failed:
+                timings[name] = StageTiming(name, error=f"skipped: {failed} failed")
+                continue
+            stage = self.stages[name]
+            outcome = _run_stage(stage.func, self._args(name, results), self.trace_memory)
+            self._record(name, outcome, results, timings, "stage" if self.trace_memory else "process")
+        return results, timings
+
+    def _make_pool(self, n_stages: int) -> Executor:
+        workers = self.max_workers or n_stages
+        if self.executor == "process":
+            return ProcessPoolExecutor(max_workers=workers)
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stage")
+
+    def _run_pool(self, names: Sequence[str]) -> Tuple[Dict[str, Any], Dict[str, StageTiming]]:
+        results: Dict[str, Any] = {}
+        timings: Dict[str, StageTiming] = {}
+        waiting = {name: set(self.stages[name].depends) for name in names}
+        dependents: Dict[str, List[str]] = {name: [] for name in names}
+        for name in names:
+            for dep in self.stages[name].depends:
+                dependents[dep].append(name)
+
+        trace = self.trace_memory and self.executor != "thread"
+        scope = "stage" if trace else "process"
+
+        with self._make_pool(len(names)) as pool:
+            running = {}
+
+            def submit_ready() -> None:
+                # Skipping a stage can make its dependents ready too
+                ready = [n for n, deps in waiting.items() if not deps]
+                while ready:
+                    for name in ready:
+                        del waiting[name]
+                        failed = self._failed_dependency(name, timings)
+                        if failed:
+                            timings[name] = StageTiming(name, error=f"skipped: {failed} failed")
+                            release(name)
+                            continue
+                        stage = self.stages[name]
+                        future = pool.submit(_run_stage, stage.func, self._args(name, results), trace)
+                        running[future] = name
+                    ready = [n for n, deps in waiting.items() if not deps]
+
+            def release(name: str) -> None:
+                for dependent in dependents[name]:
+                    waiting[dependent].discard(name)
+
+            submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        outcome = future.result()
+                    except Exception as e:
+                        # Worker died, or the stage or its result could not be pickled
+                        outcome = (None, f"{type(e).__name__}: {e}", 0.0, None)
+                    self._record(name, outcome, results, timings, scope)
+                    release(name)
+                submit_ready()
+
+        return results, {name: timings[name] for name in names}
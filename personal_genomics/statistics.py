@@ -10,6 +10,7 @@ Date: 2026-02-07
 
 from __future__ import annotations
 
+import importlib
 import math
 from dataclasses import dataclass, field
 from enum import Enum
@@ -18,8 +19,24 @@ from typing import (
 )
 
 import numpy as np
-from scipy import stats
-from scipy.special import betainc, betaln
+
+
+class _LazyModule:
+    """Module proxy that imports on first attribute access."""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr: str):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+# scipy.stats takes most of a second to import; defer it until a function
+# actually needs a distribution so CLI start-up stays fast
+stats = _LazyModule("scipy.stats")
 
 
 # =============================================================================
@@ -288,22 +305,91 @@ def bayesian_posterior(
     return mean, ci
 
 
+# NumPy reductions that accept ``axis=`` and can score every bootstrap
+# resample in one call
+_AXIS_STATISTICS = frozenset({
+    np.mean, np.median, np.std, np.var, np.sum, np.min, np.max,
+    np.amin, np.amax, np.nanmean, np.nanmedian, np.nanstd, np.nanvar, np.nansum,
+})
+
+# Resample matrix elements drawn at once (indices + values ~ 16 bytes each)
+BOOTSTRAP_MAX_ELEMENTS = 1 << 22
+
+
+def bootstrap_distribution(
+    data: Sequence[float],
+    statistic: Callable[..., float],
+    n_bootstrap: int = 1000,
+    random_state: Optional[Union[int, np.random.Generator]] = None,
+    vectorized: Optional[bool] = None,
+    max_elements: int = BOOTSTRAP_MAX_ELEMENTS
+) -> np.ndarray:
+    """
+    Statistic of ``n_bootstrap`` resamples (with replacement) of ``data``.
+    
+    Resample indices are drawn as (rows x n) matrices, at most
+    ``max_elements`` entries at a time. A vectorized statistic is applied
+    to each matrix in one call with ``axis=1``; any other callable is
+    applied row by row.
+    
+    Args:
+        data: Sequence of observations
+        statistic: Function to compute statistic from sample
+        n_bootstrap: Number of resamples
+        random_state: Random seed or Generator
+        vectorized: Whether ``statistic(samples, axis=1)`` works (default:
+            True for NumPy reductions such as np.mean and np.median)
+        max_elements: Bound on resample matrix size per chunk
+        
+    Returns:
+        float64 array of length ``n_bootstrap``
+    """
+    rng = np.random.default_rng(random_state)
+    data_arr = np.asarray(data)
+    n = len(data_arr)
+    if vectorized is None:
+        vectorized = statistic in _AXIS_STATISTICS
+    
+    out = np.empty(n_bootstrap, dtype=np.float64)
+    if n == 0:
+        out.fill(np.nan)
+        return out
+    
+    rows = max(1, max_elements // n)
+    for start in range(0, n_bootstrap, rows):
+        count = min(rows, n_bootstrap - start)
+        samples = data_arr[rng.integers(0, n, size=(count, n))]
+        if vectorized:
+            out[start:start + count] = statistic(samples, axis=1)
+        else:
+            for i in range(count):
+                out[start + i] = statistic(samples[i])
+    return out
+
+
 def bootstrap_ci(
     data: Sequence[float],
     statistic: Callable[[Sequence[float]], float],
     n_bootstrap: int = 1000,
     confidence: float = 0.95,
-    random_state: Optional[int] = None
+    random_state: Optional[int] = None,
+    vectorized: Optional[bool] = None
 ) -> ConfidenceInterval:
     """
     Bootstrap confidence interval for any statistic.
     
+    Resamples are drawn in batches (see ``bootstrap_distribution``), so
+    NumPy reductions like np.mean or np.median handle 10k+ resamples in
+    a few vectorized calls.
+    
     Args:
         data: Sequence of observations
         statistic: Function to compute statistic from sample
         n_bootstrap: Number of bootstrap iterations (default 1000)
         confidence: Confidence level (default 0.95)
         random_state: Random seed for reproducibility
+        vectorized: Whether ``statistic`` accepts ``axis=`` (default:
+            detected for NumPy reductions)
         
     Returns:
         ConfidenceInterval object
@@ -319,7 +405,6 @@ def bootstrap_ci(
             confidence=confidence, method="bootstrap_empty", n=0
         )
     
-    rng = np.random.default_rng(random_state)
     data_arr = np.array(data)
     n = len(data_arr)
     
@@ -327,17 +412,14 @@ def bootstrap_ci(
     original = statistic(data_arr)
     
     # Bootstrap resampling
-    bootstrap_stats = []
-    for _ in range(n_bootstrap):
-        sample = rng.choice(data_arr, size=n, replace=True)
-        bootstrap_stats.append(statistic(sample))
-    
-    bootstrap_stats = np.array(bootstrap_stats)
+    bootstrap_stats = bootstrap_distribution(
+        data_arr, statistic, n_bootstrap,
+        random_state=random_state, vectorized=vectorized
+    )
     
     # Percentile method
     alpha = 1 - confidence
-    lower = np.percentile(bootstrap_stats, 100 * alpha / 2)
-    upper = np.percentile(bootstrap_stats, 100 * (1 - alpha / 2))
+    lower, upper = np.percentile(bootstrap_stats, [100 * alpha / 2, 100 * (1 - alpha / 2)])
     
     return ConfidenceInterval(
         lower=float(lower),
@@ -0,0 +1,689 @@
+"""
+VCF Reader with BGZF Block Index
+
+Reads single- and multi-sample VCF files (plain, gzip or BGZF) into
+``GenotypeStore`` objects, one per sample.
+
+Variants with an rsID are keyed by it; records whose ID column is ``.``
+(or holds a non-rs identifier) are keyed by ``chrom:pos`` (see
+``genotypes.locus_id``).
+
+BGZF-compressed files (``bgzip`` output, the usual ``.vcf.gz``) are made
+of independent deflate blocks of at most 64 KB. ``BGZFIndex`` records the
+compressed offset of every block together with the rsIDs and the locus
+range of the records that start in it. The index is saved next to the
+VCF as ``<file>.blocks.npz`` and reused while the VCF is unchanged.
+Lookups for a marker panel (a few thousand rsIDs or loci) then seek to
+and inflate only the blocks that hold them instead of decompressing a
+multi-GB file.
+
+Author: OpenClaw AI
+Date: 2026-02-07
+"""
+
+from __future__ import annotations
+
+import gzip
+import logging
+import os
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .bgzf import (
+    compress_bgzf,
+    is_bgzf,
+    iter_bgzf_blocks,
+    iter_text_lines,
+    read_bgzf_block,
+)
+from .genotypes import (
+    GenotypeStore,
+    GenotypeStoreBuilder,
+    chromosome_code,
+    locus_id,
+    rsid_to_int,
+)
+from .qc import HEADER_MAX_LINES
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+#: Suffix of the block index saved next to a BGZF VCF
+INDEX_SUFFIX = ".blocks.npz"
+
+#: Bumped when the on-disk index layout changes
+INDEX_VERSION = 1
+
+_VALID_BASES = frozenset("ACGT")
+
+
+# =============================================================================
+# RECORD HELPERS
+# =============================================================================
+
+def _locus_key(chromosome: str, position: str) -> int:
+    """Sortable ``chromosome << 32 | pos`` key (-1 if unparseable)."""
+    code = chromosome_code(chromosome)
+    try:
+        pos = int(position)
+    except ValueError:
+        return -1
+    if not code or not 0 < pos <= 0xFFFFFFFF:
+        return -1
+    return code << 32 | pos
+
+
+def record_id(chromosome: str, position: str, vcf_id: str) -> Optional[str]:
+    """
+    Key for a VCF record: the first rsID in the ID column, else ``chrom:pos``.
+
+    Example:
+        >>> record_id("chr1", "100", ".")
+        '1:100'
+    """
+    if "rs" in vcf_id:
+        for candidate in vcf_id.split(";"):
+            if rsid_to_int(candidate) is not None:
+                return candidate
+    return locus_id(chromosome, position)
+
+
+def gt_to_genotype(gt: str, ref: str, alt: str) -> str:
+    """
+    Convert a GT value to an allele string (``"0/1"`` + T/C -> ``"TC"``).
+
+    Haploid calls give one base. Returns ``""`` for no-calls, half calls
+    (``./1``) and calls that involve indels or symbolic alleles, which the
+    marker modules cannot interpret.
+    """
+    if len(ref) != 1 or ref not in _VALID_BASES:
+        return ""
+    alleles = [ref] + alt.split(",")
+    bases = []
+    for index in gt.replace("|", "/").split("/"):
+        if not index.isdigit():
+            return ""
+        i = int(index)
+        if i >= len(alleles) or alleles[i] not in _VALID_BASES:
+            return ""
+        bases.append(alleles[i])
+    return "".join(bases) if len(bases) in (1, 2) else ""
+
+
+def classify_unstored_call(gt: str, ref: str, alt: str) -> Optional[Tuple[bool, bool, bool]]:
+    """
+    Classify a complete call that ``gt_to_genotype`` can't express (indel
+    or symbolic alleles), so it still counts towards ``store.qc``.
+
+    Returns:
+        (heterozygous, hemizygous, indel), or None if ``gt`` isn't a
+        complete call. ``indel`` is True for every call at a record whose
+        REF and an ALT are base sequences of different lengths.
+    """
+    alleles = [ref] + alt.split(",")
+    indices = gt.replace("|", "/").split("/")
+    if not 1 <= len(indices) <= 2 or not all(
+        index.isdigit() and int(index) < len(alleles) for index in indices
+    ):
+        return None
+    indel = ref.isalpha() and any(a.isalpha() and len(a) != len(ref) for a in alleles[1:])
+    return len(set(indices)) > 1, len(indices) == 1, indel
+
+
+# =============================================================================
+# BLOCK INDEX
+# =============================================================================
+
+class BGZFIndex:
+    """
+    Per-block offsets and contents of a BGZF-compressed VCF.
+
+    Attributes:
+        offsets: uint64 compressed offset of each block
+        first_line: int32 offset of the first line starting in each block
+            (-1 if a single line spans the whole block)
+        record_blocks: int64 blocks that contain record starts, ascending
+        block_min / block_max: int64 smallest / largest locus key
+            (``chromosome << 32 | pos``) of records starting in
+            ``record_blocks``
+        rsids: int64 sorted rsID keys
+        rsid_blocks: uint32 block holding the start of each ``rsids`` record
+        source_size / source_mtime_ns: identity of the indexed file
+    """
+
+    _ARRAYS = (
+        "offsets", "first_line", "record_blocks", "block_min", "block_max",
+        "rsids", "rsid_blocks",
+    )
+
+    def __init__(
+        self,
+        offsets: np.ndarray,
+        first_line: np.ndarray,
+        record_blocks: np.ndarray,
+        block_min: np.ndarray,
+        block_max: np.ndarray,
+        rsids: np.ndarray,
+        rsid_blocks: np.ndarray,
+        source_size: int = 0,
+        source_mtime_ns: int = 0,
+    ):
+        self.offsets = np.asarray(offsets, dtype=np.uint64)
+        self.first_line = np.asarray(first_line, dtype=np.int32)
+        self.record_blocks = np.asarray(record_blocks, dtype=np.int64)
+        self.block_min = np.asarray(block_min, dtype=np.int64)
+        self.block_max = np.asarray(block_max, dtype=np.int64)
+        self.rsids = np.asarray(rsids, dtype=np.int64)
+        self.rsid_blocks = np.asarray(rsid_blocks, dtype=np.uint32)
+        self.source_size = int(source_size)
+        self.source_mtime_ns = int(source_mtime_ns)
+        # Sorted VCFs give monotonic block ranges, allowing binary search
+        self._sorted = bool(
+            np.all(np.diff(self.block_min) >= 0) and np.all(np.diff(self.block_max) >= 0)
+        )
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __repr__(self) -> str:
+        return f"BGZFIndex({len(self)} blocks, {len(self.rsids):,} rsIDs)"
+
+    # -------------------------------------------------------------------------
+    # Build / persist
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, path: Union[str, Path], workers: Optional[int] = None) -> "BGZFIndex":
+        """
+        Scan a BGZF VCF once, recording block offsets and record keys.
+
+        Blocks are inflated on ``workers`` threads (see ``bgzf.iter_bgzf_blocks``).
+        """
+        path = Path(path)
+        stat = path.stat()
+        offsets: List[int] = []
+        first_line: List[int] = []
+        record_blocks: List[int] = []
+        block_min: List[int] = []
+        block_max: List[int] = []
+        rsid_keys: List[int] = []
+        rsid_blocks: List[int] = []
+
+        carry = b""          # unfinished line from earlier blocks
+        carry_block = -1     # block where ``carry`` started
+
+        def add_record(line: bytes, block: int) -> None:
+            if not line or line[:1] == b"#":
+                return
+            parts = line.split(b"\t", 3)
+            if len(parts) < 3:
+                return
+            chromosome, position, vcf_id = (p.decode("ascii", "replace") for p in parts[:3])
+            key = _locus_key(chromosome, position)
+            if key >= 0:
+                if record_blocks and record_blocks[-1] == block:
+                    block_min[-1] = min(block_min[-1], key)
+                    block_max[-1] = max(block_max[-1], key)
+                else:
+                    record_blocks.append(block)
+                    block_min.append(key)
+                    block_max.append(key)
+            if "rs" in vcf_id:
+                for candidate in vcf_id.split(";"):
+                    rsid = rsid_to_int(candidate)
+                    if rsid is not None:
+                        rsid_keys.append(rsid)
+                        rsid_blocks.append(block)
+
+        with open(path, "rb") as fh:
+            for block, (offset, data) in enumerate(iter_bgzf_blocks(fh, workers=workers)):
+                offsets.append(offset)
+                start = 0
+                if carry:
+                    newline = data.find(b"\n")
+                    if newline < 0:
+                        carry += data
+                        first_line.append(-1)
+                        continue
+                    add_record(carry + data[:newline], carry_block)
+                    carry = b""
+                    start = newline + 1
+                first_line.append(start if start < len(data) else -1)
+                lines = data[start:].split(b"\n")
+                for line in lines[:-1]:
+                    add_record(line, block)
+                if lines[-1]:
+                    carry, carry_block = lines[-1], block
+        if carry:
+            add_record(carry, carry_block)
+
+        rsids = np.array(rsid_keys, dtype=np.int64)
+        order = np.argsort(rsids, kind="stable")
+        index = cls(
+            offsets=np.array(offsets, dtype=np.uint64),
+            first_line=np.array(first_line, dtype=np.int32),
+            record_blocks=np.array(record_blocks, dtype=np.int64),
+            block_min=np.array(block_min, dtype=np.int64),
+            block_max=np.array(block_max, dtype=np.int64),
+            rsids=rsids[order],
+            rsid_blocks=np.array(rsid_blocks, dtype=np.uint32)[order],
+            source_size=stat.st_size,
+            source_mtime_ns=stat.st_mtime_ns,
+        )
+        logger.info(f"Indexed {path.name}: {len(index)} BGZF blocks, {len(rsids):,} rsIDs")
+        return index
+
+    @staticmethod
+    def index_path(path: Union[str, Path]) -> Path:
+        """Location of the saved index for a VCF."""
+        return Path(str(path) + INDEX_SUFFIX)
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Write the index to ``path`` (an ``.npz`` file) and return it."""
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as fh:
+            np.savez(
+                fh,
+                version=np.array(INDEX_VERSION),
+                source=np.array([self.source_size, self.source_mtime_ns], dtype=np.int64),
+                **{name: getattr(self, name) for name in self._ARRAYS},
+            )
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> Optional["BGZFIndex"]:
+        """Read a saved index, or None if it is missing or from another version."""
+        try:
+            with np.load(path) as data:
+                if int(data["version"]) != INDEX_VERSION:
+                    return None
+                size, mtime_ns = (int(v) for v in data["source"])
+                arrays = {name: data[name] for name in cls._ARRAYS}
+        except (OSError, KeyError, ValueError):
+            return None
+        return cls(**arrays, source_size=size, source_mtime_ns=mtime_ns)
+
+    def matches(self, path: Union[str, Path]) -> bool:
+        """True if ``path`` is unchanged since this index was built."""
+        try:
+            stat = Path(path).stat()
+        except OSError:
+            return False
+        return (stat.st_size, stat.st_mtime_ns) == (self.source_size, self.source_mtime_ns)
+
+    @classmethod
+    def for_file(
+        cls,
+        path: Union[str, Path],
+        save: bool = True,
+        workers: Optional[int] = None,
+    ) -> "BGZFIndex":
+        """
+        Load the saved index for a BGZF VCF, building (and saving) it if
+        it is missing or stale.
+        """
+        index_path = cls.index_path(path)
+        index = cls.load(index_path)
+        if index is not None and index.matches(path):
+            return index
+        index = cls.build(path, workers=workers)
+        if save:
+            try:
+                index.save(index_path)
+            except OSError as e:
+                logger.debug(f"Could not save block index {index_path}: {e}")
+        return index
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def blocks_for(
+        self,
+        rsids: Optional[Iterable[str]] = None,
+        loci: Optional[Iterable[Tuple[str, int]]] = None,
+    ) -> Optional[np.ndarray]:
+        """
+        Blocks holding the records for the given rsIDs and/or loci.
+
+        Args:
+            rsids: rsIDs to find
+            loci: (chromosome, position) pairs to find
+
+        Returns:
+            Sorted unique block numbers, or None when the loci cannot be
+            located by block (unsorted VCF) and the whole file must be read
+        """
+        blocks = []
+        if rsids is not None:
+            keys = np.fromiter(
+                (rsid_to_int(r) or 0 for r in rsids), dtype=np.int64
+            )
+            keys = keys[keys > 0]
+            lo = np.searchsorted(self.rsids, keys, side="left")
+            hi = np.searchsorted(self.rsids, keys, side="right")
+            for start, stop in zip(lo[hi > lo], hi[hi > lo]):
+                blocks.append(self.rsid_blocks[start:stop].astype(np.int64))
+
+        if loci is not None:
+            keys = np.array(
+                [k for k in (_locus_key(c, str(p)) for c, p in loci) if k >= 0],
+                dtype=np.int64,
+            )
+            if len(keys):
+                if not self._sorted:
+                    return None
+                # Records at a locus start in blocks whose [min, max] covers it
+                first = np.searchsorted(self.block_max, keys, side="left")
+                last = np.searchsorted(self.block_min, keys, side="right")
+                for start, stop in zip(first[last > first], last[last > first]):
+                    blocks.append(self.record_blocks[start:stop])
+
+        if not blocks:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate(blocks))
+
+
+# =============================================================================
+# READER
+# =============================================================================
+
+class VCFReader:
+    """
+    Read genotypes for one, several or all samples of a VCF.
+
+    Args:
+        path: ``.vcf``, ``.vcf.gz`` (gzip or BGZF)
+        use_index: For BGZF files, build/reuse the block index for
+            targeted reads (``rsids``/``loci``)
+        workers: Threads inflating BGZF blocks for full reads and index
+            builds (default: available CPUs, capped at 8)
+
+    Example:
+        >>> reader = VCFReader("family.vcf.gz")
+        >>> reader.samples
+        ['child', 'mother', 'father']
+        >>> stores = reader.read(rsids=["rs429358", "rs7412"])
+        >>> stores["mother"]["rs429358"]
+        'TC'
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        use_index: bool = True,
+        workers: Optional[int] = None,
+    ):
+        self.path = Path(path)
+        self.use_index = use_index
+        self.workers = workers
+        self.bgzf = is_bgzf(self.path)
+        self.header = ""
+        self.samples = self._read_samples()
+        self._index: Optional[BGZFIndex] = None
+
+    def __repr__(self) -> str:
+        return f"VCFReader({str(self.path)!r}, {len(self.samples)} samples)"
+
+    def _open_text(self):
+        if self.bgzf or self.path.suffix == ".gz":
+            return gzip.open(self.path, "rt", encoding="utf-8", errors="replace")
+        return open(self.path, "r", encoding="utf-8", errors="replace")
+
+    def _read_samples(self) -> List[str]:
+        meta: List[str] = []
+        with self._open_text() as f:
+            for line in f:
+                if line.startswith("#CHROM"):
+                    self.header = "".join(meta)
+                    return line.rstrip("\r\n").split("\t")[9:]
+                if not line.startswith("#"):
+                    break
+                if len(meta) < HEADER_MAX_LINES:
+                    meta.append(line)
+        self.header = "".join(meta)
+        return []
+
+    @property
+    def index(self) -> Optional[BGZFIndex]:
+        """Block index (built on first use), or None for non-BGZF files."""
+        if self._index is None and self.bgzf and self.use_index:
+            self._index = BGZFIndex.for_file(self.path, workers=self.workers)
+        return self._index
+
+    def sample_columns(self, samples: Optional[Union[str, int, Sequence]] = None) -> List[int]:
+        """
+        Resolve sample names/indices to positions among the sample columns.
+
+        Raises:
+            ValueError: If a sample is not in the VCF
+        """
+        if samples is None:
+            return list(range(len(self.samples)))
+        if isinstance(samples, (str, int)):
+            samples = [samples]
+        columns = []
+        for sample in samples:
+            if isinstance(sample, int) and not isinstance(sample, bool):
+                if not 0 <= sample < len(self.samples):
+                    raise ValueError(f"Sample index {sample} out of range ({len(self.samples)} samples)")
+                columns.append(sample)
+            elif sample in self.samples:
+                columns.append(self.samples.index(sample))
+            else:
+                raise ValueError(f"Sample {sample!r} not found in {self.path.name}")
+        return columns
+
+    # -------------------------------------------------------------------------
+    # Line sources
+    # -------------------------------------------------------------------------
+
+    def _iter_all_lines(self) -> Iterator[str]:
+        for line in iter_text_lines(self.path, workers=self.workers):
+            if not line.startswith("#"):
+                yield line
+
+    def _iter_block_lines(self, blocks: np.ndarray) -> Iterator[str]:
+        """Lines starting in ``blocks``, inflating only those blocks."""
+        index = self.index
+        if not len(blocks):
+            return
+        # Group consecutive blocks into runs read with one seek
+        breaks = np.flatnonzero(np.diff(blocks) != 1) + 1
+        with open(self.path, "rb") as fh:
+            for run in np.split(blocks, breaks):
+                first, last = int(run[0]), int(run[-1])
+                fh.seek(int(index.offsets[first]))
+                chunks = [read_bgzf_block(fh) for _ in range(last - first + 1)]
+                # Finish the last line, which may continue into later blocks
+                while chunks[-1] and not chunks[-1].endswith(b"\n"):
+                    data = read_bgzf_block(fh)
+                    if not data:
+                        break
+                    newline = data.find(b"\n")
+                    if newline >= 0:
+                        chunks.append(data[:newline + 1])
+                        break
+                    chunks.append(data)
+                data = b"".join(chunks)[max(int(index.first_line[first]), 0):]
+                for line in data.decode("utf-8", "replace").split("\n"):
+                    if line and not line.startswith("#"):
+                        yield line
+
+    # -------------------------------------------------------------------------
+    # Reading
+    # -------------------------------------------------------------------------
+
+    def read(
+        self,
+        samples: Optional[Union[str, int, Sequence]] = None,
+        rsids: Optional[Iterable[str]] = None,
+        loci: Optional[Iterable[Tuple[str, int]]] = None,
+    ) -> Dict[str, GenotypeStore]:
+        """
+        Load genotypes per sample.
+
+        Args:
+            samples: Sample name(s) or column index(es); None for all
+            rsids: Only load these rsIDs
+            loci: Only load these (chromosome, position) pairs. Combined
+                with ``rsids``, records matching either are loaded.
+
+        Returns:
+            Dict of sample name -> GenotypeStore (with chromosome/position
+            columns)
+        """
+        columns = self.sample_columns(samples)
+        names = [self.samples[c] for c in columns]
+
+        targeted = rsids is not None or loci is not None
+        rsid_set = set(rsids) if rsids is not None else set()
+        loci = list(loci) if loci is not None else []
+        locus_set = {_locus_key(c, str(p)) for c, p in loci}
+
+        lines: Optional[Iterable[str]] = None
+        if targeted and self.index is not None:
+            blocks = self.index.blocks_for(
+                rsids=rsid_set if rsids is not None else None,
+                loci=loci or None,
+            )
+            if blocks is not None:
+                logger.debug(f"Reading {len(blocks)}/{len(self.index)} BGZF blocks")
+                lines = self._iter_block_lines(blocks)
+        if lines is None:
+            lines = self._iter_all_lines()
+
+        builders = [GenotypeStoreBuilder() for _ in columns]
+        fields_needed = 9 + (max(columns) + 1 if columns else 0)
+        cache: Dict[Tuple[str, str, str], str] = {}
+        line_count = 0
+        error_count = 0
+
+        for line in lines:
+            line_count += 1
+            if targeted:
+                # Check the key columns before splitting the sample columns
+                head = line.split("\t", 3)
+                if len(head) < 4:
+                    continue
+                chromosome, position, vcf_id = head[:3]
+                if vcf_id not in rsid_set and not (
+                    ";" in vcf_id and rsid_set.intersection(vcf_id.split(";"))
+                ) and _locus_key(chromosome, position) not in locus_set:
+                    continue
+
+            parts = line.rstrip("\r\n").split("\t", fields_needed)
+            if len(parts) < max(fields_needed, 10):
+                continue
+            chromosome, position, vcf_id, ref, alt = parts[:5]
+
+            key = record_id(chromosome, position, vcf_id)
+            if key is None:
+                continue
+
+            try:
+                fmt = parts[8].split(":")
+                gt_idx = fmt.index("GT") if "GT" in fmt else 0
+                for builder, column in zip(builders, columns):
+                    sample = parts[9 + column]
+                    gt = sample.split(":")[gt_idx] if gt_idx else sample.split(":", 1)[0]
+                    cache_key = (gt, ref, alt)
+                    genotype = cache.get(cache_key)
+                    if genotype is None:
+                        genotype = gt_to_genotype(gt, ref, alt)
+                        if len(ref) == 1 and len(alt) == 1:
+                            cache[cache_key] = genotype
+                    if genotype:
+                        builder.add(key, genotype, chromosome, position)
+                    elif "." in gt:
+                        builder.add_no_call(key, chromosome)
+                    else:
+                        call = classify_unstored_call(gt, ref, alt)
+                        if call is not None:
+                            builder.add_unstored_call(key, chromosome, *call)
+            except (ValueError, IndexError) as e:
+                error_count += 1
+                if error_count <= 5:
+                    logger.debug(f"Record {line_count}: Parse error - {e}")
+
+        if error_count > 5:
+            logger.warning(f"Skipped {error_count} VCF records with parse errors")
+
+        stores = {name: builder.build() for name, builder in zip(names, builders)}
+        for store in stores.values():
+            store.qc.set_header(self.header)
+        return stores
+
+
+    def iter_chromosome_calls(
+        self,
+        sample: Union[str, int] = 0,
+    ) -> Iterator[Tuple[str, np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Stream one sample's SNV calls chromosome by chromosome.
+
+        Only one chromosome's arrays are in memory at a time, so this
+        suits WGS-density files (e.g. for ``roh.ROHCaller``). Expects a
+        coordinate-sorted file; indel and symbolic records are skipped.
+
+        Yields:
+            (chromosome, positions uint32, heterozygous mask, missing mask)
+        """
+        column = 9 + self.sample_columns(sample)[0]
+        current: Optional[str] = None
+        positions = array("I")
+        het = array("b")
+        missing = array("b")
+
+        def flush():
+            return (
+                current,
+                np.frombuffer(positions, dtype=np.uint32).copy() if positions else np.zeros(0, np.uint32),
+                np.frombuffer(het, dtype=np.int8).astype(bool),
+                np.frombuffer(missing, dtype=np.int8).astype(bool),
+            )
+
+        for line in self._iter_all_lines():
+            parts = line.rstrip("\r\n").split("\t", column + 1)
+            if len(parts) <= column:
+                continue
+            chromosome, position, _, ref, alt = parts[:5]
+            if len(ref) != 1 or any(len(a) != 1 for a in alt.split(",")):
+                continue
+            chromosome = chromosome[3:] if chromosome[:3].lower() == "chr" else chromosome
+            if chromosome != current:
+                if current is not None and positions:
+                    yield flush()
+                current = chromosome
+                positions, het, missing = array("I"), array("b"), array("b")
+            try:
+                pos = int(position)
+            except ValueError:
+                continue
+            gt = parts[column].split(":", 1)[0]
+            alleles = gt.replace("|", "/").split("/")
+            positions.append(pos)
+            missing.append("." in alleles)
+            het.append(len(alleles) == 2 and alleles[0] != alleles[1] and "." not in alleles)
+
+        if current is not None and positions:
+            yield flush()
+
+
+def read_vcf(
+    path: Union[str, Path],
+    samples: Optional[Union[str, int, Sequence]] = None,
+    rsids: Optional[Iterable[str]] = None,
+    loci: Optional[Iterable[Tuple[str, int]]] = None,
+) -> Dict[str, GenotypeStore]:
+    """Convenience wrapper for ``VCFReader(path).read(...)``."""
+    return VCFReader(path).read(samples=samples, rsids=rsids, loci=loci)
@@ -0,0 +1,106 @@
+"""
+Tests for batch analysis (analyze_many and --batch).
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.fixtures.synthetic_dna import (
+    SYNTHETIC_GENOME_EUROPEAN,
+    SYNTHETIC_GENOME_AFRICAN,
+)
+
+
+@pytest.fixture
+def cohort(tmp_path):
+    """Two valid kits and one unreadable one."""
+    kits = tmp_path / "kits"
+    kits.mkdir()
+    (kits / "kit_a.txt").write_text(SYNTHETIC_GENOME_EUROPEAN)
+    (kits / "kit_b.txt").write_text(SYNTHETIC_GENOME_AFRICAN)
+    (kits / "broken.txt").write_text("# nothing but comments\n")
+    (kits / "notes.md").write_text("not a DNA file")
+    return kits
+
+
+class TestCollectInputs:
+    """Tests for resolving --batch sources."""
+
+    def test_directory(self, cohort):
+        from comprehensive_analysis import collect_batch_inputs
+
+        names = [p.name for p in collect_batch_inputs(cohort)]
+        assert names == ["broken.txt", "kit_a.txt", "kit_b.txt"]
+
+    def test_manifest(self, cohort, tmp_path):
+        from comprehensive_analysis import collect_batch_inputs
+
+        manifest = tmp_path / "manifest.txt"
+        manifest.write_text(f"# nightly\nkits/kit_b.txt\n\n{cohort / 'kit_a.txt'}\n")
+        paths = collect_batch_inputs(manifest)
+        assert paths == [cohort / "kit_b.txt", cohort / "kit_a.txt"]
+
+    def test_missing_source(self, tmp_path):
+        from comprehensive_analysis import collect_batch_inputs
+
+        with pytest.raises(FileNotFoundError):
+            collect_batch_inputs(tmp_path / "nope")
+
+
+class TestAnalyzeMany:
+    """Tests for the process-pool batch runner."""
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_failures_do_not_abort_batch(self, cohort, tmp_path, workers):
+        from comprehensive_analysis import analyze_many, collect_batch_inputs
+
+        out = tmp_path / "reports"
+        summary = analyze_many(collect_batch_inputs(cohort), output_dir=out, workers=workers, cache=False)
+
+        assert summary["files"] == 3
+        assert summary["succeeded"] == 2
+        assert summary["failed"] == 1
+        assert summary["files_per_second"] > 0
+        assert summary["latency_seconds"]["max"] >= summary["latency_seconds"]["p50"]
+
+        failed = [r for r in summary["results"] if r["status"] == "error"]
+        assert failed[0]["path"].endswith("broken.txt")
+
+        # Per-file outputs and the streamed results log
+        full = json.loads((out / "kit_a" / "full_analysis.json").read_text())
+        assert full["apoe"]["genotype"] == "ε3/ε4"
+        lines = (out / "batch_results.jsonl").read_text().splitlines()
+        assert sorted(json.loads(l)["status"] for l in lines) == ["error", "ok", "ok"]
+
+    def test_duplicate_names_get_separate_dirs(self, cohort, tmp_path):
+        from comprehensive_analysis import analyze_many
+
+        other = tmp_path / "other"
+        other.mkdir()
+        (other / "kit_a.txt").write_text(SYNTHETIC_GENOME_AFRICAN)
+
+        out = tmp_path / "reports"
+        summary = analyze_many([cohort / "kit_a.txt", other / "kit_a.txt"], output_dir=out, workers=1, cache=False)
+        dirs = sorted(os.path.basename(r["output_dir"]) for r in summary["results"])
+        assert dirs == ["kit_a", "kit_a-2"]
+
+    def test_renamed_duplicates_do_not_collide(self):
+        from pathlib import Path
+        from comprehensive_analysis import _batch_output_dirs
+
+        for names in (["x/a.txt", "y/a.txt", "a-2.txt"], ["a-2.txt", "x/a.txt", "y/a.txt"]):
+            dirs = [d.name for d in _batch_output_dirs([Path(n) for n in names], Path("out"))]
+            assert len(set(dirs)) == 3, dirs
+
+    def test_format_summary(self, cohort, tmp_path):
+        from comprehensive_analysis import analyze_many, format_batch_summary
+
+        summary = analyze_many([cohort / "broken.txt"], output_dir=tmp_path / "r", workers=1, cache=False)
+        text = format_batch_summary(summary)
+        assert "0 ok, 1 failed" in text
+        assert "broken.txt" in text
@@ -0,0 +1,217 @@
+"""
+Tests for the bit-packed cohort genotype matrix.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from personal_genomics.cohort import CohortBuilder, CohortMatrix, build_cohort, classify_kinship
+from personal_genomics.genotypes import GenotypeStore
+
+
+N_SNPS = 6000
+
+
+def family(seed=11):
+    """Haplotype pairs (0 = A, 1 = G) for a small pedigree plus an unrelated kit."""
+    rng = np.random.default_rng(seed)
+    freq = rng.uniform(0.05, 0.5, N_SNPS)
+
+    def haplotype():
+        return (rng.random(N_SNPS) < freq).astype(np.uint8)
+
+    def transmit(parent):
+        return np.where(rng.random(N_SNPS) < 0.5, parent[0], parent[1])
+
+    mother = (haplotype(), haplotype())
+    father = (haplotype(), haplotype())
+    child = (transmit(mother), transmit(father))
+    sibling = (transmit(mother), transmit(father))
+    spouse = (haplotype(), haplotype())
+    grandchild = (transmit(child), transmit(spouse))
+    return {
+        "mother": mother,
+        "father": father,
+        "child": child,
+        "sibling": sibling,
+        "grandchild": grandchild,
+        "unrelated": (haplotype(), haplotype()),
+        "mother_rerun": mother,
+    }
+
+
+def to_store(haplotypes, missing=()):
+    a1 = np.where(haplotypes[0] == 1, 2, 0)
+    a2 = np.where(haplotypes[1] == 1, 2, 0)
+    codes = (np.minimum(a1, a2) * 4 + np.maximum(a1, a2)).astype(np.uint8)
+    codes[list(missing)] = 255
+    ids = np.arange(1, N_SNPS + 1)
+    chromosomes = np.repeat(np.arange(1, 7), N_SNPS // 6).astype(np.uint8)
+    positions = np.tile(np.arange(1, N_SNPS // 6 + 1) * 1000, 6).astype(np.uint32)
+    return GenotypeStore.from_arrays(ids, codes, chromosomes, positions)
+
+
+def naive_counts(g1, g2):
+    """Per-SNP string comparison, as parental_inference does."""
+    ibs = [0, 0, 0]
+    het_het = het_1 = het_2 = 0
+    for rsid, a in g1.items():
+        b = g2.get(rsid)
+        if b is None:
+            continue
+        shared = len(set(a) & set(b))
+        ibs[2 if a == b else shared if a[0] != a[1] or b[0] != b[1] else 0] += 1
+        het_1 += a[0] != a[1]
+        het_2 += b[0] != b[1]
+        het_het += a[0] != a[1] and b[0] != b[1]
+    return ibs, (het_het - 2 * ibs[0]) / (het_1 + het_2)
+
+
+@pytest.fixture(scope="module")
+def cohort():
+    return build_cohort({name: to_store(h) for name, h in family().items()})
+
+
+class TestCohortMatrix:
+    """Tests for packing and pairwise counts."""
+
+    def test_packing_round_trip(self, cohort):
+        store = to_store(family()["child"], missing=[0, 5, 64])
+        matrix = build_cohort({"child": store}, snp_ids=np.arange(1, N_SNPS + 1))
+        dosage = matrix.dosages("child")
+        assert matrix.n_snps == N_SNPS and matrix.n_words == (N_SNPS + 63) // 64
+        assert list(dosage[[0, 5, 64]]) == [-1, -1, -1]
+        expected = family()["child"][0] + family()["child"][1]
+        called = dosage >= 0
+        # ref is the first allele seen, so flip where G became ref
+        flipped = matrix.ref == 2
+        assert np.array_equal(np.where(flipped, 2 - dosage, dosage)[called], expected[called])
+        assert matrix.call_rates()[0] == pytest.approx(1 - 3 / N_SNPS)
+
+    def test_matches_string_comparison(self, cohort):
+        stores = {name: to_store(h) for name, h in family().items()}
+        for a, b in (("mother", "child"), ("child", "sibling"), ("mother", "unrelated")):
+            ibs, kinship = naive_counts(stores[a], stores[b])
+            counts = cohort.pair_counts(a, b)
+            assert [counts["ibs0"], counts["ibs1"], counts["ibs2"]] == ibs
+            assert counts["kinship"] == pytest.approx(kinship, abs=1e-4)
+
+    def test_find_relatives(self, cohort):
+        found = {
+            frozenset((r["sample_1"], r["sample_2"])): r["relationship"]
+            for r in cohort.find_relatives()
+        }
+        assert found[frozenset(("mother", "mother_rerun"))] == "duplicate_or_twin"
+        assert found[frozenset(("mother", "child"))] == "first_degree"
+        assert found[frozenset(("child", "sibling"))] == "first_degree"
+        assert found[frozenset(("mother", "grandchild"))] == "second_degree"
+        assert not any("unrelated" in pair for pair in found)
+
+    def test_chunking_does_not_change_counts(self, cohort):
+        def collect(max_elements):
+            pairs = {}
+            for block in cohort.iter_pairs(max_elements=max_elements):
+                for k in range(len(block)):
+                    pairs[(block.i[k], block.j[k])] = (block.ibs0[k], block.ibs2[k], block.kinship[k])
+            return pairs
+
+        whole = collect(1 << 20)
+        assert len(whole) == 7 * 6 // 2
+        assert collect(16) == whole
+
+    def test_lookup_table_popcount(self, cohort, monkeypatch):
+        expected = cohort.pair_counts("child", "sibling")
+        monkeypatch.delattr(np, "bitwise_count", raising=False)
+        assert cohort.pair_counts("child", "sibling") == expected
+
+    def test_save_load(self, cohort, tmp_path):
+        loaded = CohortMatrix.load(cohort.save(tmp_path / "cohort.npz"))
+        assert loaded.samples == cohort.samples
+        assert np.array_equal(loaded.has_alt, cohort.has_alt)
+        assert loaded.find_relatives() == cohort.find_relatives()
+
+
+class TestCohortBuilder:
+    """Tests for SNP panel and allele handling."""
+
+    def test_panel_and_alleles(self):
+        builder = CohortBuilder(["rs1", "rs2", "rs3", "rs4"])
+        builder.add("a", {"rs1": "AA", "rs2": "CT", "rs3": "A", "rs5": "GG"})
+        builder.add("b", {"rs1": "AG", "rs2": "TT", "rs3": "GG", "rs4": "AC"})
+        builder.add("c", {"rs1": "AT", "rs2": "CC", "rs4": "DI"})
+        matrix = builder.build()
+        assert matrix.allele(matrix.ref) == ["A", "C", "G", "A"]
+        assert matrix.allele(matrix.alt) == ["G", "T", "0", "C"]
+        assert list(matrix.dosages("a")) == [0, 1, -1, -1]
+        assert list(matrix.dosages("b")) == [1, 2, 0, 1]
+        assert list(matrix.dosages("c")) == [-1, 0, -1, -1]   # third allele, indel
+
+    def test_default_panel_is_autosomal(self):
+        store = GenotypeStore.from_arrays(
+            np.array([1, 2, 3]), np.array([0, 5, 0], dtype=np.uint8),
+            np.array([1, 23, 2], dtype=np.uint8), np.array([10, 20, 30], dtype=np.uint32),
+        )
+        matrix = build_cohort({"x": store})
+        assert matrix.n_snps == 2
+        assert list(matrix.chromosomes) == [1, 2]
+
+    def test_default_panel_is_union(self):
+        def store(ids, code):
+            ids = np.array(ids)
+            return GenotypeStore.from_arrays(
+                ids, np.full(len(ids), code, dtype=np.uint8),
+                np.ones(len(ids), dtype=np.uint8), (ids * 10).astype(np.uint32),
+            )
+
+        # "a" failed to call rs2 and rs4; "b" adds them and a second word of SNPs
+        matrix = build_cohort({"a": store([1, 3, 5], 0), "b": store(range(1, 101), 5)})
+        assert matrix.n_snps == 100
+        assert list(matrix.positions[:5]) == [10, 20, 30, 40, 50]
+        assert list(matrix.dosages("a")[:6]) == [0, -1, 0, -1, 0, -1]
+        assert list(matrix.dosages("b")[:6]) == [2, 0, 2, 0, 2, 0]     # ref is the first allele seen
+        assert (matrix.dosages("b")[5:] == 0).all()
+        assert matrix.chromosome_ranges() == [("1", 0, 100)]
+
+    def test_classify_kinship(self):
+        assert classify_kinship(0.5) == "duplicate_or_twin"
+        assert classify_kinship(0.25) == "first_degree"
+        assert classify_kinship(0.12) == "second_degree"
+        assert classify_kinship(0.06) == "third_degree"
+        assert classify_kinship(0.0) == "unrelated"
+
+    def test_too_few_shared_snps(self):
+        matrix = build_cohort({"a": {"rs1": "AG"}, "b": {"rs1": "AG"}})
+        [pair] = [r for block in matrix.iter_pairs() for r in block.to_records(matrix.samples)]
+        assert pair["relationship"] == "insufficient_data"
+        assert matrix.find_relatives() == []
+
+
+class TestRelativesCLI:
+    """Tests for comprehensive_analysis.find_cohort_relatives."""
+
+    def test_directory_of_kits(self, tmp_path):
+        from comprehensive_analysis import find_cohort_relatives
+
+        kits = tmp_path / "kits"
+        kits.mkdir()
+        for name in ("mother", "child", "unrelated"):
+            store = to_store(family()[name])
+            lines = ["# rsid\tchromosome\tposition\tgenotype"]
+            for rsid, genotype in store.items():
+                lines.append(f"{rsid}\t{store.chromosome(rsid)}\t{store.position(rsid)}\t{genotype}")
+            (kits / f"{name}.txt").write_text("\n".join(lines) + "\n")
+        (kits / "broken.txt").write_text("not a genome\n")
+
+        summary = find_cohort_relatives(
+            sorted(kits.iterdir()), output_dir=tmp_path / "out", workers=1
+        )
+        assert summary["samples"] == 3 and len(summary["failed"]) == 1
+        assert summary["relationships"] == {"first_degree": 1}
+        results = (tmp_path / "out" / "relatives.jsonl").read_text().splitlines()
+        assert len(results) == 1 and '"mother"' in results[0] and '"child"' in results[0]
+        assert CohortMatrix.load(summary["cohort_file"]).samples == ["child", "mother", "unrelated"]
@@ -94,6 +94,82 @@ class TestHGDP:
         assert "Europe" in HGDP_REGIONS
 
 
+class TestFrequencyMatrix:
+    """Tests for vectorized population likelihood scoring."""
+    
+    @staticmethod
+    def _reference_similarity(dataset, genotypes, populations):
+        """Row-by-row Hardy-Weinberg scorer the matrix engine replaces."""
+        import math
+        cursor = dataset._get_connection().cursor()
+        log_likelihoods = {pop: 0.0 for pop in populations}
+        used = 0
+        for rsid, geno in genotypes.items():
+            cursor.execute("SELECT alt_allele FROM variants WHERE rsid = ?", (rsid,))
+            row = cursor.fetchone()
+            if not geno or len(geno) != 2 or not row:
+                continue
+            alt_count = sum(1 for a in geno.upper() if a == row["alt_allele"].upper())
+            cursor.execute("SELECT population, frequency FROM frequencies WHERE rsid = ?", (rsid,))
+            freq_map = {r["population"]: r["frequency"] for r in cursor.fetchall()}
+            if not freq_map:
+                continue
+            used += 1
+            for pop in populations:
+                p = max(0.001, min(0.999, freq_map.get(pop, 0.5)))
+                prob = [(1 - p) ** 2, 2 * p * (1 - p), p ** 2][alt_count]
+                log_likelihoods[pop] += math.log(prob)
+        if used == 0:
+            return {pop: 1.0 / len(populations) for pop in populations}
+        max_ll = max(log_likelihoods.values())
+        exp_scores = {pop: math.exp(ll - max_ll) for pop, ll in log_likelihoods.items()}
+        total = sum(exp_scores.values())
+        return {pop: score / total for pop, score in exp_scores.items()}
+    
+    def test_matches_row_by_row_scoring(self):
+        """Matrix scores equal the row-by-row likelihoods."""
+        from datasets.hgdp import HGDP, HGDP_POPULATIONS
+        hgdp = HGDP()
+        hgdp.download()
+        
+        matrix = hgdp.frequency_matrix()
+        assert matrix.frequencies.dtype.name == "float32"
+        assert matrix.frequencies.shape == (matrix.n_markers, len(matrix.populations))
+        
+        genotypes = {rsid: geno for rsid, geno in zip(matrix.rsids, ["AA", "AG", "GG", "A", "DI", "CT"])}
+        genotypes["rs1"] = "AA"
+        
+        populations = list(HGDP_POPULATIONS.keys())
+        expected = self._reference_similarity(hgdp, genotypes, populations)
+        result = hgdp.calculate_population_similarity(genotypes)
+        assert result.keys() == expected.keys()
+        for pop in expected:
+            assert result[pop] == pytest.approx(expected[pop], abs=1e-6)
+    
+    def test_genotype_store_and_batch(self):
+        """GenotypeStore input and batch scoring agree with single dict scoring."""
+        from personal_genomics.genotypes import GenotypeStore
+        from datasets.sgdp import SGDPDataset
+        sgdp = SGDPDataset()
+        sgdp.download()
+        
+        rsids = sgdp.frequency_matrix().rsids
+        genomes = [
+            {rsid: "AA" for rsid in rsids},
+            {rsid: "AG" for rsid in rsids[:2]},
+            {},
+        ]
+        single = [sgdp.calculate_population_similarity(g, region="Europe") for g in genomes]
+        batch = sgdp.calculate_population_similarity_batch(genomes, region="Europe")
+        store = sgdp.calculate_population_similarity(GenotypeStore.from_dict(genomes[0]), region="Europe")
+        
+        for a, b in zip(single, batch):
+            assert a == pytest.approx(b)
+        assert store == pytest.approx(single[0])
+        # No usable markers -> uniform
+        assert len(set(batch[2].values())) == 1
+
+
 class TestSGDP:
     """Tests for SGDP dataset."""
     
@@ -168,6 +244,29 @@ class TestClinVar:
         assert var is not None
         assert "pathogenic" in var.clinical_significance.lower()
 
+    def test_bulk_annotation_matches_single_lookups(self):
+        """Bulk annotation returns the same records as per-rsID lookups."""
+        from datasets import clinvar as clinvar_module
+        from datasets.clinvar import ClinVar
+        cv = ClinVar()
+        cv.download()
+
+        genotypes = {f"rs{i}": "AA" for i in range(1, 3000)}
+        genotypes.update({"rs6025": "CT", "rs76763715": "TC", "rs429358": "TC"})
+
+        bulk = cv.check_user_variants(genotypes)
+        single = {
+            rsid: cv.get_clinvar_annotation(rsid)
+            for rsid in genotypes
+            if cv.get_clinvar_annotation(rsid)
+        }
+        assert bulk == single
+        assert len(genotypes) > clinvar_module.SQL_CHUNK_SIZE
+
+        pathogenic = cv.get_pathogenic_findings(genotypes)
+        assert pathogenic == [v for v in single.values() if v.is_pathogenic]
+        assert {"rs6025", "rs76763715"} <= {v.rsid for v in pathogenic}
+
 
 class TestPharmGKB:
     """Tests for PharmGKB dataset."""
@@ -214,6 +313,481 @@ class TestPGSCatalog:
         traits = [m.trait for m in models]
         assert any("coronary" in t.lower() for t in traits)
         assert any("diabetes" in t.lower() for t in traits)
+    
+    def test_all_prs_matches_single_scores(self):
+        """Scoring all models at once agrees with per-model scoring."""
+        from datasets.pgs_catalog import PGSCatalog
+        pgs = PGSCatalog()
+        pgs.download()
+        
+        conn = pgs._get_connection()
+        rsids = [row[0] for row in conn.execute("SELECT DISTINCT rsid FROM prs_variants")]
+        genotypes = {rsid: ("AG", "CT", "GG", "TC")[i % 4] for i, rsid in enumerate(rsids)}
+        
+        results = pgs.calculate_all_prs(genotypes)
+        assert results
+        for model in pgs.get_available_prs():
+            single = pgs.calculate_prs(model.pgs_id, genotypes)
+            if results.get(model.trait) and results[model.trait].pgs_id == model.pgs_id:
+                assert results[model.trait] == single
+
+
+SCORING_FILE = """\
+###PGS CATALOG SCORING FILE - see https://www.pgscatalog.org/downloads/#dl_ftp_scoring for additional information
+#format_version=2.0
+#pgs_id=PGS999999
+#trait_reported=Synthetic trait
+#trait_efo=EFO_0000000
+#weight_type=beta
+#HmPOS_build=GRCh38
+rsID\tchr_name\tchr_position\teffect_allele\tother_allele\teffect_weight\thm_source\thm_rsID\thm_chr\thm_pos
+rs1\t1\t100\tA\tG\t0.5\tENSEMBL\trs1\t1\t100
+rs2\t1\t200\tc\tT\t-0.25\tENSEMBL\trs2\t1\t200
+\t1\t300\tG\tA\t1.0\tliftover\t\t1\t300
+rs_old\t1\t400\tT\tC\t0.1\tENSEMBL\trs4\t1\t400
+rs5\t1\t500\tI\tD\t0.2\tENSEMBL\trs5\t1\t500
+rs6\t1\t600\tG\tA\t2.0\tENSEMBL\trs6\t1\t600
+"""
+
+
+class TestPGSScoringFiles:
+    """Tests for streaming PGS Catalog scoring files into memory maps."""
+    
+    GENOTYPES = {"rs1": "AA", "rs2": "CT", "rs4": "TT", "rs5": "DI", "rs6": "G"}
+    
+    def _write(self, directory):
+        import gzip
+        path = directory / "PGS999999_hmPOS_GRCh38.txt.gz"
+        with gzip.open(path, "wt") as f:
+            f.write(SCORING_FILE)
+        return path
+    
+    def test_ingest_in_chunks(self, tmp_path):
+        """Chunked ingestion keeps every rsID row and maps the columns."""
+        import numpy as np
+        from datasets.pgs_scoring import ScoringFileStore
+        store = ScoringFileStore(tmp_path / "scores")
+        info = store.ingest(self._write(tmp_path), chunk_rows=2)
+        
+        assert info.pgs_id == "PGS999999"
+        assert info.trait == "Synthetic trait"
+        assert (info.n_variants, info.skipped) == (5, 1)
+        
+        columns = store.open("PGS999999")
+        assert isinstance(columns["weight"], np.memmap)
+        assert columns["ids"].tolist() == [1, 2, 4, 5, 6]
+        assert columns["weight"].dtype == np.float32
+    
+    def test_score_matches_reference(self, tmp_path):
+        """Chunked memory-mapped scoring matches a hand-computed score."""
+        from datasets.pgs_scoring import ScoringFileStore
+        store = ScoringFileStore(tmp_path / "scores")
+        store.ingest(self._write(tmp_path))
+        
+        expected = 2 * 0.5 - 0.25 + 2 * 0.1 + 0.2 + 2.0
+        for chunk_rows in (1, 2, 100):
+            score, found, total = store.score("PGS999999", self.GENOTYPES, chunk_rows)
+            assert score == pytest.approx(expected, rel=1e-6)
+            assert (found, total) == (5, 5)
+    
+    def test_bad_rows_and_files_are_skipped(self, tmp_path):
+        """Non-numeric weights skip the row; non-scoring files skip the file."""
+        from datasets.pgs_scoring import ScoringFileStore
+        self._write(tmp_path)
+        (tmp_path / "README.txt").write_text("Downloaded from the PGS Catalog\n")
+        (tmp_path / "PGS888888.txt").write_text(
+            SCORING_FILE.replace("PGS999999", "PGS888888").replace("\t0.5\t", "\tNA\t")
+        )
+        store = ScoringFileStore(tmp_path / "scores")
+        infos = store.ingest_directory(tmp_path)
+
+        assert sorted(info.pgs_id for info in infos) == ["PGS888888", "PGS999999"]
+        info = store.info("PGS888888")
+        assert (info.n_variants, info.skipped) == (4, 2)
+        assert store.open("PGS888888")["ids"].tolist() == [2, 4, 5, 6]
+
+    def test_catalog_uses_scoring_files(self, tmp_path):
+        """Loaded scores are registered as models and scored from disk."""
+        from datasets.pgs_catalog import PGSCatalog
+        self._write(tmp_path)
+        pgs = PGSCatalog(data_dir=tmp_path / "pgs")
+        pgs.download()
+        
+        assert pgs.load_scoring_files(tmp_path) == {"PGS999999": 5}
+        assert any(m.pgs_id == "PGS999999" for m in pgs.get_available_prs())
+        
+        result = pgs.calculate_prs("PGS999999", self.GENOTYPES)
+        assert result.variants_used == 5
+        assert result.raw_score == pytest.approx(3.15, rel=1e-6)
+        assert pgs.calculate_all_prs(self.GENOTYPES)["Synthetic trait"] == result
+
+
+class TestDatasetRegistry:
+    """Tests for shared dataset instances and the LRU lookup cache."""
+    
+    def test_lru_eviction_and_counters(self):
+        """The least recently used entry is evicted first."""
+        from datasets import LookupCache
+        cache = LookupCache(maxsize=2)
+        cache.put("rs1", None)
+        cache.put("rs2", 0.2)
+        assert cache.get("rs1") == (True, None)
+        cache.put("rs3", 0.3)
+        assert cache.get("rs2") == (False, None)
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        assert len(cache) == 2
+        
+        cache.resize(1)
+        assert cache.get("rs3") == (True, 0.3)
+        assert cache.get("rs1") == (False, None)
+    
+    def test_singleton_instances(self):
+        """The registry hands out one instance per dataset class."""
+        from datasets import get_dataset, reset_dataset_registry
+        from datasets.clinvar import ClinVar
+        reset_dataset_registry()
+        
+        clinvar = get_dataset(ClinVar)
+        assert clinvar.is_downloaded
+        assert get_dataset("clinvar") is clinvar
+    
+    def test_convenience_lookups_are_cached(self):
+        """Repeated convenience lookups hit the shared cache."""
+        from datasets import get_lookup_cache_stats, reset_dataset_registry
+        from datasets.clinvar import get_clinical_significance
+        reset_dataset_registry()
+        
+        first = get_clinical_significance("rs334")
+        for _ in range(5):
+            assert get_clinical_significance("rs334") == first
+        stats = get_lookup_cache_stats()["clinvar"]
+        assert (stats["hits"], stats["misses"]) == (5, 1)
+    
+    def test_slow_download_does_not_block_other_datasets(self):
+        """A download holds only its own dataset's lock, and a failure isn't retried."""
+        import threading
+        from datasets import get_dataset, reset_dataset_registry
+        reset_dataset_registry()
+        started, release = threading.Event(), threading.Event()
+
+        class Slow:
+            is_downloaded = False
+
+            def download(self):
+                started.set()
+                release.wait(5)
+                return False
+
+        class Ready:
+            is_downloaded = True
+
+            def download(self):
+                raise AssertionError("already downloaded")
+
+        attempts = []
+
+        class Broken:
+            is_downloaded = False
+
+            def download(self):
+                attempts.append(1)
+                raise OSError("network down")
+
+        try:
+            worker = threading.Thread(target=get_dataset, args=(Slow,))
+            worker.start()
+            assert started.wait(5)
+            # Registered and unregistered datasets are served while Slow downloads
+            ready = get_dataset(Ready)
+            assert get_dataset(Ready) is ready
+            assert worker.is_alive()
+            release.set()
+            worker.join(5)
+            assert not get_dataset(Slow).is_downloaded
+
+            with pytest.raises(OSError):
+                get_dataset(Broken)
+            assert not get_dataset(Broken).is_downloaded
+            assert attempts == [1]
+        finally:
+            release.set()
+            reset_dataset_registry()
+
+    def test_configure_cache_size(self):
+        """Cache size changes apply to registered instances."""
+        from datasets import (
+            DEFAULT_LOOKUP_CACHE_SIZE, configure_lookup_cache, get_dataset,
+            reset_dataset_registry,
+        )
+        from datasets.clinvar import ClinVar
+        reset_dataset_registry()
+        
+        clinvar = get_dataset(ClinVar)
+        try:
+            configure_lookup_cache(1, ClinVar)
+            clinvar.cached_lookup("get_clinvar_annotation", "rs334")
+            clinvar.cached_lookup("get_clinvar_annotation", "rs7412")
+            assert clinvar.lookups.stats()["size"] == 1
+        finally:
+            configure_lookup_cache(DEFAULT_LOOKUP_CACHE_SIZE, ClinVar)
+            reset_dataset_registry()
+
+
+
+class TestIndexedDataset:
+    """Tests for the binary rsID index."""
+    
+    @staticmethod
+    def _rows(n=3000):
+        rows = ["#rsid\tchrom\tpos\tref\talt"]
+        rows += [f"rs{10 * i + 7}\t{i % 22 + 1}\t{1000 + i}\tA\tG" for i in range(n)]
+        rows.append("rs5000000000\t1\t1\tA\tG")
+        return "\n".join(rows) + "\n"
+    
+    @staticmethod
+    def _dataset(data_dir):
+        from datasets import IndexedDataset, VariantInfo
+        
+        class Table(IndexedDataset):
+            name = "indexed_test"
+            
+            def download(self, force=False):
+                return True
+            
+            def _parse_record(self, rsid, fields):
+                return VariantInfo(rsid, fields[1], int(fields[2]), fields[3], fields[4])
+        
+        return Table(data_dir=data_dir)
+    
+    @pytest.mark.parametrize("compression", ["plain", "gzip", "bgzf"])
+    def test_batched_lookup(self, tmp_path, compression):
+        import gzip
+        from personal_genomics.bgzf import compress_bgzf
+        data = self._rows().encode()
+        dataset = self._dataset(tmp_path)
+        if compression == "gzip":
+            data = gzip.compress(data)
+        elif compression == "bgzf":
+            data = compress_bgzf(data, block_size=500)
+        dataset.data_file.write_bytes(data)
+        
+        results = dataset.lookup_variants(["rs29997", "rs7", "rs8", "rs17", "rs5000000000"])
+        assert results["rs7"].position == 1000
+        assert results["rs17"].chromosome == "2"
+        assert results["rs29997"].position == 3999
+        assert results["rs8"] is None and results["rs5000000000"] is None
+        assert dataset.lookup_variant("rs15007").alt_allele == "G"
+    
+    def test_index_is_memory_mapped_and_rebuilt_when_stale(self, tmp_path):
+        import numpy as np
+        from datasets import RsidIndex
+        dataset = self._dataset(tmp_path)
+        dataset.data_file.write_bytes(self._rows(10).encode())
+        assert dataset.lookup_variant("rs97") is not None
+        
+        index = RsidIndex.load(dataset.index_file)
+        assert isinstance(index.rsids, np.memmap)
+        assert list(index.rsids[:3]) == [7, 17, 27]
+        
+        dataset.data_file.write_bytes(self._rows(20).encode())
+        assert self._dataset(tmp_path).lookup_variant("rs197").position == 1019
+
+
+class TestSQLiteConnectionPool:
+    """Tests for per-thread, read-only dataset connections."""
+    
+    @staticmethod
+    def _write_db(pool, n):
+        conn = pool.get(write=True)
+        conn.execute("CREATE TABLE IF NOT EXISTS variants (rsid TEXT PRIMARY KEY, freq REAL)")
+        conn.executemany(
+            "INSERT OR REPLACE INTO variants VALUES (?, ?)",
+            [(f"rs{i}", i / 100) for i in range(n)],
+        )
+        conn.commit()
+    
+    def test_readers_are_per_thread_and_read_only(self, tmp_path):
+        import sqlite3
+        from concurrent.futures import ThreadPoolExecutor
+        from datasets.base import SQLiteConnectionPool
+        pool = SQLiteConnectionPool(tmp_path / "data.db")
+        self._write_db(pool, 50)
+        
+        def count(_):
+            conn = pool.get()
+            return id(conn), conn.execute("SELECT COUNT(*) FROM variants").fetchone()[0]
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(count, range(40)))
+        assert {n for _, n in results} == {50}
+        assert pool.get() is pool.get()
+        assert pool.get() is not pool.get(write=True)
+        with pytest.raises(sqlite3.OperationalError):
+            pool.get().execute("DELETE FROM variants")
+        
+        pool.close()
+        assert len(pool) == 0
+    
+    def test_write_retires_readers(self, tmp_path):
+        from datasets.base import SQLiteConnectionPool
+        pool = SQLiteConnectionPool(tmp_path / "data.db")
+        self._write_db(pool, 10)
+        reader = pool.get()
+        assert reader.execute("SELECT COUNT(*) FROM variants").fetchone()[0] == 10
+        
+        self._write_db(pool, 30)
+        assert pool.get() is not reader
+        assert pool.get().execute("SELECT COUNT(*) FROM variants").fetchone()[0] == 30
+    
+    def test_dataset_lookups_from_threads(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from datasets.clinvar import ClinVar
+        clinvar = ClinVar()
+        if not clinvar.is_downloaded:
+            clinvar.download()
+        expected = clinvar.get_clinvar_annotation("rs334")
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(clinvar.get_clinvar_annotation, ["rs334"] * 20))
+        assert all(r == expected for r in results)
+        clinvar.close()
+
+CLINVAR_SUMMARY = "\t".join([
+    "#AlleleID", "Type", "Name", "GeneID", "GeneSymbol", "ClinicalSignificance",
+    "LastEvaluated", "RS# (dbSNP)", "PhenotypeList", "Assembly", "Chromosome",
+    "Start", "Stop", "ReferenceAllele", "AlternateAllele", "ReviewStatus",
+    "VariationID", "PositionVCF", "ReferenceAlleleVCF", "AlternateAlleleVCF",
+]) + "\n" + "".join(
+    "\t".join(fields) + "\n" for fields in [
+        ["1", "single nucleotide variant", "HBB E6V", "3043", "HBB", "Pathogenic",
+         "Jan 01, 2020", "334", "Sickle cell disease|not provided", "GRCh38", "11",
+         "5227002", "5227002", "na", "na", "reviewed by expert panel", "15333", "5227002", "T", "A"],
+        ["1", "single nucleotide variant", "HBB E6V", "3043", "HBB", "Pathogenic",
+         "Jan 01, 2020", "334", "Sickle cell disease", "GRCh37", "11",
+         "5248232", "5248232", "na", "na", "reviewed by expert panel", "15333", "5248232", "T", "A"],
+        ["2", "single nucleotide variant", "X", "1", "GENE1", "Conflicting interpretations of pathogenicity",
+         "-", "-1", "not specified", "GRCh38", "1",
+         "100", "100", "G", "A", "criteria provided", "20000", "-1", "na", "na"],
+        ["3", "single nucleotide variant", "Y", "2", "GENE2", "Benign/Likely benign",
+         "-", "12345", "Trait A|Trait B", "GRCh38", "2",
+         "200", "200", "C", "T", "criteria provided", "20001", "200", "C", "T"],
+        ["truncated", "line"],
+    ]
+)
+
+GNOMAD_VCF = (
+    "##fileformat=VCFv4.2\n"
+    "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\n"
+    "chr1\t1000\trs100\tA\tG\t.\tPASS\tAC=10;AN=100;AF=0.1;nhomalt=1;AF_afr=0.3;AN_afr=20;AC_afr=6;vep=X|Y\n"
+    "chr1\t2000\t.\tC\tT,G\t.\tPASS\tAC=5,1;AN=100;AF=0.05,0.01;AF_nfe=0.02,0.001\n"
+    "chr1\t3000\trs300\tG\tA\t.\tAC0\tAC=0;AN=100;AF=0\n"
+)
+
+GWAS_TSV = "\t".join([
+    "DATE ADDED TO CATALOG", "PUBMEDID", "DISEASE/TRAIT", "INITIAL SAMPLE SIZE",
+    "MAPPED_GENE", "STRONGEST SNP-RISK ALLELE", "P-VALUE", "OR or BETA",
+    "95% CI (TEXT)", "MAPPED_TRAIT_URI",
+]) + "\n" + "".join(
+    "\t".join(fields) + "\n" for fields in [
+        ["2020-01-01", "17463249", "Type 2 diabetes", "4,549 European ancestry cases, 5,579 European ancestry controls",
+         "TCF7L2", "rs7903146-T", "1E-48", "1.4", "[1.3-1.5]", "http://www.ebi.ac.uk/efo/EFO_0001360"],
+        ["2020-01-01", "25282103", "Height", "253,288 European ancestry individuals",
+         "LCORL", "rs3791679-?", "3E-30", "0.28", "[0.2-0.36] cm decrease", "http://www.ebi.ac.uk/efo/EFO_0004339"],
+        ["2020-01-01", "1", "Trait", "100 individuals", "G", "chr1:12345-A", "1E-8", "", "", ""],
+        ["2020-01-01", "1", "Trait", "100 individuals", "G", "rs1-A", "NR", "", "", ""],
+    ]
+)
+
+
+class TestDatasetBuild:
+    """Tests for bulk-loading datasets from local source dumps."""
+    
+    @staticmethod
+    def _write(path, text):
+        import gzip
+        with gzip.open(path, "wt") as f:
+            f.write(text)
+        return path
+    
+    def test_split_schema(self):
+        from datasets.build import split_schema
+        from datasets.clinvar import ClinVar
+        tables, indexes = split_schema(ClinVar.SCHEMA)
+        assert "CREATE TABLE IF NOT EXISTS variants" in tables
+        assert "INDEX" not in tables
+        assert len(indexes) == 5
+    
+    def test_clinvar(self, tmp_path):
+        from datasets.build import build_dataset
+        from datasets.clinvar import ClinVar
+        source = self._write(tmp_path / "variant_summary.txt.gz", CLINVAR_SUMMARY)
+        stats = build_dataset("clinvar", [source], data_dir=tmp_path / "clinvar", batch_rows=2)
+        
+        assert stats.rows == {"variants": 3, "conditions": 3}
+        assert stats.skipped == 1
+        assert stats.rows_per_second > 0
+        
+        clinvar = ClinVar(data_dir=tmp_path / "clinvar")
+        assert clinvar.get_version_info().record_count == 3
+        sickle = clinvar.get_clinvar_annotation("rs334")
+        assert (sickle.chromosome, sickle.position, sickle.ref_allele) == ("11", 5227002, "T")
+        assert sickle.conditions == ["Sickle cell disease"]
+        assert sickle.is_pathogenic
+        
+        conn = clinvar._get_connection()
+        levels = dict(conn.execute("SELECT variation_id, significance_level FROM variants"))
+        assert levels == {"15333": 5, "20000": 3, "20001": 1}
+        indexes = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {"idx_clinvar_rsid", "idx_clinvar_conditions"} <= indexes
+        clinvar.close()
+        assert not (tmp_path / "clinvar" / "data.db.building").exists()
+    
+    def test_gnomad(self, tmp_path):
+        from datasets.build import build_dataset
+        from datasets.gnomad import GnomAD
+        source = self._write(tmp_path / "sites.vcf.gz", GNOMAD_VCF)
+        stats = build_dataset("gnomad", [source], data_dir=tmp_path / "gnomad")
+        
+        assert stats.rows == {"variants": 3, "population_frequencies": 3}
+        assert stats.skipped == 1   # non-PASS site
+        
+        gnomad = GnomAD(data_dir=tmp_path / "gnomad")
+        assert gnomad.get_allele_frequency("rs100") == pytest.approx(0.1)
+        assert gnomad.get_population_frequencies("rs100") == {"afr": pytest.approx(0.3)}
+        conn = gnomad._get_connection()
+        row = conn.execute("SELECT af_global, ac_global FROM variants WHERE variant_id = '1-2000-C-G'").fetchone()
+        assert tuple(row) == (pytest.approx(0.01), 1)
+        gnomad.close()
+    
+    def test_gwas_catalog(self, tmp_path):
+        from datasets.build import build_dataset
+        from datasets.gwas_catalog import GWASCatalog
+        source = tmp_path / "associations.tsv"
+        source.write_text(GWAS_TSV)
+        stats = build_dataset("gwas_catalog", [source], data_dir=tmp_path / "gwas")
+        
+        assert stats.rows == {"associations": 2}
+        assert stats.skipped == 2
+        
+        gwas = GWASCatalog(data_dir=tmp_path / "gwas")
+        t2d = gwas.get_variant_associations("rs7903146")[0]
+        assert (t2d.trait, t2d.odds_ratio, t2d.risk_allele) == ("Type 2 diabetes", 1.4, "T")
+        assert (t2d.ci_lower, t2d.ci_upper) == (1.3, 1.5)
+        assert t2d.trait_ontology == "EFO:0001360"
+        assert t2d.study_sample_size == 4549 + 5579
+        assert t2d.ancestry == "European"
+        height = gwas.get_variant_associations("rs3791679")[0]
+        assert height.beta == -0.28 and height.odds_ratio is None
+        gwas.close()
+    
+    def test_rejects_unrecognized_source(self, tmp_path):
+        from datasets.build import build_dataset
+        source = tmp_path / "other.tsv"
+        source.write_text("a\tb\n1\t2\n")
+        with pytest.raises(ValueError):
+            build_dataset("clinvar", [source], data_dir=tmp_path / "clinvar")
+        assert not (tmp_path / "clinvar" / "data.db").exists()
 
 
 class TestGWASCatalog:
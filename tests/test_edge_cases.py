@@ -421,7 +421,8 @@ class TestIntegration:
             str(test_file),
             output_dir=str(output_dir),
             generate_html_dashboard=True,
-            auto_open_dashboard=False
+            auto_open_dashboard=False,
+            cache=False
         )
         
         # Check results
@@ -443,7 +444,7 @@ class TestIntegration:
         )
         
         with pytest.raises(ValueError, match="No valid genotypes"):
-            analyze_dna_file(str(test_file))
+            analyze_dna_file(str(test_file), cache=False)
 
 
 # =============================================================================
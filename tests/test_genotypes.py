@@ -0,0 +1,240 @@
+"""
+Tests for the columnar GenotypeStore.
+"""
+
+import pickle
+import sys
+import os
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from personal_genomics.genotypes import (
+    GenotypeStore,
+    GenotypeStoreBuilder,
+    rsid_to_int,
+    int_to_rsid,
+    locus_id,
+    chromosome_code,
+    CHROMOSOME_NAMES,
+)
+from tests.fixtures.synthetic_dna import SYNTHETIC_GENOME_EUROPEAN, SYNTHETIC_GENOME_EDGE_CASES
+
+
+SAMPLE = {
+    "rs429358": "TC",
+    "rs7412": "CC",
+    "rs113993960": "DI",
+    "rs2032652": "G",
+    "i4000377": "AA",
+}
+
+
+class TestEncoding:
+    """Tests for id and chromosome encoding helpers."""
+
+    def test_rsid_roundtrip(self):
+        assert rsid_to_int("rs429358") == 429358
+        assert int_to_rsid(429358) == "rs429358"
+        assert rsid_to_int("i4000377") == -4000377
+        assert int_to_rsid(-4000377) == "i4000377"
+
+    def test_invalid_rsids(self):
+        for bad in ("", "rs", "rsABC", "chrZ:100", "1:0", "1:x", None, 12345, "rs0"):
+            assert rsid_to_int(bad) is None
+
+    def test_locus_ids(self):
+        assert locus_id("chr19", "44908684") == "19:44908684"
+        assert locus_id("23", 5) == "X:5"
+        key = rsid_to_int("chr1:100")
+        assert key < 0 and key != rsid_to_int("i100")
+        assert int_to_rsid(key) == "1:100"
+        store = GenotypeStore.from_dict({"1:100": "AG", "rs7412": "CC"})
+        assert store["chr1:100"] == "AG"
+        assert sorted(store) == ["1:100", "rs7412"]
+
+    def test_chromosome_codes(self):
+        assert CHROMOSOME_NAMES[chromosome_code("19")] == "19"
+        assert CHROMOSOME_NAMES[chromosome_code("chrX")] == "X"
+        assert CHROMOSOME_NAMES[chromosome_code("M")] == "MT"
+        assert chromosome_code("weird") == 0
+
+
+class TestGenotypeStore:
+    """Tests for dict-compatible behaviour."""
+
+    def test_from_dict_matches_dict(self):
+        store = GenotypeStore.from_dict(SAMPLE)
+        assert len(store) == len(SAMPLE)
+        assert store == SAMPLE
+        for rsid, geno in SAMPLE.items():
+            assert store[rsid] == geno
+            assert rsid in store
+            assert store.get(rsid) == geno
+
+    def test_missing_keys(self):
+        store = GenotypeStore.from_dict(SAMPLE)
+        assert "rs1" not in store
+        assert store.get("rs1") is None
+        assert store.get("rs1", "") == ""
+        assert 12345 not in store
+        with pytest.raises(KeyError):
+            store["rs1"]
+
+    def test_items_and_to_dict(self):
+        store = GenotypeStore.from_dict(SAMPLE)
+        assert dict(store.items()) == SAMPLE
+        assert store.to_dict() == SAMPLE
+        assert sorted(store.values()) == sorted(SAMPLE.values())
+
+    def test_last_duplicate_wins(self):
+        builder = GenotypeStoreBuilder()
+        builder.add("rs1", "AA", "1", 100)
+        builder.add("rs2", "CC", "1", 200)
+        builder.add("rs1", "AG", "1", 100)
+        store = builder.build()
+        assert len(store) == 2
+        assert store["rs1"] == "AG"
+
+    def test_positions_preserved(self):
+        builder = GenotypeStoreBuilder()
+        builder.add("rs7412", "CC", "19", "44908822")
+        builder.add("rs2032652", "G", "Y", 14850000)
+        store = builder.build()
+        assert store.chromosome("rs7412") == "19"
+        assert store.position("rs7412") == 44908822
+        assert store.chromosome("rs2032652") == "Y"
+        assert store.has_positions
+
+    def test_vectorized_membership(self):
+        store = GenotypeStore.from_dict(SAMPLE)
+        mask = store.contains_many(["rs7412", "rs1", "i4000377", "bogus"])
+        assert mask.tolist() == [True, False, True, False]
+        idx = store.indices(["rs7412", "rs1"])
+        assert idx[1] == -1
+
+    def test_subset_keeps_indels(self):
+        store = GenotypeStore.from_dict(SAMPLE)
+        sub = store.subset(["rs113993960", "rs7412", "rs1"])
+        assert sub.to_dict() == {"rs113993960": "DI", "rs7412": "CC"}
+
+    def test_pickle_roundtrip(self):
+        store = GenotypeStore.from_dict(SAMPLE)
+        restored = pickle.loads(pickle.dumps(store))
+        assert restored == store
+
+    def test_empty_store(self):
+        store = GenotypeStoreBuilder().build()
+        assert len(store) == 0
+        assert "rs1" not in store
+        assert store.contains_many(["rs1"]).tolist() == [False]
+
+    def test_compact_footprint(self):
+        n = 100_000
+        store = GenotypeStore(
+            np.arange(1, n + 1, dtype=np.int64),
+            np.zeros(n, dtype=np.uint8),
+        )
+        assert store.nbytes < 20 * n
+
+
+class TestLoaderIntegration:
+    """Loaders return a store that works with existing analysis code."""
+
+    def test_consumer_loader_returns_store(self, tmp_path):
+        from comprehensive_analysis import load_dna_file, determine_apoe
+
+        path = tmp_path / "genome.txt"
+        path.write_text(SYNTHETIC_GENOME_EUROPEAN)
+        genotypes, fmt = load_dna_file(str(path))
+
+        assert isinstance(genotypes, GenotypeStore)
+        assert genotypes["rs7412"] == "CC"
+        assert genotypes.position("rs429358") == 44908684
+        assert determine_apoe(genotypes)["genotype"] == "ε3/ε4"
+
+    def test_analyze_markers_accepts_store(self):
+        from comprehensive_analysis import analyze_markers
+
+        markers = {"rs7412": {"gene": "APOE", "risk_allele": "T"}}
+        store = GenotypeStore.from_dict({"rs7412": "CT"})
+        result = analyze_markers(store, markers, "test")
+        assert result["found_in_data"] == 1
+        assert result["risk_variants"] == 1
+
+
+class TestFastConsumerParser:
+    """The vectorized parser must agree with the line-by-line loader."""
+
+    @pytest.mark.parametrize("genome", [
+        SYNTHETIC_GENOME_EUROPEAN,
+        SYNTHETIC_GENOME_EDGE_CASES,
+        SYNTHETIC_GENOME_EUROPEAN.replace("\tT\tC\n", "\tD\tI\n"),
+    ])
+    def test_matches_line_parser(self, tmp_path, genome):
+        from comprehensive_analysis import parse_consumer_buffer, _load_consumer_format_lines
+
+        path = tmp_path / "genome.txt"
+        path.write_text(genome)
+        fast = parse_consumer_buffer(genome.encode())
+        slow = _load_consumer_format_lines(path)
+
+        assert fast is not None
+        assert fast == slow
+        assert fast.positions.tolist() == slow.positions.tolist()
+        assert fast.chromosomes.tolist() == slow.chromosomes.tolist()
+
+    def test_blank_padded_fields_match_line_parser(self, tmp_path):
+        from comprehensive_analysis import parse_consumer_buffer, _load_consumer_format_lines
+
+        rows = [f"rs{i}\t1\t{i * 100}\tAG" for i in range(1, 40)]
+        rows[3] = "rs43 \t1\t123\tAG"
+        rows[7] = "rs44\t2 \t 456\tCT"
+        genome = "\n".join(rows) + "\n"
+        path = tmp_path / "genome.txt"
+        path.write_text(genome)
+        fast = parse_consumer_buffer(genome.encode())
+        slow = _load_consumer_format_lines(path)
+
+        assert fast["rs43"] == "AG"
+        assert fast == slow
+        assert fast.positions.tolist() == slow.positions.tolist()
+        assert fast.chromosomes.tolist() == slow.chromosomes.tolist()
+        assert fast.qc.to_dict() == slow.qc.to_dict()
+
+    def test_23andme_layout(self):
+        from comprehensive_analysis import parse_consumer_buffer
+
+        data = (
+            b"# rsid\tchromosome\tposition\tgenotype\r\n"
+            b"rs4477212\t1\t82154\tAA\r\n"
+            b"rs3094315\tchr1\t752566\tag\r\n"
+            b"rs2032652\tY\t14850000\tG\r\n"
+            b"rs1\tMT\t73\t--\r\n"
+            b"i4000377\t19\t100\tAA\r\n"
+            b"rs4477212\t1\t82154\tAG"
+        )
+        store = parse_consumer_buffer(data)
+        assert store.to_dict() == {
+            "rs4477212": "AG", "rs3094315": "AG", "rs2032652": "G",
+        }
+        assert store.chromosome("rs3094315") == "1"
+        assert store.position("rs2032652") == 14850000
+
+    def test_irregular_lines_keep_file_order(self):
+        from comprehensive_analysis import parse_consumer_buffer
+
+        rows = [f"rs{i}\t1\t{i}\tA\tA" for i in range(1, 20)]
+        rows.insert(1, "rs3,1,3,CC")
+        rows.append("rs4,1,4,GG")
+        store = parse_consumer_buffer("\n".join(rows).encode())
+        assert store["rs3"] == "AA"
+        assert store["rs4"] == "GG"
+
+    def test_declines_non_tab_files(self):
+        from comprehensive_analysis import parse_consumer_buffer
+
+        assert parse_consumer_buffer(b"RSID,CHROMOSOME,POSITION,RESULT\nrs1,1,5,AA\n") is None
+        assert parse_consumer_buffer(b"# only comments\n") is None
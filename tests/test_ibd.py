@@ -0,0 +1,207 @@
+"""
+Tests for the IBD segment finder.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from personal_genomics.cohort import CohortBuilder, build_cohort
+from personal_genomics.genotypes import GenotypeStore
+from personal_genomics.ibd import GeneticMap, IBDParams, find_ibd_segments, match_cohort
+
+
+N_CHROM = 6
+PER_CHROM = 2000
+SPACING = 10_000        # 20 Mb (20 cM at 1 cM/Mb) per chromosome
+
+CHROMOSOMES = np.repeat(np.arange(1, N_CHROM + 1), PER_CHROM).astype(np.uint8)
+POSITIONS = np.tile(np.arange(1, PER_CHROM + 1) * SPACING, N_CHROM).astype(np.uint32)
+
+
+class Population:
+    """Haplotypes (0 = A, 1 = G) with one crossover per chromosome per meiosis."""
+
+    def __init__(self, seed=3):
+        self.rng = np.random.default_rng(seed)
+        self.freq = self.rng.uniform(0.05, 0.5, len(POSITIONS))
+
+    def founder(self):
+        return tuple((self.rng.random(len(POSITIONS)) < self.freq).astype(np.uint8) for _ in range(2))
+
+    def gamete(self, parent):
+        switch = self.rng.integers(0, PER_CHROM, N_CHROM)
+        first = self.rng.integers(0, 2, N_CHROM)
+        column = np.tile(np.arange(PER_CHROM), N_CHROM)
+        which = (column >= np.repeat(switch, PER_CHROM)) ^ np.repeat(first, PER_CHROM).astype(bool)
+        return np.where(which, parent[1], parent[0])
+
+    def child(self, mother, father):
+        return self.gamete(mother), self.gamete(father)
+
+
+def to_store(haplotypes):
+    a1 = np.where(haplotypes[0] == 1, 2, 0)
+    a2 = np.where(haplotypes[1] == 1, 2, 0)
+    codes = (np.minimum(a1, a2) * 4 + np.maximum(a1, a2)).astype(np.uint8)
+    ids = np.arange(1, len(POSITIONS) + 1)
+    return GenotypeStore.from_arrays(ids, codes, CHROMOSOMES, POSITIONS)
+
+
+@pytest.fixture(scope="module")
+def pedigree():
+    pop = Population()
+    grandmother, grandfather = pop.founder(), pop.founder()
+    parent = pop.child(grandmother, grandfather)
+    aunt = pop.child(grandmother, grandfather)
+    child = pop.child(parent, pop.founder())
+    cousin = pop.child(aunt, pop.founder())
+    return {
+        "grandmother": grandmother,
+        "parent": parent,
+        "aunt": aunt,
+        "child": child,
+        "cousin": cousin,
+        "unrelated": pop.founder(),
+    }
+
+
+def planted(start_snp=500, end_snp=1500, chrom=3, seed=9):
+    """Two unrelated genomes sharing one haplotype on ``chrom`` between two SNPs."""
+    pop = Population(seed)
+    a, b = pop.founder(), pop.founder()
+    block = slice((chrom - 1) * PER_CHROM + start_snp, (chrom - 1) * PER_CHROM + end_snp)
+    b[0][block] = a[0][block]
+    return a, b, block
+
+
+class TestFindIBDSegments:
+    """Tests for find_ibd_segments."""
+
+    def test_parent_child_share_every_chromosome(self, pedigree):
+        result = find_ibd_segments(to_store(pedigree["parent"]), to_store(pedigree["child"]))
+        assert [s.chromosome for s in result.segments] == [str(c) for c in range(1, N_CHROM + 1)]
+        assert result.total_cm == pytest.approx(N_CHROM * 20, rel=0.01)
+        assert all(s.mismatches == 0 for s in result.segments)
+
+    def test_relationships_ordered(self, pedigree):
+        def total(a, b):
+            return find_ibd_segments(to_store(pedigree[a]), to_store(pedigree[b])).total_cm
+
+        aunt = total("aunt", "child")
+        cousin = total("child", "cousin")
+        assert total("parent", "child") > aunt > cousin > 0
+        assert total("child", "unrelated") == 0
+
+    def test_planted_segment(self):
+        a, b, block = planted()
+        result = find_ibd_segments(to_store(a), to_store(b), names=("a", "b"))
+        [segment] = result.segments
+        assert (result.sample_1, result.sample_2) == ("a", "b")
+        assert segment.chromosome == "3"
+        assert abs(segment.start - int(POSITIONS[block.start])) <= 20 * SPACING
+        assert abs(segment.end - int(POSITIONS[block.stop - 1])) <= 20 * SPACING
+        assert segment.length_cm == pytest.approx(10, abs=0.5)
+
+    def test_joins_across_genotyping_error(self):
+        a, b, block = planted()
+        # Opposite homozygote in the middle of the shared block
+        middle = (block.start + block.stop) // 2
+        a[0][middle] = a[1][middle] = 0
+        b[0][middle] = b[1][middle] = 1
+        [segment] = find_ibd_segments(to_store(a), to_store(b)).segments
+        assert segment.mismatches == 1
+        assert segment.length_cm == pytest.approx(10, abs=0.5)
+
+        strict = IBDParams(join_max_mismatches=0)
+        halves = find_ibd_segments(to_store(a), to_store(b), params=strict).segments
+        assert len(halves) == 0 or all(s.length_cm < 6 for s in halves)
+        loose = IBDParams(join_max_mismatches=0, min_cm=3, min_snps=200)
+        assert len(find_ibd_segments(to_store(a), to_store(b), params=loose).segments) == 2
+
+    def test_genetic_map(self, tmp_path):
+        a, b, _ = planted()
+        path = tmp_path / "chr3.map"
+        # PLINK layout, 2 cM per Mb on chromosome 3
+        path.write_text("3 . 0.0 1\n3 . 40.0 20000001\n")
+        result = find_ibd_segments(to_store(a), to_store(b), genetic_map=GeneticMap.load(path))
+        assert result.segments[0].length_cm == pytest.approx(20, abs=1)
+
+        hapmap = tmp_path / "hapmap.txt"
+        hapmap.write_text("Chromosome\tPosition(bp)\tRate(cM/Mb)\tMap(cM)\nchr3\t1\t2.0\t0.0\nchr3\t20000001\t2.0\t40.0\n")
+        genetic_map = GeneticMap.load(hapmap)
+        assert "3" in genetic_map
+        assert genetic_map.cm("3", [10_000_001])[0] == pytest.approx(20)
+        assert genetic_map.cm("4", [10_000_000])[0] == pytest.approx(10)
+
+
+@pytest.fixture(scope="module")
+def cohort(pedigree):
+    return build_cohort({name: to_store(h) for name, h in pedigree.items()})
+
+
+class TestMatchCohort:
+    """Tests for match_cohort."""
+
+    def test_matches_sorted_by_total(self, cohort):
+        matches = match_cohort(cohort, "child")
+        names = [m.sample_2 for m in matches]
+        assert names[0] == "parent"
+        assert "unrelated" not in names and "child" not in names
+        assert all(m.sample_1 == "child" for m in matches)
+        assert [m.total_cm for m in matches] == sorted((m.total_cm for m in matches), reverse=True)
+
+    def test_blocks_and_workers_agree(self, cohort):
+        def summary(**kwargs):
+            return [m.to_dict() for m in match_cohort(cohort, "child", **kwargs)]
+
+        expected = summary()
+        assert summary(max_elements=PER_CHROM) == expected
+        assert summary(workers=2) == expected
+
+    def test_worker_tasks_carry_one_chromosome(self, cohort):
+        import pickle
+        from personal_genomics.ibd import _chromosome_tasks
+
+        ranges = [(name, lo, hi, np.zeros(hi - lo)) for name, lo, hi in cohort.chromosome_ranges()]
+        query = np.zeros(cohort.n_snps, dtype=bool)
+        tasks = list(_chromosome_tasks(cohort, query, query, ranges))
+        assert len(tasks) == N_CHROM
+        for task in tasks:
+            assert task[0].shape[1] <= PER_CHROM // 64 + 2
+            assert len(pickle.dumps(task[:2])) < cohort.nbytes / 2
+
+    def test_external_query_and_unsorted_panel(self, pedigree, cohort):
+        expected = [m.to_dict() for m in match_cohort(cohort, "child")]
+
+        # The query as a genome outside the cohort (SNPs where the cohort
+        # never saw the query's second allele count as missing)
+        others = build_cohort({n: to_store(h) for n, h in pedigree.items() if n != "child"})
+        external = match_cohort(others, to_store(pedigree["child"]), query_name="child")
+        assert [(m.sample_1, m.sample_2) for m in external] == [(m["sample_1"], m["sample_2"]) for m in expected]
+        for match, reference in zip(external, expected):
+            assert match.total_cm == pytest.approx(reference["total_cm"], abs=0.5)
+
+        # A panel that isn't in position order is re-sorted first
+        shuffled = np.random.default_rng(0).permutation(np.arange(1, len(POSITIONS) + 1))
+        builder = CohortBuilder(shuffled)
+        for name, haplotypes in pedigree.items():
+            builder.add(name, to_store(haplotypes))
+        unsorted = builder.build()
+        assert unsorted.chromosome_ranges() is None
+        assert [m.to_dict() for m in match_cohort(unsorted, "child")] == expected
+
+    def test_cli_against_saved_cohort(self, pedigree, cohort, tmp_path):
+        from comprehensive_analysis import find_ibd_matches
+
+        store = to_store(pedigree["child"])
+        query = tmp_path / "query.txt"
+        lines = [f"{rsid}\t{store.chromosome(rsid)}\t{store.position(rsid)}\t{g}" for rsid, g in store.items()]
+        query.write_text("\n".join(lines) + "\n")
+        summary = find_ibd_matches(query, cohort.save(tmp_path / "cohort.npz"), output_dir=tmp_path / "out")
+        assert summary["top_matches"][0]["sample"] in ("child", "parent")
+        assert (tmp_path / "out" / "ibd_matches.jsonl").exists()
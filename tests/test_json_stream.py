@@ -0,0 +1,94 @@
+"""
+Tests for the streaming JSON writer.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from personal_genomics.json_stream import JSONObjectWriter, write_json
+from tests.fixtures.synthetic_dna import SYNTHETIC_GENOME_EUROPEAN
+
+
+SAMPLE = {
+    "total_snps": 4,
+    "apoe": {"genotype": "ε3/ε3", "risk_level": "average"},
+    "traits": {"findings": [{"rsid": "rs1", "is_risk": True, "score": 0.25}], "actionable_items": []},
+    "empty": {},
+    "path": __import__("pathlib").Path("/tmp/x"),
+}
+
+
+class TestJSONObjectWriter:
+    """Tests for JSONObjectWriter and write_json."""
+
+    def test_indented_matches_json_dump(self, tmp_path):
+        path = write_json(tmp_path / "out.json", SAMPLE)
+        assert path.read_text(encoding="utf-8") == json.dumps(SAMPLE, indent=2, default=str)
+
+    def test_compact(self, tmp_path):
+        path = write_json(tmp_path / "out.json", SAMPLE, indent=None)
+        text = path.read_text(encoding="utf-8")
+        assert "\n" not in text
+        assert json.loads(text) == json.loads(json.dumps(SAMPLE, default=str))
+
+    def test_incremental_members(self, tmp_path):
+        with JSONObjectWriter(tmp_path / "out.json") as out:
+            for key, value in SAMPLE.items():
+                out.write(key, value)
+        assert json.loads((tmp_path / "out.json").read_text()) == json.loads(json.dumps(SAMPLE, default=str))
+
+    def test_empty_object(self, tmp_path):
+        write_json(tmp_path / "out.json", {})
+        assert (tmp_path / "out.json").read_text() == "{}"
+
+    def test_failure_keeps_previous_output(self, tmp_path):
+        target = tmp_path / "out.json"
+        target.write_text('{"previous": true}')
+        with pytest.raises(RuntimeError):
+            with JSONObjectWriter(target) as out:
+                out.write("partial", 1)
+                raise RuntimeError("analysis failed")
+        assert json.loads(target.read_text()) == {"previous": True}
+        assert list(tmp_path.iterdir()) == [target]
+
+    def test_compact_analysis_output(self, tmp_path):
+        from comprehensive_analysis import analyze_dna_file
+
+        kit = tmp_path / "kit.txt"
+        kit.write_text(SYNTHETIC_GENOME_EUROPEAN)
+        pretty = analyze_dna_file(kit, output_dir=tmp_path / "a", generate_html_dashboard=False, cache=False)
+        analyze_dna_file(
+            kit, output_dir=tmp_path / "b", generate_html_dashboard=False, cache=False, compact_json=True
+        )
+
+        for name in ("full_analysis.json", "agent_summary.json"):
+            indented = (tmp_path / "a" / name).read_text(encoding="utf-8")
+            compact = (tmp_path / "b" / name).read_text(encoding="utf-8")
+            assert len(compact) < len(indented)
+            compact, indented = json.loads(compact), json.loads(indented)
+            compact.pop("analysis_timestamp", None)
+            indented.pop("analysis_timestamp", None)
+            assert compact == indented
+        assert list(json.loads((tmp_path / "a" / "full_analysis.json").read_text())) == list(pretty)
+
+    def test_analysis_keeps_only_what_reports_read(self, tmp_path):
+        import comprehensive_analysis as ca
+
+        kit = tmp_path / "kit.txt"
+        kit.write_text(SYNTHETIC_GENOME_EUROPEAN)
+        retained = ca.analyze_dna_file(kit, output_dir=tmp_path, generate_html_dashboard=False, cache=False)
+        full = json.loads((tmp_path / "full_analysis.json").read_text())
+
+        assert list(retained) == list(full)
+        assert set(retained["traits"]) <= {"actionable_items", "findings"} < set(full["traits"])
+        # The summary built from the full results is the one that was written
+        expected = ca.generate_agent_summary(full)
+        written = json.loads((tmp_path / "agent_summary.json").read_text())
+        expected.pop("analysis_timestamp")
+        written.pop("analysis_timestamp")
+        assert written == json.loads(json.dumps(expected, default=str))
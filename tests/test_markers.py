@@ -279,5 +279,189 @@ class TestMarkerConsistency:
                     f"Invalid rsID format: {rsid}"
 
 
+class TestLazyMarkers:
+    """The markers package imports category modules on first access."""
+    
+    def _run(self, code):
+        import subprocess
+        repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=repo,
+            capture_output=True, text=True, check=True,
+        )
+        return result.stdout.strip()
+    
+    def test_import_loads_no_categories(self):
+        """Importing the package alone loads no category or scipy modules."""
+        out = self._run(
+            "import sys, markers; "
+            "print(sorted(m for m in sys.modules if m.startswith(('markers.', 'scipy'))))"
+        )
+        assert out == "[]"
+    
+    def test_single_category_loads_one_module(self):
+        """Touching one category imports only its module."""
+        out = self._run(
+            "import sys; from markers import TRAIT_MARKERS; "
+            "print(sorted(m for m in sys.modules if m.startswith('markers.')))"
+        )
+        assert out == "['markers.traits']"
+    
+    def test_lazy_names_match_submodules(self):
+        """Lazy attributes and aliases resolve to the submodule objects."""
+        import markers
+        from markers import vision_hearing, traits, traits_extended
+        
+        assert markers.TRAIT_MARKERS is traits.TRAIT_MARKERS
+        assert markers.SENSORY_NOTES is vision_hearing.CLINICAL_NOTES
+        assert markers.ALL_TRAITS == {**traits.TRAIT_MARKERS, **traits_extended.TRAITS_EXTENDED}
+        assert "PRS_WEIGHTS" in dir(markers)
+        with pytest.raises(AttributeError):
+            markers.NOT_A_MARKER_SET
+
+
+class TestMarkerIndex:
+    """Tests for the compiled marker index used by analyze_markers."""
+
+    MARKERS = {
+        "rs1": {"gene": "G1", "risk_allele": "A", "trait": "t1",
+                "actionable": {"priority": "high"}},
+        "rs2": {"gene": "G2", "effect_allele": "del"},
+        "rs3": {"risk_allele": ""},
+        "not_an_rsid": {"gene": "G4", "risk_allele": "A"},
+    }
+
+    def _reference(self, genotypes):
+        """Findings computed marker by marker."""
+        findings = []
+        for rsid in ("rs1", "rs2", "rs3"):
+            geno = genotypes.get(rsid)
+            if geno:
+                info = self.MARKERS[rsid]
+                risk = info.get("risk_allele") or info.get("effect_allele", "")
+                findings.append((rsid, geno, geno.upper().count(risk.upper()) if risk else 0))
+        return findings
+
+    @pytest.mark.parametrize("as_store", [False, True])
+    def test_join_matches_per_marker_logic(self, as_store):
+        from comprehensive_analysis import MarkerIndex
+        from personal_genomics.genotypes import GenotypeStore
+
+        genotypes = {"rs1": "AG", "rs2": "DEL", "rs3": "CC", "rs9": "AA"}
+        if as_store:
+            genotypes = GenotypeStore.from_dict(genotypes)
+
+        result = MarkerIndex({"custom": self.MARKERS}).analyze(genotypes)["custom"]
+        assert result["total_in_database"] == 4
+        assert result["found_in_data"] == 3
+        assert result["risk_variants"] == 2
+        assert [(f["rsid"], f["genotype"], f["risk_copies"]) for f in result["findings"]] == \
+            self._reference(genotypes)
+        assert result["findings"][0]["trait"] == "t1"
+        assert result["actionable_items"] == [
+            {"rsid": "rs1", "gene": "G1", "genotype": "AG", "priority": "high"}
+        ]
+        assert result["findings"][2]["gene"] == "Unknown"
+
+    def test_all_categories_in_one_pass(self):
+        from comprehensive_analysis import (
+            MARKER_CATEGORIES, analyze_all_markers, analyze_markers, load_dna_file,
+        )
+        from tests.fixtures.synthetic_dna import SYNTHETIC_GENOME_HIGH_RISK
+        import tempfile
+
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write(SYNTHETIC_GENOME_HIGH_RISK)
+        try:
+            genotypes, _ = load_dna_file(f.name)
+        finally:
+            os.unlink(f.name)
+
+        combined = analyze_all_markers(genotypes)
+        assert list(combined) == list(MARKER_CATEGORIES)
+        for category, markers in MARKER_CATEGORIES.items():
+            assert combined[category] == analyze_markers(genotypes, markers, category)
+        assert sum(r["found_in_data"] for r in combined.values()) > 0
+
+
+class TestAncientPanel:
+    """Matrix IBS scoring must agree with calculate_genetic_distance."""
+    
+    CALLS = ["AA", "AG", "GA", "GG", "CT", "TT", "A", "--", "delC", "ag", ""]
+    
+    def random_genome(self, rsids, seed):
+        import random
+        rng = random.Random(seed)
+        genome = {f"rs9{i}": "CC" for i in range(50)}
+        genome.update({rsid: rng.choice(self.CALLS) for rsid in rsids if rng.random() < 0.85})
+        return genome
+    
+    def test_matches_pairwise_distance(self):
+        from markers.ancient_matching import (
+            AncientPanel, calculate_genetic_distance, get_ancient_individuals,
+        )
+        individuals = {
+            ancient_id: individual.get("snps", {})
+            for ancient_id, individual in get_ancient_individuals().items()
+            if not ancient_id.startswith("_")
+        }
+        panel = AncientPanel(individuals)
+        for seed in range(20):
+            genome = self.random_genome(panel.rsids, seed)
+            scores = panel.score(genome)
+            for row, ancient_id in enumerate(panel.ids):
+                expected = calculate_genetic_distance(genome, individuals[ancient_id])
+                if expected is None:
+                    assert scores.shared_snps[row] < 5
+                    continue
+                result = scores.as_dict(row)
+                for key in ("shared_snps", "identical_snps", "partial_snps",
+                            "different_snps", "confidence"):
+                    assert result[key] == expected[key]
+                assert result["total_ibs"] == pytest.approx(expected["total_ibs"])
+                assert result["max_ibs"] == pytest.approx(expected["max_ibs"])
+    
+    def test_ragged_panel_and_unweighted(self):
+        from markers.ancient_matching import AncientPanel
+        panel = AncientPanel({
+            "a": {"rs1": "AG", "rs2": "CC", "rs3": "delT"},
+            "b": {"rs4": "TT", "rs1": "GA"},
+            "c": {},
+        }, weights={"rs1": 2.0})
+        assert panel.rsids == ["rs1", "rs2", "rs3", "rs4"]
+        
+        scores = panel.score({"rs1": "GG", "rs2": "CC", "rs3": "TT", "rs4": "A"})
+        assert scores.shared_snps.tolist() == [2, 2, 0]
+        assert scores.identical_snps.tolist() == [1, 0, 0]
+        assert scores.partial_snps.tolist() == [1, 1, 0]
+        assert scores.total_ibs.tolist() == [4.0, 2.0, 0.0]
+        assert scores.max_ibs.tolist() == [6.0, 6.0, 0.0]
+        
+        unweighted = panel.score({"rs1": "GG", "rs2": "CC"}, weighted=False)
+        assert unweighted.total_ibs.tolist() == [3.0, 1.0, 0.0]
+    
+    def test_block_rows_do_not_change_scores(self):
+        from markers.ancient_matching import get_ancient_panel
+        panel = get_ancient_panel()
+        genome = self.random_genome(panel.rsids, 0)
+        whole = panel.score(genome)
+        blocked = panel.score(genome, block_rows=3)
+        assert whole.total_ibs.tolist() == blocked.total_ibs.tolist()
+        assert whole.shared_snps.tolist() == blocked.shared_snps.tolist()
+    
+    def test_find_closest_ancients_ranking(self):
+        from markers.ancient_matching import find_closest_ancients, get_ancient_panel
+        genome = self.random_genome(get_ancient_panel().rsids, 3)
+        everyone = find_closest_ancients(genome, top_n=1000)
+        top = find_closest_ancients(genome, top_n=5)
+        
+        assert [m["id"] for m in top] == [m["id"] for m in everyone[:5]]
+        similarities = [m["similarity_percent"] for m in everyone]
+        assert similarities == sorted(similarities, reverse=True)
+        assert all(m["total_compared"] == len(everyone) for m in top)
+        for match in top:
+            assert len(match["snp_details"]) == match["shared_snps"]
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
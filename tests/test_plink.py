@@ -0,0 +1,148 @@
+"""
+Tests for the PLINK binary writers.
+"""
+
+import os
+import struct
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from personal_genomics.cohort import build_cohort
+from personal_genomics.plink import write_bed, write_pgen
+
+
+N_SNPS = 130
+
+
+def genomes(n_samples=7, seed=5):
+    """Random A/G kits with no-calls, in SNP order rs1..rsN."""
+    rng = np.random.default_rng(seed)
+    kits = {}
+    for s in range(n_samples):
+        calls = rng.choice(["AA", "AG", "GG", "--"], N_SNPS, p=[0.4, 0.3, 0.2, 0.1])
+        kits[f"kit {s}"] = {f"rs{i + 1}": str(g) for i, g in enumerate(calls)}
+    return kits
+
+
+def decode(data, n_samples, n_variants, offset):
+    """Per-call loop over 2-bit codes, first sample in the low bits."""
+    per_variant = (n_samples + 3) // 4
+    codes = np.zeros((n_variants, n_samples), dtype=int)
+    for v in range(n_variants):
+        for s in range(n_samples):
+            byte = data[offset + v * per_variant + s // 4]
+            codes[v, s] = (byte >> (2 * (s % 4))) & 3
+    return codes
+
+
+@pytest.fixture(scope="module")
+def cohort():
+    return build_cohort(genomes(), snp_ids=[f"rs{i}" for i in range(1, N_SNPS + 1)])
+
+
+def alt_counts(cohort):
+    return np.stack([cohort.dosages(s) for s in cohort.samples]).T
+
+
+class TestWriteBed:
+    """Tests for write_bed."""
+
+    def test_bed_codes(self, cohort, tmp_path):
+        files = write_bed(cohort, tmp_path / "cohort", max_elements=64)
+        assert (files.samples, files.variants) == (7, N_SNPS)
+        data = (tmp_path / "cohort.bed").read_bytes()
+        assert data[:3] == bytes((0x6C, 0x1B, 0x01))
+        assert len(data) == 3 + N_SNPS * 2
+        # A1 = alt: 00 hom A1, 10 het, 11 hom A2, 01 missing
+        expected = np.choose(alt_counts(cohort) + 1, [0b01, 0b11, 0b10, 0b00])
+        assert np.array_equal(decode(data, 7, N_SNPS, 3), expected)
+
+    def test_bim_and_fam(self, cohort, tmp_path):
+        write_bed(cohort, tmp_path / "cohort", sexes={"kit 0": "male", "kit 1": "F"})
+        bim = (tmp_path / "cohort.bim").read_text().splitlines()
+        assert len(bim) == N_SNPS
+        chrom, vid, cm, pos, a1, a2 = bim[0].split("\t")
+        assert (vid, cm) == ("rs1", "0")
+        assert {a1, a2} == {"A", "G"} and a2 == cohort.allele(cohort.ref[:1])[0]
+        fam = [line.split("\t") for line in (tmp_path / "cohort.fam").read_text().splitlines()]
+        assert fam[0] == ["kit_0", "kit_0", "0", "0", "1", "-9"]
+        assert [row[4] for row in fam] == ["1", "2"] + ["0"] * 5
+
+
+class TestWritePgen:
+    """Tests for write_pgen."""
+
+    def test_hardcalls(self, cohort, tmp_path):
+        write_pgen(cohort, tmp_path / "cohort", max_elements=64)
+        data = (tmp_path / "cohort.pgen").read_bytes()
+        assert data[:3] == bytes((0x6C, 0x1B, 0x02))
+        assert struct.unpack("<IIB", data[3:12]) == (N_SNPS, 7, 0)
+        expected = np.where(alt_counts(cohort) < 0, 3, alt_counts(cohort))
+        assert np.array_equal(decode(data, 7, N_SNPS, 12), expected)
+
+        pvar = (tmp_path / "cohort.pvar").read_text().splitlines()
+        assert pvar[0] == "#CHROM\tPOS\tID\tREF\tALT" and len(pvar) == N_SNPS + 1
+        psam = (tmp_path / "cohort.psam").read_text().splitlines()
+        assert psam[:2] == ["#IID\tSEX", "kit_0\tNA"]
+
+    def test_dosages(self, cohort, tmp_path):
+        dosages = alt_counts(cohort).T.astype(np.float64)
+        dosages[dosages < 0] = np.nan
+        dosages[0, :3] = [0.3, 1.05, 1.9]
+        write_pgen(cohort, tmp_path / "imputed", dosages=dosages, max_elements=20)
+        data = (tmp_path / "imputed.pgen").read_bytes()
+        assert data[2] == 0x03
+        record = 2 + 7 * 2
+        assert len(data) == 12 + N_SNPS * record
+
+        first = [data[12 + v * record:12 + (v + 1) * record] for v in range(3)]
+        values = [struct.unpack("<7H", r[2:]) for r in first]
+        assert [v[0] for v in values] == [4915, 17203, 31130]
+        # Hard calls: 0.3 is missing, 1.05 -> 1, 1.9 -> missing
+        assert [decode(r, 7, 1, 0)[0, 0] for r in first] == [3, 1, 3]
+
+        missing = np.argwhere(np.isnan(dosages[1]))
+        if len(missing):
+            v = int(missing[0][0])
+            record_v = data[12 + v * record:12 + (v + 1) * record]
+            assert struct.unpack("<7H", record_v[2:])[1] == 65535
+
+    def test_dosage_shape_mismatch(self, cohort, tmp_path):
+        with pytest.raises(ValueError):
+            write_pgen(cohort, tmp_path / "bad", dosages=np.zeros((7, N_SNPS - 1)))
+
+
+class TestConvertToPlink:
+    """Tests for convert_to_plink.convert_to_plink."""
+
+    def test_directory_of_kits(self, tmp_path):
+        from convert_to_plink import convert_to_plink
+
+        kits = tmp_path / "kits"
+        kits.mkdir()
+        for name, genotypes in list(genomes(3).items()):
+            lines = ["# rsid\tchromosome\tposition\tgenotype"]
+            lines += [f"{rsid}\t1\t{i * 100}\t{g}" for i, (rsid, g) in enumerate(genotypes.items(), 1)]
+            lines.append("rs9999\tX\t5000\tA")
+            (kits / f"{name.replace(' ', '_')}.txt").write_text("\n".join(lines) + "\n")
+
+        files = convert_to_plink(kits, tmp_path / "out" / "cohort", workers=1)
+        # Default panel: every SNP called in any kit
+        kits_called = [{r for r, g in kit.items() if g != "--"} for kit in genomes(3).values()]
+        called = len(set.union(*kits_called))
+        assert called > len(kits_called[0])
+        assert (files.samples, files.variants) == (3, called + 1)
+        fam = (tmp_path / "out" / "cohort.fam").read_text().split()
+        assert fam[0] == "kit_0"
+        bim = (tmp_path / "out" / "cohort.bim").read_text().splitlines()
+        assert bim[-1].split("\t")[:2] == ["X", "rs9999"]
+        # Haploid X call kept as homozygous (hom ref: code 11)
+        data = (tmp_path / "out" / "cohort.bed").read_bytes()
+        assert decode(data, 3, called + 1, 3)[-1].tolist() == [0b11] * 3
+
+        single = convert_to_plink(kits / "kit_0.txt", tmp_path / "one", pgen=True, workers=1)
+        assert single.samples == 1 and (tmp_path / "one.pgen").exists()
@@ -0,0 +1,124 @@
+"""
+Tests for the sparse PRS weight-matrix engine.
+"""
+
+import random
+import sys
+import os
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from personal_genomics.genotypes import GenotypeStore
+from personal_genomics.prs_engine import PRSWeightMatrix
+from markers.polygenic_scores import PRS_WEIGHTS
+from markers.prs_extended import PRS_EXTENDED
+
+
+def reference_scores(weights, genotypes):
+    """Per-condition loop with str.count, as calculate_all_prs used to do."""
+    results = {}
+    for rsid, info in weights.items():
+        condition = info["condition"]
+        score, found, total = results.get(condition, (0.0, 0, 0))
+        geno = genotypes.get(rsid)
+        if geno:
+            found += 1
+            score += geno.upper().count(info["effect"].upper()) * info["beta"]
+        results[condition] = (score, found, total + 1)
+    return results
+
+
+def random_genome(rsids, seed):
+    rng = random.Random(seed)
+    calls = ["AA", "AC", "CG", "GG", "TT", "AT", "G", "T", "DI", "II"]
+    return {rsid: rng.choice(calls) for rsid in rsids if rng.random() < 0.8}
+
+
+class TestPRSWeightMatrix:
+    """The matrix product must agree with per-condition scoring."""
+
+    @pytest.mark.parametrize("table", [PRS_WEIGHTS, {**PRS_WEIGHTS, **PRS_EXTENDED}])
+    def test_matches_reference(self, table):
+        matrix = PRSWeightMatrix.from_weight_table(table)
+        for seed in range(5):
+            genome = random_genome(list(table), seed)
+            expected = reference_scores(table, genome)
+            for genotypes in (genome, GenotypeStore.from_dict(genome)):
+                scores = matrix.score(genotypes)
+                assert set(scores.score_ids) == set(expected)
+                for condition, score, found, total in scores:
+                    exp_score, exp_found, exp_total = expected[condition]
+                    assert score == pytest.approx(exp_score)
+                    assert (found, total) == (exp_found, exp_total)
+
+    def test_shared_rsid_with_different_effect_alleles(self):
+        matrix = PRSWeightMatrix.from_records([
+            ("a", "rs1", "A", 1.0),
+            ("b", "rs1", "g", 2.0),
+            ("b", "rs2", "T", 0.5),
+            ("b", "rs2", "C", 0.25),
+        ])
+        scores = matrix.score({"rs1": "AG", "rs2": "CC"})
+        assert scores.score_ids == ["a", "b"]
+        assert scores.raw_scores.tolist() == [1.0, 2.5]
+        assert scores.variants_found.tolist() == [1, 3]
+
+    def test_repeated_entry_last_wins(self):
+        matrix = PRSWeightMatrix.from_records([
+            ("a", "rs1", "A", 1.0),
+            ("a", "rs1", "A", 3.0),
+        ])
+        scores = matrix.score({"rs1": "AA"})
+        assert scores.raw_scores.tolist() == [6.0]
+        assert scores.variants_total.tolist() == [1]
+
+    def test_coverage_and_empty_models(self):
+        matrix = PRSWeightMatrix.from_records(
+            [("a", "rs1", "A", 1.0), ("a", "rs2", "", 1.0)],
+            score_ids=["empty", "a"],
+        )
+        scores = matrix.score({"rs2": "AA", "rs3": "CC"})
+        assert scores.score_ids == ["empty", "a"]
+        assert scores.raw_scores.tolist() == [0.0, 0.0]
+        assert scores.coverage.tolist() == [0.0, 0.5]
+
+    def test_score_many_matches_single(self):
+        matrix = PRSWeightMatrix.from_weight_table(PRS_WEIGHTS)
+        genomes = [random_genome(list(PRS_WEIGHTS), seed) for seed in range(4)]
+        batch = matrix.score_many([GenotypeStore.from_dict(g) for g in genomes])
+        for genome, scores in zip(genomes, batch):
+            single = matrix.score(genome)
+            np.testing.assert_allclose(scores.raw_scores, single.raw_scores)
+            assert scores.variants_found.tolist() == single.variants_found.tolist()
+
+    def test_score_subset_matches_full(self):
+        table = {**PRS_WEIGHTS, **PRS_EXTENDED}
+        matrix = PRSWeightMatrix.from_weight_table(table)
+        genome = random_genome(list(table), 7)
+        wanted = matrix.score_ids[::3][::-1]
+        for genotypes in (genome, GenotypeStore.from_dict(genome)):
+            full = {score_id: rest for score_id, *rest in matrix.score(genotypes)}
+            subset = matrix.score(genotypes, score_ids=wanted)
+            assert subset.score_ids == wanted
+            for score_id, score, found, total in subset:
+                assert score == pytest.approx(full[score_id][0])
+                assert (found, total) == tuple(full[score_id][1:])
+
+    def test_score_subset_joins_only_its_variants(self, monkeypatch):
+        matrix = PRSWeightMatrix.from_records(
+            [("a", "rs1", "A", 1.0), ("b", "rs2", "C", 2.0), ("b", "rs3", "I", 0.5)],
+            score_ids=["a", "b", "empty"],
+        )
+        encoded = []
+        dosages = matrix.dosages
+        monkeypatch.setattr(matrix, "dosages", lambda g, rows=None: encoded.append(rows) or dosages(g, rows))
+        store = GenotypeStore.from_dict({"rs1": "AA", "rs2": "CT", "rs3": "DI"})
+        scores = matrix.score(store, score_ids=["b", "empty"])
+        assert encoded[0].tolist() == [1, 2]
+        assert scores.raw_scores.tolist() == [2.5, 0.0]
+        assert scores.variants_total.tolist() == [2, 0]
+        with pytest.raises(KeyError):
+            matrix.score(store, score_ids=["missing"])
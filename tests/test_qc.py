@@ -0,0 +1,195 @@
+"""
+Tests for the load-time QC accumulator.
+"""
+
+import os
+import pickle
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from personal_genomics.genotypes import GenotypeStoreBuilder
+from personal_genomics.qc import QCStats
+
+
+KIT = """\
+# This data file generated by 23andMe at: Mon Jan 01 2024
+# build 37
+rsid\tchromosome\tposition\tgenotype
+rs1\t1\t100\tAA
+rs2\t1\t200\tAG
+rs3\t1\t300\t--
+rs4\t2\t100\tCT
+rs5\t2\t200\tDI
+rs6\t2\t300\tII
+rs7\tX\t100\tA
+rs8\tX\t200\t00
+rs9\tY\t100\tG
+rs10\tMT\t100\tA
+invalid\t1\t400\tAA
+"""
+
+VCF = """\
+##fileformat=VCFv4.2
+##source=test
+#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tS1
+1\t100\trs1\tA\tG\t.\tPASS\t.\tGT\t0/1
+1\t200\trs2\tC\tT\t.\tPASS\t.\tGT\t1/1
+1\t300\trs3\tG\tA\t.\tPASS\t.\tGT\t./.
+2\t100\trs4\tT\tC\t.\tPASS\t.\tGT\t0/0
+"""
+
+VCF_INDELS = """\
+##fileformat=VCFv4.2
+#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tS1
+1\t100\trs1\tA\tG\t.\tPASS\t.\tGT\t0/1
+1\t200\trs2\tAT\tA\t.\tPASS\t.\tGT\t0/1
+1\t300\trs3\tC\tCTT\t.\tPASS\t.\tGT\t1|1
+1\t400\trs4\tG\tGA\t.\tPASS\t.\tGT\t./.
+2\t100\trs5\tT\t<DEL>\t.\tPASS\t.\tGT\t./.
+X\t100\trs6\tTA\tT\t.\tPASS\t.\tGT\t1
+"""
+
+
+@pytest.fixture
+def kit(tmp_path):
+    path = tmp_path / "kit.txt"
+    path.write_text(KIT)
+    return path
+
+
+class TestQCStats:
+    """Tests for the counts collected while loading."""
+
+    def test_consumer_counts(self, kit):
+        from comprehensive_analysis import load_consumer_format
+
+        qc = load_consumer_format(kit).qc
+        assert qc.total_snps == 10
+        assert qc.no_call_count == 2
+        assert qc.called_snps == 8
+        assert qc.heterozygous_count == 3      # AG, CT, DI
+        assert qc.homozygous_count == 2        # AA, II
+        assert qc.hemizygous_count == 3        # X, Y, MT
+        assert qc.indel_count == 2
+        assert qc.header.startswith("# This data file generated by 23andMe")
+        counts = qc.chromosome_counts()
+        assert counts["1"] == {
+            "total": 3, "called": 2, "no_calls": 1, "heterozygous": 1,
+            "homozygous": 1, "hemizygous": 0, "indels": 0,
+        }
+        assert counts["X"]["no_calls"] == 1
+        assert set(counts) == {"1", "2", "X", "Y", "MT"}
+
+    def test_line_parser_matches_buffer_parser(self, kit):
+        from comprehensive_analysis import _load_consumer_format_lines, load_consumer_format
+
+        fast = load_consumer_format(kit).qc
+        slow = _load_consumer_format_lines(kit).qc
+        assert fast.to_dict() == slow.to_dict()
+        assert fast.header == slow.header
+
+    def test_vcf_counts(self, tmp_path):
+        from comprehensive_analysis import load_vcf
+
+        path = tmp_path / "s.vcf"
+        path.write_text(VCF)
+        genotypes = load_vcf(path)
+        assert len(genotypes) == 3
+        assert (genotypes.qc.total_snps, genotypes.qc.no_call_count) == (4, 1)
+        assert genotypes.qc.heterozygous_count == 1
+        assert "##source=test" in genotypes.qc.header
+
+    def test_vcf_indels_counted(self, tmp_path):
+        from comprehensive_analysis import load_vcf
+
+        path = tmp_path / "indels.vcf"
+        path.write_text(VCF_INDELS)
+        genotypes = load_vcf(path)
+        qc = genotypes.qc
+        # Only the SNV is stored; indel calls and no-calls still count
+        assert len(genotypes) == 1
+        assert (qc.total_snps, qc.no_call_count) == (6, 2)
+        assert qc.call_rate == pytest.approx(4 / 6)
+        assert qc.indel_count == 3
+        assert (qc.heterozygous_count, qc.homozygous_count, qc.hemizygous_count) == (2, 1, 1)
+        assert qc.chromosome_counts()["X"]["indels"] == 1
+
+    def test_builder_no_calls(self):
+        builder = GenotypeStoreBuilder()
+        builder.add("rs1", "AG", "1", 100)
+        builder.add_no_call("rs2", "1")
+        assert not builder.add_no_call("bogus")
+        store = builder.build()
+        assert len(store) == 1 and "rs2" not in store
+        assert (store.qc.total_snps, store.qc.call_rate) == (2, 0.5)
+
+    def test_survives_pickle(self, kit):
+        from comprehensive_analysis import load_consumer_format
+
+        store = pickle.loads(pickle.dumps(load_consumer_format(kit)))
+        assert store.qc.total_snps == 10
+
+    def test_merge(self):
+        a = QCStats.from_codes([1, 1], [0, 1])
+        b = QCStats.from_codes([2], [255])
+        merged = a.merge(b)
+        assert (merged.total_snps, merged.no_call_count) == (3, 1)
+        assert merged.heterozygous_count == 1 and merged.homozygous_count == 1
+
+
+class TestQualityFromQC:
+    """Quality modules build their reports from store.qc."""
+
+    @pytest.fixture
+    def genotypes(self, kit):
+        from comprehensive_analysis import load_consumer_format
+        return load_consumer_format(kit)
+
+    def test_call_rate(self, genotypes):
+        from data_quality import analyze_call_rate
+
+        result = analyze_call_rate(genotypes)
+        assert result["total_snps"] == 10
+        assert result["no_calls"] == 2
+        assert result["valid_calls"] == 8
+        assert result["indels_detected"] == 2
+
+    def test_chromosome_coverage_without_positions(self, genotypes):
+        from data_quality import analyze_chromosome_coverage, generate_quality_report
+
+        coverage = analyze_chromosome_coverage(genotypes)
+        assert coverage["status"] == "success"
+        assert coverage["coverage_by_chromosome"]["1"]["no_calls"] == 1
+
+        report = generate_quality_report(genotypes)
+        assert report["summary"]["total_snps"] == 10
+        assert report["platform_detection"]["total_snps"] == 10
+
+    def test_dict_input_unchanged(self):
+        from data_quality import analyze_chromosome_coverage
+
+        result = analyze_chromosome_coverage({"rs1": "AA"})
+        assert result["status"] == "position_data_unavailable"
+
+    def test_package_quality_report(self, genotypes):
+        from personal_genomics.quality import generate_quality_report
+
+        report = generate_quality_report(genotypes)
+        assert (report.total_snps, report.called_snps) == (10, 8)
+        assert report.chromosome_quality["1"].no_calls == 1
+        assert report.chromosome_quality["2"].call_rate == 1.0
+
+    def test_heterozygosity_rate(self, genotypes):
+        from markers.advanced_genetics import calculate_heterozygosity_rate
+
+        from_qc = calculate_heterozygosity_rate(genotypes)
+        assert from_qc["missing_count"] == 2
+        assert from_qc["total_snps_analyzed"] == 8
+        assert from_qc["heterozygous_count"] == 3
+
+        plain = calculate_heterozygosity_rate(genotypes.to_dict())
+        assert plain["heterozygous_count"] == from_qc["heterozygous_count"]
+        assert plain["homozygous_count"] == from_qc["homozygous_count"]
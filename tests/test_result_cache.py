@@ -0,0 +1,141 @@
+"""
+Tests for the content-addressed result cache.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from personal_genomics.result_cache import ResultCache, cache_key, file_digest, fingerprint
+from tests.fixtures.synthetic_dna import SYNTHETIC_GENOME_EUROPEAN
+
+
+class TestResultCache:
+    """Tests for the on-disk store."""
+
+    def test_round_trip(self, tmp_path):
+        cache = ResultCache(tmp_path)
+        value = {"findings": [{"rsid": "rs1", "risk_copies": 2}], "coverage": (1, 2)}
+        cache.put("k", value)
+        assert "k" in cache
+        assert cache.get("k") == value
+        assert cache.get("missing") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_shared_between_instances(self, tmp_path):
+        ResultCache(tmp_path).put("k", [1, 2, 3])
+        assert ResultCache(tmp_path).get("k") == [1, 2, 3]
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        payload = os.urandom(4000)   # incompressible
+        cache = ResultCache(tmp_path, max_bytes=10_000)
+        cache.put("a", payload)
+        cache.put("b", payload)
+        cache.get("a")
+        cache.put("c", payload)
+        assert "a" in cache and "c" in cache
+        assert "b" not in cache
+        assert cache.size_bytes <= 10_000
+
+    def test_oversized_value_not_stored(self, tmp_path):
+        cache = ResultCache(tmp_path, max_bytes=100)
+        cache.put("k", os.urandom(1000))
+        assert len(cache) == 0
+
+    def test_keys(self, tmp_path):
+        kit = tmp_path / "kit.txt"
+        kit.write_text("rs1\t1\t100\tAA\n")
+        digest = file_digest(kit)
+        kit.write_text("rs1\t1\t100\tAG\n")
+        assert file_digest(kit) != digest
+
+        assert fingerprint({"a": 1, "b": 2}) == fingerprint({"b": 2, "a": 1})
+        assert fingerprint({"a": 1}) != fingerprint({"a": 2})
+        assert cache_key(digest, "4.4.0", "traits") != cache_key(digest, "4.4.1", "traits")
+
+
+class TestAnalysisCache:
+    """Tests for cached analysis in analyze_dna_file."""
+
+    @pytest.fixture
+    def kit(self, tmp_path):
+        path = tmp_path / "kit.txt"
+        path.write_text(SYNTHETIC_GENOME_EUROPEAN)
+        return path
+
+    def test_cached_run_matches_fresh_run(self, kit, tmp_path):
+        import comprehensive_analysis as ca
+
+        cache = ResultCache(tmp_path / "cache")
+        fresh = ca.analyze_dna_file(kit, output_dir=tmp_path / "a", generate_html_dashboard=False, cache=False)
+        first = ca.analyze_dna_file(kit, output_dir=tmp_path / "b", generate_html_dashboard=False, cache=cache)
+        assert cache.hits == 0
+        second = ca.analyze_dna_file(kit, output_dir=tmp_path / "c", generate_html_dashboard=False, cache=cache)
+        assert cache.hits == len(ca.analysis_fingerprints())
+
+        assert list(second) == list(fresh)
+        fresh_json, first_json, second_json = (
+            json.loads((tmp_path / run / "full_analysis.json").read_text()) for run in "abc"
+        )
+        for part in ca.analysis_fingerprints():
+            assert first[part] == fresh[part]
+            assert second[part] == fresh[part]
+            assert first_json[part] == fresh_json[part]
+            assert second_json[part] == fresh_json[part]
+
+    def test_only_changed_category_recomputed(self, kit, tmp_path, monkeypatch):
+        import comprehensive_analysis as ca
+
+        cache = ResultCache(tmp_path / "cache")
+        before = ca.analyze_dna_file(kit, output_dir=tmp_path / "a", generate_html_dashboard=False, cache=cache)
+
+        traits = dict(ca.MARKER_CATEGORIES["traits"])
+        removed = next(iter(traits))
+        del traits[removed]
+        monkeypatch.setitem(ca.MARKER_CATEGORIES, "traits", traits)
+        monkeypatch.setattr(ca, "_FINGERPRINTS", {})
+        monkeypatch.setattr(ca, "_MARKER_INDEX", None)
+
+        analyzed = []
+        analyze = ca.MarkerIndex.analyze
+
+        def spy(self, genotypes, categories=None):
+            analyzed.append(list(categories) if categories is not None else None)
+            return analyze(self, genotypes, categories)
+
+        monkeypatch.setattr(ca.MarkerIndex, "analyze", spy)
+        after = ca.analyze_dna_file(kit, output_dir=tmp_path / "b", generate_html_dashboard=False, cache=cache)
+
+        assert analyzed == [["traits"]]
+        before, after = (
+            json.loads((tmp_path / run / "full_analysis.json").read_text()) for run in "ab"
+        )
+        assert after["traits"]["total_in_database"] == before["traits"]["total_in_database"] - 1
+        assert after["nutrition"] == before["nutrition"]
+
+    def test_category_code_change_invalidates_categories(self, monkeypatch):
+        import comprehensive_analysis as ca
+
+        monkeypatch.setattr(ca, "_FINGERPRINTS", {})
+        before = ca.analysis_fingerprints()
+        monkeypatch.setattr(ca, "_FINGERPRINTS", {})
+        monkeypatch.setattr(ca, "_category_code_fingerprint", lambda: "changed")
+        after = ca.analysis_fingerprints()
+
+        for part in ca.MARKER_CATEGORIES:
+            assert after[part] != before[part]
+        assert after["prs"] == before["prs"]
+
+    def test_different_file_misses(self, kit, tmp_path):
+        import comprehensive_analysis as ca
+
+        cache = ResultCache(tmp_path / "cache")
+        ca.analyze_dna_file(kit, output_dir=tmp_path / "a", generate_html_dashboard=False, cache=cache)
+        other = tmp_path / "other.txt"
+        other.write_text(SYNTHETIC_GENOME_EUROPEAN + "rs999999999\t1\t12345\tAG\n")
+        ca.analyze_dna_file(other, output_dir=tmp_path / "b", generate_html_dashboard=False, cache=cache)
+        assert cache.hits == 0
@@ -0,0 +1,181 @@
+"""
+Tests for the runs-of-homozygosity caller.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from personal_genomics.genotypes import GenotypeStore
+from personal_genomics.roh import ROHCaller, ROHParams, call_roh, call_roh_chromosome
+
+
+def synthetic_genome(n_per_chrom=3000, spacing=20_000, roh=((3, 20_000_000, 30_000_000),), seed=7):
+    """Chromosomes 1-22 with ~32% heterozygosity and homozygous blocks at ``roh``."""
+    rng = np.random.default_rng(seed)
+    chromosomes = np.repeat(np.arange(1, 23), n_per_chrom).astype(np.uint8)
+    positions = np.tile(np.arange(1, n_per_chrom + 1) * spacing, 22).astype(np.uint32)
+    a1 = rng.integers(0, 4, len(positions))
+    a2 = np.where(rng.random(len(positions)) < 0.32, (a1 + 1) % 4, a1)
+    for chrom, start, end in roh:
+        block = (chromosomes == chrom) & (positions >= start) & (positions <= end)
+        a2[block] = a1[block]
+    codes = (a1 * 4 + a2).astype(np.uint8)
+    ids = np.arange(1, len(positions) + 1)
+    return GenotypeStore.from_arrays(ids, codes, chromosomes, positions)
+
+
+class TestROHCaller:
+    """Tests for call_roh and call_roh_chromosome."""
+
+    def test_finds_planted_segment(self):
+        result = call_roh(synthetic_genome())
+        assert len(result.segments) == 1
+        segment = result.segments[0]
+        assert segment.chromosome == "3"
+        assert 19_500_000 <= segment.start <= 20_100_000
+        assert 29_900_000 <= segment.end <= 30_500_000
+        covered = 22 * (3000 - 1) * 20
+        assert result.froh == pytest.approx(segment.length_kb / covered)
+
+    def test_outbred_genome_has_no_runs(self):
+        result = call_roh(synthetic_genome(roh=()))
+        assert result.segments == []
+        assert result.froh == 0
+
+    def test_length_and_snp_filters(self):
+        store = synthetic_genome(roh=((5, 10_000_000, 10_800_000),))  # 0.8 Mb, 41 SNPs
+        assert call_roh(store).segments == []
+        relaxed = ROHParams(window_snps=20, min_snps=20, min_kb=500)
+        assert any(
+            s.chromosome == "5" and s.start <= 10_000_000 and s.end >= 10_800_000
+            for s in call_roh(store, relaxed).segments
+        )
+
+    def test_gap_splits_run(self):
+        positions = np.concatenate((np.arange(200) * 10_000, 5_000_000 + np.arange(200) * 10_000))
+        het = np.zeros(len(positions), dtype=bool)
+        params = ROHParams(min_snps=100, min_kb=1000, max_gap_kb=1000)
+        assert len(call_roh_chromosome("1", positions, het, params=params)) == 2
+        wide = ROHParams(min_snps=100, min_kb=1000, max_gap_kb=5000, density_kb=50)
+        assert len(call_roh_chromosome("1", positions, het, params=wide)) == 1
+
+    def test_het_limit_and_missing_window(self):
+        positions = np.arange(300) * 10_000
+        het = np.zeros(300, dtype=bool)
+        het[[100, 200]] = True
+        params = ROHParams(min_snps=100, min_kb=1000)
+        [segment] = call_roh_chromosome("1", positions, het, params=params)
+        assert segment.n_het == 2
+        assert call_roh_chromosome("1", positions, het, params=ROHParams(max_het=1)) == []
+
+        missing = np.zeros(300, dtype=bool)
+        missing[::5] = True   # 10 missing calls in every 50-SNP window
+        assert call_roh_chromosome("1", positions, het, missing, params) == []
+
+    def test_streaming_matches_whole_genome(self):
+        store = synthetic_genome()
+        caller = ROHCaller()
+        for chrom in range(1, 23):
+            rows = store.chromosomes == chrom
+            shuffled = np.random.default_rng(chrom).permutation(np.flatnonzero(rows))
+            caller.add_chromosome(
+                str(chrom), store.positions[shuffled], store.heterozygous_mask()[shuffled]
+            )
+        streamed, whole = caller.result(), call_roh(store)
+        assert [s.to_dict() for s in streamed.segments] == [s.to_dict() for s in whole.segments]
+        assert streamed.froh == pytest.approx(whole.froh)
+
+    def test_vcf_chromosome_stream(self, tmp_path):
+        from personal_genomics.vcf import VCFReader
+
+        store = synthetic_genome(n_per_chrom=400, roh=((2, 2_000_000, 6_000_000),))
+        het = store.heterozygous_mask()
+        lines = [
+            "##fileformat=VCFv4.2",
+            "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tS1",
+        ]
+        order = np.lexsort((store.positions, store.chromosomes))
+        for row in order:
+            gt = "0/1" if het[row] else "1/1"
+            lines.append(
+                f"chr{store.chromosomes[row]}\t{store.positions[row]}\t.\tA\tG\t.\tPASS\t.\tGT\t{gt}"
+            )
+        lines.append("2\t9000000\t.\tAT\tA\t.\tPASS\t.\tGT\t0/1")   # indel: skipped
+        path = tmp_path / "wgs.vcf"
+        path.write_text("\n".join(lines) + "\n")
+
+        caller = ROHCaller(ROHParams(min_snps=50, min_kb=1000))
+        chromosomes = []
+        for chrom, positions, het_mask, missing in VCFReader(path).iter_chromosome_calls():
+            chromosomes.append(chrom)
+            assert not missing.any()
+            caller.add_chromosome(chrom, positions, het_mask, missing)
+        assert chromosomes == [str(c) for c in range(1, 23)]
+        assert [s.chromosome for s in caller.result().segments] == ["2"]
+
+
+class TestDetectROHRegions:
+    """Tests for markers.advanced_genetics.detect_roh_regions."""
+
+    def test_store_with_positions(self):
+        from markers.advanced_genetics import detect_roh_regions, generate_roh_report
+
+        store = synthetic_genome(roh=((3, 20_000_000, 30_000_000), (7, 5_000_000, 40_000_000)))
+        result = detect_roh_regions(store)
+        assert result["analysis_possible"]
+        assert [r["chromosome"] for r in result["roh_regions"]] == ["3", "7"]
+        assert result["total_roh_length_mb"] == pytest.approx(45, abs=1.5)
+        assert result["froh"] > 0.03
+        assert generate_roh_report(store)["summary"]["status"] == "elevated"
+
+    def test_positions_dict(self):
+        from markers.advanced_genetics import detect_roh_regions
+
+        store = synthetic_genome()
+        genotypes = store.to_dict()
+        positions = {
+            rsid: (str(store.chromosome(rsid)), store.position(rsid)) for rsid in genotypes
+        }
+        result = detect_roh_regions(genotypes, snp_positions=positions)
+        assert result["segment_count"] == 1
+
+    def test_positions_dict_no_calls_are_missing(self):
+        from markers.advanced_genetics import detect_roh_regions
+
+        store = synthetic_genome()
+        genotypes = store.to_dict()
+        positions = {
+            rsid: (str(store.chromosome(rsid)), store.position(rsid)) for rsid in genotypes
+        }
+        for rsid, (chrom, pos) in positions.items():
+            if chrom == "3" and 20_000_000 <= pos <= 30_000_000 and pos % 60_000 == 0:
+                genotypes[rsid] = "--"
+        result = detect_roh_regions(genotypes, snp_positions=positions)
+        assert result["segment_count"] == 0
+
+    def test_max_het_default(self):
+        from markers.advanced_genetics import detect_roh_regions
+
+        store = synthetic_genome()
+        genotypes = store.to_dict()
+        positions = {
+            rsid: (str(store.chromosome(rsid)), store.position(rsid)) for rsid in genotypes
+        }
+        for pos in (22_000_000, 25_000_000, 28_000_000):
+            rsid = next(r for r, p in positions.items() if p == ("3", pos))
+            genotypes[rsid] = "AC"
+        assert detect_roh_regions(genotypes, snp_positions=positions)["segment_count"] == 0
+        unlimited = detect_roh_regions(genotypes, snp_positions=positions, max_het_allowed=None)
+        assert unlimited["segment_count"] == 1
+
+    def test_without_positions_falls_back(self):
+        from markers.advanced_genetics import detect_roh_regions
+
+        result = detect_roh_regions({"rs1": "AA", "rs2": "AG"})
+        assert not result["analysis_possible"]
+        assert "estimated_froh" in result
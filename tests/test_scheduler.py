@@ -0,0 +1,112 @@
+"""
+Tests for the dependency-graph stage scheduler.
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from personal_genomics.scheduler import Stage, StageScheduler
+
+
+def load(n):
+    return list(range(n))
+
+
+def total(values):
+    return sum(values)
+
+
+def largest(values):
+    return max(values)
+
+
+def report(total_value, largest_value):
+    return f"{total_value}/{largest_value}"
+
+
+def fail(values):
+    raise ValueError("bad input")
+
+
+def allocate(values):
+    return len(bytearray(8_000_000))
+
+
+def graph():
+    return [
+        Stage("load", load, args=(10,)),
+        Stage("total", total, depends=("load",)),
+        Stage("largest", largest, depends=("load",)),
+        Stage("report", report, depends=("total", "largest")),
+    ]
+
+
+
+class TestStageScheduler:
+    """Tests for concurrent, dependency-ordered stage runs."""
+    
+    @pytest.mark.parametrize("executor", ["serial", "thread", "process"])
+    def test_results_and_timings(self, executor):
+        results, timings = StageScheduler(graph(), executor=executor).run()
+        assert results["report"] == "45/9"
+        assert list(timings) == ["load", "total", "largest", "report"]
+        assert all(t.ok and t.seconds >= 0 for t in timings.values())
+        assert timings["report"].memory_scope == "process"
+    
+    @pytest.mark.parametrize("executor", ["serial", "process"])
+    def test_trace_memory(self, executor):
+        stages = [Stage("load", load, args=(1,)), Stage("alloc", allocate, depends=("load",))]
+        _, timings = StageScheduler(stages, executor=executor, trace_memory=True).run()
+        assert timings["alloc"].memory_scope == "stage"
+        assert timings["alloc"].peak_memory_mb >= 7.9
+    
+    def test_stage_subset_includes_dependencies(self):
+        scheduler = StageScheduler(graph())
+        assert scheduler.closure(["total"]) == ["load", "total"]
+        results, timings = scheduler.run(["largest"])
+        assert results == {"load": list(range(10)), "largest": 9}
+        with pytest.raises(ValueError):
+            scheduler.run(["nonexistent"])
+    
+    def test_independent_stages_overlap(self):
+        barrier = threading.Barrier(3, timeout=5)
+    
+        def wait_for_peers(_):
+            barrier.wait()
+            return threading.current_thread().name
+    
+        stages = [Stage("load", load, args=(1,))]
+        stages += [Stage(f"s{i}", wait_for_peers, depends=("load",)) for i in range(3)]
+        start = time.perf_counter()
+        results, timings = StageScheduler(stages, executor="thread").run()
+        assert all(t.ok for t in timings.values())
+        assert len({results[f"s{i}"] for i in range(3)}) == 3
+        assert time.perf_counter() - start < 5
+    
+    def test_failure_skips_dependents_only(self):
+        stages = graph() + [
+            Stage("broken", fail, depends=("load",)),
+            Stage("after_broken", total, depends=("broken",)),
+        ]
+        for executor in ("serial", "thread"):
+            results, timings = StageScheduler(stages, executor=executor).run()
+            assert timings["broken"].error == "ValueError: bad input"
+            assert timings["after_broken"].error == "skipped: broken failed"
+            assert "broken" not in results
+            assert results["report"] == "45/9"
+    
+    def test_invalid_graphs(self):
+        with pytest.raises(ValueError, match="cycle"):
+            StageScheduler([Stage("a", load, depends=("b",)), Stage("b", load, depends=("a",))])
+        with pytest.raises(ValueError, match="unknown stage"):
+            StageScheduler([Stage("a", total, depends=("missing",))])
+        with pytest.raises(ValueError, match="Duplicate"):
+            StageScheduler([Stage("a", load), Stage("a", load)])
+        with pytest.raises(ValueError, match="executor"):
+            StageScheduler(graph(), executor="gpu")
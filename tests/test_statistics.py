@@ -185,6 +185,29 @@ class TestBootstrapCI:
         ci = bootstrap_ci([], lambda x: 0)
         
         assert ci.n == 0
+    
+    def test_vectorized_matches_callable(self):
+        """Vectorized and row-by-row paths see the same resamples."""
+        import numpy as np
+        from personal_genomics.statistics import bootstrap_distribution
+        
+        data = np.random.default_rng(0).normal(size=50)
+        fast = bootstrap_distribution(data, np.median, 2000, random_state=7)
+        slow = bootstrap_distribution(data, lambda x: float(np.median(x)), 2000, random_state=7)
+        
+        assert np.allclose(fast, slow)
+    
+    def test_chunked_matches_single_batch(self):
+        """Capping the resample matrix size doesn't change the result."""
+        import numpy as np
+        from personal_genomics.statistics import bootstrap_distribution
+        
+        data = list(range(40))
+        whole = bootstrap_distribution(data, np.mean, 1000, random_state=3)
+        chunked = bootstrap_distribution(data, np.mean, 1000, random_state=3, max_elements=333)
+        
+        assert np.array_equal(whole, chunked)
+        assert len(whole) == 1000
 
 
 class TestEffectSizeCI:
@@ -96,6 +96,162 @@ class TestVCFParsing:
                 os.unlink(f.name)
 
 
+class TestVCFReader:
+    """Tests for multi-sample and block-indexed VCF reading."""
+    
+    @staticmethod
+    def family_vcf(n_records=600):
+        """Sorted 3-sample VCF text; every third record has no ID."""
+        import random
+        rng = random.Random(7)
+        lines = [
+            "##fileformat=VCFv4.2",
+            "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tchild\tmother\tfather",
+        ]
+        for i in range(n_records):
+            rsid = "." if i % 3 == 0 else f"rs{1000 + i}"
+            samples = "\t".join(
+                rng.choice(["0/0", "0/1", "1|1", "./."]) + ":" + "9" * rng.randint(1, 30)
+                for _ in range(3)
+            )
+            lines.append(f"chr2\t{100 + 37 * i}\t{rsid}\tA\tG\t50\tPASS\t.\tGT:GQ\t{samples}")
+        return "\n".join(lines) + "\n"
+    
+    def test_all_samples(self, tmp_path):
+        from personal_genomics.vcf import VCFReader
+        path = tmp_path / "family.vcf"
+        path.write_text(SYNTHETIC_VCF_MULTISAMPLE)
+        
+        reader = VCFReader(path)
+        assert reader.samples == ["SAMPLE1", "SAMPLE2", "SAMPLE3"]
+        stores = reader.read()
+        assert stores["SAMPLE1"]["rs429358"] == "TT"
+        assert stores["SAMPLE2"]["rs429358"] == "TC"
+        assert stores["SAMPLE3"]["rs429358"] == "CC"
+        assert stores["SAMPLE2"].position("rs429358") == 44908684
+    
+    def test_pick_sample(self, tmp_path):
+        from comprehensive_analysis import load_vcf, load_vcf_samples
+        path = tmp_path / "family.vcf"
+        path.write_text(SYNTHETIC_VCF_MULTISAMPLE)
+        
+        assert load_vcf(path)["rs4680"] == "GG"
+        assert load_vcf(path, sample="SAMPLE3")["rs4680"] == "AA"
+        assert load_vcf(path, sample=1)["rs4680"] == "GA"
+        assert list(load_vcf_samples(path, samples=["SAMPLE3", "SAMPLE1"])) == ["SAMPLE3", "SAMPLE1"]
+        with pytest.raises(ValueError):
+            load_vcf(path, sample="nobody")
+    
+    def test_missing_id_keyed_by_locus(self, tmp_path):
+        from personal_genomics.vcf import read_vcf
+        path = tmp_path / "noid.vcf"
+        path.write_text(
+            "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tS\n"
+            "chr1\t100\t.\tC\tT\t50\tPASS\t.\tGT\t0/1\n"
+            "chrX\t200\tesv1;rs5\tG\tA\t50\tPASS\t.\tGT\t1\n"
+            "1\t300\t.\tAT\tA\t50\tPASS\t.\tGT\t1/1\n"
+        )
+        store = read_vcf(path)["S"]
+        assert store["1:100"] == "CT"
+        assert store["rs5"] == "A"
+        assert "1:300" not in store
+    
+    def test_block_index_reads_only_target_blocks(self, tmp_path):
+        from personal_genomics.vcf import BGZFIndex, VCFReader, compress_bgzf
+        path = tmp_path / "family.vcf.gz"
+        # Tiny blocks so records span block boundaries
+        path.write_bytes(compress_bgzf(self.family_vcf().encode(), block_size=150))
+        
+        reader = VCFReader(path)
+        assert reader.bgzf
+        full = reader.read()
+        
+        rsids = ["rs1001", "rs1302", "rs1598", "rs99"]
+        loci = [("2", 100 + 37 * 300), ("chr2", 100 + 37 * 597)]
+        targeted = reader.read(rsids=rsids, loci=loci)
+        assert len(reader.index.blocks_for(rsids=rsids, loci=loci)) < len(reader.index) / 10
+        
+        wanted = {"rs1001", "rs1302", "rs1598", "2:11200", "2:22189"}
+        for sample, store in full.items():
+            expected = {k: v for k, v in store.items() if k in wanted}
+            assert dict(targeted[sample].items()) == expected
+        
+        assert BGZFIndex.index_path(path).exists()
+        assert BGZFIndex.load(BGZFIndex.index_path(path)).matches(path)
+    
+    def test_stale_index_is_rebuilt(self, tmp_path):
+        from personal_genomics.vcf import BGZFIndex, compress_bgzf
+        path = tmp_path / "family.vcf.gz"
+        path.write_bytes(compress_bgzf(self.family_vcf(100).encode(), block_size=500))
+        first = BGZFIndex.for_file(path)
+        
+        path.write_bytes(compress_bgzf(self.family_vcf(400).encode(), block_size=500))
+        assert not first.matches(path)
+        assert len(BGZFIndex.for_file(path).rsids) > len(first.rsids)
+    
+    def test_plain_gzip_targeted_read(self, tmp_path):
+        import gzip
+        from personal_genomics.vcf import VCFReader
+        path = tmp_path / "family.vcf.gz"
+        path.write_bytes(gzip.compress(self.family_vcf().encode()))
+        
+        reader = VCFReader(path)
+        assert not reader.bgzf and reader.index is None
+        stores = reader.read(samples="mother", rsids=["rs1001"])
+        assert list(stores) == ["mother"]
+        assert list(stores["mother"]) in ([], ["rs1001"])
+
+
+
+class TestBGZFReading:
+    """Tests for parallel BGZF block inflation."""
+    
+    def test_parallel_chunks_match_serial(self, tmp_path):
+        from personal_genomics.bgzf import compress_bgzf, iter_bgzf_chunks, read_file_bytes
+        data = TestVCFReader.family_vcf(2000).encode()
+        path = tmp_path / "family.vcf.gz"
+        path.write_bytes(compress_bgzf(data, block_size=300))
+        
+        with open(path, "rb") as fh:
+            chunks = list(iter_bgzf_chunks(fh, workers=4, blocks_per_task=3))
+        assert len(chunks) > 8
+        assert b"".join(chunks) == data
+        assert read_file_bytes(path, workers=1) == data
+    
+    def test_text_lines_for_all_compressions(self, tmp_path):
+        import gzip
+        from personal_genomics.bgzf import compress_bgzf, iter_text_lines
+        text = TestVCFReader.family_vcf(300)
+        expected = text.splitlines()
+        
+        plain = tmp_path / "plain.vcf"
+        plain.write_text(text)
+        gz = tmp_path / "plain.vcf.gz"
+        gz.write_bytes(gzip.compress(text.encode()))
+        bgz = tmp_path / "blocked.vcf.gz"
+        bgz.write_bytes(compress_bgzf(text.encode(), block_size=100))
+        
+        for path in (plain, gz, bgz):
+            assert list(iter_text_lines(path, workers=3)) == expected
+    
+    def test_text_lines_split_on_newline_only(self, tmp_path):
+        from personal_genomics.bgzf import compress_bgzf, iter_text_lines
+        text = "rs1\t1\t100\tAA\x0c\u2028x\r\nrs2\t1\t200\tAG\x1e\x85\nrs3\t1\t300\tGG"
+        path = tmp_path / "odd.txt.gz"
+        path.write_bytes(compress_bgzf(text.encode(), block_size=10))
+        assert list(iter_text_lines(path)) == [
+            "rs1\t1\t100\tAA\x0c\u2028x", "rs2\t1\t200\tAG\x1e\x85", "rs3\t1\t300\tGG",
+        ]
+    
+    def test_corrupt_block_raises(self, tmp_path):
+        from personal_genomics.bgzf import compress_bgzf, read_file_bytes
+        data = bytearray(compress_bgzf(b"rs1\t1\t100\tAA\n" * 500, block_size=1000))
+        data[40] ^= 0xFF
+        path = tmp_path / "bad.txt.gz"
+        path.write_bytes(bytes(data))
+        with pytest.raises(Exception):
+            read_file_bytes(path, workers=2)
+
 class TestFormatDetection:
     """Tests for DNA file format detection."""
     